@@ -355,3 +355,43 @@ def test_subclass_datetime():
     d2 = d.replace(hour=7)
     assert type(d2) is MyDatetime
     assert d2 == datetime.datetime(2016, 4, 5, 7, 2, 3)
+
+@pytest.mark.parametrize("string, format", [
+    ('2024-01-02 03:04:05', '%Y-%m-%d %H:%M:%S'),
+    ('2024-1-2T3:4:5.25', '%Y-%m-%dT%H:%M:%S.%f'),
+    ('20240229', '%Y%m%d'),
+    ('1231', '%m%d'),
+    ('2024t01', '%YT%m'),
+    ('Jan 02 2024', '%b %d %Y'),
+])
+def test_strptime_same_as_time_strptime(string, format):
+    import time
+    d = datetime.datetime.strptime(string, format)
+    assert d.timetuple()[:6] == time.strptime(string, format)[:6]
+
+@pytest.mark.parametrize("string, format", [
+    ('02/29', '%m/%d'),
+    ('2023-02-29', '%Y-%m-%d'),
+    ('2024-01-02 23:59:60', '%Y-%m-%d %H:%M:%S'),
+    ('2024-01-02 ', '%Y-%m-%d'),
+    ('2024-13-02', '%Y-%m-%d'),
+])
+def test_strptime_errors(string, format):
+    with pytest.raises(ValueError):
+        datetime.datetime.strptime(string, format)
+
+@pytest.mark.parametrize("timestamp", [
+    0, 1.5, -1.25, 1700000000.999999, 951782400, -62135596800, 253402300799])
+def test_utcfromtimestamp(timestamp):
+    import time, math
+    d = datetime.datetime.utcfromtimestamp(timestamp)
+    assert d.timetuple()[:6] == time.gmtime(math.floor(timestamp))[:6]
+
+def test_isoformat():
+    d = datetime.datetime(2024, 5, 6, 7, 8, 9, 10)
+    assert d.isoformat() == '2024-05-06T07:08:09.000010'
+    assert str(d) == '2024-05-06 07:08:09.000010'
+    assert d.replace(microsecond=0).isoformat('_') == '2024-05-06_07:08:09'
+    assert str(d.date()) == '2024-05-06'
+    assert str(d.time()) == '07:08:09.000010'
+    assert str(datetime.date(33, 1, 1)) == '0033-01-01'
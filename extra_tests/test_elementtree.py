@@ -0,0 +1,59 @@
+from xml.etree import cElementTree as ET
+from xml.etree import ElementTree
+from io import BytesIO
+
+XML = ('<root><a x="1">one</a><b/><a>two<c><a>deep</a></c></a>'
+       '<ns:a xmlns:ns="urn:x">three</ns:a></root>')
+
+def test_parser_makes_accelerated_elements():
+    root = ET.XML(XML)
+    assert type(root) is ET.Element
+    assert all(type(e) is ET.Element for e in root.iter())
+    assert root.find('a').attrib == {'x': '1'}
+    events = [(event, type(elem)) for event, elem in
+              ET.iterparse(BytesIO(XML), ['start'])]
+    assert events and all(cls is ET.Element for _, cls in events)
+
+def test_find_same_as_elementpath():
+    root = ET.XML(XML)
+    pure = ElementTree.XML(XML)
+    for path in ['a', 'b', 'c', 'missing', '{urn:x}a', './a', 'a/c',
+                 './/a', '*', 'a[@x]', '.', u'a']:
+        assert ([e.tag for e in root.findall(path)] ==
+                [e.tag for e in pure.findall(path)])
+        assert ([e.tag for e in root.iterfind(path)] ==
+                [e.tag for e in pure.iterfind(path)])
+        assert root.findtext(path, 'dflt') == pure.findtext(path, 'dflt')
+        found = root.find(path)
+        expected = pure.find(path)
+        assert (found is None) == (expected is None)
+        if found is not None:
+            assert found.tag == expected.tag
+
+def test_iter_deep_tree():
+    root = elem = ET.Element('x')
+    for i in range(5000):
+        elem = ET.SubElement(elem, 'x' if i % 2 else 'y')
+    assert len(list(root.iter())) == 5001
+    assert len(list(root.iter('y'))) == 2500
+    assert len(list(root.iter('*'))) == 5001
+
+def test_iter_order():
+    root = ET.XML(XML)
+    pure = ElementTree.XML(XML)
+    assert [e.tag for e in root.iter()] == [e.tag for e in pure.iter()]
+    assert [e.text for e in root.iter('a')] == [e.text for e in pure.iter('a')]
+
+def test_custom_target():
+    class Target(object):
+        def __init__(self):
+            self.events = []
+        def start(self, tag, attrib):
+            self.events.append((tag, attrib))
+        def end(self, tag):
+            self.events.append(tag)
+        def close(self):
+            return self.events
+    parser = ET.XMLParser(target=Target())
+    parser.feed('<r a="b"><s/></r>')
+    assert parser.close() == [('r', {'a': 'b'}), ('s', {}), 's', 'r']
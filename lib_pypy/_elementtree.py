@@ -1,6 +1,173 @@
-# Just use ElementTree.
+#
+# Accelerator for xml.etree.ElementTree, used by xml.etree.cElementTree.
+#
+# Like CPython's _elementtree.c, this module has its own Element,
+# TreeBuilder and XMLParser classes, together with the functions that
+# create them; everything else comes from ElementTree.  Compared to the
+# pure Python versions:
+#
+#  * the tree builder creates the elements directly from the attribute
+#    dicts built by the parser, without copying them again;
+#
+#  * Element.iter() walks the tree with an explicit stack, instead of
+#    going through one nested generator per level of the tree;
+#
+#  * find(), findall(), findtext() and iterfind() recognize the paths
+#    that are just a tag name (the common case), and then look at the
+#    children directly instead of going through ElementPath.  Whether a
+#    path is such a tag name is cached.
+#
 
-from xml.etree import ElementTree
+import re
+from xml.etree import ElementTree as _ET, ElementPath as _ElementPath
 
-globals().update(ElementTree.__dict__)
-del __all__
+globals().update([(_key, _value) for (_key, _value) in _ET.__dict__.items()
+                  if not _key.startswith('__')])
+del _key, _value
+
+
+# paths that select the children with the given tag; any other path
+# goes through ElementPath.  Namespace prefixes ("ns:tag") need the
+# namespaces mapping, so they are not simple either.
+_simple_path_re = re.compile(r"(?:\{[^}]+\})?[^/\[\]\(\)@=\s:.*{}]+\Z")
+_simple_paths = {}
+
+def _is_simple_path(path):
+    if type(path) is not str and type(path) is not unicode:
+        return False
+    try:
+        return _simple_paths[path]
+    except KeyError:
+        if len(_simple_paths) > 100:
+            _simple_paths.clear()
+        simple = _simple_path_re.match(path) is not None
+        _simple_paths[path] = simple
+        return simple
+
+
+class Element(_ET.Element):
+
+    def find(self, path, namespaces=None):
+        if _is_simple_path(path):
+            for e in self._children:
+                if e.tag == path:
+                    return e
+            return None
+        return _ElementPath.find(self, path, namespaces)
+
+    def findtext(self, path, default=None, namespaces=None):
+        if _is_simple_path(path):
+            for e in self._children:
+                if e.tag == path:
+                    return e.text or ""
+            return default
+        return _ElementPath.findtext(self, path, default, namespaces)
+
+    def findall(self, path, namespaces=None):
+        if _is_simple_path(path):
+            return [e for e in self._children if e.tag == path]
+        return _ElementPath.findall(self, path, namespaces)
+
+    def iterfind(self, path, namespaces=None):
+        if _is_simple_path(path):
+            return (e for e in self._children if e.tag == path)
+        return _ElementPath.iterfind(self, path, namespaces)
+
+    def iter(self, tag=None):
+        if tag == "*":
+            tag = None
+        if tag is None or self.tag == tag:
+            yield self
+        stack = [iter(self._children)]
+        while stack:
+            for e in stack[-1]:
+                if tag is None or e.tag == tag:
+                    yield e
+                if e._children:
+                    stack.append(iter(e._children))
+                    break
+            else:
+                stack.pop()
+
+_Element = _ElementInterface = Element
+
+
+class TreeBuilder(_ET.TreeBuilder):
+
+    def __init__(self, element_factory=None):
+        if element_factory is None:
+            element_factory = Element
+        _ET.TreeBuilder.__init__(self, element_factory)
+
+    def _start_fresh(self, tag, attrib):
+        # like start(), but 'attrib' is a new dict that nobody else uses
+        if self._factory is not Element:
+            return self.start(tag, attrib)
+        self._flush()
+        self._last = elem = Element.__new__(Element)
+        elem.tag = tag
+        elem.attrib = attrib
+        elem._children = []
+        if self._elem:
+            self._elem[-1]._children.append(elem)
+        self._elem.append(elem)
+        self._tail = 0
+        return elem
+
+
+class XMLParser(_ET.XMLParser):
+
+    def __init__(self, html=_sentinel, target=None, encoding=None):
+        if target is None:
+            target = TreeBuilder()
+        _ET.XMLParser.__init__(self, html, target, encoding)
+
+    def _start_list(self, tag, attrib_in):
+        fixname = self._fixname
+        fixtext = self._fixtext
+        tag = fixname(tag)
+        attrib = {}
+        if attrib_in:
+            for i in range(0, len(attrib_in), 2):
+                attrib[fixname(attrib_in[i])] = fixtext(attrib_in[i+1])
+        if type(self.target) is TreeBuilder:
+            return self.target._start_fresh(tag, attrib)
+        return self.target.start(tag, attrib)
+
+XMLTreeBuilder = XMLParser
+
+
+class ElementTree(_ET.ElementTree):
+
+    def parse(self, source, parser=None):
+        if parser is None:
+            parser = XMLParser(target=TreeBuilder())
+        return _ET.ElementTree.parse(self, source, parser)
+
+
+def parse(source, parser=None):
+    tree = ElementTree()
+    tree.parse(source, parser)
+    return tree
+
+def iterparse(source, events=None, parser=None):
+    if parser is None:
+        parser = XMLParser(target=TreeBuilder())
+    return _ET.iterparse(source, events, parser)
+
+def XML(text, parser=None):
+    if parser is None:
+        parser = XMLParser(target=TreeBuilder())
+    return _ET.XML(text, parser)
+
+fromstring = XML
+
+def XMLID(text, parser=None):
+    if parser is None:
+        parser = XMLParser(target=TreeBuilder())
+    return _ET.XMLID(text, parser)
+
+def fromstringlist(sequence, parser=None):
+    if parser is None:
+        parser = XMLParser(target=TreeBuilder())
+    return _ET.fromstringlist(sequence, parser)
@@ -12,6 +12,11 @@ import marshal, struct, sys
 try: from __pypy__ import builtinify
 except ImportError: builtinify = lambda f: f
 
+try:
+    import _pypypickle
+except ImportError:
+    _pypypickle = None
+
 # These are purely informational; no code uses these.
 format_version = "2.0"                  # File format version we write
 compatible_formats = ["1.0",            # Original protocol 0
@@ -121,6 +126,12 @@ def dump(obj, file, protocol=None):
         raise ValueError("pickle protocol %d asked for; "
                      "the highest available protocol is %d" % (
                      protocol, HIGHEST_PROTOCOL))
+    if _pypypickle is not None:
+        # fast path for objects made only of the builtin types
+        result = _pypypickle.dumps(obj, protocol)
+        if result is not None:
+            file.write(result)
+            return
     Pickler(file, protocol).dump(obj)
 
 @builtinify
@@ -130,6 +141,11 @@ def dumps(obj, protocol=None):
         raise ValueError("pickle protocol %d asked for; "
                      "the highest available protocol is %d" % (
                      protocol, HIGHEST_PROTOCOL))
+    if _pypypickle is not None:
+        # fast path for objects made only of the builtin types
+        result = _pypypickle.dumps(obj, protocol)
+        if result is not None:
+            return result
     file = StringIO()
     Pickler(file, protocol).dump(obj)
     return file.getvalue()
@@ -622,6 +638,13 @@ except ImportError:
 def load(f):
     return Unpickler(f).load()
 
+_unsupported = object()
+
 def loads(str):
+    if _pypypickle is not None and isinstance(str, bytes):
+        # fast path for pickles of the builtin types only
+        result = _pypypickle.loads(str, _unsupported)
+        if result is not _unsupported:
+            return result
     f = StringIO(str)
     return Unpickler(f).load()
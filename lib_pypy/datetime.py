@@ -23,6 +23,10 @@ import struct as _struct
 
 # for cpyext, use these as base classes
 from __pypy__._pypydatetime import dateinterop, deltainterop, timeinterop
+# interp-level versions of the hot paths
+from __pypy__._pypydatetime import (format_date as _format_date,
+    format_time as _format_time, format_datetime as _format_datetime,
+    parse_datetime as _parse_datetime)
 
 _SENTINEL = object()
 
@@ -173,6 +177,13 @@ def _ord2ymd(n):
     # start of that month:  we're done!
     return year, month, n+1
 
+# Range of the POSIX timestamps that datetime.utcfromtimestamp() converts
+# without calling time.gmtime().
+_EPOCH_ORDINAL = _ymd2ord(1970, 1, 1)
+_MIN_TIMESTAMP = (_ymd2ord(MINYEAR, 1, 1) - _EPOCH_ORDINAL) * _SECONDS_PER_DAY
+_MAX_TIMESTAMP = ((_ymd2ord(MAXYEAR, 12, 31) + 1 - _EPOCH_ORDINAL) *
+                  _SECONDS_PER_DAY - 1)
+
 # Month and day names.  For localized versions, see the calendar module.
 _MONTHNAMES = [None, "Jan", "Feb", "Mar", "Apr", "May", "Jun",
                      "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
@@ -184,13 +195,6 @@ def _build_struct_time(y, m, d, hh, mm, ss, dstflag):
     dnum = _days_before_month(y, m) + d
     return _timemodule.struct_time((y, m, d, hh, mm, ss, wday, dnum, dstflag))
 
-def _format_time(hh, mm, ss, us):
-    # Skip trailing microseconds when us==0.
-    result = "%02d:%02d:%02d" % (hh, mm, ss)
-    if us:
-        result += ".%06d" % us
-    return result
-
 # Correctly substitute for %z and %Z escapes in strftime formats.
 def _wrap_strftime(object, format, timetuple):
     year = timetuple[0]
@@ -802,7 +806,7 @@ class date(dateinterop):
         - http://www.w3.org/TR/NOTE-datetime
         - http://www.cl.cam.ac.uk/~mgk25/iso-time.html
         """
-        return "%04d-%02d-%02d" % (self._year, self._month, self._day)
+        return _format_date(self._year, self._month, self._day)
 
     __str__ = isoformat
 
@@ -1497,6 +1501,14 @@ class datetime(date):
         if us == 1000000:
             timestamp += 1
             us = 0
+        if (converter is _timemodule.gmtime and
+                _MIN_TIMESTAMP <= timestamp <= _MAX_TIMESTAMP):
+            # no need to build a struct_time for UTC
+            days, seconds = divmod(timestamp, _SECONDS_PER_DAY)
+            y, m, d = _ord2ymd(days + _EPOCH_ORDINAL)
+            hh, seconds = divmod(seconds, 3600)
+            mm, ss = divmod(seconds, 60)
+            return cls((y, m, d, hh, mm, ss, us), tzinfo=tzinfo)
         y, m, d, hh, mm, ss, weekday, jday, dst = converter(timestamp)
         ss = min(ss, 59)    # clamp out leap seconds if the platform has them
         return cls((y, m, d, hh, mm, ss, us), tzinfo=tzinfo)
@@ -1626,9 +1638,15 @@ class datetime(date):
         Optional argument sep specifies the separator between date and
         time, default 'T'.
         """
-        s = ("%04d-%02d-%02d%c" % (self._year, self._month, self._day, sep) +
-             _format_time(self._hour, self._minute, self._second,
-                          self._microsecond))
+        if type(sep) is str and len(sep) == 1:
+            s = _format_datetime(self._year, self._month, self._day, sep,
+                                 self._hour, self._minute, self._second,
+                                 self._microsecond)
+        else:
+            s = ("%04d-%02d-%02d%c" % (self._year, self._month, self._day,
+                                       sep) +
+                 _format_time(self._hour, self._minute, self._second,
+                              self._microsecond))
         off = self._utcoffset()
         if off is not None:
             if off < 0:
@@ -1663,6 +1681,11 @@ class datetime(date):
     @classmethod
     def strptime(cls, date_string, format):
         'string, format -> new datetime parsed from a string (like time.strptime()).'
+        if type(date_string) is str and type(format) is str:
+            # common numeric formats like '%Y-%m-%d %H:%M:%S'
+            fields = _parse_datetime(date_string, format)
+            if fields is not None:
+                return cls(*fields)
         from _strptime import _strptime
         # _strptime._strptime returns a two-element tuple.  The first
         # element is a time.struct_time object.  The second is the
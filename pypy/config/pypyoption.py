@@ -36,7 +36,7 @@ working_modules.update([
     "cStringIO", "thread", "itertools", "pyexpat", "cpyext", "array",
     "binascii", "_multiprocessing", '_warnings', "_collections",
     "_multibytecodec", "micronumpy", "_continuation", "_cffi_backend",
-    "_csv", "_cppyy", "_pypyjson", "_jitlog",
+    "_csv", "_cppyy", "_pypyjson", "_pypypickle", "_jitlog",
     # "_hashlib", "crypt"
 ])
 
@@ -192,6 +192,15 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
         IntOption("prebuiltintto", "highest integer which is prebuilt",
                   default=100, cmdline="--prebuiltintto"),
 
+        BoolOption("withprebuiltchar",
+                   "prebuild the strs and ascii unicodes of length 1",
+                   default=False),
+
+        BoolOption("withstrintern",
+                   "intern the short identifier-like strings produced by "
+                   "str.split() and the json decoder",
+                   default=False),
+
         BoolOption("withsmalllong", "use a version of 'long' in a C long long",
                    default=False),
 
@@ -199,6 +208,13 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
                    "use specialised tuples",
                    default=False),
 
+        BoolOption("withstrbuf", "use strings optimized for addition",
+                   default=False),
+
+        BoolOption("withstrslice", "use big slices of strings that share "
+                   "the memory of the sliced string",
+                   default=False),
+
         BoolOption("withliststrategies",
                    "enable optimized ways to store lists of primitives ",
                    default=True),
@@ -256,6 +272,7 @@ def set_pypy_opt_level(config, level):
     # memory-saving optimizations
     if level == 'mem':
         config.objspace.std.suggest(withprebuiltint=True)
+        config.objspace.std.suggest(withprebuiltchar=True)
         config.objspace.std.suggest(withliststrategies=True)
         if not IS_64_BITS:
             config.objspace.std.suggest(withsmalllong=True)
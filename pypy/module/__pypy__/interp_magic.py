@@ -9,6 +9,7 @@ from pypy.objspace.std.listobject import W_ListObject
 from pypy.objspace.std.setobject import W_BaseSetObject
 from pypy.objspace.std.typeobject import MethodCache
 from pypy.objspace.std.mapdict import MapAttrCache
+from pypy.objspace.std.strintern import StrInternCache
 from rpython.rlib import rposix, rgc, rstack
 
 
@@ -44,12 +45,29 @@ def reset_method_cache_counter(space):
 @unwrap_spec(name='text')
 def mapdict_cache_counter(space, name):
     """Return a tuple (index_cache_hits, index_cache_misses) for lookups
-    in the mapdict cache with the given attribute name."""
+    in the mapdict cache with the given attribute name.  The hits include
+    the attribute loads and method lookups that are found in the inline
+    caches of the code objects."""
     assert space.config.objspace.std.withmethodcachecounter
     cache = space.fromcache(MapAttrCache)
     return space.newtuple([space.newint(cache.hits.get(name, 0)),
                            space.newint(cache.misses.get(name, 0))])
 
+def str_intern_counters(space):
+    """Return a tuple (hits, misses) for the interning of the strings
+    produced by str.split() and the json decoder."""
+    assert space.config.objspace.std.withstrintern
+    cache = space.fromcache(StrInternCache)
+    return space.newtuple([space.newint(cache.hits),
+                           space.newint(cache.misses)])
+
+def reset_str_intern_counters(space):
+    """Reset the counters returned by str_intern_counters() to zero."""
+    assert space.config.objspace.std.withstrintern
+    cache = space.fromcache(StrInternCache)
+    cache.hits = 0
+    cache.misses = 0
+
 def builtinify(space, w_func):
     """To implement at app-level modules that are, in CPython,
     implemented in C: this decorator protects a function from being ever
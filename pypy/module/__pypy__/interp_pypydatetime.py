@@ -1,6 +1,8 @@
 from pypy.interpreter.baseobjspace import W_Root
+from pypy.interpreter.error import oefmt
 from pypy.interpreter.typedef import TypeDef
-from pypy.interpreter.gateway import interp2app
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+from rpython.rlib.rstring import StringBuilder
 from rpython.tool.sourcetools import func_with_new_name
 
 def create_class(name):
@@ -22,3 +24,172 @@ W_DateTime_Date = create_class('pypydatetime_date')
 W_DateTime_Delta = create_class('pypydatetime_delta')
 
 
+
+# ____________________________________________________________
+# Helpers for the hot paths of lib_pypy/datetime.py
+
+def _append_field(builder, value, width):
+    # like '%0*d' % (width, value), for 0 <= value
+    digits = str(value)
+    if len(digits) < width:
+        builder.append_multiple_char('0', width - len(digits))
+    builder.append(digits)
+
+def _negative_field(space):
+    return oefmt(space.w_ValueError, "negative date or time field")
+
+def _append_date(builder, year, month, day):
+    _append_field(builder, year, 4)
+    builder.append('-')
+    _append_field(builder, month, 2)
+    builder.append('-')
+    _append_field(builder, day, 2)
+
+def _append_time(builder, hour, minute, second, microsecond):
+    _append_field(builder, hour, 2)
+    builder.append(':')
+    _append_field(builder, minute, 2)
+    builder.append(':')
+    _append_field(builder, second, 2)
+    if microsecond:
+        builder.append('.')
+        _append_field(builder, microsecond, 6)
+
+@unwrap_spec(year=int, month=int, day=int)
+def format_date(space, year, month, day):
+    """Returns 'YYYY-MM-DD'."""
+    if year < 0 or month < 0 or day < 0:
+        raise _negative_field(space)
+    builder = StringBuilder(10)
+    _append_date(builder, year, month, day)
+    return space.newtext(builder.build())
+
+@unwrap_spec(hour=int, minute=int, second=int, microsecond=int)
+def format_time(space, hour, minute, second, microsecond):
+    """Returns 'HH:MM:SS.mmmmmm', or 'HH:MM:SS' if microsecond is 0."""
+    if hour < 0 or minute < 0 or second < 0 or microsecond < 0:
+        raise _negative_field(space)
+    builder = StringBuilder(15)
+    _append_time(builder, hour, minute, second, microsecond)
+    return space.newtext(builder.build())
+
+@unwrap_spec(year=int, month=int, day=int, sep='bytes', hour=int,
+             minute=int, second=int, microsecond=int)
+def format_datetime(space, year, month, day, sep, hour, minute, second,
+                    microsecond):
+    """Returns 'YYYY-MM-DD' + sep + 'HH:MM:SS.mmmmmm', without the
+    microseconds if they are 0."""
+    if (year < 0 or month < 0 or day < 0 or
+            hour < 0 or minute < 0 or second < 0 or microsecond < 0):
+        raise _negative_field(space)
+    builder = StringBuilder(26 + len(sep))
+    _append_date(builder, year, month, day)
+    builder.append(sep)
+    _append_time(builder, hour, minute, second, microsecond)
+    return space.newtext(builder.build())
+
+
+class _FastParseFailed(Exception):
+    pass
+
+# directive -> (maximum number of digits, minimum value, maximum value),
+# following the regexps of _strptime.TimeRE
+_NUMERIC_DIRECTIVES = {
+    'Y': (4, 0, 9999),
+    'm': (2, 1, 12),
+    'd': (2, 1, 31),
+    'H': (2, 0, 23),
+    'M': (2, 0, 59),
+    'S': (2, 0, 61),
+    'f': (6, 0, 999999),
+}
+
+def _isspace(c):
+    return c == ' ' or '\t' <= c <= '\r'
+
+def _parse_datetime(string, format):
+    year = 1900
+    month = day = 1
+    hour = minute = second = microsecond = 0
+    i = 0     # position in 'format'
+    j = 0     # position in 'string'
+    while i < len(format):
+        c = format[i]
+        i += 1
+        if c == '%':
+            if i == len(format):
+                raise _FastParseFailed
+            directive = format[i]
+            i += 1
+            if directive == '%':
+                if j == len(string) or string[j] != '%':
+                    raise _FastParseFailed
+                j += 1
+                continue
+            try:
+                maxdigits, minvalue, maxvalue = _NUMERIC_DIRECTIVES[directive]
+            except KeyError:
+                raise _FastParseFailed
+            start = j
+            value = 0
+            while (j < len(string) and j - start < maxdigits and
+                   '0' <= string[j] <= '9'):
+                value = value * 10 + (ord(string[j]) - ord('0'))
+                j += 1
+            ndigits = j - start
+            if ndigits == 0 or not (minvalue <= value <= maxvalue):
+                raise _FastParseFailed
+            if directive == 'Y':
+                if ndigits != 4:
+                    raise _FastParseFailed
+                year = value
+            elif directive == 'm':
+                month = value
+            elif directive == 'd':
+                day = value
+            elif directive == 'H':
+                hour = value
+            elif directive == 'M':
+                minute = value
+            elif directive == 'S':
+                second = value
+            else:
+                for k in range(ndigits, 6):
+                    value *= 10
+                microsecond = value
+        elif _isspace(c):
+            # like _strptime, a run of whitespace matches '\s+'
+            while i < len(format) and _isspace(format[i]):
+                i += 1
+            if j == len(string) or not _isspace(string[j]):
+                raise _FastParseFailed
+            while j < len(string) and _isspace(string[j]):
+                j += 1
+        else:
+            if j == len(string) or string[j] != c:
+                raise _FastParseFailed
+            j += 1
+    if j != len(string):
+        raise _FastParseFailed
+    return year, month, day, hour, minute, second, microsecond
+
+@unwrap_spec(string='bytes', format='bytes')
+def parse_datetime(space, string, format):
+    """Parses 'string' like datetime.strptime(string, format), and returns
+    (year, month, day, hour, minute, second, microsecond).
+
+    Only the formats made of literal characters and the directives %Y, %m,
+    %d, %H, %M, %S, %f and %% are supported.  Returns None if the format
+    is not supported, or if the string does not match it exactly: in that
+    case, datetime.strptime() goes through the _strptime module, which
+    handles everything else and reports the errors.
+    """
+    try:
+        fields = _parse_datetime(string, format)
+    except _FastParseFailed:
+        return space.w_None
+    year, month, day, hour, minute, second, microsecond = fields
+    return space.newtuple([space.newint(year), space.newint(month),
+                           space.newint(day), space.newint(hour),
+                           space.newint(minute), space.newint(second),
+                           space.newint(microsecond)])
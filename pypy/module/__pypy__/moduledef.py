@@ -65,6 +65,10 @@ class PyPyDateTime(MixedModule):
         'dateinterop'  : 'interp_pypydatetime.W_DateTime_Date',
         'timeinterop'  : 'interp_pypydatetime.W_DateTime_Time',
         'deltainterop' : 'interp_pypydatetime.W_DateTime_Delta',
+        'format_date'    : 'interp_pypydatetime.format_date',
+        'format_time'    : 'interp_pypydatetime.format_time',
+        'format_datetime': 'interp_pypydatetime.format_datetime',
+        'parse_datetime' : 'interp_pypydatetime.parse_datetime',
     }
 
 class PyPyBufferable(MixedModule):
@@ -142,6 +146,11 @@ class Module(MixedModule):
                                  'interp_magic.reset_method_cache_counter')
             self.extra_interpdef('mapdict_cache_counter',
                                  'interp_magic.mapdict_cache_counter')
+        if self.space.config.objspace.std.withstrintern:
+            self.extra_interpdef('str_intern_counters',
+                                 'interp_magic.str_intern_counters')
+            self.extra_interpdef('reset_str_intern_counters',
+                                 'interp_magic.reset_str_intern_counters')
         PYC_MAGIC = get_pyc_magic(self.space)
         self.extra_interpdef('PYC_MAGIC', 'space.wrap(%d)' % PYC_MAGIC)
         try:
@@ -0,0 +1,41 @@
+class AppTestPyPyDateTime(object):
+
+    def test_format(self):
+        from __pypy__._pypydatetime import (format_date, format_time,
+                                            format_datetime)
+        assert format_date(1, 2, 3) == '0001-02-03'
+        assert format_date(2024, 12, 31) == '2024-12-31'
+        assert format_time(1, 2, 3, 0) == '01:02:03'
+        assert format_time(23, 59, 59, 5) == '23:59:59.000005'
+        assert format_datetime(2024, 1, 2, 'T', 3, 4, 5, 0) == (
+            '2024-01-02T03:04:05')
+        assert format_datetime(2024, 1, 2, ' ', 3, 4, 5, 123456) == (
+            '2024-01-02 03:04:05.123456')
+        raises(ValueError, format_date, 2024, -1, 1)
+
+    def test_parse(self):
+        from __pypy__._pypydatetime import parse_datetime
+        assert parse_datetime('2024-01-02 03:04:05', '%Y-%m-%d %H:%M:%S') == (
+            2024, 1, 2, 3, 4, 5, 0)
+        assert parse_datetime('2024-1-2T3:4:5.25', '%Y-%m-%dT%H:%M:%S.%f') == (
+            2024, 1, 2, 3, 4, 5, 250000)
+        assert parse_datetime('20240102', '%Y%m%d') == (2024, 1, 2, 0, 0, 0, 0)
+        assert parse_datetime('12/31 \t 5%', '%m/%d %H%%') == (
+            1900, 12, 31, 5, 0, 0, 0)
+        assert parse_datetime('', '') == (1900, 1, 1, 0, 0, 0, 0)
+
+    def test_parse_not_supported(self):
+        from __pypy__._pypydatetime import parse_datetime
+        for string, format in [
+                ('2024-01-02', '%Y-%m-%d %H'),      # missing data
+                ('2024-01-02 ', '%Y-%m-%d'),        # unconverted data
+                ('24-01-02', '%Y-%m-%d'),           # %Y needs 4 digits
+                ('2024-13-02', '%Y-%m-%d'),         # month out of range
+                ('2024-01-00', '%Y-%m-%d'),         # day out of range
+                ('131', '%m%d'),                    # ambiguous
+                ('2024-01- 2', '%Y-%m-%d'),         # space before day
+                ('2024t01', '%YT%m'),               # case-insensitive
+                ('Jan 2024', '%b %Y'),              # other directives
+                ('2024', '%Y%'),                    # stray %
+                ]:
+            assert parse_datetime(string, format) is None
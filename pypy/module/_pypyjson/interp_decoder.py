@@ -7,6 +7,7 @@ from rpython.rlib.rarithmetic import r_uint
 from pypy.interpreter.error import oefmt
 from pypy.interpreter import unicodehelper
 from pypy.interpreter.baseobjspace import W_Root
+from pypy.objspace.std.strintern import intern_str
 from pypy.module._pypyjson import simd
 
 OVF_DIGITS = len(str(sys.maxint))
@@ -307,26 +308,43 @@ class JSONDecoder(W_Root):
         if self.ll_chars[i] == ']':
             self.pos = i+1
             return w_list
-        #
+        # as long as the items are objects with the same map, their values
+        # are stored column by column in 'table', and their dicts are not
+        # made.  See _finish_table()
+        table = None
+        if self.ll_chars[i] == '{':
+            table = self._new_table_builder()
         while True:
-            w_item = self.decode_any(i)
+            if table is not None and self.ll_chars[i] == '{':
+                w_item = self.decode_object(i + 1, table)
+            else:
+                w_item = self.decode_any(i)
             i = self.pos
-            self.space.call_method(w_list, 'append', w_item)
+            if w_item is not None:
+                if table is not None:
+                    self._append_table_rows(w_list, table)
+                    table = None
+                self.space.call_method(w_list, 'append', w_item)
             i = self.skip_whitespace(i)
             ch = self.ll_chars[i]
             i += 1
             if ch == ']':
                 self.pos = i
+                if table is not None:
+                    return self._finish_table(w_list, table)
                 return w_list
             elif ch == ',':
-                pass
+                i = self.skip_whitespace(i)
             elif ch == '\0':
                 self._raise("Unterminated array starting at char %d", start)
             else:
                 self._raise("Unexpected '%s' when decoding array (char %d)",
                             ch, i-1)
 
-    def decode_object(self, i):
+    def decode_object(self, i, table=None):
+        """ Decode an object. i must be after the opening '{'.  If table is
+        given and the object has the same map as its rows, the values are
+        added to it as a new row, and None is returned. """
         start = i
 
         i = self.skip_whitespace(i)
@@ -371,6 +389,9 @@ class JSONDecoder(W_Root):
                 if currmap.is_state_blocked():
                     dict_w = self._switch_to_dict(currmap, values_w, nextindex)
                     return self._create_dict(dict_w)
+                if table is not None and table.add_row(
+                        self.space, currmap, values_w, nextindex):
+                    return None
                 values_w = values_w[:nextindex]
                 w_res = self._create_dict_map(values_w, currmap)
                 if not currmap.is_state_useful():
@@ -397,6 +418,31 @@ class JSONDecoder(W_Root):
         from pypy.objspace.std.jsondict import get_jsonmap_from_dict
         return get_jsonmap_from_dict(w_dict)
 
+    def _new_table_builder(self):
+        from pypy.objspace.std.jsondict import JsonTableBuilder
+        return JsonTableBuilder()
+
+    def _finish_table(self, w_list, table):
+        # w_list is still empty: return a list stored as the table if there
+        # are enough rows and the map is useful
+        from pypy.objspace.std.jsondict import JSON_TABLE_MIN_ROWS
+        if (table.length >= JSON_TABLE_MIN_ROWS and
+                table.jsonmap.is_state_useful()):
+            return table.make_list(self.space)
+        self._append_table_rows(w_list, table)
+        return w_list
+
+    def _append_table_rows(self, w_list, table):
+        # make the dicts of the rows of the table, like decode_object()
+        # would have done
+        if table.length == 0:
+            return
+        dicts_w = table.make_dicts(self.space)
+        if not table.jsonmap.is_state_useful():
+            self.unclear_objects.extend(dicts_w)
+        for w_dict in dicts_w:
+            self.space.call_method(w_list, 'append', w_dict)
+
     def _switch_to_dict(self, currmap, values_w, nextindex):
         dict_w = self._create_empty_dict()
         currmap.fill_dict(dict_w, values_w)
@@ -450,6 +496,7 @@ class JSONDecoder(W_Root):
                                                           content)
         else:
             lgt = end - start
+            content = intern_str(self.space, content)
         return self.space.newutf8(content, lgt)
 
     def _create_dict(self, d):
@@ -993,6 +1040,7 @@ class JSONMap(MapBase):
         self.key_to_index = None
         self.keys_in_order = None
         self.strategy_instance = None
+        self.row_strategy_instance = None
 
     def __repr__(self):
         return "<JSONMap key_repr=%s #instantiation=%s #leaves=%s prev=%r>" % (
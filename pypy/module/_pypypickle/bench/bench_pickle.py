@@ -0,0 +1,52 @@
+"""Compare cPickle.dumps()/loads(), which use _pypypickle for the builtin
+types, with the pure-Python Pickler and Unpickler of lib_pypy/cPickle.py.
+
+Run it with a translated pypy:
+
+    pypy bench_pickle.py [repeat]
+"""
+
+import sys, time
+import cPickle
+from cStringIO import StringIO
+
+
+def make_data():
+    # a job-queue-like payload: many small records
+    return [{'id': i, 'name': 'job-%d' % i, 'args': (i, i * 0.5, None),
+             'tags': [u'urgent', u'batch'], 'retry': i % 3 == 0}
+            for i in range(20000)]
+
+def python_dumps(obj, proto):
+    f = StringIO()
+    cPickle.Pickler(f, proto).dump(obj)
+    return f.getvalue()
+
+def python_loads(data):
+    return cPickle.Unpickler(StringIO(data)).load()
+
+def measure(func, args, repeat):
+    best = float('inf')
+    for i in range(repeat):
+        t0 = time.time()
+        func(*args)
+        best = min(best, time.time() - t0)
+    return best
+
+def main(repeat=10):
+    data = make_data()
+    for proto in [0, 2]:
+        pickled = cPickle.dumps(data, proto)
+        assert pickled == python_dumps(data, proto)
+        assert cPickle.loads(pickled) == python_loads(pickled) == data
+        t_fast = measure(cPickle.dumps, (data, proto), repeat)
+        t_slow = measure(python_dumps, (data, proto), repeat)
+        print 'protocol %d dumps: %.4fs (pure Python: %.4fs, %.1fx)' % (
+            proto, t_fast, t_slow, t_slow / t_fast)
+        t_fast = measure(cPickle.loads, (pickled,), repeat)
+        t_slow = measure(python_loads, (pickled,), repeat)
+        print 'protocol %d loads: %.4fs (pure Python: %.4fs, %.1fx)' % (
+            proto, t_fast, t_slow, t_slow / t_fast)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,429 @@
+from rpython.rlib.rstring import StringBuilder
+from rpython.rlib.rstruct import ieee
+from rpython.rlib.rarithmetic import intmask
+from rpython.rlib import rutf8
+from pypy.objspace.std.dictmultiobject import W_DictMultiObject
+from pypy.objspace.std.listobject import W_ListObject
+
+
+HIGHEST_PROTOCOL = 2
+BATCHSIZE = 1000    # like pickle.Pickler._BATCHSIZE
+MAX_DEPTH = 100     # deeper structures are left to the app-level Pickler
+
+MARK            = '('
+STOP            = '.'
+POP             = '0'
+POP_MARK        = '1'
+DUP             = '2'
+FLOAT           = 'F'
+INT             = 'I'
+BININT          = 'J'
+BININT1         = 'K'
+LONG            = 'L'
+BININT2         = 'M'
+NONE            = 'N'
+STRING          = 'S'
+BINSTRING       = 'T'
+SHORT_BINSTRING = 'U'
+UNICODE         = 'V'
+BINUNICODE      = 'X'
+APPEND          = 'a'
+DICT            = 'd'
+EMPTY_DICT      = '}'
+APPENDS         = 'e'
+GET             = 'g'
+BINGET          = 'h'
+LONG_BINGET     = 'j'
+LIST            = 'l'
+EMPTY_LIST      = ']'
+PUT             = 'p'
+BINPUT          = 'q'
+LONG_BINPUT     = 'r'
+SETITEM         = 's'
+TUPLE           = 't'
+EMPTY_TUPLE     = ')'
+SETITEMS        = 'u'
+BINFLOAT        = 'G'
+PROTO           = '\x80'
+TUPLE1          = '\x85'
+TUPLE2          = '\x86'
+TUPLE3          = '\x87'
+NEWTRUE         = '\x88'
+NEWFALSE        = '\x89'
+LONG1           = '\x8a'
+LONG4           = '\x8b'
+
+TRUE            = 'I01\n'
+FALSE           = 'I00\n'
+
+_tuplesize2code = [EMPTY_TUPLE, TUPLE1, TUPLE2, TUPLE3]
+
+
+class Unsupported(Exception):
+    """The object graph (or the pickle) contains something that only the
+    app-level code of cPickle knows how to handle."""
+
+
+class Pickler(object):
+    """Produces the same pickles as cPickle.Pickler for object graphs that
+    only contain None, bools, ints, longs, floats, strs, unicodes, tuples,
+    lists and dicts (and not subclasses of them)."""
+
+    def __init__(self, space, proto):
+        self.space = space
+        self.proto = proto
+        self.bin = proto >= 1
+        self.builder = StringBuilder()
+        # keyed by identity, like __pypy__.identity_dict
+        self.memo = {}
+        # strs and unicodes are keyed by id(), like in pickle.py: equal
+        # strings may be different objects with the same id() on PyPy
+        self.memo_ids = {}
+        self.memo_count = 0
+        self.depth = 0
+
+    def dump(self, w_obj):
+        if self.proto >= 2:
+            self.builder.append(PROTO)
+            self.builder.append(chr(self.proto))
+        self.save(w_obj)
+        self.builder.append(STOP)
+        return self.builder.build()
+
+    def write_int32(self, i):
+        b = self.builder
+        b.append(chr(i & 0xff))
+        b.append(chr((i >> 8) & 0xff))
+        b.append(chr((i >> 16) & 0xff))
+        b.append(chr((i >> 24) & 0xff))
+
+    def memoize(self, w_obj):
+        self.memo[w_obj] = self.write_put()
+
+    def memoize_id(self, uid):
+        self.memo_ids[uid] = self.write_put()
+
+    def write_put(self):
+        # cPickle starts counting at one
+        self.memo_count += 1
+        index = self.memo_count
+        if self.bin:
+            if index < 256:
+                self.builder.append(BINPUT)
+                self.builder.append(chr(index))
+            else:
+                self.builder.append(LONG_BINPUT)
+                self.write_int32(index)
+        else:
+            self.builder.append(PUT)
+            self.builder.append(str(index))
+            self.builder.append('\n')
+        return index
+
+    def write_get(self, index):
+        if self.bin:
+            if index < 256:
+                self.builder.append(BINGET)
+                self.builder.append(chr(index))
+            else:
+                self.builder.append(LONG_BINGET)
+                self.write_int32(index)
+        else:
+            self.builder.append(GET)
+            self.builder.append(str(index))
+            self.builder.append('\n')
+
+    def save(self, w_obj):
+        space = self.space
+        if space.is_w(w_obj, space.w_None):
+            self.builder.append(NONE)
+            return
+        w_type = space.type(w_obj)
+        if space.is_w(w_type, space.w_int):
+            self.save_int(space.int_w(w_obj))
+        elif space.is_w(w_type, space.w_bool):
+            self.save_bool(space.is_true(w_obj))
+        elif space.is_w(w_type, space.w_float):
+            self.save_float(w_obj)
+        elif (space.is_w(w_type, space.w_bytes) or
+              space.is_w(w_type, space.w_unicode)):
+            uid = space.int_w(space.id(w_obj))
+            index = self.memo_ids.get(uid, 0)
+            if index:
+                self.write_get(index)
+            elif space.is_w(w_type, space.w_bytes):
+                self.save_bytes(w_obj)
+                self.memoize_id(uid)
+            else:
+                self.save_unicode(w_obj)
+                self.memoize_id(uid)
+        else:
+            index = self.memo.get(w_obj, 0)
+            if index:
+                self.write_get(index)
+            elif space.is_w(w_type, space.w_long):
+                self.save_long(w_obj)
+            else:
+                if self.depth >= MAX_DEPTH:
+                    raise Unsupported
+                self.depth += 1
+                if space.is_w(w_type, space.w_tuple):
+                    self.save_tuple(w_obj)
+                elif (isinstance(w_obj, W_ListObject) and
+                      space.is_w(w_type, space.w_list)):
+                    self.save_list(w_obj)
+                elif (isinstance(w_obj, W_DictMultiObject) and
+                      space.is_w(w_type, space.w_dict)):
+                    self.save_dict(w_obj)
+                else:
+                    raise Unsupported
+                self.depth -= 1
+
+    def save_bool(self, value):
+        if self.proto >= 2:
+            self.builder.append(NEWTRUE if value else NEWFALSE)
+        else:
+            self.builder.append(TRUE if value else FALSE)
+
+    def save_int(self, value):
+        b = self.builder
+        if self.bin:
+            if value >= 0:
+                if value <= 0xff:
+                    b.append(BININT1)
+                    b.append(chr(value))
+                    return
+                if value <= 0xffff:
+                    b.append(BININT2)
+                    b.append(chr(value & 0xff))
+                    b.append(chr(value >> 8))
+                    return
+            high_bits = value >> 31
+            if high_bits == 0 or high_bits == -1:
+                b.append(BININT)
+                self.write_int32(value)
+                return
+        b.append(INT)
+        b.append(str(value))
+        b.append('\n')
+
+    def save_long(self, w_obj):
+        space = self.space
+        if self.proto >= 2:
+            # minimal two's complement little-endian, like pickle.encode_long()
+            big = space.bigint_w(w_obj)
+            if big.sign == 0:
+                nbytes = 0
+                data = ''
+            else:
+                if big.sign < 0:
+                    nbits = big.invert().bit_length()
+                else:
+                    nbits = big.bit_length()
+                nbytes = (nbits >> 3) + 1
+                data = big.tobytes(nbytes, 'little', True)
+            if nbytes < 256:
+                self.builder.append(LONG1)
+                self.builder.append(chr(nbytes))
+            else:
+                self.builder.append(LONG4)
+                self.write_int32(nbytes)
+            self.builder.append(data)
+            return
+        self.builder.append(LONG)
+        self.builder.append(space.text_w(space.repr(w_obj)))
+        self.builder.append('\n')
+
+    def save_float(self, w_obj):
+        space = self.space
+        if self.bin:
+            value = ieee.float_pack(space.float_w(w_obj), 8)
+            self.builder.append(BINFLOAT)
+            for i in range(56, -8, -8):    # big-endian
+                self.builder.append(chr(intmask(value >> i) & 0xff))
+        else:
+            self.builder.append(FLOAT)
+            self.builder.append(space.text_w(space.repr(w_obj)))
+            self.builder.append('\n')
+
+    def save_bytes(self, w_obj):
+        space = self.space
+        b = self.builder
+        if self.bin:
+            s = space.bytes_w(w_obj)
+            n = len(s)
+            if n < 256:
+                b.append(SHORT_BINSTRING)
+                b.append(chr(n))
+            else:
+                b.append(BINSTRING)
+                self.write_int32(n)
+            b.append(s)
+        else:
+            b.append(STRING)
+            b.append(space.text_w(space.repr(w_obj)))
+            b.append('\n')
+
+    def save_unicode(self, w_obj):
+        space = self.space
+        if self.bin:
+            utf8 = space.utf8_w(w_obj)
+            if rutf8.has_surrogates(utf8):
+                utf8 = rutf8.reencode_utf8_with_surrogates(utf8)
+            self.builder.append(BINUNICODE)
+            self.write_int32(len(utf8))
+            self.builder.append(utf8)
+        else:
+            w_s = space.call_method(w_obj, 'replace', space.newtext('\\'),
+                                    space.newtext('\\u005c'))
+            w_s = space.call_method(w_s, 'replace', space.newtext('\n'),
+                                    space.newtext('\\u000a'))
+            w_s = space.call_method(w_s, 'encode',
+                                    space.newtext('raw-unicode-escape'))
+            self.builder.append(UNICODE)
+            self.builder.append(space.bytes_w(w_s))
+            self.builder.append('\n')
+
+    def save_tuple(self, w_obj):
+        items_w = self.space.fixedview(w_obj)
+        n = len(items_w)
+        if n == 0:
+            if self.proto:
+                self.builder.append(EMPTY_TUPLE)
+            else:
+                self.builder.append(MARK)
+                self.builder.append(TUPLE)
+            return
+        if n <= 3 and self.proto >= 2:
+            for w_item in items_w:
+                self.save(w_item)
+            index = self.memo.get(w_obj, 0)
+            if index:
+                # the tuple is recursive, and got saved by one of its items
+                for i in range(n):
+                    self.builder.append(POP)
+                self.write_get(index)
+            else:
+                self.builder.append(_tuplesize2code[n])
+                self.memoize(w_obj)
+            return
+        self.builder.append(MARK)
+        for w_item in items_w:
+            self.save(w_item)
+        index = self.memo.get(w_obj, 0)
+        if index:
+            if self.proto:
+                self.builder.append(POP_MARK)
+            else:
+                for i in range(n + 1):
+                    self.builder.append(POP)
+            self.write_get(index)
+            return
+        self.builder.append(TUPLE)
+        self.memoize(w_obj)
+
+    def save_list(self, w_obj):
+        if self.bin:
+            self.builder.append(EMPTY_LIST)
+        else:
+            self.builder.append(MARK)
+            self.builder.append(LIST)
+        self.memoize(w_obj)
+        intlist = self.space.listview_int(w_obj)
+        if intlist is not None:
+            # fast path: no need to wrap the items, ints are never memoized
+            start = 0
+            while start < len(intlist):
+                stop = self._begin_batch(start, len(intlist))
+                for i in range(start, stop):
+                    self.save_int(intlist[i])
+                    self._end_item(APPEND)
+                self._end_batch(start, stop, APPEND, APPENDS)
+                start = stop
+            return
+        items_w = self.space.listview(w_obj)
+        start = 0
+        while start < len(items_w):
+            stop = self._begin_batch(start, len(items_w))
+            for i in range(start, stop):
+                self.save(items_w[i])
+                self._end_item(APPEND)
+            self._end_batch(start, stop, APPEND, APPENDS)
+            start = stop
+
+    def save_dict(self, w_obj):
+        if w_obj.getitem_str('__name__') is not None:
+            # might be the __dict__ of a module, which pickle.py saves
+            # as getattr(module, '__dict__')
+            raise Unsupported
+        if self.bin:
+            self.builder.append(EMPTY_DICT)
+        else:
+            self.builder.append(MARK)
+            self.builder.append(DICT)
+        self.memoize(w_obj)
+        items = []
+        iterator = w_obj.iteritems()
+        while True:
+            w_key, w_value = iterator.next_item()
+            if w_key is None:
+                break
+            items.append((w_key, w_value))
+        start = 0
+        while start < len(items):
+            stop = self._begin_batch(start, len(items))
+            for i in range(start, stop):
+                w_key, w_value = items[i]
+                self.save(w_key)
+                self.save(w_value)
+                self._end_item(SETITEM)
+            self._end_batch(start, stop, SETITEM, SETITEMS)
+            start = stop
+
+    # Batching as in pickle.Pickler._batch_appends() and _batch_setitems():
+    # with protocol 0, every item is followed by APPEND or SETITEM; with
+    # the binary protocols, batches of more than one item are enclosed
+    # between MARK and APPENDS or SETITEMS.
+
+    def _begin_batch(self, start, length):
+        if not self.bin:
+            return length
+        stop = min(start + BATCHSIZE, length)
+        if stop - start > 1:
+            self.builder.append(MARK)
+        return stop
+
+    def _end_item(self, single_opcode):
+        if not self.bin:
+            self.builder.append(single_opcode)
+
+    def _end_batch(self, start, stop, single_opcode, batch_opcode):
+        if self.bin:
+            if stop - start > 1:
+                self.builder.append(batch_opcode)
+            else:
+                self.builder.append(single_opcode)
+
+
+def dumps(space, w_obj, w_protocol=None):
+    """dumps(obj, protocol=0) -> string, or None
+
+    Like cPickle.dumps(), but returns None if 'obj' contains anything
+    else than None, bools, ints, longs, floats, strs, unicodes, tuples,
+    lists and dicts.
+    """
+    if space.is_none(w_protocol):
+        proto = 0
+    elif space.is_w(space.type(w_protocol), space.w_int):
+        proto = space.int_w(w_protocol)
+        if proto < 0:
+            proto = HIGHEST_PROTOCOL
+        elif proto > HIGHEST_PROTOCOL:
+            return space.w_None
+    else:
+        return space.w_None
+    pickler = Pickler(space, proto)
+    try:
+        return space.newbytes(pickler.dump(w_obj))
+    except Unsupported:
+        return space.w_None
@@ -0,0 +1,324 @@
+from rpython.rlib.rbigint import rbigint
+from rpython.rlib.rstruct import ieee
+from rpython.rlib.rarithmetic import intmask, string_to_int
+from rpython.rlib.rstring import ParseStringError, ParseStringOverflowError
+from pypy.interpreter import unicodehelper
+from pypy.interpreter.error import OperationError
+from pypy.objspace.std.listobject import W_ListObject
+from pypy.module._pypypickle.interp_pickler import (Unsupported,
+    HIGHEST_PROTOCOL,
+    MARK, STOP, POP, POP_MARK, DUP, FLOAT, INT, BININT, BININT1, LONG,
+    BININT2, NONE, STRING, BINSTRING, SHORT_BINSTRING, UNICODE, BINUNICODE,
+    APPEND, DICT, EMPTY_DICT, APPENDS, GET, BINGET, LONG_BINGET, LIST,
+    EMPTY_LIST, PUT, BINPUT, LONG_BINPUT, SETITEM, TUPLE, EMPTY_TUPLE,
+    SETITEMS, BINFLOAT, PROTO, TUPLE1, TUPLE2, TUPLE3, NEWTRUE, NEWFALSE,
+    LONG1, LONG4)
+
+
+class Unpickler(object):
+    """Loads the pickles that only contain None, bools, ints, longs, floats,
+    strs, unicodes, tuples, lists and dicts.  Any other opcode, as well as
+    any kind of error in the pickle, raises Unsupported: the app-level
+    cPickle.Unpickler then starts again and reports the error if needed.
+    This includes the OperationErrors raised while building the objects
+    for an invalid literal or an unhashable dict key: ValueError (or
+    UnicodeDecodeError), OverflowError and TypeError.  Other errors, like
+    a MemoryError or a KeyboardInterrupt, are not errors in the pickle and
+    are propagated.
+    Nothing else than these builtin types is created before that, so
+    starting again has no visible side-effect.
+
+    Instead of pushing mark objects on the stack, the positions of the
+    marks are kept in a separate list.
+    """
+
+    def __init__(self, space, data):
+        self.space = space
+        self.data = data
+        self.pos = 0
+        self.stack_w = []
+        self.marks = []
+        self.memo = {}
+
+    def read(self, n):
+        start = self.pos
+        stop = start + n
+        if n < 0 or stop > len(self.data):
+            raise Unsupported
+        assert stop >= 0
+        self.pos = stop
+        return self.data[start:stop]
+
+    def read_byte(self):
+        pos = self.pos
+        if pos >= len(self.data):
+            raise Unsupported
+        self.pos = pos + 1
+        return ord(self.data[pos])
+
+    def read_int32(self):
+        s = self.read(4)
+        a = ord(s[0])
+        b = ord(s[1])
+        c = ord(s[2])
+        d = ord(s[3])
+        if d & 0x80:
+            d -= 0x100
+        x = a | (b<<8) | (c<<16) | (d<<24)
+        return intmask(x)
+
+    def readline(self):
+        """Returns the next line, without the final newline."""
+        start = self.pos
+        end = self.data.find('\n', start)
+        if end < 0:
+            raise Unsupported
+        assert end >= 0
+        self.pos = end + 1
+        return self.data[start:end]
+
+    def push(self, w_obj):
+        self.stack_w.append(w_obj)
+
+    def top_is_mark(self):
+        return bool(self.marks) and self.marks[-1] == len(self.stack_w)
+
+    def pop(self):
+        if not self.stack_w or self.top_is_mark():
+            raise Unsupported
+        return self.stack_w.pop()
+
+    def top(self):
+        if not self.stack_w or self.top_is_mark():
+            raise Unsupported
+        return self.stack_w[-1]
+
+    def pop_mark(self):
+        """Removes the topmost mark and returns the items above it."""
+        if not self.marks:
+            raise Unsupported
+        k = self.marks.pop()
+        items_w = self.stack_w[k:]
+        del self.stack_w[k:]
+        return items_w
+
+    def pop_mark_fixed(self):
+        """Like pop_mark(), but returns a list that is not resized."""
+        items_w = self.pop_mark()
+        result_w = [None] * len(items_w)
+        for i in range(len(items_w)):
+            result_w[i] = items_w[i]
+        return result_w
+
+    def load(self):
+        space = self.space
+        try:
+            return self._load()
+        except OperationError as e:
+            if (e.match(space, space.w_ValueError) or
+                    e.match(space, space.w_OverflowError) or
+                    e.match(space, space.w_TypeError)):
+                raise Unsupported
+            raise
+
+    def _load(self):
+        space = self.space
+        while True:
+            key = chr(self.read_byte())
+            if key == STOP:
+                break
+            elif key == MARK:
+                self.marks.append(len(self.stack_w))
+            elif key == PROTO:
+                proto = self.read_byte()
+                if proto > HIGHEST_PROTOCOL:
+                    raise Unsupported
+            elif key == NONE:
+                self.push(space.w_None)
+            elif key == NEWTRUE:
+                self.push(space.w_True)
+            elif key == NEWFALSE:
+                self.push(space.w_False)
+            elif key == BININT:
+                self.push(space.newint(self.read_int32()))
+            elif key == BININT1:
+                self.push(space.newint(self.read_byte()))
+            elif key == BININT2:
+                low = self.read_byte()
+                self.push(space.newint(low | (self.read_byte() << 8)))
+            elif key == INT:
+                self.load_int()
+            elif key == LONG:
+                w_s = space.newbytes(self.readline())
+                self.push(space.call_function(space.w_long, w_s,
+                                              space.newint(0)))
+            elif key == LONG1:
+                self.load_binlong(self.read_byte())
+            elif key == LONG4:
+                self.load_binlong(self.read_int32())
+            elif key == FLOAT:
+                w_s = space.newbytes(self.readline())
+                self.push(space.call_function(space.w_float, w_s))
+            elif key == BINFLOAT:
+                value = ieee.unpack_float(self.read(8), True)
+                self.push(space.newfloat(value))
+            elif key == SHORT_BINSTRING:
+                self.push(space.newbytes(self.read(self.read_byte())))
+            elif key == BINSTRING:
+                self.push(space.newbytes(self.read(self.read_int32())))
+            elif key == STRING:
+                self.load_string()
+            elif key == BINUNICODE:
+                s = self.read(self.read_int32())
+                length = unicodehelper.check_utf8_or_raise(space, s)
+                self.push(space.newutf8(s, length))
+            elif key == UNICODE:
+                w_s = space.newbytes(self.readline())
+                self.push(space.call_function(space.w_unicode, w_s,
+                                      space.newtext('raw-unicode-escape')))
+            elif key == EMPTY_TUPLE:
+                self.push(space.newtuple([]))
+            elif key == TUPLE1:
+                w_a = self.pop()
+                self.push(space.newtuple([w_a]))
+            elif key == TUPLE2:
+                w_b = self.pop()
+                w_a = self.pop()
+                self.push(space.newtuple([w_a, w_b]))
+            elif key == TUPLE3:
+                w_c = self.pop()
+                w_b = self.pop()
+                w_a = self.pop()
+                self.push(space.newtuple([w_a, w_b, w_c]))
+            elif key == TUPLE:
+                self.push(space.newtuple(self.pop_mark_fixed()))
+            elif key == EMPTY_LIST:
+                self.push(space.newlist([]))
+            elif key == LIST:
+                self.push(space.newlist(self.pop_mark()))
+            elif key == EMPTY_DICT:
+                self.push(space.newdict())
+            elif key == DICT:
+                items_w = self.pop_mark()
+                w_dict = space.newdict()
+                self.setitems(w_dict, items_w)
+                self.push(w_dict)
+            elif key == APPEND:
+                w_item = self.pop()
+                self.get_list().append(w_item)
+            elif key == APPENDS:
+                items_w = self.pop_mark()
+                w_list = self.get_list()
+                for w_item in items_w:
+                    w_list.append(w_item)
+            elif key == SETITEM:
+                w_value = self.pop()
+                w_key = self.pop()
+                space.setitem(self.get_dict(), w_key, w_value)
+            elif key == SETITEMS:
+                items_w = self.pop_mark()
+                self.setitems(self.get_dict(), items_w)
+            elif key == BINPUT:
+                self.memo[self.read_byte()] = self.top()
+            elif key == LONG_BINPUT:
+                self.memo[self.read_int32()] = self.top()
+            elif key == PUT:
+                self.memo[self.read_text_index()] = self.top()
+            elif key == BINGET:
+                self.load_get(self.read_byte())
+            elif key == LONG_BINGET:
+                self.load_get(self.read_int32())
+            elif key == GET:
+                self.load_get(self.read_text_index())
+            elif key == POP:
+                if self.top_is_mark():
+                    self.marks.pop()
+                else:
+                    self.pop()
+            elif key == POP_MARK:
+                self.pop_mark()
+            elif key == DUP:
+                self.push(self.top())
+            else:
+                raise Unsupported
+        return self.pop()
+
+    def load_int(self):
+        space = self.space
+        line = self.readline()
+        if line == '00':
+            self.push(space.w_False)
+        elif line == '01':
+            self.push(space.w_True)
+        else:
+            self.push(space.call_function(space.w_int, space.newbytes(line)))
+
+    def load_binlong(self, n):
+        s = self.read(n)
+        self.push(self.space.newlong_from_rbigint(
+            rbigint.frombytes(s, 'little', True)))
+
+    def load_string(self):
+        rep = self.readline()
+        if len(rep) < 2:
+            raise Unsupported
+        quote = rep[0]
+        if (quote != "'" and quote != '"') or rep[len(rep) - 1] != quote:
+            raise Unsupported
+        end = len(rep) - 1
+        assert end >= 1
+        w_rep = self.space.newbytes(rep[1:end])
+        self.push(self.space.call_method(w_rep, 'decode',
+                                         self.space.newtext('string-escape')))
+
+    def read_text_index(self):
+        # the keys of the app-level memo are strings; only accept the
+        # ones that are the repr() of an int, like the binary opcodes use
+        line = self.readline()
+        try:
+            index = string_to_int(line)
+        except (ParseStringError, ParseStringOverflowError):
+            raise Unsupported
+        if str(index) != line:
+            raise Unsupported
+        return index
+
+    def load_get(self, index):
+        try:
+            w_obj = self.memo[index]
+        except KeyError:
+            raise Unsupported
+        self.push(w_obj)
+
+    def get_list(self):
+        w_list = self.top()
+        if (not isinstance(w_list, W_ListObject) or
+                not self.space.is_w(self.space.type(w_list), self.space.w_list)):
+            raise Unsupported
+        return w_list
+
+    def get_dict(self):
+        w_dict = self.top()
+        if not self.space.is_w(self.space.type(w_dict), self.space.w_dict):
+            raise Unsupported
+        return w_dict
+
+    def setitems(self, w_dict, items_w):
+        if len(items_w) & 1:
+            raise Unsupported
+        for i in range(0, len(items_w), 2):
+            self.space.setitem(w_dict, items_w[i], items_w[i + 1])
+
+
+def loads(space, w_data, w_default):
+    """loads(string, default) -> object
+
+    Like cPickle.loads(), but returns 'default' if the pickle contains
+    anything else than None, bools, ints, longs, floats, strs, unicodes,
+    tuples, lists and dicts, or if it is invalid.
+    """
+    unpickler = Unpickler(space, space.bytes_w(w_data))
+    try:
+        return unpickler.load()
+    except Unsupported:
+        return w_default
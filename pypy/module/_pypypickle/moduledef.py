@@ -0,0 +1,11 @@
+from pypy.interpreter.mixedmodule import MixedModule
+
+class Module(MixedModule):
+    """fast pickling of builtin types, for cPickle"""
+
+    appleveldefs = {}
+
+    interpleveldefs = {
+        'dumps' : 'interp_pickler.dumps',
+        'loads' : 'interp_unpickler.loads',
+        }
@@ -0,0 +1,130 @@
+import pytest
+from pypy.interpreter.error import OperationError
+from pypy.module._pypypickle.interp_pickler import Unsupported
+from pypy.module._pypypickle.interp_unpickler import Unpickler
+
+
+class TestUnpickler(object):
+    spaceconfig = {"usemodules": ['_pypypickle', 'struct', 'binascii']}
+
+    def test_load_errors(self, space):
+        class RaisingUnpickler(Unpickler):
+            def _load(self):
+                raise OperationError(self.w_type, space.w_None)
+
+        # the errors of invalid pickle data make the app-level Unpickler
+        # start again, the others are propagated
+        for w_type in [space.w_ValueError, space.w_UnicodeDecodeError,
+                       space.w_OverflowError, space.w_TypeError]:
+            unpickler = RaisingUnpickler(space, '')
+            unpickler.w_type = w_type
+            pytest.raises(Unsupported, unpickler.load)
+        for w_type in [space.w_MemoryError, space.w_KeyboardInterrupt,
+                       space.w_RuntimeError]:
+            unpickler = RaisingUnpickler(space, '')
+            unpickler.w_type = w_type
+            e = pytest.raises(OperationError, unpickler.load)
+            assert e.value.match(space, w_type)
+
+
+class AppTestPyPyPickle(object):
+    spaceconfig = {"usemodules": ['_pypypickle', 'struct', 'binascii']}
+
+    def setup_class(cls):
+        cls.w_samples = cls.space.appexec([], """():
+            l = [1, 2]
+            t = ('abc', l)
+            return [None, True, False, 0, 1, 255, 256, 65535, 65536, -1,
+                    -256, 2**31 - 1, -2**31, 2**31, -2**31 - 1, 2**62,
+                    0L, 1L, 127L, 128L, 255L, -128L, -129L, -256L,
+                    2L**2000, -2L**2000, 1.5, -0.0, 1e300, float('inf'),
+                    '', 'a', 'hello', 'x' * 300, 'with\\nnewline',
+                    u'', u'\\xe9t\\xe9', u'\\u1234\\n\\\\', u'\\ud800',
+                    (), (1,), (1, 2), (1, 2, 3), (1, 2, 3, 4),
+                    [], [1, 2, 3], range(2500), ['a', 'b'] * 1001,
+                    {}, {1: 2, 'a': [3]}, dict.fromkeys(range(1500)),
+                    [l, l, t, t], {'k': t, 'l': l}]
+        """)
+
+    def test_same_as_app_level(self):
+        import cPickle, _pypypickle
+        from StringIO import StringIO
+        for proto in [0, 1, 2, -1, None]:
+            for obj in self.samples:
+                f = StringIO()
+                cPickle.Pickler(f, proto).dump(obj)
+                expected = f.getvalue()
+                assert _pypypickle.dumps(obj, proto) == expected
+                assert _pypypickle.loads(expected, None) == obj
+
+    def test_shared_and_recursive(self):
+        import cPickle, _pypypickle
+        l = []
+        l.append(l)
+        t = (l, 5)
+        l.append(t)
+        d = {}
+        d['self'] = d
+        for proto in [0, 1, 2]:
+            data = _pypypickle.dumps([l, t, d], proto)
+            pickler = cPickle.Pickler(proto)
+            pickler.dump([l, t, d])
+            assert data == pickler.getvalue()
+            l2, t2, d2 = _pypypickle.loads(data, None)
+            assert l2[0] is l2
+            assert l2[1] is t2
+            assert t2[0] is l2
+            assert d2['self'] is d2
+
+    def test_unsupported_objects(self):
+        import _pypypickle
+        class A(object):
+            pass
+        class MyList(list):
+            pass
+        for obj in [A(), MyList(), [1, A()], {'x': int}, 1j, set(),
+                    {'__name__': 'sys'}]:
+            assert _pypypickle.dumps(obj, 2) is None
+        nested = []
+        for i in range(200):
+            nested = [nested]
+        assert _pypypickle.dumps(nested, 2) is None
+        assert _pypypickle.dumps(1, 3) is None
+        assert _pypypickle.dumps(1, 'x') is None
+
+    def test_unsupported_pickles(self):
+        import cPickle, _pypypickle
+        marker = object()
+        for data in [cPickle.dumps(int, 2), cPickle.dumps(1j, 2),
+                     '', 'K', 'K\x01', '(.', ']K\x01a(K\x02',
+                     'h\x05.', 'p01\n.', 'I1\n0.', '\x80\x03N.']:
+            assert _pypypickle.loads(data, marker) is marker
+        # the errors raised while building the objects
+        for data in ['Ixyz\n.', 'Lxyz\n.', 'Fxyz\n.', "S'\\x'\n.",
+                     'X\x01\x00\x00\x00\xff.', 'V\\u12\n.',
+                     '}]K\x01s.', '(]K\x01d.']:
+            assert _pypypickle.loads(data, marker) is marker
+
+    def test_text_opcodes(self):
+        import _pypypickle
+        assert _pypypickle.loads("S'a\\x00b'\np1\n.", None) == 'a\x00b'
+        assert _pypypickle.loads('I01\n.', None) is True
+        assert _pypypickle.loads('I00\n.', None) is False
+        assert _pypypickle.loads('I12345678901234567890\n.', None) == (
+            12345678901234567890)
+        assert _pypypickle.loads('L-5L\n.', None) == -5
+        assert _pypypickle.loads('F0.25\n.', None) == 0.25
+        assert _pypypickle.loads('Va\\u1234\n.', None) == u'a\u1234'
+        assert _pypypickle.loads('(I1\nI2\nl(dp1\ng1\n.', None) == {}
+
+    def test_cpickle_uses_it(self):
+        import cPickle
+        obj = {'a': [1, 2.5, u'x'], 'b': (None, True)}
+        for proto in [0, 1, 2]:
+            assert cPickle.loads(cPickle.dumps(obj, proto)) == obj
+        obj['c'] = set([5])
+        assert cPickle.loads(cPickle.dumps(obj, 2)) == obj
+        raises(ValueError, cPickle.dumps, 1, 3)
+        raises(EOFError, cPickle.loads, '')
+        raises(ValueError, cPickle.loads, 'Ixyz\n.')
+        raises(TypeError, cPickle.loads, '}]K\x01s.')
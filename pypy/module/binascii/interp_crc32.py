@@ -3,10 +3,18 @@ from rpython.rtyper.lltypesystem import rffi
 from rpython.rlib.rarithmetic import r_uint, intmask
 from rpython.rlib import rzipfile
 
+# like zlib.crc32(), only release the GIL for inputs of more than 5KB:
+# for smaller ones, releasing and retaking it costs more than the CRC
+RELEASE_GIL_LIMIT = 5 * 1024
+
 @unwrap_spec(data='bufferstr', oldcrc='truncatedint_w')
 def crc32(space, data, oldcrc=0):
     "Compute the CRC-32 incrementally."
 
-    crc = rzipfile.crc32(data, r_uint(oldcrc))
+    if len(data) <= RELEASE_GIL_LIMIT:
+        crc = rzipfile.crc32(data, r_uint(oldcrc))
+    else:
+        with rffi.scoped_nonmovingbuffer(data) as buf:
+            crc = rzipfile.crc32_raw(buf, len(data), r_uint(oldcrc))
     crc = rffi.cast(rffi.INT, crc)    # unsigned => 32-bit signed
     return space.newint(intmask(crc))
@@ -373,6 +373,17 @@ class AppTestBinascii(object):
             ]:
             assert self.binascii.crc32(input, initial) == expected
 
+    def test_crc32_big_input(self):
+        # more than 5KB: computed without the GIL, with the same result
+        data = "".join([chr(i & 0xff) for i in range(3 * 5 * 1024 + 1)])
+        half = len(data) // 2
+        crc = self.binascii.crc32(data)
+        assert crc == 1844232171
+        assert crc == self.binascii.crc32(data[half:],
+                                          self.binascii.crc32(data[:half]))
+        assert crc == self.binascii.crc32(buffer(data))
+        assert self.binascii.crc32(data, 12345) != crc
+
     def test_hexlify(self):
         for input, expected in [
             ("", ""),
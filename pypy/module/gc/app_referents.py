@@ -58,6 +58,8 @@ class GcStats(object):
                      'peak_memory', 'peak_allocated_memory', 'total_arena_memory',
                      'total_rawmalloced_memory', 'nursery_size',
                      'peak_arena_memory', 'peak_rawmalloced_memory',
+                     'total_arena_allocated_memory',
+                     'arena_free_pages_memory',
                      ):
             setattr(self, item, self._format(getattr(self._s, item)))
         self.memory_used_sum = self._format(self._s.total_gc_memory + self._s.total_memory_pressure +
@@ -65,6 +67,12 @@ class GcStats(object):
         self.memory_allocated_sum = self._format(self._s.total_allocated_memory + self._s.total_memory_pressure +
                                             self._s.jit_backend_allocated)
         self.total_gc_time = self._s.total_gc_time
+        if self._s.total_arena_allocated_memory > 0:
+            self.arena_fragmentation = 1.0 - (
+                float(self._s.total_arena_memory) /
+                self._s.total_arena_allocated_memory)
+        else:
+            self.arena_fragmentation = 0.0
 
     def _format(self, v):
         if v < 1000000:
@@ -95,6 +103,11 @@ class GcStats(object):
     -----------------------------
     Total:                   %s
 
+    Arenas:
+       allocated:            %s
+       in free pages:        %s
+       fragmentation:        %.1f%%
+
     Total time spent in GC:  %s
     """ % (self.total_gc_memory, self.peak_memory,
               self.total_arena_memory,
@@ -111,6 +124,10 @@ class GcStats(object):
            self.jit_backend_allocated,
            extra,
            self.memory_allocated_sum,
+
+           self.total_arena_allocated_memory,
+           self.arena_free_pages_memory,
+           self.arena_fragmentation * 100.0,
            self.total_gc_time / 1000.0)
 
 
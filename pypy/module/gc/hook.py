@@ -44,12 +44,15 @@ class LowLevelGcHooks(GcHooks):
         action.pinned_objects = pinned_objects
         action.fire()
 
-    def on_gc_collect_step(self, duration, oldstate, newstate):
+    def on_gc_collect_step(self, duration, oldstate, newstate, pages_freed):
         action = self.w_hooks.gc_collect_step
         action.count += 1
         action.duration += duration
         action.duration_min = min(action.duration_min, duration)
         action.duration_max = max(action.duration_max, duration)
+        if oldstate == incminimark.STATE_SWEEPING:
+            action.sweep_duration += duration
+        action.pages_freed += pages_freed
         action.oldstate = oldstate
         action.newstate = newstate
         action.fire()
@@ -184,6 +187,8 @@ class GcCollectStepHookAction(NoRecursiveAction):
         self.duration = 0.0
         self.duration_min = inf
         self.duration_max = 0.0
+        self.sweep_duration = 0.0
+        self.pages_freed = 0
 
     def fix_annotation(self):
         # the annotation of the class and its attributes must be completed
@@ -194,6 +199,8 @@ class GcCollectStepHookAction(NoRecursiveAction):
             self.duration = NonConstant(-53.2)
             self.duration_min = NonConstant(-53.2)
             self.duration_max = NonConstant(-53.2)
+            self.sweep_duration = NonConstant(-53.2)
+            self.pages_freed = NonConstant(-42)
             self.oldstate = NonConstant(-42)
             self.newstate = NonConstant(-42)
             self.fire()
@@ -206,7 +213,9 @@ class GcCollectStepHookAction(NoRecursiveAction):
             self.duration_max,
             self.oldstate,
             self.newstate,
-            rgc.is_done__states(self.oldstate, self.newstate))
+            rgc.is_done__states(self.oldstate, self.newstate),
+            self.sweep_duration,
+            self.pages_freed)
         self.reset()
         self.space.call_function(self.w_callable, w_stats)
 
@@ -284,7 +293,8 @@ class W_GcCollectStepStats(W_Root):
     GC_STATES = tuple(incminimark.GC_STATES + ['USERDEL'])
 
     def __init__(self, count, duration, duration_min, duration_max,
-                 oldstate, newstate, major_is_done):
+                 oldstate, newstate, major_is_done, sweep_duration,
+                 pages_freed):
         self.count = count
         self.duration = duration
         self.duration_min = duration_min
@@ -292,6 +302,8 @@ class W_GcCollectStepStats(W_Root):
         self.oldstate = oldstate
         self.newstate = newstate
         self.major_is_done = major_is_done
+        self.sweep_duration = sweep_duration
+        self.pages_freed = pages_freed
 
 
 class W_GcCollectStats(W_Root):
@@ -367,7 +379,9 @@ W_GcCollectStepStats.typedef = TypeDef(
         "duration_min",
         "duration_max",
         "oldstate",
-        "newstate"))
+        "newstate",
+        "sweep_duration",
+        "pages_freed"))
     )
 
 W_GcCollectStats.typedef = TypeDef(
@@ -19,6 +19,16 @@ def collect(space, generation=0):
     rgc.collect()
     _run_finalizers(space)
 
+def compact(space):
+    """Run a full collection, then give back to the OS the memory of the
+    pages left free inside the GC arenas.  Objects are never moved, so
+    the pages that still contain some objects stay in memory.  Returns
+    the number of bytes given back by this call: the first OS page of
+    each free page is kept, and the pages already given back by a
+    previous call are not counted again."""
+    collect(space)
+    return space.newint(rgc.release_free_memory())
+
 def _run_finalizers(space):
     # if we are running in gc.disable() mode but gc.collect() is called,
     # we should still call the finalizers now.  We do this as an attempt
@@ -109,6 +119,8 @@ class StepCollector(object):
                 newstate = W_GcCollectStepStats.STATE_USERDEL
                 self.finalizing = True
         #
+        # the durations and the number of freed pages are not measured
+        # here, so they are all reported as -1 ("unavailable")
         duration = -1
         return W_GcCollectStepStats(
             count = 1,
@@ -117,7 +129,9 @@ class StepCollector(object):
             duration_max = duration,
             oldstate = oldstate,
             newstate = newstate,
-            major_is_done = major_is_done)
+            major_is_done = major_is_done,
+            sweep_duration = duration,
+            pages_freed = -1)
 
     def _collect_step(self):
         return rgc.collect_step()
@@ -119,6 +119,21 @@ def get_objects(space):
     result_w = rgc.do_get_objects(try_cast_gcref_to_w_root)
     return space.newlist(result_w)
 
+def get_strslice_stats(space):
+    """Return a tuple (number of str slices sharing the memory of another
+    str, total length of these slices, total length of the strs whose
+    memory they keep alive).  Always zeros unless pypy was translated
+    with --objspace-std-withstrslice."""
+    if not rgc.has_gcflag_extra():
+        raise missing_operation(space)
+    count = shared = retained = 0
+    if space.config.objspace.std.withstrslice:
+        from pypy.objspace.std.strsliceobject import get_slice_stats
+        result_w = rgc.do_get_objects(try_cast_gcref_to_w_root)
+        count, shared, retained = get_slice_stats(result_w)
+    return space.newtuple([space.newint(count), space.newint(shared),
+                           space.newint(retained)])
+
 def get_referents(space, args_w):
     """Return a list of objects directly referred to by any of the arguments.
     """
@@ -192,6 +207,10 @@ class W_GcStats(W_Root):
         self.peak_rawmalloced_memory = rgc.get_stats(rgc.PEAK_RAWMALLOCED_MEMORY)
         self.nursery_size = rgc.get_stats(rgc.NURSERY_SIZE)
         self.total_gc_time = rgc.get_stats(rgc.TOTAL_GC_TIME)
+        self.total_arena_allocated_memory = rgc.get_stats(
+            rgc.TOTAL_ARENA_ALLOCATED_MEMORY)
+        self.arena_free_pages_memory = rgc.get_stats(
+            rgc.ARENA_FREE_PAGES_MEMORY)
 
 W_GcStats.typedef = TypeDef("GcStats",
     total_memory_pressure=interp_attrproperty("total_memory_pressure",
@@ -220,6 +239,10 @@ W_GcStats.typedef = TypeDef("GcStats",
         cls=W_GcStats, wrapfn="newint"),
     total_gc_time=interp_attrproperty("total_gc_time",
         cls=W_GcStats, wrapfn="newint"),
+    total_arena_allocated_memory=interp_attrproperty(
+        "total_arena_allocated_memory", cls=W_GcStats, wrapfn="newint"),
+    arena_free_pages_memory=interp_attrproperty("arena_free_pages_memory",
+        cls=W_GcStats, wrapfn="newint"),
 )
 
 @unwrap_spec(memory_pressure=bool)
@@ -119,6 +119,19 @@ class AppTestGC(object):
         assert n >= 2 # at least one step + 1 finalizing
         assert X.deleted == 3
 
+    def test_compact(self):
+        import gc
+
+        class X(object):
+            deleted = 0
+            def __del__(self):
+                X.deleted += 1
+
+        X(); X()
+        res = gc.compact()    # a full collection, like gc.collect()
+        assert isinstance(res, int) and res >= 0
+        assert X.deleted == 2
+
 class AppTestGcDumpHeap(object):
     pytestmark = py.test.mark.xfail(run=False)
 
@@ -230,6 +243,8 @@ def test_StepCollector():
     while True:
         result = sc.do()
         transitions.append((result.oldstate, result.newstate, sc.my_finalized))
+        assert result.duration == result.sweep_duration == -1
+        assert result.pages_freed == -1
         if result.major_is_done:
             break
 
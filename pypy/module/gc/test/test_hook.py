@@ -16,9 +16,11 @@ class AppTestGcHooks(object):
         def fire_gc_minor(space, duration, total_memory_used, pinned_objects):
             gchooks.fire_gc_minor(duration, total_memory_used, pinned_objects)
 
-        @unwrap_spec(ObjSpace, int, int, int)
-        def fire_gc_collect_step(space, duration, oldstate, newstate):
-            gchooks.fire_gc_collect_step(duration, oldstate, newstate)
+        @unwrap_spec(ObjSpace, int, int, int, int)
+        def fire_gc_collect_step(space, duration, oldstate, newstate,
+                                 pages_freed=0):
+            gchooks.fire_gc_collect_step(duration, oldstate, newstate,
+                                         pages_freed)
 
         @unwrap_spec(ObjSpace, int, int, int, r_uint, r_uint, r_uint)
         def fire_gc_collect(space, a, b, c, d, e, f):
@@ -28,9 +30,9 @@ class AppTestGcHooks(object):
         def fire_many(space):
             gchooks.fire_gc_minor(5.0, 0, 0)
             gchooks.fire_gc_minor(7.0, 0, 0)
-            gchooks.fire_gc_collect_step(5.0, 0, 0)
-            gchooks.fire_gc_collect_step(15.0, 0, 0)
-            gchooks.fire_gc_collect_step(22.0, 0, 0)
+            gchooks.fire_gc_collect_step(5.0, 0, 0, 0)
+            gchooks.fire_gc_collect_step(15.0, 2, 2, 3)
+            gchooks.fire_gc_collect_step(22.0, 2, 3, 4)
             gchooks.fire_gc_collect(1, 2, 3, 4, 5, 6)
 
         cls.w_fire_gc_minor = space.wrap(interp2app(fire_gc_minor))
@@ -93,6 +95,24 @@ class AppTestGcHooks(object):
         self.fire_gc_collect_step(70, SCANNING, MARKING)  # won't fire
         assert lst == oldlst
 
+    def test_on_gc_collect_step_sweeping(self):
+        import gc
+        S = gc.GcCollectStepStats
+        lst = []
+        def on_gc_collect_step(stats):
+            lst.append((stats.oldstate, stats.newstate,
+                        stats.sweep_duration, stats.pages_freed))
+        gc.hooks.on_gc_collect_step = on_gc_collect_step
+        self.fire_gc_collect_step(10, S.STATE_MARKING, S.STATE_SWEEPING)
+        self.fire_gc_collect_step(20, S.STATE_SWEEPING, S.STATE_SWEEPING, 5)
+        self.fire_gc_collect_step(30, S.STATE_SWEEPING, S.STATE_FINALIZING, 2)
+        assert lst == [
+            (S.STATE_MARKING, S.STATE_SWEEPING, 0, 0),
+            (S.STATE_SWEEPING, S.STATE_SWEEPING, 20, 5),
+            (S.STATE_SWEEPING, S.STATE_FINALIZING, 30, 2),
+            ]
+        gc.hooks.on_gc_collect_step = None
+
     def test_on_gc_collect(self):
         import gc
         lst = []
@@ -143,7 +163,8 @@ class AppTestGcHooks(object):
 
             def on_gc_collect_step(self, stats):
                 self.steps.append((stats.count, stats.duration,
-                                   stats.duration_min, stats.duration_max))
+                                   stats.duration_min, stats.duration_max,
+                                   stats.sweep_duration, stats.pages_freed))
 
             on_gc_collect = None
 
@@ -151,7 +172,7 @@ class AppTestGcHooks(object):
         gc.hooks.set(myhooks)
         self.fire_many()
         assert myhooks.minors == [(2, 12, 5, 7)]
-        assert myhooks.steps == [(3, 42, 5, 22)]
+        assert myhooks.steps == [(3, 42, 5, 22, 37, 7)]
 
     def test_clear_queue(self):
         import gc
@@ -150,3 +150,38 @@ class AppTestReferentsMore(object):
         assert a in lst
         lst = gc.get_referrers(A)
         assert a in lst
+
+
+class AppTestStrSliceStats(object):
+    spaceconfig = {"objspace.std.withstrslice": True}
+
+    def setup_class(cls):
+        from rpython.rlib import rgc
+        cls._backup = [rgc.get_rpy_roots]
+        l4 = cls.space.newlist([])
+        cls.ALL_ROOTS = [l4]
+        cls.w_ALL_ROOTS = cls.space.newlist(cls.ALL_ROOTS)
+        rgc.get_rpy_roots = lambda: (
+            map(rgc._GcRef, cls.ALL_ROOTS) + [rgc.NULL_GCREF]*2)
+        cls.w_runappdirect = cls.space.wrap(option.runappdirect)
+
+    def teardown_class(cls):
+        from rpython.rlib import rgc
+        rgc.get_rpy_roots = cls._backup[0]
+
+    def test_get_strslice_stats(self):
+        import gc
+        if self.runappdirect:
+            skip("depends on the content of the whole heap")
+        l4 = self.ALL_ROOTS[0]
+        s = "x" * 1000
+        l4.append(s[:300])
+        l4.append(s[500:])
+        l4.append(s[:10])             # copied
+        t = "y" * 400
+        l4.append(t[100:])
+        assert gc.get_strslice_stats() == (3, 1100, 1400)
+        l4[0] + "z"                   # forces the slice
+        assert gc.get_strslice_stats() == (2, 800, 1400)
+        del l4[:]
+        assert gc.get_strslice_stats() == (0, 0, 0)
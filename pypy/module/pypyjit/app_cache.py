@@ -0,0 +1,159 @@
+# NOT_RPYTHON
+
+"""
+A cache of the places where the JIT compiled loops, kept across runs.
+
+Machine code itself cannot be reused by another process: it contains
+addresses of objects of the current process.  What we can save is the
+location of the loops that became hot, as (co_filename, co_firstlineno,
+co_name, next_instr).  When a process starts with the same cache file,
+these locations are handed to trace_next_iteration() as soon as the
+corresponding code objects are found, so that the JIT starts tracing
+them after a few iterations instead of after reaching the threshold.
+"""
+
+import pypyjit
+
+CACHE_VERSION = 1
+MAX_ENTRIES = 10000
+
+# {(co_filename, co_firstlineno, co_name): [(next_instr, count)]}
+# for the entries loaded from the cache file but not seeded yet
+_pending = {}
+# {(co_filename, co_firstlineno, co_name, next_instr): count}
+# for all the entries read from the cache file
+_loaded = {}
+
+
+def _cache_tag():
+    import sys
+    return '%s %s' % (sys.version.split()[0], sys.pypy_version_info)
+
+def _read_cache_file(filename):
+    import marshal
+    try:
+        f = open(filename, 'rb')
+    except IOError:
+        return []
+    try:
+        try:
+            data = marshal.load(f)
+        except (EOFError, ValueError, TypeError):
+            return []
+    finally:
+        f.close()
+    if (not isinstance(data, tuple) or len(data) != 3 or
+            data[0] != CACHE_VERSION or data[1] != _cache_tag()):
+        return []     # written by a different version: ignore it
+    return data[2]
+
+def load_hot_loops(filename):
+    """ load_hot_loops(filename) -> number of loops seeded now
+
+    Read a cache file written by save_hot_loops() and ask the JIT to
+    trace soon all the loops listed there.  Loops in code objects that
+    don't exist yet (e.g. in modules not imported so far) are kept
+    pending; call prewarm_hot_loops() again later to seed them.
+    A file written by another version of PyPy is ignored.
+    """
+    for co_filename, firstlineno, name, next_instr, count in (
+            _read_cache_file(filename)):
+        key = (co_filename, firstlineno, name, next_instr)
+        if key in _loaded:
+            continue
+        _loaded[key] = count
+        codekey = (co_filename, firstlineno, name)
+        _pending.setdefault(codekey, []).append((next_instr, count))
+    return prewarm_hot_loops()
+
+def _iter_code_objects(seen):
+    import sys, types
+    todo = []
+    for module in sys.modules.values():
+        if module is not None:
+            todo.append(module)
+    while todo:
+        obj = todo.pop()
+        if id(obj) in seen:
+            continue
+        seen[id(obj)] = obj
+        if isinstance(obj, types.CodeType):
+            yield obj
+            todo.extend(obj.co_consts)
+        elif isinstance(obj, types.FunctionType):
+            todo.append(obj.func_code)
+        elif isinstance(obj, (types.MethodType, staticmethod, classmethod)):
+            todo.append(obj.__func__)
+        elif isinstance(obj, (types.ModuleType, type, types.ClassType)):
+            try:
+                todo.extend(obj.__dict__.values())
+            except AttributeError:
+                pass
+
+def prewarm_hot_loops():
+    """ prewarm_hot_loops() -> number of loops seeded
+
+    Look for the code objects of loops loaded by load_hot_loops()
+    that were not found so far, and ask the JIT to trace them soon.
+    The code objects are searched among the functions, classes and
+    methods reachable from sys.modules.
+    """
+    if not _pending:
+        return 0
+    seeded = 0
+    for code in _iter_code_objects({}):
+        codekey = (code.co_filename, code.co_firstlineno, code.co_name)
+        entries = _pending.pop(codekey, None)
+        if entries is None:
+            continue
+        for next_instr, count in entries:
+            if next_instr < len(code.co_code):
+                pypyjit.trace_next_iteration(next_instr, False, code)
+                seeded += 1
+        if not _pending:
+            break
+    return seeded
+
+def save_hot_loops(filename):
+    """ save_hot_loops(filename)
+
+    Write to 'filename' the location of the loops compiled so far by
+    this process (recorded if enable_hot_loop_cache() was called),
+    together with the ones read by load_hot_loops().
+    """
+    import marshal, os
+    merged = _loaded.copy()
+    for co_filename, firstlineno, name, next_instr, count in (
+            pypyjit._get_hot_loops()):
+        key = (co_filename, firstlineno, name, next_instr)
+        merged[key] = merged.get(key, 0) + count
+    entries = [key + (count,) for key, count in merged.items()]
+    entries.sort(key=lambda entry: -entry[4])
+    del entries[MAX_ENTRIES:]
+    tmpname = '%s.%d.tmp' % (filename, os.getpid())
+    f = open(tmpname, 'wb')
+    try:
+        marshal.dump((CACHE_VERSION, _cache_tag(), entries), f)
+    finally:
+        f.close()
+    os.rename(tmpname, filename)
+
+def enable_hot_loop_cache(filename):
+    """ enable_hot_loop_cache(filename) -> number of loops seeded now
+
+    Opt-in persistent cache of the hot loops.  Loads 'filename' if it
+    exists (see load_hot_loops()), starts recording the location of
+    every loop compiled from now on, and saves them back to 'filename'
+    when the process exits.  Call prewarm_hot_loops() after the
+    application modules are imported to seed the remaining loops.
+    """
+    import atexit
+    pypyjit._set_record_hot_loops(True)
+    atexit.register(_save_at_exit, filename)
+    return load_hot_loops(filename)
+
+def _save_at_exit(filename):
+    try:
+        save_hot_loops(filename)
+    except (IOError, OSError):
+        pass
@@ -25,6 +25,9 @@ class Cache(object):
         self.w_abort_hook = None
         self.w_trace_too_long_hook = None
         self.compile_hook_with_ops = False
+        # {(co_filename, co_firstlineno, co_name, next_instr): count}
+        self.hot_loops = {}
+        self.record_hot_loops = False
 
     def getno(self):
         self.no += 1
@@ -100,6 +103,46 @@ def set_trace_too_long_hook(space, w_hook):
     cache.w_trace_too_long_hook = w_hook
     cache.in_recursion = NonConstant(False)
 
+def record_hot_loop(cache, jitdriver, greenkey):
+    # called from the compile hook: remember where a loop was compiled,
+    # in a form that survives the end of the process (see app_cache.py)
+    if greenkey is None or jitdriver.name != 'pypyjit':
+        return
+    next_instr = greenkey[0].getint()
+    ll_code = lltype.cast_opaque_ptr(lltype.Ptr(OBJECT),
+                                     greenkey[2].getref_base())
+    pycode = cast_base_ptr_to_instance(PyCode, ll_code)
+    key = (pycode.co_filename, pycode.co_firstlineno, pycode.co_name,
+           next_instr)
+    cache.hot_loops[key] = cache.hot_loops.get(key, 0) + 1
+
+@unwrap_spec(flag=bool)
+def set_record_hot_loops(space, flag):
+    """ _set_record_hot_loops(flag)
+
+    Start or stop recording the location of every compiled loop.
+    Used by enable_hot_loop_cache().
+    """
+    cache = space.fromcache(Cache)
+    cache.record_hot_loops = flag
+
+def get_hot_loops(space):
+    """ _get_hot_loops() -> list of tuples
+
+    Return the recorded loop locations as a list of tuples
+    (co_filename, co_firstlineno, co_name, next_instr, count).
+    """
+    cache = space.fromcache(Cache)
+    l_w = []
+    for key, count in cache.hot_loops.items():
+        filename, firstlineno, name, next_instr = key
+        l_w.append(space.newtuple([space.newtext(filename),
+                                   space.newint(firstlineno),
+                                   space.newtext(name),
+                                   space.newint(next_instr),
+                                   space.newint(count)]))
+    return space.newlist(l_w)
+
 def wrap_oplist(space, logops, operations, ops_offset=None):
     # this function is called from the JIT
     from rpython.jit.metainterp.resoperation import rop
@@ -397,6 +440,48 @@ def get_stats_asmmemmgr(space):
     m2 = jit_hooks.stats_asmmemmgr_used(None)
     return space.newtuple([space.newint(m1), space.newint(m2)])
 
+def get_stats_memmgr(space):
+    """Returns the size of the machine code and resume data of the loops
+    currently kept alive by the JIT, and the number of loops freed so far
+    because the 'code_budget' parameter was exceeded, as a pair
+    (code_size, evicted_loops)."""
+    m1 = jit_hooks.stats_memmgr_code_size(None)
+    m2 = jit_hooks.stats_memmgr_evicted_loops(None)
+    return space.newtuple([space.newint(m1), space.newint(m2)])
+
+def enable_guard_stats(space):
+    """ Start counting the failures of the guards of the loops and bridges
+    compiled from now on.  The previous counts are forgotten.
+    """
+    jit_hooks.stats_set_guard_stats(None, True)
+
+def disable_guard_stats(space):
+    """ Stop counting the guard failures.  The counts so far are kept
+    and can still be read with get_guard_stats().
+    """
+    jit_hooks.stats_set_guard_stats(None, False)
+
+def get_guard_stats(space):
+    """ get_guard_stats() -> list of tuples
+
+    Return the guards that failed since enable_guard_stats() as a list of
+    tuples (guard, location, failures), the ones that failed the most
+    first.  'guard' is the name of the operation, like 'guard_class' or
+    'guard_value', and 'location' is the position in the Python code that
+    produced it, in the same format as in the JIT logs.  Only the failures
+    that went back to the interpreter are counted, not the ones that
+    already go to a compiled bridge.
+    """
+    ll_stats = jit_hooks.stats_get_guard_stats(None)
+    l_w = []
+    if ll_stats:
+        for i in range(len(ll_stats)):
+            l_w.append(space.newtuple([
+                space.newtext(hlstr(ll_stats[i].guard)),
+                space.newtext(hlstr(ll_stats[i].location)),
+                space.newint(ll_stats[i].failures)]))
+    return space.newlist(l_w)
+
 def enable_debug(space):
     """ Set the jit debugging - completely necessary for some stats to work,
     most notably assembler counters.
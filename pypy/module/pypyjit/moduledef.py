@@ -2,6 +2,10 @@ from pypy.interpreter.mixedmodule import MixedModule
 
 class Module(MixedModule):
     appleveldefs = {
+        'enable_hot_loop_cache': 'app_cache.enable_hot_loop_cache',
+        'load_hot_loops': 'app_cache.load_hot_loops',
+        'save_hot_loops': 'app_cache.save_hot_loops',
+        'prewarm_hot_loops': 'app_cache.prewarm_hot_loops',
     }
 
     interpleveldefs = {
@@ -18,6 +22,12 @@ class Module(MixedModule):
         'set_trace_too_long_hook': 'interp_resop.set_trace_too_long_hook',
         'get_stats_snapshot': 'interp_resop.get_stats_snapshot',
         'get_stats_asmmemmgr': 'interp_resop.get_stats_asmmemmgr',
+        'get_stats_memmgr': 'interp_resop.get_stats_memmgr',
+        'enable_guard_stats': 'interp_resop.enable_guard_stats',
+        'disable_guard_stats': 'interp_resop.disable_guard_stats',
+        'get_guard_stats': 'interp_resop.get_guard_stats',
+        '_set_record_hot_loops': 'interp_resop.set_record_hot_loops',
+        '_get_hot_loops': 'interp_resop.get_hot_loops',
         # those things are disabled because they have bugs, but if
         # they're found to be useful, fix test_ztranslation_jit_stats
         # in the backend first. get_stats_snapshot still produces
@@ -0,0 +1,105 @@
+import py
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+from rpython.jit.metainterp.compile import ResumeGuardDescr
+from rpython.jit.metainterp.guardstats import GuardStats
+from rpython.jit.tool.oparser import parse
+from rpython.rtyper.annlowlevel import cast_instance_to_base_ptr
+from rpython.rtyper.lltypesystem import lltype, llmemory
+from rpython.rlib import jit_hooks
+from pypy.module.pypyjit.test.test_jit_hook import MockJitDriverSD
+
+
+class MockSD(object):
+    jitdrivers_sd = [MockJitDriverSD]
+
+
+class AppTestGuardStats(object):
+    spaceconfig = dict(usemodules=('pypyjit',))
+
+    def setup_class(cls):
+        if cls.runappdirect:
+            py.test.skip("Can't run this test with -A")
+        w_f = cls.space.appexec([], """():
+        def function():
+            pass
+        return function
+        """)
+        ll_code = cast_instance_to_base_ptr(w_f.code)
+        code_gcref = lltype.cast_opaque_ptr(llmemory.GCREF, ll_code)
+
+        guard_stats = GuardStats(MockSD())
+        cls.orig_jit_hooks = (jit_hooks.stats_set_guard_stats,
+                              jit_hooks.stats_get_guard_stats)
+        # there is no warmrunnerdesc when not translated
+        jit_hooks.stats_set_guard_stats = (
+            lambda warmrunnerdesc, flag: guard_stats.set_enabled(flag))
+        jit_hooks.stats_get_guard_stats = (
+            lambda warmrunnerdesc: guard_stats.get_all_stats())
+
+        oplist = parse("""
+        [i1, i2, p2]
+        i3 = int_add(i1, i2)
+        debug_merge_point(0, 0, 0, 0, 0, ConstPtr(ptr0))
+        guard_nonnull(p2) []
+        guard_true(i3) []
+        """, namespace={'ptr0': code_gcref}).operations
+        descrs = []
+        for op in oplist:
+            if op.is_guard():
+                descr = ResumeGuardDescr()
+                op.setdescr(descr)
+                descrs.append(descr)
+
+        def interp_on_compile():
+            # what compile.py does after compiling a loop
+            if guard_stats.enabled:
+                guard_stats.record_guards(0, None, oplist)
+
+        @unwrap_spec(index=int)
+        def interp_fail_guard(index):
+            # what the handle_fail() of the descr does
+            if guard_stats.enabled:
+                guard_stats.guard_failed(descrs[index])
+
+        space = cls.space
+        cls.w_on_compile = space.wrap(interp2app(interp_on_compile))
+        cls.w_fail_guard = space.wrap(interp2app(interp_fail_guard))
+
+    def teardown_class(cls):
+        (jit_hooks.stats_set_guard_stats,
+         jit_hooks.stats_get_guard_stats) = cls.orig_jit_hooks
+
+    def test_guard_stats(self):
+        import pypyjit
+        pypyjit.enable_guard_stats()
+        assert pypyjit.get_guard_stats() == []
+        self.on_compile()
+        assert pypyjit.get_guard_stats() == []
+        self.fail_guard(1)
+        self.fail_guard(0)
+        self.fail_guard(1)
+        assert pypyjit.get_guard_stats() == [
+            ('guard_true', 'function', 2),
+            ('guard_nonnull', 'function', 1)]
+        # disabling keeps the counts, but stops counting
+        pypyjit.disable_guard_stats()
+        self.fail_guard(0)
+        self.fail_guard(0)
+        assert pypyjit.get_guard_stats() == [
+            ('guard_true', 'function', 2),
+            ('guard_nonnull', 'function', 1)]
+        # enabling again forgets everything, including the guards of the
+        # loops compiled before
+        pypyjit.enable_guard_stats()
+        self.fail_guard(1)
+        assert pypyjit.get_guard_stats() == []
+        pypyjit.disable_guard_stats()
+
+    def test_guards_compiled_while_disabled(self):
+        import pypyjit
+        pypyjit.disable_guard_stats()
+        self.on_compile()
+        pypyjit.enable_guard_stats()
+        self.fail_guard(0)
+        assert pypyjit.get_guard_stats() == []
+        pypyjit.disable_guard_stats()
@@ -0,0 +1,81 @@
+import py
+from pypy.interpreter.gateway import interp2app
+from rpython.jit.metainterp.history import JitCellToken, ConstInt, ConstPtr
+from rpython.jit.metainterp.logger import Logger
+from rpython.rtyper.annlowlevel import cast_instance_to_base_ptr
+from rpython.rtyper.lltypesystem import lltype, llmemory
+from rpython.rlib.jit import JitDebugInfo
+from pypy.module.pypyjit.hooks import pypy_hooks
+from pypy.module.pypyjit.test.test_jit_hook import MockJitDriverSD, MockSD
+
+
+class AppTestHotLoopCache(object):
+    spaceconfig = dict(usemodules=('pypyjit',))
+
+    def setup_class(cls):
+        if cls.runappdirect:
+            py.test.skip("Can't run this test with -A")
+        space = cls.space
+        w_f = space.appexec([], """():
+        def function():
+            for i in range(10):
+                pass
+        return function
+        """)
+        cls.w_f = w_f
+        ll_code = cast_instance_to_base_ptr(w_f.code)
+        code_gcref = lltype.cast_opaque_ptr(llmemory.GCREF, ll_code)
+        logger = Logger(MockSD())
+
+        def interp_on_compile(next_instr):
+            greenkey = [ConstInt(next_instr), ConstInt(0),
+                        ConstPtr(code_gcref)]
+            di_loop = JitDebugInfo(MockJitDriverSD, logger, JitCellToken(),
+                                   [], 'loop', greenkey)
+            if pypy_hooks.are_hooks_enabled():
+                pypy_hooks.after_compile(di_loop)
+
+        cls.w_on_compile = space.wrap(interp2app(interp_on_compile,
+                                                 unwrap_spec=[int]))
+        cls.w_tmpfile = space.wrap(str(py.test.ensuretemp("hot_loops")
+                                       .join("cache")))
+
+    def test_record_and_reload(self):
+        import pypyjit, sys
+        self.on_compile(3)       # not recording yet
+        assert pypyjit._get_hot_loops() == []
+        pypyjit._set_record_hot_loops(True)
+        try:
+            self.on_compile(7)
+            self.on_compile(7)
+        finally:
+            pypyjit._set_record_hot_loops(False)
+        code = self.f.func_code
+        assert pypyjit._get_hot_loops() == [
+            (code.co_filename, code.co_firstlineno, code.co_name, 7, 2)]
+        pypyjit.save_hot_loops(self.tmpfile)
+        #
+        seeded = []
+        def trace_next_iteration(next_instr, is_being_profiled, code):
+            seeded.append((next_instr, is_being_profiled, code))
+        orig = pypyjit.trace_next_iteration
+        pypyjit.trace_next_iteration = trace_next_iteration
+        # the function must be reachable from sys.modules to be found
+        sys.modules['test_hot_loop_cache_mod'] = mod = type(sys)('mod')
+        try:
+            assert pypyjit.load_hot_loops(self.tmpfile) == 0
+            mod.function = self.f
+            assert pypyjit.prewarm_hot_loops() == 1
+            assert pypyjit.prewarm_hot_loops() == 0
+        finally:
+            pypyjit.trace_next_iteration = orig
+            del sys.modules['test_hot_loop_cache_mod']
+        assert seeded == [(7, False, code)]
+
+    def test_ignore_bad_file(self):
+        import pypyjit, marshal
+        f = open(self.tmpfile, 'wb')
+        marshal.dump((0, 'some other version', [('x', 1, 'y', 2, 3)]), f)
+        f.close()
+        assert pypyjit.load_hot_loops(self.tmpfile) == 0
+        assert pypyjit.load_hot_loops(self.tmpfile + '.missing') == 0
@@ -0,0 +1,48 @@
+"""Build strings with repeated additions, like templating code and loggers
+do.  Compare a pypy translated with --objspace-std-withstrbuf with one
+translated without it:
+
+    pypy bench_strbuf.py [repeat]
+"""
+
+import sys, time
+
+
+ROWS = [{'id': i, 'name': 'item-%d' % i, 'price': i * 0.25}
+        for i in range(2000)]
+
+def render_template(rows):
+    # what a naive template engine produces
+    out = '<table>\n'
+    for row in rows:
+        out += '<tr><td>' + str(row['id']) + '</td>'
+        out += '<td>' + row['name'] + '</td>'
+        out += '<td>' + str(row['price']) + '</td></tr>\n'
+    out += '</table>\n'
+    return out
+
+def build_log_lines(n):
+    lines = []
+    for i in range(n):
+        line = '2024-01-01 12:00:00'
+        line += ' INFO'
+        line += ' worker-' + str(i % 8)
+        line += ': processed request ' + str(i)
+        line += ' in ' + str(i % 100) + 'ms'
+        lines.append(line)
+    return len('\n'.join(lines))
+
+def measure(func, args, repeat):
+    best = float('inf')
+    for i in range(repeat):
+        t0 = time.time()
+        func(*args)
+        best = min(best, time.time() - t0)
+    return best
+
+def main(repeat=10):
+    print 'templating: %.4fs' % measure(render_template, (ROWS,), repeat)
+    print 'log lines:  %.4fs' % measure(build_log_lines, (20000,), repeat)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -1,5 +1,9 @@
 """The builtin str implementation"""
 
+import inspect
+
+import py
+
 from rpython.rlib import jit, rutf8
 from rpython.rlib.objectmodel import (
     compute_hash, compute_unique_id, import_from_mixin)
@@ -16,8 +20,9 @@ from pypy.objspace.std import newformat
 from pypy.objspace.std.basestringtype import basestring_typedef
 from pypy.objspace.std.formatting import mod_format
 from pypy.objspace.std.stringmethods import StringMethods
+from pypy.objspace.std.strintern import intern_list
 from pypy.objspace.std.unicodeobject import (
-    decode_object, unicode_from_encoded_object,
+    W_UnicodeObject, decode_object, unicode_from_encoded_object,
     getdefaultencoding, unicode_from_string)
 from pypy.objspace.std.util import IDTAG_SPECIAL, IDTAG_SHIFT
 
@@ -80,6 +85,9 @@ class W_AbstractBytesObject(W_Root):
     def descr_getitem(self, space, w_index):
         """x.__getitem__(y) <==> x[y]"""
 
+    def descr_getbuffer(self, space, w_flags):
+        ""
+
     def descr_getnewargs(self, space):
         ""
 
@@ -428,6 +436,12 @@ class W_AbstractBytesObject(W_Root):
         Return a copy of the string S converted to uppercase.
         """
 
+    def descr_formatter_parser(self, space):
+        ""
+
+    def descr_formatter_field_name_split(self, space):
+        ""
+
     @unwrap_spec(width=int)
     def descr_zfill(self, space, width):
         """S.zfill(width) -> string
@@ -488,6 +502,13 @@ class W_BytesObject(W_AbstractBytesObject):
     def _new(self, value):
         return W_BytesObject(value)
 
+    def _getitem_result(self, space, index):
+        try:
+            character = self._value[index]
+        except IndexError:
+            raise oefmt(space.w_IndexError, "string index out of range")
+        return space.newbytes(character)
+
     def _new_from_list(self, value):
         return W_BytesObject(''.join(value))
 
@@ -502,7 +523,7 @@ class W_BytesObject(W_AbstractBytesObject):
     @staticmethod
     def _use_rstr_ops(space, w_other):
         from pypy.objspace.std.unicodeobject import W_UnicodeObject
-        return (isinstance(w_other, W_BytesObject) or
+        return (isinstance(w_other, W_AbstractBytesObject) or
                 isinstance(w_other, W_UnicodeObject))
 
     @staticmethod
@@ -566,7 +587,7 @@ class W_BytesObject(W_AbstractBytesObject):
     _title = _upper
 
     def _newlist_unwrapped(self, space, lst):
-        return space.newlist_bytes(lst)
+        return space.newlist_bytes(intern_list(space, lst))
 
     @staticmethod
     @unwrap_spec(w_object=WrappedDefault(""))
@@ -615,31 +636,43 @@ class W_BytesObject(W_AbstractBytesObject):
         return mod_format(space, w_values, self, do_unicode=False)
 
     def descr_eq(self, space, w_other):
+        if _is_lazy_bytes(space, w_other):
+            return space.newbool(self._value == w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value == w_other._value)
 
     def descr_ne(self, space, w_other):
+        if _is_lazy_bytes(space, w_other):
+            return space.newbool(self._value != w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value != w_other._value)
 
     def descr_lt(self, space, w_other):
+        if _is_lazy_bytes(space, w_other):
+            return space.newbool(self._value < w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value < w_other._value)
 
     def descr_le(self, space, w_other):
+        if _is_lazy_bytes(space, w_other):
+            return space.newbool(self._value <= w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value <= w_other._value)
 
     def descr_gt(self, space, w_other):
+        if _is_lazy_bytes(space, w_other):
+            return space.newbool(self._value > w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value > w_other._value)
 
     def descr_ge(self, space, w_other):
+        if _is_lazy_bytes(space, w_other):
+            return space.newbool(self._value >= w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value >= w_other._value)
@@ -657,8 +690,22 @@ class W_BytesObject(W_AbstractBytesObject):
             from .bytearrayobject import W_BytearrayObject, _make_data
             self_as_bytearray = W_BytearrayObject(_make_data(self._value))
             return space.add(self_as_bytearray, w_other)
+        elif (space.config.objspace.std.withstrbuf and
+                  space.isinstance_w(w_other, space.w_bytes)):
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            builder = StringBuilder()
+            builder.append(self._value)
+            builder.append(space.bytes_w(w_other))
+            return W_StringBufferObject(builder)
         return self._StringMethods_descr_add(space, w_other)
 
+    _StringMethods__sliced = _sliced
+    def _sliced(self, space, s, start, stop, orig_obj):
+        if space.config.objspace.std.withstrslice:
+            from pypy.objspace.std.strsliceobject import make_bytes_slice
+            return make_bytes_slice(s, start, stop)
+        return self._StringMethods__sliced(space, s, start, stop, orig_obj)
+
     _StringMethods__startswith = _startswith
     def _startswith(self, space, value, w_prefix, start, end):
         if space.isinstance_w(w_prefix, space.w_unicode):
@@ -830,12 +877,114 @@ class W_BytesObject(W_AbstractBytesObject):
         return tformat.formatter_field_name_split()
 
 
+class W_LazyBytesObject(W_AbstractBytesObject):
+    """Base class of the strs that only compute their value when it is
+    needed (objspace.std.withstrbuf and objspace.std.withstrslice).  They
+    use the typedef of W_BytesObject, and the methods that they don't
+    implement themselves work on the computed value, see
+    make_lazy_delegates().
+    """
+
+    def force(self):
+        """Return the value of the str, as an RPython string."""
+        raise NotImplementedError("abstract base class")
+
+    def force_w(self):
+        """Return the value of the str, as a W_BytesObject."""
+        raise NotImplementedError("abstract base class")
+
+    def unwrap(self, space):
+        return self.force()
+
+    def str_w(self, space):
+        return self.force()
+
+    def utf8_w(self, space):
+        return self.force()
+
+    def buffer_w(self, space, flags):
+        space.check_buf_flags(flags, True)
+        return SimpleView(StringBuffer(self.force()))
+
+    def readbuf_w(self, space):
+        return StringBuffer(self.force())
+
+    def writebuf_w(self, space):
+        raise oefmt(space.w_TypeError,
+                    "Cannot use string as modifiable buffer")
+
+    charbuf_w = str_w
+
+    def listview_bytes(self):
+        return self.force_w().listview_bytes()
+
+    def ord(self, space):
+        return self.force_w().ord(space)
+
+
+def _is_lazy_bytes(space, w_obj):
+    return ((space.config.objspace.std.withstrbuf or
+             space.config.objspace.std.withstrslice) and
+            isinstance(w_obj, W_LazyBytesObject))
+
+def unwrap_lazy_bytes(w_obj):
+    if isinstance(w_obj, W_LazyBytesObject):
+        return w_obj.force_w()
+    return w_obj
+
+def _make_lazy_delegate(name, func):
+    args = inspect.getargs(func.func_code)
+    if args.varargs or args.keywords:
+        raise TypeError("Varargs and keywords not supported in unwrap_spec")
+    argnames = args.args[1:]
+    callargs = ['unwrap_lazy_bytes(%s)' % arg if arg.startswith('w_') else arg
+                for arg in argnames]
+    source = py.code.Source("""
+    def %(name)s(self, %(args)s):
+        return self.force_w().%(name)s(%(callargs)s)
+    """ % {'name': name, 'args': ', '.join(argnames),
+           'callargs': ', '.join(callargs)})
+    d = {'unwrap_lazy_bytes': unwrap_lazy_bytes}
+    exec source.compile() in d
+    f = d[name]
+    f.func_defaults = func.func_defaults
+    f.__module__ = func.__module__
+    unwrap_spec_ = getattr(func, 'unwrap_spec', None)
+    if unwrap_spec_ is not None:
+        f = unwrap_spec(**unwrap_spec_)(f)
+    return f
+
+def make_lazy_delegates(cls):
+    """Add to the subclass 'cls' of W_LazyBytesObject all the methods of
+    str that it does not define itself.  They call the method of the
+    forced W_BytesObject, with the lazy strs among the arguments forced
+    too."""
+    for name, func in W_AbstractBytesObject.__dict__.items():
+        if (not name.startswith('descr_') or name == 'descr_new' or
+                name in cls.__dict__):
+            continue
+        setattr(cls, name, _make_lazy_delegate(name, func))
+    cls.typedef = W_BytesObject.typedef
+
+
 def _create_list_from_bytes(value):
     # need this helper function to allow the jit to look inside and inline
     # listview_bytes
     return [s for s in value]
 
 W_BytesObject.EMPTY = W_BytesObject('')
+W_BytesObject.PREBUILT = None
+
+
+def setup_prebuilt_chars(space):
+    # not reset to None for the other spaces: a space with the option may
+    # be used again after them in the tests.  The tables are only used by
+    # the spaces that have the option, see newbytes() and newutf8()
+    if (space.config.objspace.std.withprebuiltchar and
+            W_BytesObject.PREBUILT is None):
+        W_BytesObject.PREBUILT = [W_BytesObject(chr(i)) for i in range(256)]
+        W_UnicodeObject.PREBUILT = [W_UnicodeObject(chr(i), 1)
+                                    for i in range(128)]
 
 
 W_BytesObject.typedef = TypeDef(
@@ -905,17 +1054,18 @@ W_BytesObject.typedef = TypeDef(
     translate = interpindirect2app(W_AbstractBytesObject.descr_translate),
     upper = interpindirect2app(W_AbstractBytesObject.descr_upper),
     zfill = interpindirect2app(W_AbstractBytesObject.descr_zfill),
-    __buffer__ = interp2app(W_BytesObject.descr_getbuffer),
+    __buffer__ = interpindirect2app(W_AbstractBytesObject.descr_getbuffer),
 
-    format = interpindirect2app(W_BytesObject.descr_format),
-    __format__ = interpindirect2app(W_BytesObject.descr__format__),
-    __mod__ = interpindirect2app(W_BytesObject.descr_mod),
-    __rmod__ = interpindirect2app(W_BytesObject.descr_rmod),
+    format = interpindirect2app(W_AbstractBytesObject.descr_format),
+    __format__ = interpindirect2app(W_AbstractBytesObject.descr__format__),
+    __mod__ = interpindirect2app(W_AbstractBytesObject.descr_mod),
+    __rmod__ = interpindirect2app(W_AbstractBytesObject.descr_rmod),
     __getnewargs__ = interpindirect2app(
         W_AbstractBytesObject.descr_getnewargs),
-    _formatter_parser = interp2app(W_BytesObject.descr_formatter_parser),
-    _formatter_field_name_split =
-        interp2app(W_BytesObject.descr_formatter_field_name_split),
+    _formatter_parser = interpindirect2app(
+        W_AbstractBytesObject.descr_formatter_parser),
+    _formatter_field_name_split = interpindirect2app(
+        W_AbstractBytesObject.descr_formatter_field_name_split),
 )
 W_BytesObject.typedef.flag_sequence_bug_compat = True
 
@@ -12,6 +12,10 @@ from pypy.interpreter.gateway import (
 from pypy.interpreter.mixedmodule import MixedModule
 from pypy.interpreter.signature import Signature
 from pypy.interpreter.typedef import TypeDef
+from pypy.objspace.std.floatobject import W_FloatObject
+from pypy.objspace.std.intobject import W_IntObject
+from pypy.objspace.std.tupleobject import (is_int_or_bytes_tuple,
+    int_or_bytes_tuple_eq, int_or_bytes_tuple_hash)
 from pypy.objspace.std.util import negate
 
 
@@ -30,6 +34,13 @@ def _never_equal_to_string(space, w_lookup_type):
             space.is_w(w_lookup_type, space.w_bool) or
             space.is_w(w_lookup_type, space.w_float))
 
+def _never_equal_to_int(space, w_lookup_type):
+    # XXX there are many more types
+    return (space.is_w(w_lookup_type, space.w_NoneType) or
+            space.is_w(w_lookup_type, space.w_bytes) or
+            space.is_w(w_lookup_type, space.w_unicode)
+            )
+
 
 @specialize.call_location()
 def w_dict_unrolling_heuristic(w_dct):
@@ -665,27 +676,53 @@ class EmptyDictStrategy(DictStrategy):
     def get_empty_storage(self):
         return self.erase(None)
 
-    def switch_to_correct_strategy(self, w_dict, w_key):
-        if type(w_key) is self.space.StringObjectCls:
-            self.switch_to_bytes_strategy(w_dict)
+    def switch_to_correct_strategy(self, w_dict, w_key, w_value):
+        space = self.space
+        if type(w_key) is space.StringObjectCls:
+            if type(w_value) is W_IntObject:
+                self.switch_to_bytes_int_strategy(w_dict)
+            else:
+                self.switch_to_bytes_strategy(w_dict)
             return
-        elif type(w_key) is self.space.UnicodeObjectCls:
-            self.switch_to_unicode_strategy(w_dict)
+        elif type(w_key) is space.UnicodeObjectCls:
+            if type(w_value) is W_IntObject:
+                self.switch_to_strategy(w_dict,
+                                        space.fromcache(UnicodeIntDictStrategy))
+            else:
+                self.switch_to_unicode_strategy(w_dict)
             return
-        w_type = self.space.type(w_key)
-        if self.space.is_w(w_type, self.space.w_int):
-            self.switch_to_int_strategy(w_dict)
+        w_type = space.type(w_key)
+        if space.is_w(w_type, space.w_int):
+            if type(w_value) is W_IntObject:
+                self.switch_to_strategy(w_dict,
+                                        space.fromcache(IntIntDictStrategy))
+            elif type(w_value) is W_FloatObject:
+                self.switch_to_strategy(w_dict,
+                                        space.fromcache(IntFloatDictStrategy))
+            else:
+                self.switch_to_int_strategy(w_dict)
+        elif is_int_or_bytes_tuple(w_key):
+            self.switch_to_tuple_strategy(w_dict)
         elif w_type.compares_by_identity():
             self.switch_to_identity_strategy(w_dict)
         else:
             self.switch_to_object_strategy(w_dict)
 
+    def switch_to_strategy(self, w_dict, strategy):
+        storage = strategy.get_empty_storage()
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = storage
+
     def switch_to_bytes_strategy(self, w_dict):
         strategy = self.space.fromcache(BytesDictStrategy)
         storage = strategy.get_empty_storage()
         w_dict.set_strategy(strategy)
         w_dict.dstorage = storage
 
+    def switch_to_bytes_int_strategy(self, w_dict):
+        self.switch_to_strategy(w_dict,
+                                self.space.fromcache(BytesIntDictStrategy))
+
     def switch_to_unicode_strategy(self, w_dict):
         strategy = self.space.fromcache(UnicodeDictStrategy)
         storage = strategy.get_empty_storage()
@@ -698,6 +735,12 @@ class EmptyDictStrategy(DictStrategy):
         w_dict.set_strategy(strategy)
         w_dict.dstorage = storage
 
+    def switch_to_tuple_strategy(self, w_dict):
+        strategy = self.space.fromcache(TupleDictStrategy)
+        storage = strategy.get_empty_storage()
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = storage
+
     def switch_to_identity_strategy(self, w_dict):
         from pypy.objspace.std.identitydict import IdentityDictStrategy
         strategy = self.space.fromcache(IdentityDictStrategy)
@@ -724,16 +767,19 @@ class EmptyDictStrategy(DictStrategy):
 
     def setdefault(self, w_dict, w_key, w_default):
         # here the dict is always empty
-        self.switch_to_correct_strategy(w_dict, w_key)
+        self.switch_to_correct_strategy(w_dict, w_key, w_default)
         w_dict.setitem(w_key, w_default)
         return w_default
 
     def setitem(self, w_dict, w_key, w_value):
-        self.switch_to_correct_strategy(w_dict, w_key)
+        self.switch_to_correct_strategy(w_dict, w_key, w_value)
         w_dict.setitem(w_key, w_value)
 
     def setitem_str(self, w_dict, key, w_value):
-        self.switch_to_bytes_strategy(w_dict)
+        if type(w_value) is W_IntObject:
+            self.switch_to_bytes_int_strategy(w_dict)
+        else:
+            self.switch_to_bytes_strategy(w_dict)
         w_dict.setitem_str(key, w_value)
 
     def delitem(self, w_dict, w_key):
@@ -874,16 +920,40 @@ def create_iterator_classes(dictimpl):
             else:
                 return None
 
-    class IterClassValues(BaseValueIterator):
-        def __init__(self, space, strategy, w_dict):
-            self.iterator = strategy.getitervalues(w_dict)
-            BaseIteratorImplementation.__init__(self, space, strategy, w_dict)
+    if not getattr(dictimpl, 'devolves_values', False):
+        class IterClassValues(BaseValueIterator):
+            def __init__(self, space, strategy, w_dict):
+                self.iterator = strategy.getitervalues(w_dict)
+                BaseIteratorImplementation.__init__(self, space, strategy,
+                                                    w_dict)
 
-        def next_value_entry(self):
-            for value in self.iterator:
-                return wrapvalue(self.space, value)
-            else:
-                return None
+            def next_value_entry(self):
+                for value in self.iterator:
+                    return wrapvalue(self.space, value)
+                else:
+                    return None
+    else:
+        class IterClassValues(BaseValueIterator):
+            # storing a value of another type changes the strategy without
+            # changing the length of the dict.  In this case the value found
+            # in the old storage might be out-of-date: look it up again.
+            def __init__(self, space, strategy, w_dict):
+                self.iterator = strategy.getiteritems_with_hash(w_dict)
+                BaseIteratorImplementation.__init__(self, space, strategy,
+                                                    w_dict)
+
+            def next_value_entry(self):
+                for key, value, keyhash in self.iterator:
+                    if self.strategy is self.w_dict.get_strategy():
+                        return wrapvalue(self.space, value)
+                    w_value = self.w_dict.getitem(wrapkey(self.space, key))
+                    if w_value is None:
+                        self.len = -1   # Make this error state sticky
+                        raise oefmt(self.space.w_RuntimeError,
+                                    "dictionary changed during iteration")
+                    return w_value
+                else:
+                    return None
 
     class IterClassItems(BaseItemIterator):
         def __init__(self, space, strategy, w_dict):
@@ -1314,13 +1384,235 @@ class IntDictStrategy(AbstractTypedStrategy, DictStrategy):
         space = self.space
         return space.is_w(space.type(w_obj), space.w_int)
 
+    def _never_equal_to(self, w_lookup_type):
+        return _never_equal_to_int(self.space, w_lookup_type)
+
+    def listview_int(self, w_dict):
+        return self.unerase(w_dict.dstorage).keys()
+
+    def wrapkey(space, key):
+        return space.newint(key)
+
+    def w_keys(self, w_dict):
+        return self.space.newlist_int(self.listview_int(w_dict))
+
+create_iterator_classes(IntDictStrategy)
+
+
+class TupleDictStrategy(AbstractTypedStrategy, DictStrategy):
+    """For dicts whose keys are all tuples of ints and strs, like (int, int)
+    or (str, int).  The keys are compared and hashed without going through
+    the object space."""
+    erase, unerase = rerased.new_erasing_pair("tuple")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def wrap(self, unwrapped):
+        return unwrapped
+
+    def unwrap(self, wrapped):
+        return wrapped
+
+    def is_correct_type(self, w_obj):
+        return is_int_or_bytes_tuple(w_obj)
+
+    def get_empty_storage(self):
+        res = r_dict(int_or_bytes_tuple_eq, int_or_bytes_tuple_hash,
+                     force_non_null=True, simple_hash_eq=True)
+        return self.erase(res)
+
     def _never_equal_to(self, w_lookup_type):
         space = self.space
         # XXX there are many more types
-        return (space.is_w(w_lookup_type, space.w_NoneType) or
+        return (_never_equal_to_string(space, w_lookup_type) or
                 space.is_w(w_lookup_type, space.w_bytes) or
-                space.is_w(w_lookup_type, space.w_unicode)
-                )
+                space.is_w(w_lookup_type, space.w_unicode))
+
+    def w_keys(self, w_dict):
+        return self.space.newlist(self.unerase(w_dict.dstorage).keys())
+
+    def wrapkey(space, key):
+        return key
+
+create_iterator_classes(TupleDictStrategy)
+
+
+# strategies that store the values unboxed too
+
+class AbstractUnboxedValueStrategy(object):
+    """Mixin for the strategies that store ints or floats as values without
+    boxing them, so that e.g. counting with 'd[key] += 1' does not allocate.
+    Storing a value of another type devolves the dict to the strategy that
+    has the same keys, but boxed values (see get_boxed_strategy())."""
+    _mixin_ = True
+
+    # see create_iterator_classes()
+    devolves_values = True
+
+    def get_boxed_strategy(self):
+        raise NotImplementedError("abstract base class")
+
+    def is_correct_value(self, w_value):
+        raise NotImplementedError("abstract base class")
+
+    def unwrap_value(self, w_value):
+        raise NotImplementedError("abstract base class")
+
+    def wrap_value(self, value):
+        raise NotImplementedError("abstract base class")
+
+    def setitem(self, w_dict, w_key, w_value):
+        if self.is_correct_type(w_key):
+            if self.is_correct_value(w_value):
+                d = self.unerase(w_dict.dstorage)
+                d[self.unwrap(w_key)] = self.unwrap_value(w_value)
+                return
+            self.switch_to_boxed_strategy(w_dict)
+        else:
+            self.switch_to_object_strategy(w_dict)
+        w_dict.setitem(w_key, w_value)
+
+    def setdefault(self, w_dict, w_key, w_default):
+        if self.is_correct_type(w_key):
+            d = self.unerase(w_dict.dstorage)
+            key = self.unwrap(w_key)
+            try:
+                value = d[key]
+            except KeyError:
+                if self.is_correct_value(w_default):
+                    d[key] = self.unwrap_value(w_default)
+                    return w_default
+            else:
+                return self.wrap_value(value)
+            self.switch_to_boxed_strategy(w_dict)
+        else:
+            self.switch_to_object_strategy(w_dict)
+        return w_dict.setdefault(w_key, w_default)
+
+    def getitem(self, w_dict, w_key):
+        space = self.space
+        if self.is_correct_type(w_key):
+            d = self.unerase(w_dict.dstorage)
+            try:
+                value = d[self.unwrap(w_key)]
+            except KeyError:
+                return None
+            return self.wrap_value(value)
+        elif self._never_equal_to(space.type(w_key)):
+            return None
+        else:
+            self.switch_to_object_strategy(w_dict)
+            return w_dict.getitem(w_key)
+
+    def values(self, w_dict):
+        return [self.wrap_value(value)
+                for value in self.unerase(w_dict.dstorage).itervalues()]
+
+    def items(self, w_dict):
+        space = self.space
+        d = self.unerase(w_dict.dstorage)
+        return [space.newtuple([self.wrap(key), self.wrap_value(value)])
+                for (key, value) in d.iteritems()]
+
+    def popitem(self, w_dict):
+        key, value = self.unerase(w_dict.dstorage).popitem()
+        return (self.wrap(key), self.wrap_value(value))
+
+    def pop(self, w_dict, w_key, w_default):
+        space = self.space
+        if self.is_correct_type(w_key):
+            d = self.unerase(w_dict.dstorage)
+            try:
+                value = d.pop(self.unwrap(w_key))
+            except KeyError:
+                if w_default is None:
+                    raise KeyError
+                return w_default
+            return self.wrap_value(value)
+        elif self._never_equal_to(space.type(w_key)):
+            if w_default is not None:
+                return w_default
+            raise KeyError
+        else:
+            self.switch_to_object_strategy(w_dict)
+            return w_dict.get_strategy().pop(w_dict, w_key, w_default)
+
+    def switch_to_boxed_strategy(self, w_dict):
+        d = self.unerase(w_dict.dstorage)
+        strategy = self.get_boxed_strategy()
+        d_new = strategy.unerase(strategy.get_empty_storage())
+        for key, value, keyhash in objectmodel.iteritems_with_hash(d):
+            objectmodel.setitem_with_hash(d_new, key, keyhash,
+                                          self.wrap_value(value))
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = strategy.erase(d_new)
+
+    def switch_to_object_strategy(self, w_dict):
+        d = self.unerase(w_dict.dstorage)
+        strategy = self.space.fromcache(ObjectDictStrategy)
+        d_new = strategy.unerase(strategy.get_empty_storage())
+        for key, value in d.iteritems():
+            d_new[self.wrap(key)] = self.wrap_value(value)
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = strategy.erase(d_new)
+
+
+class IntValuesMixin(object):
+    _mixin_ = True
+
+    def is_correct_value(self, w_value):
+        return type(w_value) is W_IntObject
+
+    def unwrap_value(self, w_value):
+        return self.space.int_w(w_value)
+
+    def wrap_value(self, value):
+        return self.space.newint(value)
+
+    def wrapvalue(space, value):
+        return space.newint(value)
+
+
+class FloatValuesMixin(object):
+    _mixin_ = True
+
+    def is_correct_value(self, w_value):
+        return type(w_value) is W_FloatObject
+
+    def unwrap_value(self, w_value):
+        return self.space.float_w(w_value)
+
+    def wrap_value(self, value):
+        return self.space.newfloat(value)
+
+    def wrapvalue(space, value):
+        return space.newfloat(value)
+
+
+class IntIntDictStrategy(IntValuesMixin, AbstractUnboxedValueStrategy,
+                         AbstractTypedStrategy, DictStrategy):
+    erase, unerase = rerased.new_erasing_pair("int-int")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def get_boxed_strategy(self):
+        return self.space.fromcache(IntDictStrategy)
+
+    def wrap(self, unwrapped):
+        return self.space.newint(unwrapped)
+
+    def unwrap(self, wrapped):
+        return self.space.int_w(wrapped)
+
+    def get_empty_storage(self):
+        return self.erase({})
+
+    def is_correct_type(self, w_obj):
+        space = self.space
+        return space.is_w(space.type(w_obj), space.w_int)
+
+    def _never_equal_to(self, w_lookup_type):
+        return _never_equal_to_int(self.space, w_lookup_type)
 
     def listview_int(self, w_dict):
         return self.unerase(w_dict.dstorage).keys()
@@ -1331,7 +1623,153 @@ class IntDictStrategy(AbstractTypedStrategy, DictStrategy):
     def w_keys(self, w_dict):
         return self.space.newlist_int(self.listview_int(w_dict))
 
-create_iterator_classes(IntDictStrategy)
+create_iterator_classes(IntIntDictStrategy)
+
+
+class IntFloatDictStrategy(FloatValuesMixin, AbstractUnboxedValueStrategy,
+                           AbstractTypedStrategy, DictStrategy):
+    erase, unerase = rerased.new_erasing_pair("int-float")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def get_boxed_strategy(self):
+        return self.space.fromcache(IntDictStrategy)
+
+    def wrap(self, unwrapped):
+        return self.space.newint(unwrapped)
+
+    def unwrap(self, wrapped):
+        return self.space.int_w(wrapped)
+
+    def get_empty_storage(self):
+        return self.erase({})
+
+    def is_correct_type(self, w_obj):
+        space = self.space
+        return space.is_w(space.type(w_obj), space.w_int)
+
+    def _never_equal_to(self, w_lookup_type):
+        return _never_equal_to_int(self.space, w_lookup_type)
+
+    def listview_int(self, w_dict):
+        return self.unerase(w_dict.dstorage).keys()
+
+    def wrapkey(space, key):
+        return space.newint(key)
+
+    def w_keys(self, w_dict):
+        return self.space.newlist_int(self.listview_int(w_dict))
+
+create_iterator_classes(IntFloatDictStrategy)
+
+
+class BytesIntDictStrategy(IntValuesMixin, AbstractUnboxedValueStrategy,
+                           AbstractTypedStrategy, DictStrategy):
+    erase, unerase = rerased.new_erasing_pair("bytes-int")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def get_boxed_strategy(self):
+        return self.space.fromcache(BytesDictStrategy)
+
+    def wrap(self, unwrapped):
+        return self.space.newbytes(unwrapped)
+
+    def unwrap(self, wrapped):
+        return self.space.bytes_w(wrapped)
+
+    def is_correct_type(self, w_obj):
+        space = self.space
+        return space.is_w(space.type(w_obj), space.w_bytes)
+
+    def get_empty_storage(self):
+        return self.erase({})
+
+    def _never_equal_to(self, w_lookup_type):
+        return _never_equal_to_string(self.space, w_lookup_type)
+
+    def setitem_str(self, w_dict, key, w_value):
+        assert key is not None
+        if self.is_correct_value(w_value):
+            self.unerase(w_dict.dstorage)[key] = self.unwrap_value(w_value)
+        else:
+            self.switch_to_boxed_strategy(w_dict)
+            w_dict.setitem_str(key, w_value)
+
+    def getitem(self, w_dict, w_key):
+        space = self.space
+        # -- This is called extremely often.  Hack for performance --
+        if type(w_key) is space.StringObjectCls:
+            return self.getitem_str(w_dict, w_key.unwrap(space))
+        # -- End of performance hack --
+        return AbstractUnboxedValueStrategy.getitem(self, w_dict, w_key)
+
+    def getitem_str(self, w_dict, key):
+        assert key is not None
+        d = self.unerase(w_dict.dstorage)
+        try:
+            value = d[key]
+        except KeyError:
+            return None
+        return self.wrap_value(value)
+
+    def listview_bytes(self, w_dict):
+        return self.unerase(w_dict.dstorage).keys()
+
+    def w_keys(self, w_dict):
+        return self.space.newlist_bytes(self.listview_bytes(w_dict))
+
+    def wrapkey(space, key):
+        return space.newbytes(key)
+
+    @jit.look_inside_iff(lambda self, w_dict:
+                         w_dict_unrolling_heuristic(w_dict))
+    def view_as_kwargs(self, w_dict):
+        d = self.unerase(w_dict.dstorage)
+        l = len(d)
+        keys, values = [None] * l, [None] * l
+        i = 0
+        for key, val in d.iteritems():
+            keys[i] = key
+            values[i] = self.wrap_value(val)
+            i += 1
+        return keys, values
+
+create_iterator_classes(BytesIntDictStrategy)
+
+
+class UnicodeIntDictStrategy(IntValuesMixin, AbstractUnboxedValueStrategy,
+                             AbstractTypedStrategy, DictStrategy):
+    erase, unerase = rerased.new_erasing_pair("unicode-int")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def get_boxed_strategy(self):
+        return self.space.fromcache(UnicodeDictStrategy)
+
+    def wrap(self, unwrapped):
+        return unwrapped
+
+    def unwrap(self, wrapped):
+        assert type(wrapped) is self.space.UnicodeObjectCls
+        return wrapped
+
+    def is_correct_type(self, w_obj):
+        space = self.space
+        return type(w_obj) is space.UnicodeObjectCls
+
+    def get_empty_storage(self):
+        res = r_dict(unicode_eq, unicode_hash, force_non_null=True,
+                     simple_hash_eq=True)
+        return self.erase(res)
+
+    def _never_equal_to(self, w_lookup_type):
+        return _never_equal_to_string(self.space, w_lookup_type)
+
+    def wrapkey(space, key):
+        return key
+
+create_iterator_classes(UnicodeIntDictStrategy)
 
 
 def update1(space, w_dict, w_data):
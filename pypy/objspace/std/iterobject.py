@@ -113,7 +113,7 @@ class W_FastUnicodeIterObject(W_AbstractSeqIterObject):
             raise OperationError(space.w_StopIteration, space.w_None)
         start = self.byteindex
         end = w_seq.next_codepoint_pos_dont_look_inside(start)
-        w_res = W_UnicodeObject(w_seq._utf8[start:end], 1)
+        w_res = space.newutf8(w_seq._utf8[start:end], 1)
         self.byteindex = end
         self.index += 1
         return w_res
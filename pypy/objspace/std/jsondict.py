@@ -4,10 +4,18 @@ Somewhat similar to MapDictStrategy, also uses a map.
 """
 
 from rpython.rlib import jit, rerased, objectmodel, debug
+from rpython.tool.sourcetools import func_with_new_name
 
 from pypy.objspace.std.dictmultiobject import (
     UnicodeDictStrategy, DictStrategy,
     create_iterator_classes, W_DictObject)
+from pypy.objspace.std.floatobject import W_FloatObject
+from pypy.objspace.std.intobject import W_IntObject
+from pypy.objspace.std.listobject import ListStrategy, W_ListObject
+
+# lists of at least this many json dicts of the same shape are stored as
+# a table, see JsonDictListStrategy
+JSON_TABLE_MIN_ROWS = 8
 
 
 def from_values_and_jsonmap(space, values_w, jsonmap):
@@ -15,11 +23,15 @@ def from_values_and_jsonmap(space, values_w, jsonmap):
         assert len(values_w) == len(jsonmap.get_keys_in_order())
         assert len(values_w) != 0
     debug.make_sure_not_resized(values_w)
+    strategy = get_jsondict_strategy(space, jsonmap)
+    storage = strategy.erase(values_w)
+    return W_DictObject(space, strategy, storage)
+
+def get_jsondict_strategy(space, jsonmap):
     strategy = jsonmap.strategy_instance
     if strategy is None:
         jsonmap.strategy_instance = strategy = JsonDictStrategy(space, jsonmap)
-    storage = strategy.erase(values_w)
-    return W_DictObject(space, strategy, storage)
+    return strategy
 
 def devolve_jsonmap_dict(w_dict):
     assert isinstance(w_dict, W_DictObject)
@@ -169,3 +181,405 @@ class ZipItemsWithHash(object):
 
 
 create_iterator_classes(JsonDictStrategy)
+
+
+# ____________________________________________________________
+# lists of json dicts of the same shape, stored column by column
+
+class JsonTableBuilder(object):
+    """ Used by the json decoder while the items of an array are all objects
+    with the same jsonmap: their values are stored column by column as
+    they are decoded, without making their dicts. """
+
+    def __init__(self):
+        self.jsonmap = None
+        self.columns = None    # list of JsonColumn, in key order
+        self.length = 0
+
+    def add_row(self, space, jsonmap, values_w, length):
+        """ Add the values_w[:length] of an object with the given jsonmap.
+        Return False if the jsonmap is not the one of the other rows. """
+        if self.jsonmap is None:
+            self.jsonmap = jsonmap
+            self.columns = [make_empty_column(values_w[i])
+                            for i in range(length)]
+        elif jsonmap is not self.jsonmap:
+            return False
+        columns = self.columns
+        assert len(columns) == length
+        for i in range(length):
+            if not columns[i].append(values_w[i]):
+                columns[i] = columns[i].generalize(space)
+                columns[i].append(values_w[i])
+        self.length += 1
+        return True
+
+    def make_dicts(self, space):
+        """ Return the dicts of all the rows, with their own values. """
+        dicts_w = [None] * self.length
+        for row in range(self.length):
+            values_w = [column.getitem(space, row)
+                        for column in self.columns]
+            dicts_w[row] = from_values_and_jsonmap(space, values_w,
+                                                   self.jsonmap)
+        return dicts_w
+
+    def make_list(self, space):
+        table = JsonTable(self.jsonmap, self.columns, self.length)
+        strategy = space.fromcache(JsonDictListStrategy)
+        return W_ListObject.from_storage_and_strategy(
+                space, strategy.erase(table), strategy)
+
+
+class JsonTable(object):
+    """ The storage of a JsonDictListStrategy list: one column per key,
+    one row per dict.  The dicts are only made when somebody asks for
+    them, as JsonRowDictStrategy dicts which read and write their row.
+    The table keeps them from then on, so that their identity is kept,
+    and so that the dicts that stopped using their row (because they got
+    another key, or were cleared, etc.) keep their changes. """
+
+    def __init__(self, jsonmap, columns, length):
+        self.jsonmap = jsonmap
+        self.columns = columns    # list of JsonColumn, in key order
+        self.dicts_w = [None] * length    # the dict of each row, or None
+
+    def length(self):
+        return len(self.dicts_w)
+
+    def getrow(self, space, index):
+        w_dict = self.dicts_w[index]
+        if w_dict is None:
+            strategy = get_jsondict_row_strategy(space, self.jsonmap)
+            storage = strategy.erase(JsonRow(self, index))
+            w_dict = W_DictObject(space, strategy, storage)
+            self.dicts_w[index] = w_dict
+        return w_dict
+
+    def setvalue(self, space, column_index, row, w_value):
+        column = self.columns[column_index]
+        if not column.setitem(row, w_value):
+            column = column.generalize(space)
+            self.columns[column_index] = column
+            column.setitem(row, w_value)
+
+
+class JsonRow(object):
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def getvalue(self, space, column_index):
+        return self.table.columns[column_index].getitem(space, self.index)
+
+    def getvalues(self, space):
+        return [column.getitem(space, self.index)
+                for column in self.table.columns]
+
+
+def make_empty_column(w_value):
+    if type(w_value) is W_IntObject:
+        return IntColumn([])
+    if type(w_value) is W_FloatObject:
+        return FloatColumn([])
+    return ObjectColumn([])
+
+class JsonColumn(object):
+    def getitem(self, space, row):
+        raise NotImplementedError("abstract base class")
+
+    def setitem(self, row, w_value):
+        """ Return False if w_value cannot be stored in this column. """
+        raise NotImplementedError("abstract base class")
+
+    def append(self, w_value):
+        """ Return False if w_value cannot be stored in this column. """
+        raise NotImplementedError("abstract base class")
+
+    def generalize(self, space):
+        raise NotImplementedError("abstract base class")
+
+class ObjectColumn(JsonColumn):
+    def __init__(self, values_w):
+        self.values_w = values_w
+
+    def getitem(self, space, row):
+        return self.values_w[row]
+
+    def setitem(self, row, w_value):
+        self.values_w[row] = w_value
+        return True
+
+    def append(self, w_value):
+        self.values_w.append(w_value)
+        return True
+
+    def generalize(self, space):
+        return self
+
+class IntColumn(JsonColumn):
+    def __init__(self, values):
+        self.values = values
+
+    def getitem(self, space, row):
+        return space.newint(self.values[row])
+
+    def setitem(self, row, w_value):
+        if type(w_value) is not W_IntObject:
+            return False
+        self.values[row] = w_value.intval
+        return True
+
+    def append(self, w_value):
+        if type(w_value) is not W_IntObject:
+            return False
+        self.values.append(w_value.intval)
+        return True
+
+    def generalize(self, space):
+        return ObjectColumn([space.newint(value) for value in self.values])
+
+class FloatColumn(JsonColumn):
+    def __init__(self, values):
+        self.values = values
+
+    def getitem(self, space, row):
+        return space.newfloat(self.values[row])
+
+    def setitem(self, row, w_value):
+        if type(w_value) is not W_FloatObject:
+            return False
+        self.values[row] = w_value.floatval
+        return True
+
+    def append(self, w_value):
+        if type(w_value) is not W_FloatObject:
+            return False
+        self.values.append(w_value.floatval)
+        return True
+
+    def generalize(self, space):
+        return ObjectColumn([space.newfloat(value) for value in self.values])
+
+
+def get_jsondict_row_strategy(space, jsonmap):
+    strategy = jsonmap.row_strategy_instance
+    if strategy is None:
+        jsonmap.row_strategy_instance = strategy = JsonRowDictStrategy(
+            space, jsonmap)
+    return strategy
+
+class JsonRowDictStrategy(DictStrategy):
+    """ The dicts of a JsonDictListStrategy list.  The storage is a JsonRow.
+    Anything else than reading or replacing the value of an existing key
+    turns the dict into a JsonDictStrategy dict with its own values first.
+    """
+    erase, unerase = rerased.new_erasing_pair("jsondict_row")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    _immutable_fields_ = ['jsonmap']
+
+    def __init__(self, space, jsonmap):
+        DictStrategy.__init__(self, space)
+        self.jsonmap = jsonmap
+
+    def wrap(self, w_key):
+        return w_key
+
+    def wrapkey(space, key):
+        return key
+
+    def get_empty_storage(self):
+        raise NotImplementedError("should not be reachable")
+
+    def is_correct_type(self, w_obj):
+        space = self.space
+        return space.is_w(space.type(w_obj), space.w_unicode)
+
+    def _never_equal_to(self, w_lookup_type):
+        return False
+
+    def length(self, w_dict):
+        return len(self.jsonmap.get_keys_in_order())
+
+    def getitem(self, w_dict, w_key):
+        if self.is_correct_type(w_key):
+            return self.getitem_unicode(w_dict, w_key)
+        else:
+            self.switch_to_unicode_strategy(w_dict)
+            return w_dict.getitem(w_key)
+
+    def getitem_unicode(self, w_dict, w_key):
+        row = self.unerase(w_dict.dstorage)
+        if jit.isconstant(w_key):
+            jit.promote(self)
+        index = self.jsonmap.get_index(w_key)
+        if index == -1:
+            return None
+        return row.getvalue(self.space, index)
+
+    def setitem(self, w_dict, w_key, w_value):
+        if self.is_correct_type(w_key):
+            row = self.unerase(w_dict.dstorage)
+            index = self.jsonmap.get_index(w_key)
+            if index != -1:
+                row.table.setvalue(self.space, index, row.index, w_value)
+                return
+        self.switch_to_unicode_strategy(w_dict)
+        w_dict.setitem(w_key, w_value)
+
+    def setdefault(self, w_dict, w_key, w_default):
+        if self.is_correct_type(w_key):
+            w_result = self.getitem_unicode(w_dict, w_key)
+            if w_result is not None:
+                return w_result
+        self.switch_to_unicode_strategy(w_dict)
+        return w_dict.setdefault(w_key, w_default)
+
+    def delitem(self, w_dict, w_key):
+        self.switch_to_unicode_strategy(w_dict)
+        return w_dict.delitem(w_key)
+
+    def popitem(self, w_dict):
+        self.switch_to_unicode_strategy(w_dict)
+        return w_dict.popitem()
+
+    def switch_to_jsondict_strategy(self, w_dict):
+        # the row in the table is not used any more after this.  The
+        # table keeps w_dict, so getrow() keeps returning it with its
+        # changes.  The same is true for the switches done by the
+        # generic code, like clear()
+        values_w = self.unerase(w_dict.dstorage).getvalues(self.space)
+        strategy = get_jsondict_strategy(self.space, self.jsonmap)
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = strategy.erase(values_w)
+        return strategy
+
+    def switch_to_unicode_strategy(self, w_dict):
+        strategy = self.switch_to_jsondict_strategy(w_dict)
+        strategy.switch_to_unicode_strategy(w_dict)
+
+    def w_keys(self, w_dict):
+        return self.space.newlist(self.jsonmap.get_keys_in_order())
+
+    def values(self, w_dict):
+        return self.unerase(w_dict.dstorage).getvalues(self.space)
+
+    def items(self, w_dict):
+        space = self.space
+        values_w = self.unerase(w_dict.dstorage).getvalues(space)
+        res = [None] * len(values_w)
+        for index, w_key in enumerate(self.jsonmap.get_keys_in_order()):
+            res[index] = space.newtuple([w_key, values_w[index]])
+        return res
+
+    def getiterkeys(self, w_dict):
+        return iter(self.jsonmap.get_keys_in_order())
+
+    def getitervalues(self, w_dict):
+        return iter(self.unerase(w_dict.dstorage).getvalues(self.space))
+
+    def getiteritems_with_hash(self, w_dict):
+        values_w = self.unerase(w_dict.dstorage).getvalues(self.space)
+        return ZipItemsWithHash(self.jsonmap.get_keys_in_order(), values_w)
+
+create_iterator_classes(JsonRowDictStrategy)
+
+
+class JsonDictListStrategy(ListStrategy):
+    """ A list of json dicts with the same keys, made by the json decoder.
+    The storage is a JsonTable, which only changes when the dicts in it
+    are made or modified: all the operations that change the list itself
+    switch it to ObjectListStrategy first.  This means that lists can
+    share their JsonTable. """
+    erase, unerase = rerased.new_erasing_pair("jsondict_table")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def init_from_list_w(self, w_list, list_w):
+        raise NotImplementedError
+
+    def clone(self, w_list):
+        return W_ListObject.from_storage_and_strategy(
+                self.space, w_list.lstorage, self)
+
+    def copy_into(self, w_list, w_other):
+        w_other.strategy = self
+        w_other.lstorage = w_list.lstorage
+
+    def getstorage_copy(self, w_list):
+        return w_list.lstorage
+
+    def _resize_hint(self, w_list, hint):
+        assert hint >= 0
+
+    def length(self, w_list):
+        return self.unerase(w_list.lstorage).length()
+
+    def getitem(self, w_list, index):
+        table = self.unerase(w_list.lstorage)
+        length = table.length()
+        if index < 0:
+            index += length
+            if index < 0:
+                raise IndexError
+        elif index >= length:
+            raise IndexError
+        return table.getrow(self.space, index)
+
+    def getitems_copy(self, w_list):
+        table = self.unerase(w_list.lstorage)
+        return [table.getrow(self.space, index)
+                for index in range(table.length())]
+    getitems_fixedsize = func_with_new_name(getitems_copy,
+                                            "getitems_fixedsize")
+    getitems_unroll = getitems_fixedsize
+
+    def getslice(self, w_list, start, stop, step, length):
+        table = self.unerase(w_list.lstorage)
+        items_w = [None] * length
+        for i in range(length):
+            items_w[i] = table.getrow(self.space, start)
+            start += step
+        return W_ListObject(self.space, items_w)
+
+    def append(self, w_list, w_item):
+        w_list.switch_to_object_strategy()
+        w_list.append(w_item)
+
+    def inplace_mul(self, w_list, times):
+        w_list.switch_to_object_strategy()
+        w_list.inplace_mul(times)
+
+    def deleteslice(self, w_list, start, step, slicelength):
+        w_list.switch_to_object_strategy()
+        w_list.deleteslice(start, step, slicelength)
+
+    def pop(self, w_list, index):
+        w_list.switch_to_object_strategy()
+        return w_list.pop(index)
+
+    def setitem(self, w_list, index, w_item):
+        w_list.switch_to_object_strategy()
+        w_list.setitem(index, w_item)
+
+    def setslice(self, w_list, start, step, slicelength, sequence_w):
+        w_list.switch_to_object_strategy()
+        w_list.setslice(start, step, slicelength, sequence_w)
+
+    def insert(self, w_list, index, w_item):
+        w_list.switch_to_object_strategy()
+        w_list.insert(index, w_item)
+
+    def extend(self, w_list, w_any):
+        w_list.switch_to_object_strategy()
+        w_list.extend(w_any)
+
+    def reverse(self, w_list):
+        w_list.switch_to_object_strategy()
+        w_list.reverse()
+
+    def sort(self, w_list, reverse):
+        w_list.switch_to_object_strategy()
+        w_list.descr_sort(self.space, None, None, reverse)
@@ -21,6 +21,8 @@ class EmptyKwargsDictStrategy(EmptyDictStrategy):
         w_dict.set_strategy(strategy)
         w_dict.dstorage = storage
 
+    switch_to_bytes_int_strategy = switch_to_bytes_strategy
+
 
 class KwargsDictStrategy(DictStrategy):
     erase, unerase = rerased.new_erasing_pair("kwargsdict")
@@ -26,6 +26,7 @@ from pypy.interpreter.gateway import (
 from pypy.interpreter.signature import Signature
 from pypy.interpreter.typedef import TypeDef
 from pypy.interpreter.miscutils import StringSort
+from pypy.objspace.std.boolobject import W_BoolObject
 from pypy.objspace.std.bytesobject import W_BytesObject
 from pypy.objspace.std.floatobject import W_FloatObject
 from pypy.objspace.std.intobject import W_IntObject
@@ -39,6 +40,10 @@ from pypy.objspace.std.util import get_positive_index, negate
 
 __all__ = ['W_ListObject', 'make_range_list', 'make_empty_list_with_size']
 
+# lists of at least this many ints that all fit in a byte are stored as
+# a list of chars instead of a list of machine words
+BYTE_LIST_MIN_LENGTH = 16
+
 
 UNROLL_CUTOFF = 5
 
@@ -80,15 +85,28 @@ def get_strategy_from_list_objects(space, list_w, sizehint):
     check_int_or_float = False
 
     if type(w_firstobj) is W_IntObject:
-        # check for all-ints
+        # check for all-ints, and whether they all fit in a byte
+        all_bytes = (len(list_w) >= BYTE_LIST_MIN_LENGTH and
+                     _is_byte(w_firstobj))
         for i in range(1, len(list_w)):
             w_obj = list_w[i]
             if type(w_obj) is not W_IntObject:
                 check_int_or_float = (type(w_obj) is W_FloatObject)
                 break
+            all_bytes = all_bytes and _is_byte(w_obj)
         else:
+            if all_bytes:
+                return space.fromcache(ByteListStrategy)
             return space.fromcache(IntegerListStrategy)
 
+    elif type(w_firstobj) is W_BoolObject:
+        # check for all-bools
+        for i in range(1, len(list_w)):
+            if type(list_w[i]) is not W_BoolObject:
+                break
+        else:
+            return space.fromcache(BoolListStrategy)
+
     elif type(w_firstobj) is W_BytesObject:
         # check for all-strings
         for i in range(1, len(list_w)):
@@ -131,6 +149,10 @@ def get_strategy_from_list_objects(space, list_w, sizehint):
     return space.fromcache(ObjectListStrategy)
 
 
+def _is_byte(w_int):
+    return 0 <= w_int.intval < 256
+
+
 def _get_printable_location(strategy_type, greenkey):
     return 'list__do_extend_from_iterable [%s, %s]' % (
         strategy_type,
@@ -947,6 +969,8 @@ class EmptyListStrategy(ListStrategy):
     def switch_to_correct_strategy(self, w_list, w_item):
         if type(w_item) is W_IntObject:
             strategy = self.space.fromcache(IntegerListStrategy)
+        elif type(w_item) is W_BoolObject:
+            strategy = self.space.fromcache(BoolListStrategy)
         elif type(w_item) is W_BytesObject:
             strategy = self.space.fromcache(BytesListStrategy)
         elif type(w_item) is W_UnicodeObject and w_item.is_ascii():
@@ -1682,7 +1706,8 @@ class IntegerListStrategy(ListStrategy):
     _base_extend_from_list = _extend_from_list
 
     def _extend_from_list(self, w_list, w_other):
-        if isinstance(w_other.strategy, BaseRangeListStrategy):
+        if (isinstance(w_other.strategy, BaseRangeListStrategy) or
+            w_other.strategy is self.space.fromcache(ByteListStrategy)):
             l = self.unerase(w_list.lstorage)
             other = w_other.getitems_int()
             assert other is not None
@@ -1699,7 +1724,8 @@ class IntegerListStrategy(ListStrategy):
     _base_setslice = setslice
 
     def setslice(self, w_list, start, step, slicelength, w_other):
-        if w_other.strategy is self.space.fromcache(RangeListStrategy):
+        if (w_other.strategy is self.space.fromcache(RangeListStrategy) or
+            w_other.strategy is self.space.fromcache(ByteListStrategy)):
             storage = self.erase(w_other.getitems_int())
             w_other = W_ListObject.from_storage_and_strategy(
                     self.space, storage, self)
@@ -1710,6 +1736,23 @@ class IntegerListStrategy(ListStrategy):
                 return
         return self._base_setslice(w_list, start, step, slicelength, w_other)
 
+    _base_mul = mul
+
+    def mul(self, w_list, times):
+        # '[0] * n' and similar: make a byte list if the result is long
+        # enough and all the items fit in a byte
+        l = self.unerase(w_list.lstorage)
+        if (times > 1 and len(l) * min(times, BYTE_LIST_MIN_LENGTH) >=
+                BYTE_LIST_MIN_LENGTH):
+            for intval in l:
+                if not 0 <= intval < 256:
+                    break
+            else:
+                strategy = self.space.fromcache(ByteListStrategy)
+                items = [chr(intval) for intval in l]
+                return W_ListObject.from_storage_and_strategy(
+                    self.space, strategy.erase(items * times), strategy)
+        return self._base_mul(w_list, times)
 
     @staticmethod
     def int_2_float_or_int(w_list):
@@ -1743,6 +1786,129 @@ class IntegerListStrategy(ListStrategy):
         w_list.switch_to_object_strategy()
 
 
+class ByteListStrategy(ListStrategy):
+    """A list of ints in range(256), stored one char per item.  Storing
+    anything else widens it to IntegerListStrategy or ObjectListStrategy.
+    """
+    import_from_mixin(AbstractUnwrappedStrategy)
+
+    _none_value = '\x00'
+
+    def wrap(self, charval):
+        return self.space.newint(ord(charval))
+
+    def unwrap(self, w_int):
+        return chr(self.space.int_w(w_int))
+
+    erase, unerase = rerased.new_erasing_pair("byte")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def is_correct_type(self, w_obj):
+        return type(w_obj) is W_IntObject and _is_byte(w_obj)
+
+    def list_is_correct_type(self, w_list):
+        return w_list.strategy is self.space.fromcache(ByteListStrategy)
+
+    def sort(self, w_list, reverse):
+        # counting sort: equal items are indistinguishable anyway
+        l = self.unerase(w_list.lstorage)
+        counts = [0] * 256
+        for charval in l:
+            counts[ord(charval)] += 1
+        i = 0
+        for value in range(256):
+            if reverse:
+                value = 255 - value
+            for j in range(counts[value]):
+                l[i] = chr(value)
+                i += 1
+
+    def getitems_int(self, w_list):
+        return [ord(charval) for charval in self.unerase(w_list.lstorage)]
+
+    _base_find = find
+
+    def find(self, w_list, w_obj, start, stop):
+        if type(w_obj) is W_IntObject and not _is_byte(w_obj):
+            raise ValueError
+        return self._base_find(w_list, w_obj, start, stop)
+
+    def _widens_to_integer(self, w_other):
+        space = self.space
+        return (isinstance(w_other.strategy, BaseRangeListStrategy) or
+                w_other.strategy is space.fromcache(IntegerListStrategy) or
+                w_other.strategy is space.fromcache(FloatListStrategy) or
+                w_other.strategy is space.fromcache(IntOrFloatListStrategy))
+
+    _base_extend_from_list = _extend_from_list
+
+    def _extend_from_list(self, w_list, w_other):
+        if self._widens_to_integer(w_other):
+            self.switch_to_integer_strategy(w_list)
+            w_list.extend(w_other)
+            return
+        return self._base_extend_from_list(w_list, w_other)
+
+    _base_setslice = setslice
+
+    def setslice(self, w_list, start, step, slicelength, w_other):
+        if self._widens_to_integer(w_other):
+            self.switch_to_integer_strategy(w_list)
+            w_list.setslice(start, step, slicelength, w_other)
+            return
+        return self._base_setslice(w_list, start, step, slicelength, w_other)
+
+    def switch_to_integer_strategy(self, w_list):
+        items = self.getitems_int(w_list)
+        strategy = self.space.fromcache(IntegerListStrategy)
+        w_list.strategy = strategy
+        w_list.lstorage = strategy.erase(items)
+
+    def switch_to_next_strategy(self, w_list, w_sample_item):
+        if (type(w_sample_item) is W_IntObject or
+                type(w_sample_item) is W_FloatObject):
+            # IntegerListStrategy knows what to do with the float
+            self.switch_to_integer_strategy(w_list)
+        else:
+            w_list.switch_to_object_strategy()
+
+
+class BoolListStrategy(ListStrategy):
+    import_from_mixin(AbstractUnwrappedStrategy)
+
+    _none_value = False
+
+    def wrap(self, boolval):
+        return self.space.newbool(boolval)
+
+    def unwrap(self, w_bool):
+        return self.space.is_true(w_bool)
+
+    erase, unerase = rerased.new_erasing_pair("bool")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def is_correct_type(self, w_obj):
+        return type(w_obj) is W_BoolObject
+
+    def list_is_correct_type(self, w_list):
+        return w_list.strategy is self.space.fromcache(BoolListStrategy)
+
+    def sort(self, w_list, reverse):
+        l = self.unerase(w_list.lstorage)
+        falses = 0
+        for boolval in l:
+            if not boolval:
+                falses += 1
+        if reverse:
+            split = len(l) - falses
+        else:
+            split = falses
+        for i in range(len(l)):
+            l[i] = (i >= split) != reverse
+
+
 class FloatListStrategy(ListStrategy):
     import_from_mixin(AbstractUnwrappedStrategy)
 
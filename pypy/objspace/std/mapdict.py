@@ -1,7 +1,8 @@
 import weakref, sys
 
 from rpython.rlib import jit, objectmodel, debug, rerased
-from rpython.rlib.rarithmetic import intmask, r_uint
+from rpython.rlib.longlong2float import longlong2float, float2longlong
+from rpython.rlib.rarithmetic import intmask, r_uint, r_longlong
 
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.objspace.std.dictmultiobject import (
@@ -9,6 +10,8 @@ from pypy.objspace.std.dictmultiobject import (
     BaseValueIterator, BaseItemIterator, _never_equal_to_string,
     W_DictObject, BytesDictStrategy, UnicodeDictStrategy
 )
+from pypy.objspace.std.floatobject import W_FloatObject
+from pypy.objspace.std.intobject import W_IntObject
 from pypy.objspace.std.typeobject import MutableCell
 
 
@@ -29,16 +32,37 @@ NUM_DIGITS_POW2 = 1 << NUM_DIGITS
 # dict)
 LIMIT_MAP_ATTRIBUTES = 80
 
+# the storage kinds of the attributes.  The values of the attributes of
+# kind int or float are not boxed: they are all stored together, as
+# longlongs, in an UnboxedValues that takes a single storage slot.  Like
+# in IntOrFloatListStrategy, floats are stored with float2longlong(); the
+# map tells which kind each value is, so the ints need no tagging
+KIND_OBJECT = 0
+KIND_INT = 1
+KIND_FLOAT = 2
+
+def _get_storage_kind(index, w_value):
+    if index == SPECIAL:
+        return KIND_OBJECT
+    if type(w_value) is W_IntObject:
+        return KIND_INT
+    if type(w_value) is W_FloatObject:
+        return KIND_FLOAT
+    return KIND_OBJECT
+
 
 class AbstractAttribute(object):
-    _immutable_fields_ = ['terminator']
+    _immutable_fields_ = ['terminator', 'cache_attrs_version?']
     cache_attrs = None
+    devolved_maps = None
     _size_estimate = 0
 
     def __init__(self, space, terminator):
         self.space = space
         assert isinstance(terminator, Terminator)
         self.terminator = terminator
+        # changed when an attribute in 'cache_attrs' is replaced
+        self.cache_attrs_version = 0
 
     def read(self, obj, name, index):
         attr = self.find_map_attr(name, index)
@@ -49,9 +73,11 @@ class AbstractAttribute(object):
             jit.isconstant(obj) and
             not attr.ever_mutated
         ):
+            if isinstance(attr, UnboxedPlainAttribute):
+                return attr._pure_direct_read(obj)
             return self._pure_mapdict_read_storage(obj, attr.storageindex)
         else:
-            return obj._mapdict_read_storage(attr.storageindex)
+            return attr._direct_read(obj)
 
     @jit.elidable
     def _pure_mapdict_read_storage(self, obj, storageindex):
@@ -63,7 +89,7 @@ class AbstractAttribute(object):
             return self.terminator._write_terminator(obj, name, index, w_value)
         if not attr.ever_mutated:
             attr.ever_mutated = True
-        obj._mapdict_write_storage(attr.storageindex, w_value)
+        attr._direct_write(obj, w_value)
         return True
 
     def delete(self, obj, name, index):
@@ -120,6 +146,11 @@ class AbstractAttribute(object):
     def length(self):
         raise NotImplementedError("abstract base class")
 
+    def num_attributes(self):
+        # the number of attributes, which can be more than self.length():
+        # all the unboxed attributes share a single storage slot
+        raise NotImplementedError("abstract base class")
+
     def get_terminator(self):
         return self.terminator
 
@@ -133,17 +164,69 @@ class AbstractAttribute(object):
     def search(self, attrtype):
         return None
 
+    def _get_new_attr(self, name, index, kind):
+        attr = self._pure_get_new_attr(name, index, kind,
+                                       self.cache_attrs_version)
+        if attr.kind != KIND_OBJECT and attr.kind != kind:
+            attr = self._replace_with_boxed_attr(attr)
+        return attr
+
     @jit.elidable
-    def _get_new_attr(self, name, index):
+    def _pure_get_new_attr(self, name, index, kind, version):
         cache = self.cache_attrs
         if cache is None:
             cache = self.cache_attrs = {}
         attr = cache.get((name, index), None)
         if attr is None:
-            attr = PlainAttribute(name, index, self)
+            if kind == KIND_OBJECT:
+                attr = PlainAttribute(name, index, self)
+            else:
+                attr = UnboxedPlainAttribute(name, index, self, kind)
             cache[name, index] = attr
         return attr
 
+    @jit.dont_look_inside
+    def _replace_with_boxed_attr(self, attr):
+        # the attribute got values of different types: from now on, the
+        # new objects store it boxed.  The objects that use 'attr' keep
+        # doing so until they get a value of the wrong type, see
+        # UnboxedPlainAttribute._devolve()
+        key = (attr.name, attr.index)
+        new_attr = self.cache_attrs.get(key, None)
+        if new_attr is attr:
+            new_attr = PlainAttribute(attr.name, attr.index, self)
+            new_attr.order = attr.order
+            self.cache_attrs[key] = new_attr
+            # invalidates the results of _pure_get_new_attr() in traces
+            self.cache_attrs_version += 1
+        return new_attr
+
+    def _get_devolved_map(self, attr):
+        # the map that the objects with this map move to when 'attr', an
+        # unboxed attribute of the chain, gets a value of another type
+        key = (attr.name, attr.index)
+        devolved_maps = self.devolved_maps
+        if devolved_maps is None:
+            devolved_maps = self.devolved_maps = {}
+        new_map = devolved_maps.get(key, None)
+        if new_map is None:
+            new_map = self._make_devolved_map(attr)
+            devolved_maps[key] = new_map
+        return new_map
+
+    def _make_devolved_map(self, attr):
+        raise NotImplementedError("abstract base class")
+
+    def _devolves_into(self, map):
+        # True if objects with this map can have moved to 'map' by
+        # devolving one or more of their unboxed attributes
+        if self.devolved_maps is None:
+            return False
+        for new_map in self.devolved_maps.values():
+            if new_map is map or new_map._devolves_into(map):
+                return True
+        return False
+
     def add_attr(self, obj, name, index, w_value):
         self._reorder_and_add(obj, name, index, w_value)
         if not jit.we_are_jitted():
@@ -155,7 +238,8 @@ class AbstractAttribute(object):
             oldattr._size_estimate = size_est
 
     def _add_attr_without_reordering(self, obj, name, index, w_value):
-        attr = self._get_new_attr(name, index)
+        kind = _get_storage_kind(index, w_value)
+        attr = self._get_new_attr(name, index, kind)
         attr._switch_map_and_write_storage(obj, w_value)
 
     @jit.unroll_safe
@@ -170,13 +254,17 @@ class AbstractAttribute(object):
         # the order is important here: first change the map, then the storage,
         # for the benefit of the special subclasses
         obj._set_mapdict_map(self)
+        self._init_and_write_storage(obj, w_value)
+
+    def _init_and_write_storage(self, obj, w_value):
         obj._mapdict_write_storage(self.storageindex, w_value)
 
 
     @jit.elidable
     def _find_branch_to_move_into(self, name, index):
         # walk up the map chain to find an ancestor with lower order that
-        # already has the current name as a child inserted
+        # already has the current name as a child inserted.  Returns it
+        # with the number of attributes to re-add, or (0, self)
         current_order = sys.maxint
         number_to_readd = 0
         current = self
@@ -189,10 +277,10 @@ class AbstractAttribute(object):
                 # we reached the top, so we didn't find it anywhere,
                 # just add it to the top attribute
                 if not isinstance(current, PlainAttribute):
-                    return 0, self._get_new_attr(name, index)
+                    return 0, self
 
             else:
-                return number_to_readd, attr
+                return number_to_readd, current
             # if not found try parent
             number_to_readd += 1
             current_order = current.order
@@ -226,17 +314,19 @@ class AbstractAttribute(object):
         stack_index = 0
         while True:
             current = self
-            number_to_readd, attr = self._find_branch_to_move_into(name, index)
+            number_to_readd, branch = self._find_branch_to_move_into(name,
+                                                                     index)
+            kind = _get_storage_kind(index, w_value)
+            attr = branch._get_new_attr(name, index, kind)
             # we found the attributes further up, need to save the
             # previous values of the attributes we passed
             if number_to_readd:
                 if stack is None:
-                    stack = [erase_map(None)] * (self.length() * 2)
+                    stack = [erase_map(None)] * (self.num_attributes() * 2)
                 current = self
                 for i in range(number_to_readd):
                     assert isinstance(current, PlainAttribute)
-                    w_self_value = obj._mapdict_read_storage(
-                            current.storageindex)
+                    w_self_value = current._direct_read(obj)
                     stack[stack_index] = erase_map(current)
                     stack[stack_index + 1] = erase_item(w_self_value)
                     stack_index += 2
@@ -279,7 +369,8 @@ class Terminator(AbstractAttribute):
 
     def _write_terminator(self, obj, name, index, w_value):
         obj._get_mapdict_map().add_attr(obj, name, index, w_value)
-        if index == DICT and obj._get_mapdict_map().length() >= LIMIT_MAP_ATTRIBUTES:
+        map = obj._get_mapdict_map()
+        if index == DICT and map.num_attributes() >= LIMIT_MAP_ATTRIBUTES:
             space = self.space
             w_dict = obj.getdict(space)
             assert isinstance(w_dict, W_DictMultiObject)
@@ -297,6 +388,9 @@ class Terminator(AbstractAttribute):
     def length(self):
         return 0
 
+    def num_attributes(self):
+        return 0
+
     def set_terminator(self, obj, terminator):
         result = Object()
         result.space = self.space
@@ -374,7 +468,8 @@ class DevolvedDictTerminator(Terminator):
         return Terminator.set_terminator(self, obj, terminator)
 
 class PlainAttribute(AbstractAttribute):
-    _immutable_fields_ = ['name', 'index', 'storageindex', 'back', 'ever_mutated?', 'order']
+    _immutable_fields_ = ['name', 'index', 'storageindex', 'back', 'ever_mutated?', 'order', 'kind',
+                          '_num_attributes']
 
     def __init__(self, name, index, back):
         AbstractAttribute.__init__(self, back.space, back.terminator)
@@ -382,9 +477,17 @@ class PlainAttribute(AbstractAttribute):
         self.index = index
         self.storageindex = back.length()
         self.back = back
+        self._num_attributes = back.num_attributes() + 1
         self._size_estimate = self.length() * NUM_DIGITS_POW2
         self.ever_mutated = False
         self.order = len(back.cache_attrs) if back.cache_attrs else 0
+        self.kind = KIND_OBJECT
+
+    def _direct_read(self, obj):
+        return obj._mapdict_read_storage(self.storageindex)
+
+    def _direct_write(self, obj, w_value):
+        obj._mapdict_write_storage(self.storageindex, w_value)
 
     def _copy_attr(self, obj, new_obj):
         w_value = self.read(obj, self.name, self.index)
@@ -409,6 +512,9 @@ class PlainAttribute(AbstractAttribute):
     def length(self):
         return self.storageindex + 1
 
+    def num_attributes(self):
+        return self._num_attributes
+
     def set_terminator(self, obj, terminator):
         new_obj = self.back.set_terminator(obj, terminator)
         self._copy_attr(obj, new_obj)
@@ -423,7 +529,7 @@ class PlainAttribute(AbstractAttribute):
         new_obj = self.back.materialize_r_dict(space, obj, dict_w)
         if self.index == DICT:
             w_attr = space.newtext(self.name)
-            dict_w[w_attr] = obj._mapdict_read_storage(self.storageindex)
+            dict_w[w_attr] = self._direct_read(obj)
         else:
             self._copy_attr(obj, new_obj)
         return new_obj
@@ -431,7 +537,7 @@ class PlainAttribute(AbstractAttribute):
     def materialize_str_dict(self, space, obj, str_dict):
         new_obj = self.back.materialize_str_dict(space, obj, str_dict)
         if self.index == DICT:
-            str_dict[self.name] = obj._mapdict_read_storage(self.storageindex)
+            str_dict[self.name] = self._direct_read(obj)
         else:
             self._copy_attr(obj, new_obj)
         return new_obj
@@ -442,9 +548,139 @@ class PlainAttribute(AbstractAttribute):
             self._copy_attr(obj, new_obj)
         return new_obj
 
+    def _make_devolved_map(self, attr):
+        if self is attr:
+            return self.back._replace_with_boxed_attr(self)
+        back = self.back._make_devolved_map(attr)
+        return back._get_new_attr(self.name, self.index, self.kind)
+
     def __repr__(self):
         return "<PlainAttribute %s %s %s %r>" % (self.name, self.index, self.storageindex, self.back)
 
+def _attrs_from_root(map):
+    attrs = []
+    while isinstance(map, PlainAttribute):
+        attrs.append(map)
+        map = map.back
+    attrs.reverse()
+    return attrs
+
+class UnboxedValues(W_Root):
+    """The values of the attributes of kind int or float of an object,
+    stored as longlongs.  It takes the storage slot of the first of these
+    attributes, and is never seen by app-level code."""
+
+    def __init__(self, size):
+        self.values = [r_longlong(0)] * size
+
+def _read_unboxed(obj, storageindex, listindex, kind):
+    unboxed = obj._mapdict_read_storage(storageindex)
+    assert isinstance(unboxed, UnboxedValues)
+    value = unboxed.values[listindex]
+    if kind == KIND_INT:
+        return W_IntObject(intmask(value))
+    return W_FloatObject(longlong2float(value))
+
+def _last_unboxed_attr(attr):
+    while isinstance(attr, PlainAttribute):
+        if isinstance(attr, UnboxedPlainAttribute):
+            return attr
+        attr = attr.back
+    return None
+
+class UnboxedPlainAttribute(PlainAttribute):
+    """An attribute that so far only had values of the same kind, int or
+    float, which are stored unboxed.  All the unboxed attributes of a map
+    share the same storage slot: 'listindex' is the position in it."""
+    _immutable_fields_ = ['listindex', 'first_unboxed',
+                          'unboxed_size_estimate?', '_length']
+
+    def __init__(self, name, index, back, kind):
+        self._length = back.length() + 1     # for PlainAttribute.__init__
+        PlainAttribute.__init__(self, name, index, back)
+        self.kind = kind
+        prev = _last_unboxed_attr(back)
+        if prev is None:
+            # takes a new storage slot
+            self.listindex = 0
+            self.first_unboxed = self
+            self.unboxed_size_estimate = 1
+            self._length = self.storageindex + 1
+        else:
+            self.storageindex = prev.storageindex
+            self.listindex = prev.listindex + 1
+            self.first_unboxed = first = prev.first_unboxed
+            if first.unboxed_size_estimate <= self.listindex:
+                first.unboxed_size_estimate = self.listindex + 1
+            self._length = back.length()
+        self._size_estimate = self._length * NUM_DIGITS_POW2
+
+    def length(self):
+        return self._length
+
+    def _get_unboxed_values(self, obj):
+        unboxed = obj._mapdict_read_storage(self.storageindex)
+        assert isinstance(unboxed, UnboxedValues)
+        return unboxed
+
+    def _direct_read(self, obj):
+        return _read_unboxed(obj, self.storageindex, self.listindex, self.kind)
+
+    @jit.elidable
+    def _pure_direct_read(self, obj):
+        return self._direct_read(obj)
+
+    def _direct_write(self, obj, w_value):
+        if self.kind == KIND_INT:
+            if type(w_value) is W_IntObject:
+                value = r_longlong(w_value.intval)
+                self._get_unboxed_values(obj).values[self.listindex] = value
+                return
+        elif type(w_value) is W_FloatObject:
+            value = float2longlong(w_value.floatval)
+            self._get_unboxed_values(obj).values[self.listindex] = value
+            return
+        self._devolve(obj, w_value)
+
+    def _init_and_write_storage(self, obj, w_value):
+        size = self.first_unboxed.unboxed_size_estimate
+        if self.listindex == 0:
+            obj._mapdict_write_storage(self.storageindex, UnboxedValues(size))
+        else:
+            unboxed = self._get_unboxed_values(obj)
+            if self.listindex >= len(unboxed.values):
+                values = [r_longlong(0)] * max(size, self.listindex + 1)
+                for i in range(len(unboxed.values)):
+                    values[i] = unboxed.values[i]
+                unboxed.values = values
+        self._direct_write(obj, w_value)
+
+    @jit.dont_look_inside
+    def _devolve(self, obj, w_value):
+        # 'w_value' is of another type: store this attribute boxed, in
+        # 'obj' and in the objects that get this attribute from now on.
+        # All the objects with the same map move to the same new map,
+        # which has the same attributes in the same order
+        map = obj._get_mapdict_map()
+        new_map = map._get_devolved_map(self)
+        old_attrs = _attrs_from_root(map)
+        new_attrs = _attrs_from_root(new_map)
+        assert len(old_attrs) == len(new_attrs)
+        new_obj = map.terminator.copy(obj)
+        for i in range(len(new_attrs)):
+            old_attr = old_attrs[i]
+            if old_attr is self:
+                w_attr_value = w_value
+            else:
+                w_attr_value = old_attr._direct_read(obj)
+            new_attrs[i]._switch_map_and_write_storage(new_obj, w_attr_value)
+        obj._set_mapdict_storage_and_map(new_obj.storage, new_obj.map)
+
+    def __repr__(self):
+        return "<UnboxedPlainAttribute %s %s %s %s %s %r>" % (
+            self.name, self.index, self.kind, self.storageindex,
+            self.listindex, self.back)
+
 class MapAttrCache(object):
     def __init__(self, space):
         SIZE = 1 << space.config.objspace.std.methodcachesizeexp
@@ -907,6 +1143,17 @@ class IteratorMixin(object):
             curr_map = curr_map.back
         self.attrs = attrs
 
+    def _same_map(self):
+        curr_map = self.w_obj._get_mapdict_map()
+        if self.orig_map is curr_map:
+            return True
+        # devolving an unboxed attribute moves the object to a map with
+        # the same keys in the same order: the iteration can go on
+        if self.orig_map._devolves_into(curr_map):
+            self.orig_map = curr_map
+            return True
+        return False
+
 
 class MapDictIteratorKeys(BaseKeyIterator):
     objectmodel.import_from_mixin(IteratorMixin)
@@ -917,7 +1164,7 @@ class MapDictIteratorKeys(BaseKeyIterator):
 
     def next_key_entry(self):
         assert isinstance(self.w_dict.get_strategy(), MapDictStrategy)
-        if self.orig_map is not self.w_obj._get_mapdict_map():
+        if not self._same_map():
             return None
         attrs = self.attrs
         if len(attrs) > 0:
@@ -936,7 +1183,7 @@ class MapDictIteratorValues(BaseValueIterator):
 
     def next_value_entry(self):
         assert isinstance(self.w_dict.get_strategy(), MapDictStrategy)
-        if self.orig_map is not self.w_obj._get_mapdict_map():
+        if not self._same_map():
             return None
         attrs = self.attrs
         if len(attrs) > 0:
@@ -954,7 +1201,7 @@ class MapDictIteratorItems(BaseItemIterator):
 
     def next_item_entry(self):
         assert isinstance(self.w_dict.get_strategy(), MapDictStrategy)
-        if self.orig_map is not self.w_obj._get_mapdict_map():
+        if not self._same_map():
             return None, None
         attrs = self.attrs
         if len(attrs) > 0:
@@ -966,11 +1213,22 @@ class MapDictIteratorItems(BaseItemIterator):
 
 # ____________________________________________________________
 # Magic caching
+#
+# Every name of a code object has a small polymorphic inline cache used
+# by LOAD_ATTR and LOOKUP_METHOD: a chain of at most MAX_CACHE_ENTRIES
+# CacheEntries, linked with 'next', for different maps.  This way code
+# that sees instances of a few different classes, or both loads and
+# calls the same attribute, doesn't keep refilling a single entry.
+
+MAX_CACHE_ENTRIES = 4
 
 class CacheEntry(object):
     version_tag = None
     storageindex = 0
+    kind = KIND_OBJECT
+    listindex = 0
     w_method = None # for callmethod
+    next = None
     success_counter = 0
     failure_counter = 0
 
@@ -1001,29 +1259,72 @@ def init_mapdict_cache(pycode):
     num_entries = len(pycode.co_names_w)
     pycode._mapdict_caches = [INVALID_CACHE_ENTRY] * num_entries
 
+def _get_entry_to_fill(pycode, nameindex, map, is_method):
+    # reuse the entry for the same map and the same kind of lookup, whose
+    # version_tag is out of date, or an entry whose map was freed.
+    # Otherwise add a new entry in front, or reuse the last one if there
+    # are already MAX_CACHE_ENTRIES.
+    first = pycode._mapdict_caches[nameindex]
+    if first is INVALID_CACHE_ENTRY:
+        entry = CacheEntry()
+        pycode._mapdict_caches[nameindex] = entry
+        return entry
+    entry = first
+    length = 1
+    while True:
+        mymap = entry.map_wref()
+        if mymap is None:
+            return entry
+        if mymap is map and (entry.w_method is not None) == is_method:
+            return entry
+        if entry.next is None:
+            break
+        entry = entry.next
+        length += 1
+    if length < MAX_CACHE_ENTRIES:
+        entry = CacheEntry()
+        entry.next = first
+        pycode._mapdict_caches[nameindex] = entry
+    return entry
+
 @jit.dont_look_inside
-def _fill_cache(pycode, nameindex, map, version_tag, storageindex, w_method=None):
+def _fill_cache(pycode, nameindex, map, version_tag, storageindex, w_method=None,
+                kind=KIND_OBJECT, listindex=0):
     if not pycode.space._side_effects_ok():
         return
-    entry = pycode._mapdict_caches[nameindex]
-    if entry is INVALID_CACHE_ENTRY:
-        entry = CacheEntry()
-        pycode._mapdict_caches[nameindex] = entry
+    entry = _get_entry_to_fill(pycode, nameindex, map, w_method is not None)
     entry.map_wref = weakref.ref(map)
     entry.version_tag = version_tag
     entry.storageindex = storageindex
+    entry.kind = kind
+    entry.listindex = listindex
     entry.w_method = w_method
     if pycode.space.config.objspace.std.withmethodcachecounter:
         entry.failure_counter += 1
 
+def _count_cache_hit(pycode, nameindex):
+    # counted together with the hits of MapAttrCache, for
+    # __pypy__.mapdict_cache_counter()
+    space = pycode.space
+    name = space.text_w(pycode.co_names_w[nameindex])
+    cache = space.fromcache(MapAttrCache)
+    cache.hits[name] = cache.hits.get(name, 0) + 1
+
 def LOAD_ATTR_caching(pycode, w_obj, nameindex):
     # this whole mess is to make the interpreter quite a bit faster; it's not
     # used if we_are_jitted().
     entry = pycode._mapdict_caches[nameindex]
     map = w_obj._get_mapdict_map()
-    if entry.is_valid_for_map(map) and entry.w_method is None:
-        # everything matches, it's incredibly fast
-        return w_obj._mapdict_read_storage(entry.storageindex)
+    while entry is not None:
+        if entry.is_valid_for_map(map) and entry.w_method is None:
+            # everything matches, it's incredibly fast
+            if pycode.space.config.objspace.std.withmethodcachecounter:
+                _count_cache_hit(pycode, nameindex)
+            if entry.kind == KIND_OBJECT:
+                return w_obj._mapdict_read_storage(entry.storageindex)
+            return _read_unboxed(w_obj, entry.storageindex, entry.listindex,
+                                 entry.kind)
+        entry = entry.next
     return LOAD_ATTR_slowpath(pycode, w_obj, nameindex, map)
 LOAD_ATTR_caching._always_inline_ = True
 
@@ -1069,8 +1370,14 @@ def LOAD_ATTR_slowpath(pycode, w_obj, nameindex, map):
                     # Note that if map.terminator is a DevolvedDictTerminator
                     # or the class provides its own dict, not using mapdict, then:
                     # map.find_map_attr will always return None if index==DICT.
-                    _fill_cache(pycode, nameindex, map, version_tag, attr.storageindex)
-                    return w_obj._mapdict_read_storage(attr.storageindex)
+                    if isinstance(attr, UnboxedPlainAttribute):
+                        _fill_cache(pycode, nameindex, map, version_tag,
+                                    attr.storageindex, kind=attr.kind,
+                                    listindex=attr.listindex)
+                    else:
+                        _fill_cache(pycode, nameindex, map, version_tag,
+                                    attr.storageindex)
+                    return attr._direct_read(w_obj)
     if space.config.objspace.std.withmethodcachecounter:
         INVALID_CACHE_ENTRY.failure_counter += 1
     return space.getattr(w_obj, w_name)
@@ -1079,12 +1386,17 @@ LOAD_ATTR_slowpath._dont_inline_ = True
 def LOOKUP_METHOD_mapdict(f, nameindex, w_obj):
     pycode = f.getcode()
     entry = pycode._mapdict_caches[nameindex]
-    if entry.is_valid_for_obj(w_obj):
-        w_method = entry.w_method
-        if w_method is not None:
-            f.pushvalue(w_method)
-            f.pushvalue(w_obj)
-            return True
+    map = w_obj._get_mapdict_map()
+    while entry is not None:
+        if entry.is_valid_for_map(map):
+            w_method = entry.w_method
+            if w_method is not None:
+                if pycode.space.config.objspace.std.withmethodcachecounter:
+                    _count_cache_hit(pycode, nameindex)
+                f.pushvalue(w_method)
+                f.pushvalue(w_obj)
+                return True
+        entry = entry.next
     return False
 
 def LOOKUP_METHOD_mapdict_fill_cache_method(space, pycode, name, nameindex,
@@ -1104,7 +1416,3 @@ def LOOKUP_METHOD_mapdict_fill_cache_method(space, pycode, name, nameindex,
     if map is None or isinstance(map.terminator, DevolvedDictTerminator):
         return
     _fill_cache(pycode, nameindex, map, version_tag, -1, w_method)
-
-# XXX fix me: if a function contains a loop with both LOAD_ATTR and
-# XXX LOOKUP_METHOD on the same attribute name, it keeps trashing and
-# XXX rebuilding the cache
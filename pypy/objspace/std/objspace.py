@@ -16,7 +16,8 @@ from pypy.objspace.std.basestringtype import basestring_typedef
 from pypy.objspace.std.boolobject import W_BoolObject
 from pypy.objspace.std.bufferobject import W_Buffer
 from pypy.objspace.std.bytearrayobject import W_BytearrayObject
-from pypy.objspace.std.bytesobject import W_BytesObject
+from pypy.objspace.std.bytesobject import (
+    W_BytesObject, setup_prebuilt_chars)
 from pypy.objspace.std.complexobject import W_ComplexObject
 from pypy.objspace.std.dictmultiobject import W_DictMultiObject, W_DictObject
 from pypy.objspace.std.floatobject import W_FloatObject
@@ -48,6 +49,7 @@ class StdObjSpace(ObjSpace):
         """
 
         setup_prebuilt(self)
+        setup_prebuilt_chars(self)
         self.FrameClass = frame.build_frame(self)
         self.StringObjectCls = W_BytesObject
         self.UnicodeObjectCls = W_UnicodeObject
@@ -353,11 +355,13 @@ class StdObjSpace(ObjSpace):
 
     def newbytes(self, s):
         assert isinstance(s, str)
+        if self.config.objspace.std.withprebuiltchar and len(s) == 1:
+            return W_BytesObject.PREBUILT[ord(s[0])]
         return W_BytesObject(s)
 
     def newtext(self, s):
         assert isinstance(s, str)
-        return W_BytesObject(s) # Python3 this is unicode
+        return self.newbytes(s) # Python3 this is unicode
 
     def newtext_or_none(self, s):
         if s is None:
@@ -367,6 +371,8 @@ class StdObjSpace(ObjSpace):
     def newutf8(self, utf8s, length):
         assert utf8s is not None
         assert isinstance(utf8s, str)
+        if self.config.objspace.std.withprebuiltchar and len(utf8s) == 1:
+            return W_UnicodeObject.PREBUILT[ord(utf8s[0])]
         return W_UnicodeObject(utf8s, length)
 
     def newfilename(self, s):
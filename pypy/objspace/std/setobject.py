@@ -5,13 +5,15 @@ from pypy.interpreter.signature import Signature
 from pypy.interpreter.typedef import TypeDef
 from pypy.objspace.std.bytesobject import W_BytesObject
 from pypy.objspace.std.intobject import W_IntObject
+from pypy.objspace.std.tupleobject import (is_int_or_bytes_tuple,
+    int_or_bytes_tuple_eq, int_or_bytes_tuple_hash)
 from pypy.objspace.std.unicodeobject import W_UnicodeObject
 from pypy.objspace.std.util import IDTAG_SPECIAL, IDTAG_SHIFT
 
-from rpython.rlib.objectmodel import r_dict
+from rpython.rlib.objectmodel import r_dict, specialize
 from rpython.rlib.objectmodel import iterkeys_with_hash, contains_with_hash
 from rpython.rlib.objectmodel import setitem_with_hash, delitem_with_hash
-from rpython.rlib.rarithmetic import intmask, r_uint
+from rpython.rlib.rarithmetic import intmask, r_uint, LONG_BIT, LONG_BIT_SHIFT
 from rpython.rlib import rerased, jit, rutf8
 
 
@@ -830,6 +832,8 @@ class EmptySetStrategy(SetStrategy):
             strategy = self.space.fromcache(BytesSetStrategy)
         elif type(w_key) is W_UnicodeObject and w_key.is_ascii():
             strategy = self.space.fromcache(AsciiSetStrategy)
+        elif is_int_or_bytes_tuple(w_key):
+            strategy = self.space.fromcache(TupleSetStrategy)
         elif self.space.type(w_key).compares_by_identity():
             strategy = self.space.fromcache(IdentitySetStrategy)
         else:
@@ -909,6 +913,11 @@ class AbstractUnwrappedSetStrategy(object):
         """ Returns a wrapped version of the given unwrapped item. """
         raise NotImplementedError
 
+    def convert_other(self, w_other):
+        """ Returns w_other, or a copy of it with this strategy if it
+        stores the same kind of items in another way."""
+        return w_other
+
     @jit.look_inside_iff(lambda self, list_w:
             jit.loop_unrolling_heuristic(list_w, len(list_w), UNROLL_CUTOFF))
     def get_storage_from_list(self, list_w):
@@ -992,6 +1001,7 @@ class AbstractUnwrappedSetStrategy(object):
             return False
         if w_set.length() == 0:
             return True
+        w_other = self.convert_other(w_other)
         # it's possible to have 0-length strategy that's not empty
         if w_set.strategy is w_other.strategy:
             return self._issubset_unwrapped(w_set, w_other)
@@ -1022,6 +1032,7 @@ class AbstractUnwrappedSetStrategy(object):
         return self.erase(result_dict)
 
     def _difference_base(self, w_set, w_other):
+        w_other = self.convert_other(w_other)
         if self is w_other.strategy:
             storage = self._difference_unwrapped(w_set, w_other)
         elif not w_set.strategy.may_contain_equal_elements(w_other.strategy):
@@ -1057,6 +1068,7 @@ class AbstractUnwrappedSetStrategy(object):
             w_set.remove(w_item)
 
     def difference_update(self, w_set, w_other):
+        w_other = self.convert_other(w_other)
         if self.length(w_set) < w_other.strategy.length(w_other):
             # small_set -= big_set: compute the difference as a new set
             storage = self._difference_base(w_set, w_other)
@@ -1101,6 +1113,7 @@ class AbstractUnwrappedSetStrategy(object):
         return strategy.erase(newsetdata)
 
     def _symmetric_difference_base(self, w_set, w_other):
+        w_other = self.convert_other(w_other)
         if self is w_other.strategy:
             strategy = w_set.strategy
             storage = self._symmetric_difference_unwrapped(w_set, w_other)
@@ -1123,6 +1136,7 @@ class AbstractUnwrappedSetStrategy(object):
         w_set.sstorage = storage
 
     def _intersect_base(self, w_set, w_other):
+        w_other = self.convert_other(w_other)
         if self is w_other.strategy:
             strategy = self
             if w_set.length() > w_other.length():
@@ -1195,6 +1209,7 @@ class AbstractUnwrappedSetStrategy(object):
         if w_set.length() == 0:
             return True
 
+        w_other = self.convert_other(w_other)
         if w_set.strategy is w_other.strategy:
             return self._issubset_unwrapped(w_set, w_other)
         elif not w_set.strategy.may_contain_equal_elements(w_other.strategy):
@@ -1223,6 +1238,7 @@ class AbstractUnwrappedSetStrategy(object):
         if w_set.length() > w_other.length():
             return w_other.isdisjoint(w_set)
 
+        w_other = self.convert_other(w_other)
         if w_set.strategy is w_other.strategy:
             return self._isdisjoint_unwrapped(w_set, w_other)
         elif not w_set.strategy.may_contain_equal_elements(w_other.strategy):
@@ -1231,6 +1247,7 @@ class AbstractUnwrappedSetStrategy(object):
             return self._isdisjoint_wrapped(w_set, w_other)
 
     def update(self, w_set, w_other):
+        w_other = self.convert_other(w_other)
         if self is w_other.strategy:
             d_set = self.unerase(w_set.sstorage)
             d_other = self.unerase(w_other.sstorage)
@@ -1275,10 +1292,14 @@ class BytesSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     def may_contain_equal_elements(self, strategy):
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        elif strategy is self.space.fromcache(BitmapSetStrategy):
+            return False
         elif strategy is self.space.fromcache(EmptySetStrategy):
             return False
         elif strategy is self.space.fromcache(IdentitySetStrategy):
             return False
+        elif strategy is self.space.fromcache(TupleSetStrategy):
+            return False
         return True
 
     def unwrap(self, w_item):
@@ -1314,10 +1335,14 @@ class AsciiSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     def may_contain_equal_elements(self, strategy):
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        elif strategy is self.space.fromcache(BitmapSetStrategy):
+            return False
         elif strategy is self.space.fromcache(EmptySetStrategy):
             return False
         elif strategy is self.space.fromcache(IdentitySetStrategy):
             return False
+        elif strategy is self.space.fromcache(TupleSetStrategy):
+            return False
         return True
 
     def unwrap(self, w_item):
@@ -1359,6 +1384,8 @@ class IntegerSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
             return False
         elif strategy is self.space.fromcache(IdentitySetStrategy):
             return False
+        elif strategy is self.space.fromcache(TupleSetStrategy):
+            return False
         return True
 
     def unwrap(self, w_item):
@@ -1367,10 +1394,507 @@ class IntegerSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     def wrap(self, item):
         return self.space.newint(item)
 
+    def convert_other(self, w_other):
+        strategy = self.space.fromcache(BitmapSetStrategy)
+        if w_other.strategy is strategy:
+            return strategy.as_int_set(w_other)
+        return w_other
+
     def iter(self, w_set):
         return IntegerIteratorImplementation(self.space, self, w_set)
 
 
+# Sets of ints use BitmapSetStrategy if they are made from a list of at
+# least BITMAP_MIN_LENGTH ints, with at most BITMAP_DENSE bits per item.
+# They switch to IntegerSetStrategy when there are more than
+# BITMAP_SPARSE bits per item, unless the bitmap is at most
+# BITMAP_SMALL_WORDS words long.
+BITMAP_MIN_LENGTH = 16
+BITMAP_DENSE = 8
+BITMAP_SPARSE = 32
+BITMAP_SMALL_WORDS = 4
+
+_M1 = r_uint(-1) // 3
+_M2 = r_uint(-1) // 5
+_M4 = r_uint(-1) // 17
+_H01 = r_uint(-1) // 255
+
+def _popcount(x):
+    x = x - ((x >> 1) & _M1)
+    x = (x & _M2) + ((x >> 2) & _M2)
+    x = (x + (x >> 4)) & _M4
+    return intmask((x * _H01) >> (LONG_BIT - 8))
+
+def _max_bitmap_words(length, bits_per_item):
+    return max(length * bits_per_item // LONG_BIT, BITMAP_SMALL_WORDS)
+
+
+class IntBitmap(object):
+    """ The storage of BitmapSetStrategy: bit 'i' of words[k] is set if
+    the set contains (first_word + k) * LONG_BIT + i."""
+
+    def __init__(self, first_word, words, length):
+        self.first_word = first_word
+        self.words = words
+        self.length = length
+
+    def copy(self):
+        return IntBitmap(self.first_word, self.words[:], self.length)
+
+    def stop_word(self):
+        return self.first_word + len(self.words)
+
+    def getword(self, wordnum):
+        k = wordnum - self.first_word
+        if 0 <= k < len(self.words):
+            return self.words[k]
+        return r_uint(0)
+
+    def is_dense_enough(self):
+        return len(self.words) <= _max_bitmap_words(self.length,
+                                                    BITMAP_SPARSE)
+
+    def contains(self, x):
+        k = (x >> LONG_BIT_SHIFT) - self.first_word
+        if 0 <= k < len(self.words):
+            return bool(self.words[k] & (r_uint(1) << (x & (LONG_BIT - 1))))
+        return False
+
+    def add(self, x):
+        """ Adds x.  Returns False, without doing anything, if that would
+        make the bitmap too sparse."""
+        wordnum = x >> LONG_BIT_SHIFT
+        words = self.words
+        k = wordnum - self.first_word
+        if not 0 <= k < len(words):
+            if self.length == 0:
+                self.first_word = wordnum
+                self.words = words = [r_uint(0)]
+                k = 0
+            else:
+                maxwords = _max_bitmap_words(self.length + 1, BITMAP_SPARSE)
+                if k < 0:
+                    if len(words) - k > maxwords:
+                        return False
+                    self.words = words = [r_uint(0)] * (-k) + words
+                    self.first_word = wordnum
+                    k = 0
+                else:
+                    if k + 1 > maxwords:
+                        return False
+                    words.extend([r_uint(0)] * (k + 1 - len(words)))
+        bit = r_uint(1) << (x & (LONG_BIT - 1))
+        if not words[k] & bit:
+            words[k] |= bit
+            self.length += 1
+        return True
+
+    def remove(self, x):
+        k = (x >> LONG_BIT_SHIFT) - self.first_word
+        if 0 <= k < len(self.words):
+            bit = r_uint(1) << (x & (LONG_BIT - 1))
+            if self.words[k] & bit:
+                self.words[k] &= ~bit
+                self.length -= 1
+                return True
+        return False
+
+    def pop(self):
+        """ Removes and returns the largest item.  The bitmap must not be
+        empty."""
+        words = self.words
+        while not words[-1]:
+            words.pop()
+        k = len(words) - 1
+        word = words[k]
+        bit = LONG_BIT - 1
+        while not (word >> bit) & 1:
+            bit -= 1
+        word &= ~(r_uint(1) << bit)
+        if word:
+            words[k] = word
+        else:
+            words.pop()
+        self.length -= 1
+        return ((self.first_word + k) << LONG_BIT_SHIFT) + bit
+
+    def tolist(self):
+        result = [0] * self.length
+        i = 0
+        for k in range(len(self.words)):
+            word = self.words[k]
+            base = (self.first_word + k) << LONG_BIT_SHIFT
+            while word:
+                low = word & (~word + 1)
+                result[i] = base + _popcount(low - 1)
+                i += 1
+                word ^= low
+        return result
+
+    def issubset(self, other):
+        for k in range(len(self.words)):
+            if self.words[k] & ~other.getword(self.first_word + k):
+                return False
+        return True
+
+    def isdisjoint(self, other):
+        for k in range(len(self.words)):
+            if self.words[k] & other.getword(self.first_word + k):
+                return False
+        return True
+
+
+def make_bitmap(first_word, words):
+    """ Makes an IntBitmap, without the zero words at both ends."""
+    start = 0
+    stop = len(words)
+    while start < stop and not words[start]:
+        start += 1
+    while stop > start and not words[stop - 1]:
+        stop -= 1
+    if start > 0 or stop < len(words):
+        words = words[start:stop]
+        first_word += start
+    length = 0
+    for word in words:
+        length += _popcount(word)
+    return IntBitmap(first_word, words, length)
+
+def bitmap_from_int_list(items):
+    """ Returns an IntBitmap with the given ints, or None if they are too
+    few or too spread out for a bitmap."""
+    if len(items) < BITMAP_MIN_LENGTH:
+        return None
+    lo = hi = items[0]
+    for x in items:
+        if x < lo:
+            lo = x
+        elif x > hi:
+            hi = x
+    first_word = lo >> LONG_BIT_SHIFT
+    nwords = (hi >> LONG_BIT_SHIFT) - first_word + 1
+    if nwords > _max_bitmap_words(len(items), BITMAP_DENSE):
+        return None
+    bitmap = IntBitmap(first_word, [r_uint(0)] * nwords, 0)
+    for x in items:
+        bitmap.add(x)
+    return bitmap
+
+BITMAP_AND = 0
+BITMAP_OR = 1
+BITMAP_XOR = 2
+BITMAP_SUB = 3
+
+@specialize.arg(2)
+def combine_bitmaps(b1, b2, op):
+    """ Computes 'b1 & b2', 'b1 | b2', 'b1 ^ b2' or 'b1 - b2' one word
+    at a time."""
+    if op == BITMAP_AND:
+        first = max(b1.first_word, b2.first_word)
+        stop = min(b1.stop_word(), b2.stop_word())
+    elif op == BITMAP_SUB or b2.length == 0:
+        first = b1.first_word
+        stop = b1.stop_word()
+    elif b1.length == 0:
+        first = b2.first_word
+        stop = b2.stop_word()
+    else:
+        first = min(b1.first_word, b2.first_word)
+        stop = max(b1.stop_word(), b2.stop_word())
+    if stop < first:
+        stop = first
+    words = [r_uint(0)] * (stop - first)
+    for k in range(stop - first):
+        w1 = b1.getword(first + k)
+        w2 = b2.getword(first + k)
+        if op == BITMAP_AND:
+            words[k] = w1 & w2
+        elif op == BITMAP_OR:
+            words[k] = w1 | w2
+        elif op == BITMAP_XOR:
+            words[k] = w1 ^ w2
+        else:
+            words[k] = w1 & ~w2
+    return make_bitmap(first, words)
+
+
+class BitmapSetStrategy(SetStrategy):
+    """ Sets of ints that are close to each other, stored as an IntBitmap.
+    The operations between two such sets work on whole words.  The
+    operations with a set of another strategy are done on a copy that
+    uses IntegerSetStrategy, or switch to it if they are in-place."""
+    erase, unerase = rerased.new_erasing_pair("bitmap")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def get_empty_storage(self):
+        return self.erase(IntBitmap(0, [], 0))
+
+    def listview_int(self, w_set):
+        return self.unerase(w_set.sstorage).tolist()
+
+    def is_correct_type(self, w_key):
+        return type(w_key) is W_IntObject
+
+    def may_contain_equal_elements(self, strategy):
+        if strategy is self.space.fromcache(BytesSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(AsciiSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(EmptySetStrategy):
+            return False
+        elif strategy is self.space.fromcache(IdentitySetStrategy):
+            return False
+        elif strategy is self.space.fromcache(TupleSetStrategy):
+            return False
+        return True
+
+    def _storage_and_strategy(self, bitmap):
+        if bitmap.is_dense_enough():
+            return self.erase(bitmap), self
+        strategy = self.space.fromcache(IntegerSetStrategy)
+        storage = strategy.get_storage_from_unwrapped_list(bitmap.tolist())
+        return storage, strategy
+
+    def _from_bitmap(self, w_set, bitmap):
+        storage, strategy = self._storage_and_strategy(bitmap)
+        return w_set.from_storage_and_strategy(storage, strategy)
+
+    def _set_bitmap(self, w_set, bitmap):
+        storage, strategy = self._storage_and_strategy(bitmap)
+        w_set.strategy = strategy
+        w_set.sstorage = storage
+
+    def as_int_set(self, w_set):
+        """ Returns a copy of w_set that uses IntegerSetStrategy."""
+        strategy = self.space.fromcache(IntegerSetStrategy)
+        storage = strategy.get_storage_from_unwrapped_list(
+            self.listview_int(w_set))
+        return w_set.from_storage_and_strategy(storage, strategy)
+
+    def switch_to_int_strategy(self, w_set):
+        strategy = self.space.fromcache(IntegerSetStrategy)
+        storage = strategy.get_storage_from_unwrapped_list(
+            self.listview_int(w_set))
+        w_set.strategy = strategy
+        w_set.sstorage = storage
+
+    def length(self, w_set):
+        return self.unerase(w_set.sstorage).length
+
+    def clear(self, w_set):
+        w_set.switch_to_empty_strategy()
+
+    def copy_real(self, w_set):
+        storage = self.get_storage_copy(w_set)
+        return w_set.from_storage_and_strategy(storage, self)
+
+    def add(self, w_set, w_key):
+        if self.is_correct_type(w_key):
+            bitmap = self.unerase(w_set.sstorage)
+            if bitmap.add(self.space.int_w(w_key)):
+                return
+            self.switch_to_int_strategy(w_set)
+        else:
+            w_set.switch_to_object_strategy(self.space)
+        w_set.add(w_key)
+
+    def remove(self, w_set, w_item):
+        if not self.is_correct_type(w_item):
+            w_set.switch_to_object_strategy(self.space)
+            return w_set.remove(w_item)
+        bitmap = self.unerase(w_set.sstorage)
+        if not bitmap.remove(self.space.int_w(w_item)):
+            return False
+        if not bitmap.is_dense_enough():
+            self.switch_to_int_strategy(w_set)
+        return True
+
+    def getdict_w(self, w_set):
+        result = newset(self.space)
+        for key in self.listview_int(w_set):
+            result[self.space.newint(key)] = None
+        return result
+
+    def get_storage_copy(self, w_set):
+        return self.erase(self.unerase(w_set.sstorage).copy())
+
+    def getkeys(self, w_set):
+        return [self.space.newint(key) for key in self.listview_int(w_set)]
+
+    def has_key(self, w_set, w_key):
+        if not self.is_correct_type(w_key):
+            w_set.switch_to_object_strategy(self.space)
+            return w_set.has_key(w_key)
+        bitmap = self.unerase(w_set.sstorage)
+        return bitmap.contains(self.space.int_w(w_key))
+
+    def equals(self, w_set, w_other):
+        if w_set.length() != w_other.length():
+            return False
+        if w_set.length() == 0:
+            return True
+        if w_other.strategy is self:
+            return self.unerase(w_set.sstorage).issubset(
+                self.unerase(w_other.sstorage))
+        if not self.may_contain_equal_elements(w_other.strategy):
+            return False
+        return self.as_int_set(w_set).equals(w_other)
+
+    def difference(self, w_set, w_other):
+        if w_other.strategy is self:
+            bitmap = combine_bitmaps(self.unerase(w_set.sstorage),
+                                     self.unerase(w_other.sstorage),
+                                     BITMAP_SUB)
+            return self._from_bitmap(w_set, bitmap)
+        if not self.may_contain_equal_elements(w_other.strategy):
+            return w_set.copy_real()
+        return self.as_int_set(w_set).difference(w_other)
+
+    def difference_update(self, w_set, w_other):
+        if w_other.strategy is self:
+            bitmap = combine_bitmaps(self.unerase(w_set.sstorage),
+                                     self.unerase(w_other.sstorage),
+                                     BITMAP_SUB)
+            self._set_bitmap(w_set, bitmap)
+        elif self.may_contain_equal_elements(w_other.strategy):
+            self.switch_to_int_strategy(w_set)
+            w_set.difference_update(w_other)
+
+    def symmetric_difference(self, w_set, w_other):
+        if w_other.length() == 0:
+            return w_set.copy_real()
+        if w_other.strategy is self:
+            bitmap = combine_bitmaps(self.unerase(w_set.sstorage),
+                                     self.unerase(w_other.sstorage),
+                                     BITMAP_XOR)
+            return self._from_bitmap(w_set, bitmap)
+        return self.as_int_set(w_set).symmetric_difference(w_other)
+
+    def symmetric_difference_update(self, w_set, w_other):
+        if w_other.length() == 0:
+            return
+        if w_other.strategy is self:
+            bitmap = combine_bitmaps(self.unerase(w_set.sstorage),
+                                     self.unerase(w_other.sstorage),
+                                     BITMAP_XOR)
+            self._set_bitmap(w_set, bitmap)
+        else:
+            self.switch_to_int_strategy(w_set)
+            w_set.symmetric_difference_update(w_other)
+
+    def intersect(self, w_set, w_other):
+        if w_other.strategy is self:
+            bitmap = combine_bitmaps(self.unerase(w_set.sstorage),
+                                     self.unerase(w_other.sstorage),
+                                     BITMAP_AND)
+            return self._from_bitmap(w_set, bitmap)
+        if not self.may_contain_equal_elements(w_other.strategy):
+            strategy = self.space.fromcache(EmptySetStrategy)
+            return w_set.from_storage_and_strategy(
+                strategy.get_empty_storage(), strategy)
+        return self.as_int_set(w_set).intersect(w_other)
+
+    def intersect_update(self, w_set, w_other):
+        if w_other.strategy is self:
+            bitmap = combine_bitmaps(self.unerase(w_set.sstorage),
+                                     self.unerase(w_other.sstorage),
+                                     BITMAP_AND)
+            self._set_bitmap(w_set, bitmap)
+        elif not self.may_contain_equal_elements(w_other.strategy):
+            w_set.switch_to_empty_strategy()
+        else:
+            self.switch_to_int_strategy(w_set)
+            w_set.intersect_update(w_other)
+
+    def issubset(self, w_set, w_other):
+        if w_set.length() == 0:
+            return True
+        if w_other.strategy is self:
+            return self.unerase(w_set.sstorage).issubset(
+                self.unerase(w_other.sstorage))
+        if not self.may_contain_equal_elements(w_other.strategy):
+            return False
+        return self.as_int_set(w_set).issubset(w_other)
+
+    def isdisjoint(self, w_set, w_other):
+        if w_other.length() == 0:
+            return True
+        if w_other.strategy is self:
+            return self.unerase(w_set.sstorage).isdisjoint(
+                self.unerase(w_other.sstorage))
+        if not self.may_contain_equal_elements(w_other.strategy):
+            return True
+        return self.as_int_set(w_set).isdisjoint(w_other)
+
+    def update(self, w_set, w_other):
+        if w_other.length() == 0:
+            return
+        if w_other.strategy is self:
+            bitmap = combine_bitmaps(self.unerase(w_set.sstorage),
+                                     self.unerase(w_other.sstorage),
+                                     BITMAP_OR)
+            self._set_bitmap(w_set, bitmap)
+        else:
+            self.switch_to_int_strategy(w_set)
+            w_set.update(w_other)
+
+    def iter(self, w_set):
+        return BitmapIteratorImplementation(self.space, self, w_set)
+
+    def popitem(self, w_set):
+        bitmap = self.unerase(w_set.sstorage)
+        if bitmap.length == 0:
+            raise oefmt(self.space.w_KeyError, "pop from an empty set")
+        result = bitmap.pop()
+        if not bitmap.is_dense_enough():
+            self.switch_to_int_strategy(w_set)
+        return self.space.newint(result)
+
+
+class TupleSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
+    erase, unerase = rerased.new_erasing_pair("tuple")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    intersect_jmp = jit.JitDriver(greens = [], reds = 'auto',
+                                  name='set(tuple).intersect')
+
+    def get_empty_storage(self):
+        return self.erase(self.get_empty_dict())
+
+    def get_empty_dict(self):
+        return r_dict(int_or_bytes_tuple_eq, int_or_bytes_tuple_hash,
+                      force_non_null=True, simple_hash_eq=True)
+
+    def is_correct_type(self, w_key):
+        return is_int_or_bytes_tuple(w_key)
+
+    def may_contain_equal_elements(self, strategy):
+        if strategy is self.space.fromcache(EmptySetStrategy):
+            return False
+        elif strategy is self.space.fromcache(IntegerSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(BitmapSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(BytesSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(AsciiSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(IdentitySetStrategy):
+            return False
+        return True
+
+    def unwrap(self, w_item):
+        return w_item
+
+    def wrap(self, item):
+        return item
+
+    def iter(self, w_set):
+        return RDictIteratorImplementation(self.space, self, w_set)
+
+
 class ObjectSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     erase, unerase = rerased.new_erasing_pair("object")
     erase = staticmethod(erase)
@@ -1442,10 +1966,14 @@ class IdentitySetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
             return False
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        if strategy is self.space.fromcache(BitmapSetStrategy):
+            return False
         if strategy is self.space.fromcache(BytesSetStrategy):
             return False
         if strategy is self.space.fromcache(AsciiSetStrategy):
             return False
+        if strategy is self.space.fromcache(TupleSetStrategy):
+            return False
         return True
 
     def unwrap(self, w_item):
@@ -1547,6 +2075,27 @@ class IntegerIteratorImplementation(IteratorImplementation):
         else:
             return None
 
+class BitmapIteratorImplementation(IteratorImplementation):
+    def __init__(self, space, strategy, w_set):
+        IteratorImplementation.__init__(self, space, strategy, w_set)
+        self.bitmap = strategy.unerase(w_set.sstorage)
+        self.wordnum = self.bitmap.first_word - 1
+        self.word = r_uint(0)    # the bits of 'wordnum' not returned yet
+
+    def next_entry(self):
+        bitmap = self.bitmap
+        word = self.word
+        while not word:
+            self.wordnum += 1
+            k = self.wordnum - bitmap.first_word
+            if k >= len(bitmap.words):
+                return None
+            word = bitmap.words[k]
+        low = word & (~word + 1)
+        self.word = word ^ low
+        return self.space.newint((self.wordnum << LONG_BIT_SHIFT) +
+                                 _popcount(low - 1))
+
 class IdentityIteratorImplementation(IteratorImplementation):
     def __init__(self, space, strategy, w_set):
         IteratorImplementation.__init__(self, space, strategy, w_set)
@@ -1633,6 +2182,12 @@ def set_strategy_and_setdata(space, w_set, w_iterable):
 
     intlist = space.listview_int(w_iterable)
     if intlist is not None:
+        bitmap = bitmap_from_int_list(intlist)
+        if bitmap is not None:
+            strategy = space.fromcache(BitmapSetStrategy)
+            w_set.strategy = strategy
+            w_set.sstorage = strategy.erase(bitmap)
+            return
         strategy = space.fromcache(IntegerSetStrategy)
         w_set.strategy = strategy
         w_set.sstorage = strategy.get_storage_from_unwrapped_list(intlist)
@@ -1679,6 +2234,15 @@ def _pick_correct_strategy_unroll(space, w_set, w_iterable):
         w_set.sstorage = w_set.strategy.get_storage_from_list(iterable_w)
         return
 
+    # check for tuples of ints and strings
+    for w_item in iterable_w:
+        if not is_int_or_bytes_tuple(w_item):
+            break
+    else:
+        w_set.strategy = space.fromcache(TupleSetStrategy)
+        w_set.sstorage = w_set.strategy.get_storage_from_list(iterable_w)
+        return
+
     # check for compares by identity
     for w_item in iterable_w:
         if not space.type(w_item).compares_by_identity():
@@ -1,6 +1,9 @@
 from pypy.interpreter.error import oefmt
-from pypy.objspace.std.tupleobject import W_AbstractTupleObject
+from pypy.objspace.std.tupleobject import (W_AbstractTupleObject,
+    UNROLL_CUTOFF, _unroll_condition, _unroll_condition_cmp)
 from pypy.objspace.std.util import negate
+from rpython.rlib import jit
+from rpython.rlib.debug import make_sure_not_resized
 from rpython.rlib.objectmodel import specialize
 from rpython.rlib.rarithmetic import intmask
 from rpython.rlib.unroll import unrolling_iterable
@@ -137,12 +140,115 @@ def make_specialised_class(typetuple):
     _specialisations.append(cls)
     return cls
 
+# the longest tuples that make_homogeneous_class() is used for.  The
+# generic tuple operations (slicing, 'in', iter(), '+', ...) work on
+# tolist(), which boxes all the items again: this is only cheap enough
+# for small tuples, like records or coordinates
+HOMOGENEOUS_MAX_LENGTH = 8
+
+def make_homogeneous_class(typ):
+    """Tuples of up to HOMOGENEOUS_MAX_LENGTH items which are all ints, or
+    all floats, stored unboxed in a list."""
+    if typ == int:
+        wrap = lambda space, x: space.newint(x)
+    elif typ == float:
+        wrap = lambda space, x: space.newfloat(x)
+    else:
+        assert 0
+
+    class cls(W_AbstractTupleObject):
+        _immutable_fields_ = ['items[*]']
+
+        def __init__(self, space, items):
+            make_sure_not_resized(items)
+            self.space = space
+            self.items = items
+
+        def length(self):
+            return len(self.items)
+
+        @jit.look_inside_iff(_unroll_condition)
+        def tolist(self):
+            items = self.items
+            list_w = [None] * len(items)
+            for i in range(len(items)):
+                list_w[i] = wrap(self.space, items[i])
+            return list_w
+
+        def getitems_copy(self):
+            return [wrap(self.space, x) for x in self.items]
+
+        def getitem(self, space, index):
+            items = self.items
+            if index < 0:
+                index += len(items)
+            if not 0 <= index < len(items):
+                raise oefmt(space.w_IndexError, "tuple index out of range")
+            return wrap(space, items[index])
+
+        @jit.look_inside_iff(lambda self, space: _unroll_condition(self))
+        def descr_hash(self, space):
+            # same algorithm as W_TupleObject.descr_hash()
+            mult = 1000003
+            x = 0x345678
+            z = len(self.items)
+            for value in self.items:
+                if typ == float:
+                    from pypy.objspace.std.floatobject import _hash_float
+                    y = _hash_float(space, value)
+                else:
+                    from pypy.objspace.std.intobject import _hash_int
+                    y = _hash_int(value)
+                x = (x ^ y) * mult
+                z -= 1
+                mult += 82520 + z + z
+            x += 97531
+            return space.newint(intmask(x))
+
+        def descr_eq(self, space, w_other):
+            if not isinstance(w_other, W_AbstractTupleObject):
+                return space.w_NotImplemented
+            return self._descr_eq(space, w_other)
+
+        @jit.look_inside_iff(_unroll_condition_cmp)
+        def _descr_eq(self, space, w_other):
+            items1 = self.items
+            if not isinstance(w_other, cls):
+                items2_w = w_other.tolist()
+                if len(items1) != len(items2_w):
+                    return space.w_False
+                for i in range(len(items1)):
+                    if not space.eq_w(wrap(space, items1[i]), items2_w[i]):
+                        return space.w_False
+                return space.w_True
+
+            items2 = w_other.items
+            if len(items1) != len(items2):
+                return space.w_False
+            for i in range(len(items1)):
+                if items1[i] != items2[i]:
+                    if typ == float:
+                        # issue with NaNs, which should be equal here
+                        if (float2longlong(items1[i]) ==
+                            float2longlong(items2[i])):
+                            continue
+                    return space.w_False
+            return space.w_True
+
+        descr_ne = negate(descr_eq)
+
+    cls.__name__ = 'W_SpecialisedTupleObject_%ss' % (typ.__name__,)
+    _specialisations.append(cls)
+    return cls
+
 # ---------- current specialized versions ----------
 
 _specialisations = []
 Cls_ii = make_specialised_class((int, int))
 Cls_oo = make_specialised_class((object, object))
 Cls_ff = make_specialised_class((float, float))
+Cls_ints = make_homogeneous_class(int)
+Cls_floats = make_homogeneous_class(float)
 
 def makespecialisedtuple(space, list_w):
     from pypy.objspace.std.intobject import W_IntObject
@@ -156,9 +262,35 @@ def makespecialisedtuple(space, list_w):
             if type(w_arg2) is W_FloatObject:
                 return Cls_ff(space, space.float_w(w_arg1), space.float_w(w_arg2))
         return Cls_oo(space, w_arg1, w_arg2)
+    elif 2 < len(list_w) <= HOMOGENEOUS_MAX_LENGTH:
+        return _makehomogeneoustuple(space, list_w)
     else:
         raise NotSpecialised
 
+@jit.look_inside_iff(lambda space, list_w:
+        jit.loop_unrolling_heuristic(list_w, len(list_w), UNROLL_CUTOFF))
+def _makehomogeneoustuple(space, list_w):
+    from pypy.objspace.std.intobject import W_IntObject
+    from pypy.objspace.std.floatobject import W_FloatObject
+    w_first = list_w[0]
+    if type(w_first) is W_IntObject:
+        for w_item in list_w:
+            if type(w_item) is not W_IntObject:
+                raise NotSpecialised
+        intitems = [0] * len(list_w)
+        for i in range(len(list_w)):
+            intitems[i] = space.int_w(list_w[i])
+        return Cls_ints(space, intitems)
+    elif type(w_first) is W_FloatObject:
+        for w_item in list_w:
+            if type(w_item) is not W_FloatObject:
+                raise NotSpecialised
+        floatitems = [0.0] * len(list_w)
+        for i in range(len(list_w)):
+            floatitems[i] = space.float_w(list_w[i])
+        return Cls_floats(space, floatitems)
+    raise NotSpecialised
+
 # --------------------------------------------------
 # Special code based on list strategies to implement zip(),
 # here with two list arguments only.  This builds a zipped
@@ -0,0 +1,65 @@
+"""A str that is the result of additions, kept in a StringBuilder until
+it is really needed (objspace.std.withstrbuf)."""
+
+from rpython.rlib.rstring import StringBuilder
+
+from pypy.objspace.std.bytesobject import (
+    W_BytesObject, W_LazyBytesObject, make_lazy_delegates)
+
+
+class W_StringBufferObject(W_LazyBytesObject):
+    """The result of 'a + b' on strs.  Adding more to the end of it appends
+    to the same StringBuilder, which is shared with the previous results
+    of the additions: each of them only knows its own length.  The string
+    is built the first time it is needed for anything else than an
+    addition or len().
+    """
+    w_str = None
+
+    def __init__(self, builder):
+        self.builder = builder             # StringBuilder
+        self.length = builder.getlength()
+
+    def force(self):
+        if self.w_str is None:
+            s = self.builder.build()
+            if self.length < len(s):
+                s = s[:self.length]
+            self.w_str = W_BytesObject(s)
+            return s
+        else:
+            return self.w_str._value
+
+    def force_w(self):
+        self.force()
+        return self.w_str
+
+    def __repr__(self):
+        """representation for debugging purposes"""
+        return "%s(%r[:%d])" % (
+            self.__class__.__name__, self.builder, self.length)
+
+    def descr_len(self, space):
+        return space.newint(self.length)
+
+    def descr_add(self, space, w_other):
+        if not space.isinstance_w(w_other, space.w_bytes):
+            # unicode, bytearray, buffers...
+            return self.force_w().descr_add(space, w_other)
+        other = space.bytes_w(w_other)
+        if self.builder.getlength() != self.length:
+            # somebody already appended to our builder: start a new one
+            builder = StringBuilder()
+            builder.append(self.force())
+        else:
+            builder = self.builder
+        builder.append(other)
+        return W_StringBufferObject(builder)
+
+    def descr_str(self, space):
+        # you cannot get subclasses of W_StringBufferObject here
+        assert type(self) is W_StringBufferObject
+        return self
+
+
+make_lazy_delegates(W_StringBufferObject)
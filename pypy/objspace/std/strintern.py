@@ -0,0 +1,55 @@
+"""Interning of the short identifier-like strings produced by str.split()
+and by the json decoder (objspace.std.withstrintern)."""
+
+from rpython.rlib.objectmodel import compute_hash
+
+STR_INTERN_SIZE = 1024          # must be a power of two
+STR_INTERN_MAX_LENGTH = 20
+
+
+def _is_identifier_like(s):
+    if not 0 < len(s) <= STR_INTERN_MAX_LENGTH:
+        return False
+    for c in s:
+        if not (c.isalnum() or c == '_'):
+            return False
+    return True
+
+
+class StrInternCache(object):
+    """A direct-mapped cache of the recently seen short strings.  When a
+    new string is equal to the one in its slot, the one in the slot is
+    returned instead, so that e.g. the repeated column names of a big file
+    split into words are only kept once in memory.  A collision replaces
+    the string in the slot.
+    """
+
+    def __init__(self, space):
+        self.strings = [None] * STR_INTERN_SIZE
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, s):
+        if not _is_identifier_like(s):
+            return s
+        index = compute_hash(s) & (STR_INTERN_SIZE - 1)
+        cached = self.strings[index]
+        if cached is not None and cached == s:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        self.strings[index] = s
+        return s
+
+
+def intern_str(space, s):
+    if not space.config.objspace.std.withstrintern:
+        return s
+    return space.fromcache(StrInternCache).intern(s)
+
+def intern_list(space, lst):
+    if space.config.objspace.std.withstrintern:
+        cache = space.fromcache(StrInternCache)
+        for i in range(len(lst)):
+            lst[i] = cache.intern(lst[i])
+    return lst
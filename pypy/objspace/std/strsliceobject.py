@@ -0,0 +1,117 @@
+"""A str that is a slice of a bigger str, sharing its memory until it is
+really needed (objspace.std.withstrslice)."""
+
+from rpython.rlib.objectmodel import compute_unique_id
+
+from pypy.interpreter.error import oefmt
+from pypy.objspace.std.bytesobject import (
+    W_BytesObject, W_LazyBytesObject, make_lazy_delegates)
+from pypy.objspace.std.sliceobject import (
+    W_SliceObject, normalize_simple_slice)
+
+# shorter slices are always copied
+STRSLICE_MIN_LENGTH = 64
+# slices shorter than 1/STRSLICE_MAX_RATIO of the sliced string are copied
+# too: otherwise they could keep alive a big string that is mostly unused
+STRSLICE_MAX_RATIO = 4
+
+
+def make_bytes_slice(value, start, stop):
+    """Return value[start:stop] as a W_BytesSliceObject if it is big enough,
+    else as a new W_BytesObject."""
+    assert 0 <= start <= stop
+    length = stop - start
+    if (length >= STRSLICE_MIN_LENGTH and
+            length * STRSLICE_MAX_RATIO >= len(value)):
+        return W_BytesSliceObject(value, start, stop)
+    return W_BytesObject(value[start:stop])
+
+
+class W_BytesSliceObject(W_LazyBytesObject):
+    """The slice 'value[start:stop]', where 'value' is the RPython string of
+    another str.  Indexing and slicing it does not copy anything; the slice
+    is copied the first time it is needed for anything else, and 'value' is
+    released then.
+    """
+    w_str = None
+
+    def __init__(self, value, start, stop):
+        assert 0 <= start <= stop <= len(value)
+        self.value = value
+        self.start = start
+        self.stop = stop
+
+    def force(self):
+        if self.w_str is None:
+            s = self.value[self.start:self.stop]
+            self.w_str = W_BytesObject(s)
+            self.value = None
+            return s
+        else:
+            return self.w_str._value
+
+    def force_w(self):
+        self.force()
+        return self.w_str
+
+    def __repr__(self):
+        """representation for debugging purposes"""
+        return "%s(%r[%d:%d])" % (
+            self.__class__.__name__, self.value, self.start, self.stop)
+
+    def descr_len(self, space):
+        return space.newint(self.stop - self.start)
+
+    def descr_getitem(self, space, w_index):
+        if self.w_str is not None:
+            return self.w_str.descr_getitem(space, w_index)
+        length = self.stop - self.start
+        if isinstance(w_index, W_SliceObject):
+            start, stop, step, sl = w_index.indices4(space, length)
+            if step == 1 and sl > 0:
+                return make_bytes_slice(self.value, self.start + start,
+                                        self.start + stop)
+            return self.force_w().descr_getitem(space, w_index)
+        index = space.getindex_w(w_index, space.w_IndexError, "string index")
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise oefmt(space.w_IndexError, "string index out of range")
+        return space.newbytes(self.value[self.start + index])
+
+    def descr_getslice(self, space, w_start, w_stop):
+        if self.w_str is not None:
+            return self.w_str.descr_getslice(space, w_start, w_stop)
+        start, stop = normalize_simple_slice(
+            space, self.stop - self.start, w_start, w_stop)
+        if start == stop:
+            return W_BytesObject.EMPTY
+        return make_bytes_slice(self.value, self.start + start,
+                                self.start + stop)
+
+    def descr_str(self, space):
+        # you cannot get subclasses of W_BytesSliceObject here
+        assert type(self) is W_BytesSliceObject
+        return self
+
+
+make_lazy_delegates(W_BytesSliceObject)
+
+
+def get_slice_stats(objects_w):
+    """Return (number of slices, total length of the slices, total length
+    of the strings they share) for the W_BytesSliceObjects in objects_w that
+    are not copied yet."""
+    count = 0
+    shared = 0
+    retained = 0
+    seen = {}
+    for w_obj in objects_w:
+        if isinstance(w_obj, W_BytesSliceObject) and w_obj.w_str is None:
+            count += 1
+            shared += w_obj.stop - w_obj.start
+            uid = compute_unique_id(w_obj.value)
+            if uid not in seen:
+                seen[uid] = None
+                retained += len(w_obj.value)
+    return count, shared, retained
@@ -1139,7 +1139,7 @@ class AppTestStrategies(object):
     def test_empty_to_string(self):
         d = {}
         assert "EmptyDictStrategy" in self.get_strategy(d)
-        d[b"a"] = 1
+        d[b"a"] = "b"
         assert "BytesDictStrategy" in self.get_strategy(d)
 
         class O(object):
@@ -1147,21 +1147,21 @@ class AppTestStrategies(object):
         o = O()
         d = o.__dict__ = {}
         assert "EmptyDictStrategy" in self.get_strategy(d)
-        o.a = 1
+        o.a = "b"
         assert "BytesDictStrategy" in self.get_strategy(d)
 
     def test_empty_to_unicode(self):
         d = {}
         assert "EmptyDictStrategy" in self.get_strategy(d)
-        d[u"a"] = 1
+        d[u"a"] = "b"
         assert "UnicodeDictStrategy" in self.get_strategy(d)
-        assert d[u"a"] == 1
-        assert d["a"] == 1
+        assert d[u"a"] == "b"
+        assert d["a"] == "b"
         assert d.keys() == [u"a"]
         assert type(d.keys()[0]) is unicode
 
         d = {}
-        d[u"ä"] = 1
+        d[u"ä"] = "b"
         assert "UnicodeDictStrategy" in self.get_strategy(d)
 
     def test_empty_to_int(self):
@@ -1170,6 +1170,161 @@ class AppTestStrategies(object):
         assert "IntDictStrategy" in self.get_strategy(d)
         assert d[1L] == "hi"
 
+    def test_unboxed_values(self):
+        d = {}
+        d[1] = 2
+        assert "IntIntDictStrategy" in self.get_strategy(d)
+        d[1] += 5
+        d[3] = -1
+        assert d == {1: 7, 3: -1}
+        assert type(d[1]) is int
+        assert "IntIntDictStrategy" in self.get_strategy(d)
+        d = {}
+        d[1] = 2.5
+        assert "IntFloatDictStrategy" in self.get_strategy(d)
+        d[1] += 1.0
+        assert d[1] == 3.5
+        d = {}
+        d["a"] = 1
+        assert "BytesIntDictStrategy" in self.get_strategy(d)
+        d = {}
+        d.setdefault(u"a", 0)
+        assert "UnicodeIntDictStrategy" in self.get_strategy(d)
+        assert d[u"a"] == 0
+        d = dict(a=1, b=2)
+        assert "BytesIntDictStrategy" in self.get_strategy(d)
+        def f(**kwargs):
+            return kwargs
+        assert f(**d) == {"a": 1, "b": 2}
+        # values of other types, including bools and longs, are never unboxed
+        for value in [True, 2L, "x", None, 1.5]:
+            d = {1: value}
+            assert "IntIntDictStrategy" not in self.get_strategy(d)
+            assert d[1] is value
+
+    def test_unboxed_values_devolve(self):
+        d = {1: 10, 2: 20, 3: 30}
+        assert "IntIntDictStrategy" in self.get_strategy(d)
+        d[2] = "x"
+        assert "IntDictStrategy" in self.get_strategy(d)
+        assert d == {1: 10, 2: "x", 3: 30}
+        assert d.keys() == [1, 2, 3]
+        d = {1: 1.5}
+        d[2] = 3
+        assert "IntDictStrategy" in self.get_strategy(d)
+        assert d == {1: 1.5, 2: 3}
+        assert type(d[2]) is int
+        d = {"a": 1, "b": 2}
+        d.setdefault("c", 3.5)
+        assert "BytesDictStrategy" in self.get_strategy(d)
+        assert d == {"a": 1, "b": 2, "c": 3.5}
+        d = {"a": 1, "b": 2}
+        assert d.setdefault("a", 3.5) == 1
+        assert "BytesIntDictStrategy" in self.get_strategy(d)
+        d = {u"a": 1}
+        d[u"b"] = []
+        assert "UnicodeDictStrategy" in self.get_strategy(d)
+        assert d == {u"a": 1, u"b": []}
+        d = {1: 2}
+        d["a"] = 3
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d == {1: 2, "a": 3}
+
+    def test_unboxed_values_methods(self):
+        d = {1: 10, 2: 20, 3: 30}
+        assert "IntIntDictStrategy" in self.get_strategy(d)
+        assert d.values() == [10, 20, 30]
+        assert list(d.itervalues()) == [10, 20, 30]
+        assert d.items() == [(1, 10), (2, 20), (3, 30)]
+        assert list(d.iteritems()) == [(1, 10), (2, 20), (3, 30)]
+        assert d.get(4) is None
+        assert d.get(4, 5) == 5
+        assert d.pop(2) == 20
+        assert d.pop(2, "default") == "default"
+        raises(KeyError, d.pop, 2)
+        key, value = d.popitem()
+        assert value == key * 10
+        assert type(value) is int
+        d[key] = value
+        d2 = d.copy()
+        assert "IntIntDictStrategy" in self.get_strategy(d2)
+        assert d2 == {1: 10, 3: 30}
+        d2.update({5: 50})
+        assert d2 == {1: 10, 3: 30, 5: 50}
+        assert "IntIntDictStrategy" in self.get_strategy(d2)
+        assert d[1.0] == 10
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+
+    def test_unboxed_values_iter_devolve(self):
+        d = {1: 10, 2: 20, 3: 30}
+        it = d.itervalues()
+        assert it.next() == 10
+        d[3] = "x"
+        assert list(it) == [20, "x"]
+        d = {1: 10, 2: 20, 3: 30}
+        it = d.itervalues()
+        assert it.next() == 10
+        d[3] = "x"
+        del d[2]
+        d[4] = 40
+        raises(RuntimeError, list, it)
+
+    def test_empty_to_tuple(self):
+        d = {}
+        d[(1, 2)] = "a"
+        assert "TupleDictStrategy" in self.get_strategy(d)
+        d[("x", 3)] = "b"
+        d[(4, "y", 5, "z")] = "c"
+        d[()] = "d"
+        assert "TupleDictStrategy" in self.get_strategy(d)
+        assert d[(1, 2)] == "a"
+        assert d[("x", 3)] == "b"
+        assert d[(4, "y", 5, "z")] == "c"
+        assert d[()] == "d"
+        assert d.get((2, 1)) is None
+        assert d.get(("x", "3")) is None
+        assert d.get(1) is None
+        assert d.get("x") is None
+        assert sorted(d.keys()) == [(), (1, 2), (4, "y", 5, "z"), ("x", 3)]
+        assert "TupleDictStrategy" in self.get_strategy(d)
+        del d[(1, 2)]
+        assert (1, 2) not in d
+        assert "TupleDictStrategy" in self.get_strategy(d)
+        # keys that are equal without being ints or strs
+        assert d[(4, u"y", 5.0, "z")] == "c"
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+
+    def test_tuple_strategy_other_keys(self):
+        d = {(1, 2): "a"}
+        d[(1, 2.5)] = "b"
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d == {(1, 2): "a", (1, 2.5): "b"}
+        d = {(True, 2): "a"}
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        class T(tuple):
+            pass
+        d = {(1, 2): "a"}
+        d[T((3, 4))] = "b"
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d[(3, 4)] == "b"
+        d = {(1, 2): "a"}
+        assert d[T((1, 2))] == "a"
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+
+    def test_tuple_strategy_hash(self):
+        keys = [(1, 2), (-1, -1), ("a", 1, "b"), (2 ** 40, ""), (1, 2, 3)]
+        d = dict.fromkeys(keys)
+        assert "TupleDictStrategy" in self.get_strategy(d)
+        for key in keys:
+            assert key in d
+        d2 = {}
+        d2.update(d)
+        assert "TupleDictStrategy" in self.get_strategy(d2)
+        assert d2 == d
+        for key, value in d.items():
+            assert value is None
+            assert key in keys
+
     def test_iter_dict_length_change(self):
         d = {1: 2, 3: 4, 5: 6}
         it = d.iteritems()
@@ -1,3 +1,5 @@
+import gc
+
 
 class AppTest(object):
     spaceconfig = {"objspace.usemodules._pypyjson": True}
@@ -124,3 +126,182 @@ class AppTest(object):
         x.__dict__ = d
 
         x.foo = 'baz'  # used to segfault on pypy3
+
+    def test_list_of_dicts_is_a_table(self):
+        import __pypy__
+        import _pypyjson
+
+        s = '[%s]' % ', '.join(
+            '{"id": %d, "price": %d.5, "name": "n%d"}' % (i, i, i)
+            for i in range(20))
+        l = _pypyjson.loads(s)
+        assert __pypy__.strategy(l) == "JsonDictListStrategy"
+        assert len(l) == 20
+        d = l[3]
+        assert __pypy__.strategy(d) == "JsonRowDictStrategy"
+        assert d is l[3] is l[-17]
+        assert d == {u"id": 3, u"price": 3.5, u"name": u"n3"}
+        assert d.keys() == [u"id", u"price", u"name"]
+        assert list(d.itervalues()) == [3, 3.5, u"n3"]
+        assert [r[u"price"] for r in l] == [i + 0.5 for i in range(20)]
+        assert l[5:8] == [l[5], l[6], l[7]]
+        assert l[5:8][0] is l[5]
+        raises(IndexError, "l[20]")
+
+        # replacing values keeps the row, even with values of other types
+        d[u"id"] = u"x"
+        d[u"price"] = 1
+        assert d == {u"id": u"x", u"price": 1, u"name": u"n3"}
+        assert __pypy__.strategy(d) == "JsonRowDictStrategy"
+        assert [r[u"id"] for r in l][:5] == [0, 1, 2, u"x", 4]
+
+        # other changes give the dict its own storage
+        d[u"new"] = 5
+        assert __pypy__.strategy(d) == "UnicodeDictStrategy"
+        assert l[3] is d
+        assert d == {u"id": u"x", u"price": 1, u"name": u"n3", u"new": 5}
+        del l[4][u"id"]
+        assert l[4] == {u"price": 4.5, u"name": u"n4"}
+
+    def test_list_of_dicts_table_changes(self):
+        import __pypy__
+        import _pypyjson
+
+        s = '[%s]' % ', '.join('{"a": %d}' % i for i in range(10))
+        l = _pypyjson.loads(s)
+        assert __pypy__.strategy(l) == "JsonDictListStrategy"
+        l2 = list(l)
+        assert __pypy__.strategy(l2) == "JsonDictListStrategy"
+        l2[0][u"a"] = 100
+        assert l[0][u"a"] == 100
+        first = l[0]
+        l.append(None)
+        assert __pypy__.strategy(l) == "ObjectListStrategy"
+        assert l[0] is first is l2[0]
+        assert l[:-1] == [{u"a": 100}] + [{u"a": i} for i in range(1, 10)]
+        l2.sort(key=lambda d: -d[u"a"])
+        assert [d[u"a"] for d in l2] == [100] + range(9, 0, -1)
+
+    def test_short_or_mixed_list_of_dicts(self):
+        import __pypy__
+        import _pypyjson
+
+        l = _pypyjson.loads('[{"a": 1}, {"a": 2}]')
+        assert __pypy__.strategy(l) == "ObjectListStrategy"
+        s = '[%s, {"b": 1}]' % ', '.join('{"a": %d}' % i for i in range(10))
+        l = _pypyjson.loads(s)
+        assert __pypy__.strategy(l) == "ObjectListStrategy"
+        assert l == [{u"a": i} for i in range(10)] + [{u"b": 1}]
+        assert __pypy__.strategy(l[0]) == "JsonDictStrategy"
+        for s in ['[%s, 5]', '[%s, {}]', '[%s, {"a": 1, "a": 2}]',
+                  '[%s, [{"a": 1}]]']:
+            s = s % ', '.join('{"a": %d}' % i for i in range(10))
+            l = _pypyjson.loads(s)
+            assert __pypy__.strategy(l) == "ObjectListStrategy"
+            assert l[:10] == [{u"a": i} for i in range(10)]
+            assert len(l) == 11
+        l = _pypyjson.loads('[ {"a": [%s]} , {"a": 1} ]' % ', '.join(
+            '{"a": %d.5}' % i for i in range(10)))
+        assert __pypy__.strategy(l[0][u"a"]) == "JsonDictListStrategy"
+        assert l == [{u"a": [{u"a": i + 0.5} for i in range(10)]}, {u"a": 1}]
+
+
+class TestJsonTable(object):
+    spaceconfig = {"objspace.usemodules._pypyjson": True}
+
+    def make_table(self):
+        from pypy.objspace.std.jsondict import JsonDictListStrategy
+        w_l = self.space.appexec([], """():
+            import _pypyjson
+            s = '[%s]' % ', '.join('{"a": %d, "b": 1}' % i
+                                   for i in range(10))
+            return _pypyjson.loads(s)
+        """)
+        assert isinstance(w_l.strategy, JsonDictListStrategy)
+        return w_l, JsonDictListStrategy.unerase(w_l.lstorage)
+
+    def test_identity(self):
+        space = self.space
+        w_l, table = self.make_table()
+        w_0 = space.newint(0)
+        ids = [space.int_w(space.id(w_d)) for w_d in space.unpackiterable(w_l)]
+        gc.collect()
+        assert space.getitem(w_l, w_0) is space.getitem(w_l, w_0)
+        assert [space.int_w(space.id(w_d))
+                for w_d in space.unpackiterable(w_l)] == ids
+
+    def test_changes_are_kept(self):
+        space = self.space
+        w_a = space.newutf8("a", 1)
+        w_l, table = self.make_table()
+        w_l2 = space.call_function(space.w_list, w_l)
+        space.call_method(space.getitem(w_l, space.newint(0)), "clear")
+        space.setitem(space.getitem(w_l, space.newint(1)), w_a,
+                      space.newint(100))
+        space.call_method(space.getitem(w_l, space.newint(2)), "popitem")
+        gc.collect()
+        for w_list in [w_l, w_l2]:
+            assert space.int_w(space.len(
+                space.getitem(w_list, space.newint(0)))) == 0
+            assert space.int_w(space.getitem(
+                space.getitem(w_list, space.newint(1)), w_a)) == 100
+            assert space.int_w(space.len(
+                space.getitem(w_list, space.newint(2)))) == 1
+
+    def test_changes_of_type(self):
+        from pypy.objspace.std.jsondict import (
+            JsonRowDictStrategy, IntColumn, ObjectColumn)
+        space = self.space
+        w_a = space.newutf8("a", 1)
+        w_l, table = self.make_table()
+        assert isinstance(table.columns[0], IntColumn)
+        w_d = space.getitem(w_l, space.newint(3))
+        space.setitem(w_d, w_a, space.newint(42))
+        assert isinstance(table.columns[0], IntColumn)
+        space.setitem(w_d, w_a, space.w_None)
+        assert isinstance(table.columns[0], ObjectColumn)
+        assert isinstance(w_d.get_strategy(), JsonRowDictStrategy)
+        assert space.is_w(space.getitem(w_d, w_a), space.w_None)
+        w_4 = space.getitem(space.getitem(w_l, space.newint(4)), w_a)
+        assert space.int_w(w_4) == 4
+
+    def test_decode_then_iterate(self, monkeypatch):
+        # decoding the list does not make the dicts, and reading one value
+        # of each row only boxes that value: no row is copied
+        from pypy.objspace.std import jsondict
+        from pypy.objspace.std.jsondict import (
+            JsonRowDictStrategy, IntColumn, FloatColumn, ObjectColumn)
+        from pypy.objspace.std.intobject import W_IntObject
+        made = []
+        def from_values_and_jsonmap(space, values_w, jsonmap):
+            made.append(values_w)
+            return orig(space, values_w, jsonmap)
+        orig = jsondict.from_values_and_jsonmap
+        monkeypatch.setattr(jsondict, "from_values_and_jsonmap",
+                            from_values_and_jsonmap)
+        space = self.space
+        w_l = space.appexec([], """():
+            import _pypyjson
+            s = '[%s]' % ', '.join(
+                '{"id": %d, "price": %d.5, "qty": %d, "name": "n%d"}'
+                % (i, i, i * 2, i) for i in range(1000))
+            return _pypyjson.loads(s)
+        """)
+        assert made == []
+        table = w_l.strategy.unerase(w_l.lstorage)
+        assert [type(column) for column in table.columns] == [
+            IntColumn, FloatColumn, IntColumn, ObjectColumn]
+        reads = []
+        for index, column in enumerate(table.columns):
+            def getitem(space, row, index=index, column=column):
+                reads.append((index, row))
+                return type(column).getitem(column, space, row)
+            monkeypatch.setattr(column, "getitem", getitem)
+        w_res = space.appexec([w_l], """(rows):
+            return sum([r[u'qty'] for r in rows])
+        """)
+        assert space.int_w(w_res) == 999 * 1000
+        assert made == []
+        assert reads == [(2, row) for row in range(1000)]
+        for w_d in space.unpackiterable(w_l):
+            assert isinstance(w_d.get_strategy(), JsonRowDictStrategy)
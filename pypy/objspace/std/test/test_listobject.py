@@ -1668,6 +1668,28 @@ class AppTestListObject(object):
             assert L3.index(0.0, i) == i
             assert L3.index(-0.0, i) == i
 
+    def test_small_ints_and_bools(self):
+        l = [0] * 20
+        l[3] = 255
+        assert l.count(0) == 19
+        assert 255 in l and 256 not in l and -1 not in l
+        assert sum(l) == 255
+        assert l[2:6] == [0, 255, 0, 0]
+        l[5] = 300
+        assert sum(l) == 555
+        assert l.index(300) == 5
+        l = range(20)
+        l.sort(reverse=True)
+        assert l == range(19, -1, -1)
+        assert [x % 2 == 0 for x in range(4)] == [True, False, True, False]
+        l = [True, False, True]
+        l.sort()
+        assert l == [False, True, True]
+        assert [type(x) for x in l] == [bool, bool, bool]
+        assert sum(l) == 2
+        l.append(None)
+        assert l == [False, True, True, None]
+
 
 class AppTestRangeListForcing:
     """Tests for range lists that test forcing. Regular tests should go in
@@ -4,7 +4,7 @@ from pypy.objspace.std.listobject import (
     W_ListObject, EmptyListStrategy, ObjectListStrategy, IntegerListStrategy,
     FloatListStrategy, BytesListStrategy, RangeListStrategy,
     SimpleRangeListStrategy, make_range_list, AsciiListStrategy,
-    IntOrFloatListStrategy)
+    IntOrFloatListStrategy, ByteListStrategy, BoolListStrategy)
 from pypy.objspace.std import listobject
 from pypy.objspace.std.test.test_listobject import TestW_ListObject
 
@@ -1050,6 +1050,128 @@ class TestW_ListStrategies(TestW_ListObject):
         w_item = l.getitem(0)
         assert isinstance(w_item, space.StringObjectCls)
 
+    def test_byte_list(self):
+        space = self.space
+        w = space.wrap
+        w_l = W_ListObject(space, [w(i) for i in range(16)])
+        assert isinstance(w_l.strategy, ByteListStrategy)
+        assert space.listview_int(w_l) == range(16)
+        # too short, or not all fitting in a byte
+        w_l = W_ListObject(space, [w(i) for i in range(15)])
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+        w_l = W_ListObject(space, [w(i) for i in range(15)] + [w(256)])
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+        w_l = W_ListObject(space, [w(-1)] + [w(i) for i in range(15)])
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+
+    def test_byte_list_mul(self):
+        space = self.space
+        w_l = W_ListObject(space, [space.wrap(0)])
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+        w_res = w_l.mul(16)
+        assert isinstance(w_res.strategy, ByteListStrategy)
+        assert space.unwrap(w_res) == [0] * 16
+        assert isinstance(w_l.mul(15).strategy, IntegerListStrategy)
+        w_l = W_ListObject(space, [space.wrap(0), space.wrap(1000)])
+        assert isinstance(w_l.mul(100).strategy, IntegerListStrategy)
+        w_res = w_res.mul(3)
+        assert isinstance(w_res.strategy, ByteListStrategy)
+        assert w_res.length() == 48
+        w_slice = w_res.getslice(2, 30, 3, 10)
+        assert isinstance(w_slice.strategy, ByteListStrategy)
+        assert space.unwrap(w_slice) == [0] * 10
+
+    def test_byte_list_widening(self):
+        space = self.space
+        w = space.wrap
+        w_l = W_ListObject(space, [w(i) for i in range(16)])
+        w_l.append(w(255))
+        assert isinstance(w_l.strategy, ByteListStrategy)
+        w_l.append(w(256))
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+        assert space.unwrap(w_l) == range(16) + [255, 256]
+
+        w_l = W_ListObject(space, [w(i) for i in range(16)])
+        w_l.setitem(3, w(-5))
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+        assert space.unwrap(w_l)[:5] == [0, 1, 2, -5, 4]
+
+        w_l = W_ListObject(space, [w(i) for i in range(16)])
+        w_l.append(w(1.5))
+        assert isinstance(w_l.strategy, IntOrFloatListStrategy)
+
+        w_l = W_ListObject(space, [w(i) for i in range(16)])
+        w_l.append(w('x'))
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+
+    def test_byte_list_extend(self):
+        space = self.space
+        w = space.wrap
+        w_l = W_ListObject(space, [w(i) for i in range(16)])
+        w_l.extend(W_ListObject(space, [w(i) for i in range(20)]))
+        assert isinstance(w_l.strategy, ByteListStrategy)
+        w_l.extend(W_ListObject(space, [w(1000)]))
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+        assert space.unwrap(w_l) == range(16) + range(20) + [1000]
+
+        w_l = W_ListObject(space, [w(1000)])
+        w_l.extend(W_ListObject(space, [w(i) for i in range(16)]))
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+        assert space.unwrap(w_l) == [1000] + range(16)
+
+        w_l = W_ListObject(space, [w(i) for i in range(16)])
+        w_l.extend(make_range_list(space, 0, 1, 3))
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+        assert space.unwrap(w_l) == range(16) + range(3)
+
+    def test_byte_list_setslice(self):
+        space = self.space
+        w = space.wrap
+        w_l = W_ListObject(space, [w(i) for i in range(16)])
+        w_l.setslice(0, 1, 2, W_ListObject(space, [w(300)]))
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+        assert space.unwrap(w_l) == [300] + range(2, 16)
+
+        w_l = W_ListObject(space, [w(1000)])
+        w_l.setslice(0, 1, 1, W_ListObject(space, [w(i) for i in range(16)]))
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+        assert space.unwrap(w_l) == range(16)
+
+    def test_byte_list_sort_and_find(self):
+        space = self.space
+        w = space.wrap
+        w_l = W_ListObject(space, [w(i * 7 % 16) for i in range(32)])
+        w_l.sort(False)
+        assert space.unwrap(w_l) == sorted(range(16) * 2)
+        w_l.sort(True)
+        assert space.unwrap(w_l) == sorted(range(16) * 2, reverse=True)
+        assert w_l.find(w(15)) == 0
+        py.test.raises(ValueError, w_l.find, w(256))
+        py.test.raises(ValueError, w_l.find, w(-1))
+        assert w_l.find(w(3.0)) == 24
+        assert w_l.find(space.w_True) == 28
+
+    def test_bool_list(self):
+        space = self.space
+        w_l = W_ListObject(space, [space.w_True, space.w_False])
+        assert isinstance(w_l.strategy, BoolListStrategy)
+        assert w_l.getitem(0) is space.w_True
+        w_l.append(space.w_True)
+        assert isinstance(w_l.strategy, BoolListStrategy)
+        w_l.sort(False)
+        assert space.unwrap(w_l) == [False, True, True]
+        w_l.sort(True)
+        assert space.unwrap(w_l) == [True, True, False]
+        assert w_l.find(space.wrap(0)) == 2
+        w_l.append(space.wrap(1))
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        assert space.unwrap(w_l) == [True, True, False, 1]
+
+        w_l = W_ListObject(space, [])
+        w_l.append(space.w_False)
+        assert isinstance(w_l.strategy, BoolListStrategy)
+        assert isinstance(w_l.mul(100).strategy, BoolListStrategy)
+
 
 class TestW_ListStrategiesDisabled:
     spaceconfig = {"objspace.std.withliststrategies": False}
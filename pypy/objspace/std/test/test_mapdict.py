@@ -1,5 +1,7 @@
 from pypy.objspace.std.test.test_dictmultiobject import FakeSpace, W_DictObject
 from pypy.objspace.std.mapdict import *
+from pypy.objspace.std.mapdict import _attrs_from_root
+from rpython.rlib.longlong2float import longlong2float, float2longlong
 
 class Config:
     class objspace:
@@ -529,6 +531,216 @@ def test_size_prediction():
                 obj.setdictvalue(space, a, 50)
         assert c.terminator.size_estimate() in [(i + 10) // 2, (i + 11) // 2]
 
+def test_unboxed_attributes():
+    from pypy.objspace.std.intobject import W_IntObject
+    from pypy.objspace.std.floatobject import W_FloatObject
+    cls = Class()
+    obj = cls.instantiate()
+    obj.setdictvalue(space, "a", W_IntObject(10))
+    obj.setdictvalue(space, "b", "x")
+    obj.setdictvalue(space, "c", W_FloatObject(1.5))
+    obj.setdictvalue(space, "d", W_IntObject(-7))
+    assert isinstance(obj.map, UnboxedPlainAttribute)
+    assert obj.map.kind == KIND_INT
+    assert obj.map.back.kind == KIND_FLOAT
+    assert obj.map.back.back.kind == KIND_OBJECT
+    # a, c and d share the first storage slot
+    assert obj.map.length() == 2
+    assert len(obj.storage) == 2 or obj.storage[2] is None
+    unboxed = obj.storage[0]
+    assert isinstance(unboxed, UnboxedValues)
+    assert unboxed.values[1] == float2longlong(1.5)
+    assert obj.storage[1] == "x"
+    assert obj.getdictvalue(space, "a").intval == 10
+    assert obj.getdictvalue(space, "c").floatval == 1.5
+    assert obj.getdictvalue(space, "d").intval == -7
+
+    # writing values of the same kind doesn't change the map
+    map = obj.map
+    obj.setdictvalue(space, "a", W_IntObject(sys.maxint))
+    obj.setdictvalue(space, "c", W_FloatObject(-0.0))
+    assert obj.map is map
+    assert obj.storage[0] is unboxed
+    assert obj.getdictvalue(space, "a").intval == sys.maxint
+    assert str(obj.getdictvalue(space, "c").floatval) == "-0.0"
+
+    # other objects get the same map
+    obj2 = cls.instantiate()
+    obj2.setdictvalue(space, "a", W_IntObject(1))
+    obj2.setdictvalue(space, "b", "y")
+    obj2.setdictvalue(space, "c", W_FloatObject(2.5))
+    obj2.setdictvalue(space, "d", W_IntObject(3))
+    assert obj2.map is map
+    assert obj2.storage[0].values == [1, float2longlong(2.5), 3]
+
+def test_unboxed_attributes_bit_patterns():
+    # ints whose bit pattern is a NaN, and NaNs with a payload, come back
+    # unchanged: the values are stored as longlongs, not as floats
+    from pypy.objspace.std.intobject import W_IntObject
+    from pypy.objspace.std.floatobject import W_FloatObject
+    nan = longlong2float(0x7ff8000000001234)
+    cls = Class()
+    for intval in [-1, sys.maxint, -sys.maxint-1, 0x7ff8000000000001]:
+        for floatval in [nan, -0.0, float("inf"), float("-inf")]:
+            obj = cls.instantiate()
+            obj.setdictvalue(space, "a", W_IntObject(intval))
+            obj.setdictvalue(space, "b", W_FloatObject(floatval))
+            assert isinstance(obj.map, UnboxedPlainAttribute)
+            w_a = obj.getdictvalue(space, "a")
+            w_b = obj.getdictvalue(space, "b")
+            assert type(w_a) is W_IntObject and w_a.intval == intval
+            assert type(w_b) is W_FloatObject
+            assert float2longlong(w_b.floatval) == float2longlong(floatval)
+
+def test_unboxed_attributes_devolve_outside_elidable():
+    # _pure_get_new_attr() is elidable: it never replaces an attribute.
+    # Devolving does it in _get_new_attr() and changes the quasi-immutable
+    # 'cache_attrs_version', so that traces don't reuse the old result
+    from pypy.objspace.std.intobject import W_IntObject
+    cls = Class()
+    obj = cls.instantiate()
+    obj.setdictvalue(space, "a", W_IntObject(1))
+    terminator = obj.map.back
+    version = terminator.cache_attrs_version
+    unboxed_attr = terminator._get_new_attr("a", DICT, KIND_INT)
+    assert unboxed_attr is obj.map
+    attr = terminator._pure_get_new_attr("a", DICT, KIND_OBJECT, version)
+    assert attr is unboxed_attr
+    assert terminator.cache_attrs_version == version
+    boxed_attr = terminator._get_new_attr("a", DICT, KIND_OBJECT)
+    assert boxed_attr.kind == KIND_OBJECT
+    assert terminator.cache_attrs_version == version + 1
+    attr = terminator._pure_get_new_attr("a", DICT, KIND_INT, version + 1)
+    assert attr is boxed_attr
+    assert terminator._get_new_attr("a", DICT, KIND_INT) is boxed_attr
+    assert terminator.cache_attrs_version == version + 1
+
+def test_unboxed_attributes_devolve():
+    from pypy.objspace.std.intobject import W_IntObject
+    from pypy.objspace.std.floatobject import W_FloatObject
+    cls = Class()
+    obj = cls.instantiate()
+    obj.setdictvalue(space, "a", W_IntObject(10))
+    obj.setdictvalue(space, "b", W_FloatObject(1.5))
+    old_map = obj.map
+    obj2 = cls.instantiate()
+    obj2.setdictvalue(space, "a", W_IntObject(20))
+    obj2.setdictvalue(space, "b", W_FloatObject(2.5))
+    assert obj2.map is old_map
+
+    # an int attribute gets a float: it is stored boxed from now on
+    w_value = W_FloatObject(3.5)
+    obj.setdictvalue(space, "a", w_value)
+    assert obj.getdictvalue(space, "a") is w_value
+    assert obj.getdictvalue(space, "b").floatval == 1.5
+    assert obj.map.back.kind == KIND_OBJECT
+    assert obj.map.kind == KIND_FLOAT
+    assert obj.map is not old_map
+    # the other objects keep their map until they get another type too
+    assert obj2.map is old_map
+    assert obj2.getdictvalue(space, "a").intval == 20
+    obj2.setdictvalue(space, "a", "boxed")
+    assert obj2.map is obj.map
+    assert obj2.getdictvalue(space, "a") == "boxed"
+    assert obj2.getdictvalue(space, "b").floatval == 2.5
+    # and the new objects never get the unboxed map again
+    obj3 = cls.instantiate()
+    obj3.setdictvalue(space, "a", W_IntObject(30))
+    obj3.setdictvalue(space, "b", W_FloatObject(4.5))
+    assert obj3.map is obj.map
+    assert obj3.getdictvalue(space, "a").intval == 30
+
+def test_unboxed_attributes_devolve_same_map():
+    from pypy.objspace.std.intobject import W_IntObject
+    from pypy.objspace.std.floatobject import W_FloatObject
+    cls = Class()
+    objs = []
+    for i in range(3):
+        obj = cls.instantiate()
+        obj.setdictvalue(space, "a", W_IntObject(i))
+        obj.setdictvalue(space, "b", "x")
+        obj.setdictvalue(space, "c", W_FloatObject(i + 0.5))
+        objs.append(obj)
+    old_map = objs[0].map
+    # devolving the same attribute always gives the same map, which
+    # keeps the attributes in the same order
+    objs[0].setdictvalue(space, "c", "y")
+    objs[1].setdictvalue(space, "c", "z")
+    new_map = objs[0].map
+    assert objs[1].map is new_map
+    assert old_map._get_devolved_map(old_map) is new_map
+    assert [attr.name for attr in _attrs_from_root(new_map)] == ["a", "b", "c"]
+    assert old_map._devolves_into(new_map)
+    # devolving another attribute afterwards
+    objs[1].setdictvalue(space, "a", "t")
+    assert old_map._devolves_into(objs[1].map)
+    assert not new_map._devolves_into(old_map)
+    assert objs[1].getdictvalue(space, "a") == "t"
+    assert objs[1].getdictvalue(space, "b") == "x"
+    assert objs[1].getdictvalue(space, "c") == "z"
+    assert objs[2].map is old_map
+    assert objs[2].getdictvalue(space, "c").floatval == 2.5
+
+def test_unboxed_attributes_reorder():
+    # the unboxed attributes share a storage slot: there are more attributes
+    # to re-add than storage slots
+    from pypy.objspace.std.intobject import W_IntObject
+    cls = Class()
+    obj = cls.instantiate()
+    obj.setdictvalue(space, "x", W_IntObject(1))
+    obj.setdictvalue(space, "y", W_IntObject(2))
+    obj.setdictvalue(space, "z", W_IntObject(3))
+    obj2 = cls.instantiate()
+    obj2.setdictvalue(space, "y", W_IntObject(2))
+    obj2.setdictvalue(space, "z", W_IntObject(3))
+    assert obj2.map.length() == 1
+    assert obj2.map.num_attributes() == 2
+    obj2.setdictvalue(space, "x", W_IntObject(1))
+    assert obj2.map is obj.map
+    assert obj2.getdictvalue(space, "x").intval == 1
+    assert obj2.getdictvalue(space, "y").intval == 2
+    assert obj2.getdictvalue(space, "z").intval == 3
+
+def test_unboxed_attributes_limit():
+    from pypy.objspace.std.intobject import W_IntObject
+    cls = Class()
+    obj = cls.instantiate()
+    for i in range(1000):
+        obj.setdictvalue(space, str(i), W_IntObject(i))
+    # moved to a dict after LIMIT_MAP_ATTRIBUTES attributes, even though
+    # they only took a single storage slot
+    assert obj.map.search(DICT) is None
+    assert obj.map.num_attributes() < LIMIT_MAP_ATTRIBUTES
+    assert len(obj.storage) == 1
+    for i in range(1000):
+        assert obj.getdictvalue(space, str(i)).intval == i
+
+def test_unboxed_attributes_delete_and_materialize():
+    from pypy.objspace.std.intobject import W_IntObject
+    from pypy.objspace.std.floatobject import W_FloatObject
+    cls = Class()
+    obj = cls.instantiate()
+    obj.setdictvalue(space, "a", W_IntObject(1))
+    obj.setdictvalue(space, "b", W_FloatObject(2.0))
+    obj.setdictvalue(space, "c", W_IntObject(3))
+    assert obj.deldictvalue(space, "b")
+    assert obj.getdictvalue(space, "a").intval == 1
+    assert obj.getdictvalue(space, "b") is None
+    assert obj.getdictvalue(space, "c").intval == 3
+
+    class FakeDict(W_DictObject):
+        def __init__(self, d):
+            self.dstorage = d
+
+    d = {}
+    w_d = FakeDict(d)
+    flag = obj.map.write(obj, "dict", SPECIAL, w_d)
+    assert flag
+    materialize_r_dict(space, obj, d)
+    assert sorted(d) == ["a", "c"]
+    assert d["a"].intval == 1
+    assert d["c"].intval == 3
+
 # ___________________________________________________________
 # dict tests
 
@@ -907,6 +1119,102 @@ class AppTestWithMapDict(object):
         for key in d:
             assert d[key] == int(key)
 
+    def test_unboxed_attributes(self):
+        import sys
+        class A(object):
+            pass
+        a = A()
+        a.x = 1
+        a.y = 2.5
+        a.z = "z"
+        a.t = -sys.maxint - 1
+        for i in range(10):
+            a.x += 1
+            a.y *= 2
+        assert a.x == 11
+        assert a.y == 2560.0
+        assert a.t == -sys.maxint - 1
+        assert type(a.x) is int and type(a.y) is float
+        assert a.__dict__ == {"x": 11, "y": 2560.0, "z": "z",
+                              "t": -sys.maxint - 1}
+        # changing the type of the values
+        a.x = 1.5
+        a.y = True
+        b = A()
+        b.x = 5
+        b.y = 6.5
+        b.z = None
+        assert (a.x, a.y, a.z) == (1.5, True, "z")
+        assert type(a.y) is bool
+        b.x = 2L
+        assert type(b.x) is long
+        assert (b.x, b.y, b.z) == (2, 6.5, None)
+        del a.x
+        assert not hasattr(a, "x")
+        assert (a.y, a.t) == (True, -sys.maxint - 1)
+
+    def test_unboxed_attributes_devolve_while_iterating(self):
+        class A(object):
+            pass
+        a = A()
+        a.x = 1
+        a.y = 2
+        a.z = 3
+        seen = []
+        for k in a.__dict__:
+            seen.append(k)
+            setattr(a, k, str(getattr(a, k)))
+        assert sorted(seen) == ["x", "y", "z"]
+        assert (a.x, a.y, a.z) == ("1", "2", "3")
+        b = A()
+        b.x = 1.5
+        b.y = 2
+        items = []
+        for k, v in b.__dict__.items():
+            items.append((k, v))
+            b.x = None
+        assert sorted(items) == [("x", 1.5), ("y", 2)]
+        for v in b.__dict__.itervalues():
+            b.y = "y"
+        assert (b.x, b.y) == (None, "y")
+
+    def test_unboxed_attributes_slots_and_class_change(self):
+        class A(object):
+            __slots__ = ["x", "y"]
+        class B(object):
+            pass
+        class C(object):
+            pass
+        a = A()
+        a.x = 3
+        a.y = 4.25
+        assert (a.x, a.y) == (3, 4.25)
+        a.x = "x"
+        assert (a.x, a.y) == ("x", 4.25)
+        del a.y
+        raises(AttributeError, "a.y")
+        b = B()
+        b.u = 7
+        b.v = float("nan")
+        b.__class__ = C
+        assert isinstance(b, C)
+        assert b.u == 7
+        assert b.v != b.v
+        b.__dict__ = {"w": 8}
+        assert not hasattr(b, "u")
+        assert b.w == 8
+
+    def test_unboxed_attributes_identity(self):
+        class A(object):
+            pass
+        a = A()
+        a.x = 12345678
+        a.y = 0.1
+        assert a.x is 12345678
+        assert a.y is 0.1
+        assert id(a.x) == id(12345678)
+        assert a.x is a.x and a.y is a.y
+
 
 
 class AppTestWithMapDictAndCounters(object):
@@ -936,6 +1244,32 @@ class AppTestWithMapDictAndCounters(object):
             return space.wrap((failures, successes, globalfailures))
         check.unwrap_spec = [gateway.ObjSpace, gateway.W_Root, 'text']
         cls.w_check = cls.space.wrap(gateway.interp2app(check))
+        #
+        def check_chain(space, w_func, name):
+            # like check(), but for all the entries of the polymorphic
+            # cache; also returns their number
+            w_code = space.getattr(w_func, space.wrap('func_code'))
+            nameindex = map(space.str_w, w_code.co_names_w).index(name)
+            entry = w_code._mapdict_caches[nameindex]
+            while entry is not None:
+                entry.failure_counter = 0
+                entry.success_counter = 0
+                entry = entry.next
+            #
+            w_res = space.call_function(w_func)
+            assert space.eq_w(w_res, space.wrap(42))
+            #
+            failures = successes = length = 0
+            entry = w_code._mapdict_caches[nameindex]
+            if entry is not INVALID_CACHE_ENTRY:
+                while entry is not None:
+                    failures += entry.failure_counter
+                    successes += entry.success_counter
+                    length += 1
+                    entry = entry.next
+            return space.wrap((failures, successes, length))
+        check_chain.unwrap_spec = [gateway.ObjSpace, gateway.W_Root, 'text']
+        cls.w_check_chain = cls.space.wrap(gateway.interp2app(check_chain))
 
     def test_simple(self):
         class A(object):
@@ -974,6 +1308,25 @@ class AppTestWithMapDictAndCounters(object):
         res = self.check(f, 'x')
         assert res == (0, 1, 0)
 
+    def test_unboxed(self):
+        class A(object):
+            pass
+        a = A()
+        a.y = "y"
+        a.x = 42.0
+        def f():
+            return a.x
+        #
+        res = self.check(f, 'x')
+        assert res == (1, 0, 0)
+        res = self.check(f, 'x')
+        assert res == (0, 1, 0)
+        a.x = 42
+        res = self.check(f, 'x')
+        assert res == (1, 0, 0)
+        res = self.check(f, 'x')
+        assert res == (0, 1, 0)
+
     def test_property(self):
         class A(object):
             x = property(lambda self: 42)
@@ -1174,6 +1527,104 @@ class AppTestWithMapDictAndCounters(object):
         res = self.check(f, 'm')
         assert res == (0, 2, 1)
 
+    def test_polymorphic(self):
+        class A(object):
+            pass
+        class B(object):
+            pass
+        a = A()
+        a.x = 21
+        b = B()
+        b.y = 0
+        b.x = 21
+        def f():
+            res = 0
+            for obj in [a, b, a, b]:
+                res += obj.x
+            return res // 2
+        #
+        # one entry for each map: the last one is first in the cache
+        res = self.check(f, 'x')
+        assert res == (1, 1, 0)
+        res = self.check(f, 'x')
+        assert res == (0, 2, 0)
+        res = self.check(f, 'x')
+        assert res == (0, 2, 0)
+
+    def test_polymorphic_call_method(self):
+        global A, B
+        class A(object):
+            def m(self):
+                return 20
+        class B(object):
+            def m(self):
+                return 22
+
+        exec """if 1:
+
+            def f():
+                res = 0
+                for obj in [A(), B()]:
+                    res += obj.m()
+                return res
+        """
+        res = self.check(f, 'm')
+        assert res == (1, 0, 0)
+        res = self.check(f, 'm')
+        assert res == (0, 1, 0)
+        res = self.check(f, 'm')
+        assert res == (0, 1, 0)
+
+    def test_megamorphic(self):
+        classes = []
+        for i in range(6):
+            class A(object):
+                pass
+            classes.append(A)
+        objs = []
+        for i, cls in enumerate(classes):
+            obj = cls()
+            obj.x = i
+            objs.append(obj)
+        def f():
+            total = 0
+            for i in range(7):
+                for obj in objs:
+                    total += obj.x
+            return total - 15 * 7 + 42
+        #
+        # the entries of the maps 0 to 3 are created, then the last
+        # one (for the map 0) is refilled for the maps 4 and 5
+        res = self.check_chain(f, 'x')
+        assert res == (6 + 6 * 3, 3 * 6, 4)
+        # the entries for the maps 1 to 3 stay; the maps 0, 4 and 5
+        # keep refilling the last one
+        res = self.check_chain(f, 'x')
+        assert res == (3 * 7, 3 * 7, 4)
+
+    def test_refill_out_of_date_entry(self):
+        class A(object):
+            pass
+        class B(object):
+            pass
+        a = A()
+        a.x = 42
+        b = B()
+        b.x = 42
+        def f():
+            return (a.x + b.x) // 2
+        #
+        res = self.check_chain(f, 'x')
+        assert res == (2, 0, 2)
+        res = self.check_chain(f, 'x')
+        assert res == (0, 2, 2)
+        #
+        A.y = 5     # changes the version_tag of A
+        res = self.check_chain(f, 'x')
+        assert res == (1, 1, 2)    # refilled, not added
+        res = self.check_chain(f, 'x')
+        assert res == (0, 2, 2)
+
     def test_dont_keep_class_alive(self):
         import weakref
         import gc
@@ -0,0 +1,65 @@
+from pypy.objspace.std.test import test_bytesobject, test_unicodeobject
+
+
+class TestPrebuiltChar:
+    spaceconfig = {"objspace.std.withprebuiltchar": True}
+
+    def test_newbytes(self):
+        space = self.space
+        assert space.newbytes("a") is space.newbytes("a")
+        assert space.newtext("\xff") is space.newbytes("\xff")
+        assert space.newbytes("ab") is not space.newbytes("ab")
+
+    def test_getitem(self):
+        space = self.space
+        w_s = space.newbytes("hello")
+        w_c = space.getitem(w_s, space.newint(1))
+        assert w_c is space.newbytes("e")
+        w_it = space.iter(w_s)
+        assert space.next(w_it) is space.newbytes("h")
+        w_chr = space.call_function(space.builtin.get("chr"), space.newint(7))
+        assert w_chr is space.newbytes("\x07")
+
+    def test_unicode(self):
+        space = self.space
+        assert space.newutf8("a", 1) is space.newutf8("a", 1)
+        w_u = space.newutf8("x\xc3\xa9", 2)
+        assert space.getitem(w_u, space.newint(0)) is space.newutf8("x", 1)
+        w_e = space.getitem(w_u, space.newint(1))
+        assert space.utf8_w(w_e) == "\xc3\xa9"
+        assert w_e is not space.getitem(w_u, space.newint(1))
+        w_it = space.iter(w_u)
+        assert space.next(w_it) is space.newutf8("x", 1)
+
+
+class TestNoPrebuiltChar:
+    def test_not_shared(self):
+        # the tables are filled by the spaces that have the option, but
+        # not used by the others
+        from pypy.objspace.std.bytesobject import W_BytesObject
+        from pypy.objspace.std.unicodeobject import W_UnicodeObject
+        from pypy.tool.pytest.objspace import gettestobjspace
+        gettestobjspace(**{"objspace.std.withprebuiltchar": True})
+        assert W_BytesObject.PREBUILT is not None
+        space = self.space
+        assert not space.config.objspace.std.withprebuiltchar
+        assert space.newbytes("a") is not space.newbytes("a")
+        w_s = space.newbytes("hello")
+        w_c = space.getitem(w_s, space.newint(1))
+        assert w_c is not W_BytesObject.PREBUILT[ord("e")]
+        w_h = space.next(space.iter(w_s))
+        assert w_h is not W_BytesObject.PREBUILT[ord("h")]
+        w_u = space.newutf8("xy", 2)
+        w_x = space.getitem(w_u, space.newint(0))
+        assert w_x is not W_UnicodeObject.PREBUILT[ord("x")]
+        w_x = space.next(space.iter(w_u))
+        assert w_x is not W_UnicodeObject.PREBUILT[ord("x")]
+
+
+class AppTestBytesObject(test_bytesobject.AppTestBytesObject):
+    spaceconfig = {"objspace.std.withprebuiltchar": True}
+
+
+class AppTestUnicodeString(test_unicodeobject.AppTestUnicodeString):
+    spaceconfig = {"objspace.std.withprebuiltchar": True,
+                   "usemodules": ["unicodedata"]}
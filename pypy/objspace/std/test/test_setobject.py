@@ -1069,6 +1069,161 @@ class AppTestAppSetTest:
         s.intersection_update(set())
         assert strategy(s) == "EmptySetStrategy"
 
+    def test_tuple_strategy(self):
+        from __pypy__ import strategy
+        s = set([(1, 2), ("a", 3), (4, "b", 5)])
+        assert strategy(s) == "TupleSetStrategy"
+        s.add((6, 7))
+        assert strategy(s) == "TupleSetStrategy"
+        assert (1, 2) in s
+        assert ("a", 3) in s
+        assert (2, 1) not in s
+        assert strategy(s) == "TupleSetStrategy"
+        s2 = set([(1, 2), (8, 9)])
+        assert strategy(s2) == "TupleSetStrategy"
+        assert s & s2 == set([(1, 2)])
+        assert s - s2 == set([("a", 3), (4, "b", 5), (6, 7)])
+        assert strategy(s - s2) == "TupleSetStrategy"
+        assert s2 - set([1, 2]) == s2
+        assert s ^ s2 == set([("a", 3), (4, "b", 5), (6, 7), (8, 9)])
+        assert (1.0, 2) in s
+        assert strategy(s) == "ObjectSetStrategy"
+        s = set()
+        s.add((1, 2))
+        assert strategy(s) == "TupleSetStrategy"
+        s.add((1, 2.5))
+        assert strategy(s) == "ObjectSetStrategy"
+        assert s == set([(1, 2), (1, 2.5)])
+
+    def test_bitmap_strategy(self):
+        from __pypy__ import strategy
+        s = set(range(100))
+        assert strategy(s) == "BitmapSetStrategy"
+        assert strategy(set(range(5))) == "IntegerSetStrategy"
+        assert strategy(set(range(0, 10000, 100))) == "IntegerSetStrategy"
+        assert len(s) == 100
+        assert 5 in s and 99 in s
+        assert 100 not in s and -1 not in s
+        assert sorted(s) == range(100)
+        s.add(200)
+        s.add(-70)
+        assert strategy(s) == "BitmapSetStrategy"
+        assert sorted(s) == [-70] + range(100) + [200]
+        s.add(10 ** 9)
+        assert strategy(s) == "IntegerSetStrategy"
+        assert sorted(s) == [-70] + range(100) + [200, 10 ** 9]
+        s = set(range(-50, 50))
+        s.add("x")
+        assert strategy(s) == "ObjectSetStrategy"
+        assert s == set(range(-50, 50) + ["x"])
+        assert frozenset(range(100)) == frozenset(range(100))
+        assert hash(frozenset(range(100))) == hash(frozenset(range(99, -1, -1) + [5]))
+
+    def test_bitmap_strategy_operations(self):
+        from __pypy__ import strategy
+        a = set(range(0, 300, 2))
+        b = set(range(100, 400, 3))
+        assert strategy(a) == strategy(b) == "BitmapSetStrategy"
+        la = range(0, 300, 2)
+        lb = range(100, 400, 3)
+        for op in [set.__and__, set.__or__, set.__sub__, set.__xor__,
+                   set.issubset, set.isdisjoint, set.__eq__]:
+            res = op(a, b)
+            expected = op(set(la), set(lb))
+            assert res == expected
+            res = op(b, a)
+            expected = op(set(lb), set(la))
+            assert res == expected
+        assert strategy(a | b) == "BitmapSetStrategy"
+        assert strategy(a - b) == "BitmapSetStrategy"
+        assert set(range(50)) < set(range(60))
+        assert not set(range(50)).isdisjoint(set(range(49, 100)))
+        assert set(range(50)).isdisjoint(set(range(50, 100)))
+        assert set(range(50)) != set(range(1, 51))
+        # a sparse result switches back to the dict of ints
+        c = set(range(1000)) & set(range(990, 2000))
+        assert c == set(range(990, 1000))
+        c = set(range(1000)) & set([5, 800] + range(2000, 2100))
+        assert strategy(c) == "IntegerSetStrategy"
+        assert c == set([5, 800])
+        # with sets of other strategies
+        c = set(range(20)) & set([3, 4, 50])
+        assert c == set([3, 4])
+        assert strategy(c) == "IntegerSetStrategy"
+        assert set(range(20)) - set([3, 4, 50]) == set(range(20)) - set([3, 4])
+        assert set([3, 4, 50]) - set(range(20)) == set([50])
+        assert set([3, 4, 50]) | set(range(20)) == set(range(20) + [50])
+        assert strategy(set([3, 4, 50]) | set(range(20))) == "IntegerSetStrategy"
+        assert set(range(20)) ^ set([3, 4, 50]) == set(range(20)) ^ set([3, 50, 4])
+        assert set(range(20)) & set(["a"]) == set()
+        assert set(range(20)) - set(["a"]) == set(range(20))
+        assert set(range(20)) == set(range(20)) | set()
+        assert set(range(20)) | set(["a"]) == set(range(20) + ["a"])
+        assert set(range(20)) != set(map(str, range(20)))
+        assert set(range(20)) == set([float(i) for i in range(20)])
+        assert set([3, 4]) <= set(range(20))
+        assert set([3, 4]).isdisjoint(set(range(5, 25)))
+
+    def test_bitmap_strategy_inplace(self):
+        from __pypy__ import strategy
+        a = set(range(100))
+        a -= set(range(10, 100))
+        assert a == set(range(10))
+        a = set(range(100))
+        a &= set(range(50, 150))
+        assert a == set(range(50, 100))
+        assert strategy(a) == "BitmapSetStrategy"
+        a |= set(range(200, 300))
+        assert a == set(range(50, 100) + range(200, 300))
+        assert strategy(a) == "BitmapSetStrategy"
+        a ^= set(range(250, 350))
+        assert a == set(range(50, 100) + range(200, 250) + range(300, 350))
+        a = set(range(100))
+        a |= set([1000])
+        assert a == set(range(100) + [1000])
+        a = set(range(100))
+        a -= set([5, 6, 1000])
+        assert a == set(range(100)) - set([5, 6])
+        a = set(range(100))
+        a &= set(["a", "b"])
+        assert a == set()
+        a = set(range(100))
+        a.update(set())
+        a.difference_update(set())
+        a.symmetric_difference_update(set())
+        assert strategy(a) == "BitmapSetStrategy"
+        a.intersection_update(set())
+        assert strategy(a) == "EmptySetStrategy"
+
+    def test_bitmap_strategy_remove_pop(self):
+        from __pypy__ import strategy
+        s = set(range(1000))
+        for i in range(0, 1000, 2):
+            s.remove(i)
+        assert strategy(s) == "BitmapSetStrategy"
+        raises(KeyError, s.remove, 0)
+        s.discard(0)
+        for i in range(1, 960, 2):
+            s.discard(i)
+        # too sparse now
+        assert strategy(s) == "IntegerSetStrategy"
+        assert s == set(range(961, 1000, 2))
+        s = set(range(100))
+        popped = [s.pop() for i in range(100)]
+        assert sorted(popped) == range(100)
+        assert s == set()
+        raises(KeyError, s.pop)
+
+    def test_bitmap_strategy_iter(self):
+        s = set(range(-100, 100))
+        it = iter(s)
+        assert it.__length_hint__() == 200
+        assert sorted(it) == range(-100, 100)
+        it = iter(s)
+        next(it)
+        s.add(500)
+        raises(RuntimeError, list, it)
+
     def test_weird_exception_from_iterable(self):
         def f():
            raise ValueError
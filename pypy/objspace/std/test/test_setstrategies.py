@@ -2,7 +2,9 @@ from pypy.objspace.std.setobject import W_SetObject
 from pypy.objspace.std.setobject import (
     BytesIteratorImplementation, BytesSetStrategy, EmptySetStrategy,
     IntegerIteratorImplementation, IntegerSetStrategy, ObjectSetStrategy,
-    UnicodeIteratorImplementation, AsciiSetStrategy)
+    UnicodeIteratorImplementation, AsciiSetStrategy, BitmapSetStrategy,
+    BitmapIteratorImplementation, IntBitmap, bitmap_from_int_list,
+    combine_bitmaps, BITMAP_AND, BITMAP_OR, BITMAP_XOR, BITMAP_SUB)
 from pypy.objspace.std.listobject import W_ListObject
 
 class TestW_SetStrategies:
@@ -144,3 +146,63 @@ class TestW_SetStrategies:
         #
         #s = W_SetObject(space, self.wrapped([u"a", u"b"]))
         #assert sorted(space.listview_unicode(s)) == [u"a", u"b"]
+
+    def test_bitmap_from_list(self):
+        space = self.space
+        s = W_SetObject(space, self.wrapped(range(100)))
+        assert s.strategy is space.fromcache(BitmapSetStrategy)
+        assert space.listview_int(s) == range(100)
+        it = s.iter()
+        assert isinstance(it, BitmapIteratorImplementation)
+        assert space.unwrap(it.next()) == 0
+        assert space.unwrap(it.next()) == 1
+        s = W_SetObject(space, self.wrapped(range(0, 1000, 10)))
+        assert s.strategy is space.fromcache(IntegerSetStrategy)
+
+    def test_bitmap_from_int_list(self):
+        assert bitmap_from_int_list(range(10)) is None
+        assert bitmap_from_int_list(range(0, 10000, 100)) is None
+        b = bitmap_from_int_list(range(-64, 64) + [5, 6])
+        assert b.first_word == -1
+        assert len(b.words) == 2
+        assert b.length == 128
+        assert b.tolist() == range(-64, 64)
+        assert b.contains(-64) and b.contains(63)
+        assert not b.contains(-65) and not b.contains(64)
+
+    def test_intbitmap(self):
+        b = IntBitmap(0, [], 0)
+        assert b.add(1000)
+        assert b.first_word == 1000 // 64
+        assert b.add(900)
+        assert b.add(1100)
+        assert b.tolist() == [900, 1000, 1100]
+        assert not b.add(10 ** 6)
+        assert b.tolist() == [900, 1000, 1100]
+        assert b.remove(1000)
+        assert not b.remove(1000)
+        assert b.length == 2
+        assert b.pop() == 1100
+        assert b.pop() == 900
+        assert b.length == 0
+
+    def test_combine_bitmaps(self):
+        l1 = range(0, 500, 3)
+        l2 = range(200, 800, 5)
+        b1 = bitmap_from_int_list(l1)
+        b2 = bitmap_from_int_list(l2)
+        for op, func in [(BITMAP_AND, set.__and__), (BITMAP_OR, set.__or__),
+                         (BITMAP_XOR, set.__xor__), (BITMAP_SUB, set.__sub__)]:
+            b = combine_bitmaps(b1, b2, op)
+            assert b.tolist() == sorted(func(set(l1), set(l2)))
+            assert b.length == len(b.tolist())
+            if b.words:
+                assert b.words[0] and b.words[-1]
+        assert combine_bitmaps(b1, IntBitmap(0, [], 0), BITMAP_OR).tolist() == l1
+        assert combine_bitmaps(IntBitmap(0, [], 0), b2, BITMAP_OR).tolist() == l2
+        assert combine_bitmaps(b1, bitmap_from_int_list(range(1000, 1100)),
+                               BITMAP_AND).tolist() == []
+        assert b1.issubset(combine_bitmaps(b1, b2, BITMAP_OR))
+        assert not b1.issubset(b2)
+        assert not b1.isdisjoint(b2)
+        assert b1.isdisjoint(combine_bitmaps(b2, b1, BITMAP_SUB))
@@ -49,7 +49,11 @@ class TestW_SpecialisedTupleObject():
         hash_test([1, (1, 2)])
         hash_test([1, ('a', 2)])
         hash_test([1, ()])
-        hash_test([1, 2, 3], must_be_specialized=False)
+        hash_test([1, 2, 3])
+        hash_test([1.5, -2.0, 1e300, 0.0])
+        hash_test([1, 2, 3.0], must_be_specialized=False)
+        hash_test(range(8))
+        hash_test(range(100), must_be_specialized=False)
         hash_test([1 << 62, 0])
 
     try:
@@ -101,9 +105,68 @@ class AppTestW_SpecialisedTupleObject:
         assert len(t) == 2
 
     def test_notspecialisedtuple(self):
-        assert not self.isspecialised((42, 43, 44, 45))
+        assert not self.isspecialised((42, 43, 44, 'x'))
+        assert not self.isspecialised((42, 43, 44.5))
         assert not self.isspecialised((1.5,))
 
+    def test_homogeneous(self):
+        t = (1, 2, 3, 4, 5)
+        assert self.isspecialised(t, '_ints')
+        assert self.isspecialised((1.5, 2.5, 3.5), '_floats')
+        assert self.isspecialised(tuple(range(8)), '_ints')
+        assert self.isspecialised(tuple([0.5] * 8), '_floats')
+        # longer tuples are not specialised: slicing them, iterating over
+        # them, etc. would box all the items each time
+        assert not self.isspecialised(tuple(range(9)))
+        assert not self.isspecialised(tuple(range(1000)))
+        assert not self.isspecialised(tuple([0.5] * 9))
+        assert self.isspecialised(t[1:4], '_ints')
+        assert self.isspecialised(t + (6,), '_ints')
+        assert len(t) == 5
+        assert t[0] == 1 and t[-1] == 5
+        raises(IndexError, "t[5]")
+        raises(IndexError, "t[-6]")
+        assert list(t) == [1, 2, 3, 4, 5]
+        assert t[::2] == (1, 3, 5)
+        assert 3 in t and 6 not in t and 3.0 in t
+        assert t.index(4) == 3 and t.count(2) == 1
+        assert t == (1, 2, 3, 4, 5.0)
+        assert t == (1, 2, 3, 4, 5L)
+        assert t != (1, 2, 3, 4, 6)
+        assert t != (1, 2, 3, 4)
+        assert (1.0, 2.0, 3.0) == (1, 2, 3)
+        assert t < (1, 2, 3, 4, 6) and t > (1, 2, 3, 4)
+        assert type((True, False, True)[0]) is bool
+        assert not self.isspecialised((True, False, True), '_ints')
+
+    def test_homogeneous_hash(self):
+        for t in [(1, 2, 3), (-1, -1, -1), (1.5, 2.0, -0.0),
+                  (float('inf'), 1e300, 2.0)]:
+            u = tuple(list(t) + ['x'])[:-1]
+            assert hash(t) == hash(u)
+            assert t == u
+        assert hash((1, 2, 3)) == hash((1.0, 2.0, 3.0)) == hash((1L, 2, 3.0))
+        d = {(1, 2, 3): 'a', (1.5, 2.5, 3.5): 'b'}
+        assert d[1.0, 2, 3] == 'a'
+        assert d[tuple([1.5, 2.5, 3.5])] == 'b'
+
+    def test_tuple_keys(self):
+        from __pypy__ import strategy
+        keys = [(1, 2), (-1, -1), (1, 2, 3), ("a", 1), (1, "a", 2, "b")]
+        d = dict.fromkeys(keys, 42)
+        assert strategy(d) == "TupleDictStrategy"
+        for key in keys:
+            assert d[tuple(list(key))] == 42
+            assert d[tuple(list(key) + ['x'])[:-1]] == 42
+        assert d.get((2, 1)) is None
+        assert d.get((1, 2, 3, 4)) is None
+        assert strategy(d) == "TupleDictStrategy"
+        s = set(keys)
+        assert strategy(s) == "TupleSetStrategy"
+        assert s == set([tuple(list(key)) for key in keys])
+        assert d[1.0, 2] == 42
+        assert strategy(d) == "ObjectDictStrategy"
+
     def test_slicing_to_specialised(self):
         t = (1, 2, 3)
         assert self.isspecialised(t[0:2])
@@ -226,8 +289,8 @@ class AppTestW_SpecialisedTupleObject:
         assert a == (2.2,) + b
         assert not a != (2.2,) + b
         #
-        if not self.isspecialised((1, 2, 3)):
-            skip("don't have specialization for 3-tuples")
+        if not self.isspecialised((1, 2.2, '333')):
+            skip("don't have specialization for mixed 3-tuples")
         a = (1, 2.2, '333')
         assert self.isspecialised(a)
         assert len(a) == 3
@@ -250,6 +313,10 @@ class AppTestW_SpecialisedTupleObject:
         assert N in T
         assert T == (N, N)
         assert (0.0, 0.0) == (-0.0, -0.0)
+        T = (N, N, N)
+        assert N in T
+        assert T == (N, N, N)
+        assert (0.0, 0.0, 0.0) == (-0.0, -0.0, -0.0)
 
 
 class AppTestAll(test_tupleobject.AppTestW_TupleObject):
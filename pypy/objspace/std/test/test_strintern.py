@@ -0,0 +1,49 @@
+from pypy.objspace.std.strintern import StrInternCache, STR_INTERN_MAX_LENGTH
+
+
+class TestStrInternCache:
+    def test_intern(self):
+        cache = StrInternCache(self.space)
+        s1 = "".join(["na", "me"])
+        s2 = "".join(["na", "me"])
+        assert s1 is not s2
+        assert cache.intern(s1) is s1
+        assert cache.intern(s2) is s1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_not_identifier_like(self):
+        cache = StrInternCache(self.space)
+        for s in ["", "a b", "x-y", "a" * (STR_INTERN_MAX_LENGTH + 1)]:
+            s2 = s[:1] + s[1:]
+            assert cache.intern(s) is s
+            assert cache.intern(s2) is s2
+        assert (cache.hits, cache.misses) == (0, 0)
+
+
+class AppTestStrIntern:
+    spaceconfig = {"objspace.std.withstrintern": True,
+                   "usemodules": ["_pypyjson"]}
+
+    def test_split(self):
+        import __pypy__
+        __pypy__.reset_str_intern_counters()
+        line = "id,name,price\n" * 10
+        words = line.replace("\n", ",").split(",")
+        assert words[:4] == ["id", "name", "price", "id"]
+        hits, misses = __pypy__.str_intern_counters()
+        assert misses == 3
+        assert hits == 27
+
+    def test_unicode_split(self):
+        import __pypy__
+        __pypy__.reset_str_intern_counters()
+        words = u"abc abc \xe9 \xe9 x-y x-y".split()
+        assert words == [u"abc", u"abc", u"\xe9", u"\xe9", u"x-y", u"x-y"]
+        assert __pypy__.str_intern_counters() == (1, 1)
+
+    def test_json(self):
+        import __pypy__, _pypyjson
+        __pypy__.reset_str_intern_counters()
+        l = _pypyjson.loads('["red", "green", "red", "a b", "red"]')
+        assert l == [u"red", u"green", u"red", u"a b", u"red"]
+        assert __pypy__.str_intern_counters() == (2, 2)
@@ -0,0 +1,66 @@
+from pypy.objspace.std.test import test_bytesobject
+
+class AppTestStringObject(test_bytesobject.AppTestBytesObject):
+    spaceconfig = {"objspace.std.withstrslice": True}
+
+    def setup_class(cls):
+        cls.w_is_slice = cls.space.appexec([], """():
+            import __pypy__
+            def is_slice(s):
+                return 'W_BytesSliceObject' in __pypy__.internal_repr(s)
+            return is_slice
+        """)
+
+    def test_basic(self):
+        s = "abcdefgh" * 100
+        t = s[10:500]
+        assert self.is_slice(t)
+        assert type(t) is str
+        assert len(t) == 490
+        assert t == s[10:500]
+        assert t[0] == "c" and t[-1] == "d" and t[-490] == "c"
+        raises(IndexError, "t[490]")
+        raises(IndexError, "t[-491]")
+        assert hash(t) == hash("cdefgh" + "abcdefgh" * 60 + "abcd")
+
+    def test_small_slices_are_copied(self):
+        s = "x" * 1000
+        assert not self.is_slice(s[:63])
+        # too small compared to s
+        assert not self.is_slice(s[:200])
+        assert self.is_slice(s[:250])
+        assert self.is_slice(s[750:])
+
+    def test_slice_of_slice(self):
+        s = "".join([chr(i) for i in range(256)]) * 4
+        t = s[100:900]
+        u = t[50:700]
+        assert self.is_slice(u)
+        assert u == s[150:800]
+        assert t[::2] == s[100:900:2]
+        v = u[10:100]
+        assert not self.is_slice(v)
+        assert v == s[160:250]
+        assert t[-300:] == s[600:900]
+        assert t[800:] == ""
+
+    def test_methods(self):
+        s = "hello world " * 50
+        t = s[6:]
+        assert t.startswith("world")
+        assert t.split()[:3] == ["world", "hello", "world"]
+        assert t.upper().startswith("WORLD")
+        assert t.find("hello") == 6
+        assert "hello" + t == "hello" + s[6:]
+        assert s[:594] < t
+        assert {t: 1}[s[6:]] == 1
+        assert str(t) is t
+        assert buffer(t)[:5] == "world"
+        assert t.strip() == s[6:-1]
+        assert "x".join([t, t]) == s[6:] + "x" + s[6:]
+
+    def test_partition(self):
+        s = "a" * 100 + "=" + "b" * 100
+        left, sep, right = s.partition("=")
+        assert self.is_slice(left) and self.is_slice(right)
+        assert (left, sep, right) == ("a" * 100, "=", "b" * 100)
@@ -7,11 +7,14 @@ from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.gateway import (
     WrappedDefault, interp2app, interpindirect2app, unwrap_spec)
 from pypy.interpreter.typedef import TypeDef
+from pypy.objspace.std.bytesobject import W_BytesObject
+from pypy.objspace.std.intobject import W_IntObject, _hash_int
 from pypy.objspace.std.sliceobject import (W_SliceObject, unwrap_start_stop,
     normalize_simple_slice)
 from pypy.objspace.std.util import negate, IDTAG_SPECIAL, IDTAG_SHIFT
 from rpython.rlib import jit
 from rpython.rlib.debug import make_sure_not_resized
+from rpython.rlib.objectmodel import compute_hash
 from rpython.rlib.rarithmetic import intmask
 
 
@@ -104,6 +107,8 @@ class W_AbstractTupleObject(W_Root):
             return w_sequence
         else:
             tuple_w = space.fixedview(w_sequence)
+            if space.is_w(w_tupletype, space.w_tuple):
+                return space.newtuple(tuple_w)
         w_obj = space.allocate_instance(W_TupleObject, w_tupletype)
         W_TupleObject.__init__(w_obj, tuple_w)
         return w_obj
@@ -370,3 +375,90 @@ def wraptuple(space, list_w):
         except NotSpecialised:
             pass
     return W_TupleObject(list_w)
+
+
+# ____________________________________________________________
+# Keys of TupleDictStrategy and TupleSetStrategy: exact tuples whose items
+# are all exact ints or exact strs.  They are compared and hashed directly
+# here, without going through space.eq_w() and space.hash_w(); the hash is
+# the same as the one computed by descr_hash().
+
+def is_int_or_bytes_tuple(w_obj):
+    from pypy.objspace.std.specialisedtupleobject import Cls_ii, Cls_ints
+    if not isinstance(w_obj, W_AbstractTupleObject):
+        return False
+    if w_obj.user_overridden_class:
+        return False
+    if isinstance(w_obj, Cls_ii) or isinstance(w_obj, Cls_ints):
+        return True
+    return _items_are_int_or_bytes(w_obj.tolist())
+
+@jit.look_inside_iff(lambda items_w:
+        jit.loop_unrolling_heuristic(items_w, len(items_w), UNROLL_CUTOFF))
+def _items_are_int_or_bytes(items_w):
+    for w_item in items_w:
+        if type(w_item) is not W_IntObject and type(w_item) is not W_BytesObject:
+            return False
+    return True
+
+def int_or_bytes_tuple_hash(w_tuple):
+    from pypy.objspace.std.specialisedtupleobject import Cls_ii, Cls_ints
+    # the specialised tuples already hash their unboxed items directly
+    if isinstance(w_tuple, Cls_ii):
+        return w_tuple.space.int_w(w_tuple.descr_hash(w_tuple.space))
+    if isinstance(w_tuple, Cls_ints):
+        return w_tuple.space.int_w(w_tuple.descr_hash(w_tuple.space))
+    assert isinstance(w_tuple, W_AbstractTupleObject)
+    return _hash_int_or_bytes_items(w_tuple.tolist())
+
+@jit.look_inside_iff(lambda items_w:
+        jit.loop_unrolling_heuristic(items_w, len(items_w), UNROLL_CUTOFF))
+def _hash_int_or_bytes_items(items_w):
+    # same algorithm as W_TupleObject.descr_hash()
+    mult = 1000003
+    x = 0x345678
+    z = len(items_w)
+    for w_item in items_w:
+        if type(w_item) is W_IntObject:
+            y = _hash_int(w_item.intval)
+        else:
+            assert isinstance(w_item, W_BytesObject)
+            y = compute_hash(w_item._value)
+            y -= (y == -1)
+        x = (x ^ y) * mult
+        z -= 1
+        mult += 82520 + z + z
+    x += 97531
+    return intmask(x)
+
+def int_or_bytes_tuple_eq(w_tuple1, w_tuple2):
+    from pypy.objspace.std.specialisedtupleobject import Cls_ii, Cls_ints
+    if w_tuple1 is w_tuple2:
+        return True
+    if isinstance(w_tuple1, Cls_ii) and isinstance(w_tuple2, Cls_ii):
+        return (w_tuple1.value0 == w_tuple2.value0 and
+                w_tuple1.value1 == w_tuple2.value1)
+    if isinstance(w_tuple1, Cls_ints) and isinstance(w_tuple2, Cls_ints):
+        return w_tuple1.items == w_tuple2.items
+    assert isinstance(w_tuple1, W_AbstractTupleObject)
+    assert isinstance(w_tuple2, W_AbstractTupleObject)
+    return _eq_int_or_bytes_items(w_tuple1.tolist(), w_tuple2.tolist())
+
+@jit.look_inside_iff(lambda items1_w, items2_w:
+        jit.loop_unrolling_heuristic(items1_w, len(items1_w), UNROLL_CUTOFF))
+def _eq_int_or_bytes_items(items1_w, items2_w):
+    if len(items1_w) != len(items2_w):
+        return False
+    for i in range(len(items1_w)):
+        w_item1 = items1_w[i]
+        w_item2 = items2_w[i]
+        if type(w_item1) is W_IntObject:
+            if (type(w_item2) is not W_IntObject or
+                    w_item1.intval != w_item2.intval):
+                return False
+        else:
+            assert isinstance(w_item1, W_BytesObject)
+            if (type(w_item2) is not W_BytesObject or
+                    w_item1._value != w_item2._value):
+                return False
+    return True
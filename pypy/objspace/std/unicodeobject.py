@@ -25,6 +25,7 @@ from pypy.objspace.std.formatting import mod_format
 from pypy.objspace.std.sliceobject import (W_SliceObject,
     unwrap_start_stop, normalize_simple_slice)
 from pypy.objspace.std.stringmethods import StringMethods
+from pypy.objspace.std.strintern import intern_list
 from pypy.objspace.std.util import IDTAG_SPECIAL, IDTAG_SHIFT
 
 __all__ = ['W_UnicodeObject', 'wrapunicode', 'plain_str2unicode',
@@ -682,14 +683,16 @@ class W_UnicodeObject(W_Root):
         value = self._utf8
         if space.is_none(w_sep):
             res = split(value, maxsplit=maxsplit, isutf8=True)
-            return space.newlist_utf8(res, self.is_ascii())
+            return space.newlist_utf8(intern_list(space, res),
+                                      self.is_ascii())
 
         by = self.convert_arg_to_w_unicode(space, w_sep)._utf8
         if len(by) == 0:
             raise oefmt(space.w_ValueError, "empty separator")
         res = split(value, by, maxsplit, isutf8=True)
 
-        return space.newlist_utf8(res, self.is_ascii())
+        return space.newlist_utf8(intern_list(space, res),
+                                  self.is_ascii())
 
     @unwrap_spec(maxsplit=int)
     def descr_rsplit(self, space, w_sep=None, maxsplit=-1):
@@ -697,14 +700,16 @@ class W_UnicodeObject(W_Root):
         value = self._utf8
         if space.is_none(w_sep):
             res = rsplit(value, maxsplit=maxsplit, isutf8=True)
-            return space.newlist_utf8(res, self.is_ascii())
+            return space.newlist_utf8(intern_list(space, res),
+                                      self.is_ascii())
 
         by = self.convert_arg_to_w_unicode(space, w_sep)._utf8
         if len(by) == 0:
             raise oefmt(space.w_ValueError, "empty separator")
         res = rsplit(value, by, maxsplit, isutf8=True)
 
-        return space.newlist_utf8(res, self.is_ascii())
+        return space.newlist_utf8(intern_list(space, res),
+                                  self.is_ascii())
 
     def descr_getitem(self, space, w_index):
         if isinstance(w_index, W_SliceObject):
@@ -921,7 +926,7 @@ class W_UnicodeObject(W_Root):
         start = self._index_to_byte(index)
         # we must not inline next_codepoint_pos, otherwise we produce a guard!
         end = self.next_codepoint_pos_dont_look_inside(start)
-        return W_UnicodeObject(self._utf8[start:end], 1)
+        return space.newutf8(self._utf8[start:end], 1)
 
     @jit.unroll_safe
     def _getitem_result_constant_index_jit(self, space, index):
@@ -1814,6 +1819,7 @@ def _create_list_from_unicode(value):
     return [s for s in value]
 
 W_UnicodeObject.EMPTY = W_UnicodeObject('', 0)
+W_UnicodeObject.PREBUILT = None
 
 
 # Helper for converting int/long
@@ -26,6 +26,7 @@ from rpython.rlib.objectmodel import Symbolic, compute_hash
 class LLAsmInfo(object):
     def __init__(self, lltrace):
         self.ops_offset = None
+        self.asmlen = 0
         self.lltrace = lltrace
 
 class LLTrace(object):
@@ -327,6 +328,7 @@ class LLGraphCPU(model.AbstractCPU):
     supports_longlong = r_uint is not r_ulonglong
     supports_singlefloats = True
     supports_guard_gc_type = True
+    supports_guard_always_fails = True
     translate_support_code = False
     is_llgraph = True
     vector_ext = VectorExt()
@@ -1311,6 +1313,9 @@ class LLFrame(object):
         if self.lltrace.invalid:
             self.fail_guard(descr)
 
+    def execute_guard_always_fails(self, descr):
+        self.fail_guard(descr)
+
     def execute_int_add_ovf(self, _, x, y):
         try:
             z = ovfcheck(x + y)
@@ -19,6 +19,7 @@ class AbstractCPU(object):
     # Boxes and Consts are BoxFloats and ConstFloats.
     supports_singlefloats = False
     supports_guard_gc_type = False
+    supports_guard_always_fails = False
     supports_load_effective_address = False
 
     propagate_exception_descr = None
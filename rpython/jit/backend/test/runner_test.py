@@ -3482,6 +3482,39 @@ class LLtypeBackendTest(BaseBackendTest):
                 else:
                     assert (got_lasterror, got_altlaster) == (43, 4)
 
+    def test_guard_always_fails(self):
+        if not self.cpu.supports_guard_always_fails:
+            py.test.skip("guard_always_fails not supported")
+        faildescr = BasicFailDescr(1)
+        finaldescr = BasicFinalDescr(0)
+        loop = parse("""
+        [i0, i1]
+        i2 = int_add(i0, 1)
+        guard_always_fails(descr=faildescr) [i2, i1]
+        finish(i0, descr=finaldescr)
+        """, namespace=locals())
+        looptoken = JitCellToken()
+        self.cpu.compile_loop(loop.inputargs, loop.operations, looptoken)
+        deadframe = self.cpu.execute_token(looptoken, -42, 9)
+        fail = self.cpu.get_latest_descr(deadframe)
+        assert fail is faildescr
+        assert self.cpu.get_int_value(deadframe, 0) == -41
+        assert self.cpu.get_int_value(deadframe, 1) == 9
+
+        # attach a bridge
+        finaldescr2 = BasicFinalDescr(2)
+        bridge = parse("""
+        [i2, i3]
+        i4 = int_sub(i2, i3)
+        finish(i4, descr=finaldescr2)
+        """, namespace=locals())
+        self.cpu.compile_bridge(faildescr, bridge.inputargs,
+                                bridge.operations, looptoken)
+        deadframe = self.cpu.execute_token(looptoken, -42, 9)
+        fail = self.cpu.get_latest_descr(deadframe)
+        assert fail.identifier == 2
+        assert self.cpu.get_int_value(deadframe, 0) == -50
+
     def test_guard_not_invalidated(self):
         cpu = self.cpu
         faildescr = BasicFailDescr(1)
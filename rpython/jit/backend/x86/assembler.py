@@ -1801,6 +1801,13 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
         guard_token.known_scratch_value = saved
         self.pending_guard_tokens.append(guard_token)
 
+    def genop_guard_guard_always_fails(self, guard_op, guard_token, locs, ign):
+        # there is no unconditional form of the patchable 'Jcond rel32'
+        # used by guards: emit a comparison whose outcome is known
+        self.mc.CMP_rr(eax.value, eax.value)
+        self.guard_success_cc = rx86.Conditions['NE']
+        self.implement_guard(guard_token)
+
     def genop_guard_guard_exception(self, guard_op, guard_token, locs, resloc):
         loc = locs[0]
         loc1 = locs[1]
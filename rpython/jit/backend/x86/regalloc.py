@@ -447,6 +447,8 @@ class RegAlloc(BaseRegalloc, VectorRegallocMixin):
     def consider_guard_no_exception(self, op):
         self.perform_guard(op, [], None)
 
+    consider_guard_always_fails = consider_guard_no_exception
+
     def consider_guard_not_invalidated(self, op):
         mc = self.assembler.mc
         n = mc.get_relative_pos(break_basic_block=False)
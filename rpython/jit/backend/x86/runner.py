@@ -17,6 +17,7 @@ class AbstractX86CPU(AbstractLLCPU):
     debug = True
     supports_floats = True
     supports_singlefloats = True
+    supports_guard_always_fails = True
     supports_load_effective_address = True
 
     dont_keepalive_stuff = False # for tests
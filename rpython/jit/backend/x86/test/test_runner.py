@@ -378,6 +378,47 @@ class TestX86(LLtypeBackendTest):
                     else:
                         assert result != expected
 
+    def test_guard_always_fails_keeps_values(self):
+        # guard_always_fails is emitted as a CMP of eax with itself
+        # followed by the guard's JNE: check that the values in the
+        # registers, including the result of a comparison, reach the
+        # failargs and the bridge unchanged
+        faildescr = BasicFailDescr(1)
+        faildescr2 = BasicFailDescr(2)
+        targettoken = TargetToken()
+        loop = parse("""
+        [i0, i1]
+        label(i0, i1, descr=targettoken)
+        i2 = int_add(i0, i1)
+        i3 = int_lt(i2, i1)
+        i4 = int_mul(i2, 3)
+        guard_always_fails(descr=faildescr) [i0, i1, i2, i3, i4]
+        jump(i2, i1, descr=targettoken)
+        """, namespace=locals())
+        looptoken = JitCellToken()
+        self.cpu.compile_loop(loop.inputargs, loop.operations, looptoken)
+        deadframe = self.cpu.execute_token(looptoken, 5, 7)
+        fail = self.cpu.get_latest_descr(deadframe)
+        assert fail is faildescr
+        values = [self.cpu.get_int_value(deadframe, i) for i in range(5)]
+        assert values == [5, 7, 12, 0, 36]
+
+        # a bridge that jumps back to the loop, which fails again at
+        # every iteration
+        bridge = parse("""
+        [i0, i1, i2, i3, i4]
+        i5 = int_ge(i2, 30)
+        guard_false(i5, descr=faildescr2) [i2, i4]
+        jump(i2, i1, descr=targettoken)
+        """, namespace=locals())
+        self.cpu.compile_bridge(faildescr, bridge.inputargs,
+                                bridge.operations, looptoken)
+        deadframe = self.cpu.execute_token(looptoken, 5, 7)
+        fail = self.cpu.get_latest_descr(deadframe)
+        assert fail is faildescr2
+        assert self.cpu.get_int_value(deadframe, 0) == 33
+        assert self.cpu.get_int_value(deadframe, 1) == 99
+
     def test_compile_bridge_check_profile_info(self):
         py.test.skip("does not work, reinvestigate")
         class FakeProfileAgent(object):
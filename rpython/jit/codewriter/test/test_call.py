@@ -201,6 +201,39 @@ def test_releases_gil_analyzer():
     assert call_descr.extrainfo.has_random_effects()
     assert call_descr.extrainfo.is_call_release_gil() is False
 
+def test_releasegil_decorator_has_random_effects():
+    from rpython.jit.backend.llgraph.runner import LLGraphCPU
+    from rpython.rlib import rgil
+
+    @rgil.releasegil
+    def raw_sum(buf, length):
+        total = 0
+        for i in range(length):
+            total += buf[i]
+        return total
+
+    def f(n):
+        buf = lltype.malloc(rffi.LONGP.TO, n, flavor='raw')
+        res = raw_sum(buf, n)
+        lltype.free(buf, flavor='raw')
+        return res
+
+    rtyper = support.annotate(f, [5])
+    jitdriver_sd = FakeJitDriverSD(rtyper.annotator.translator.graphs[0])
+    cc = CallControl(LLGraphCPU(rtyper), jitdrivers_sd=[jitdriver_sd])
+    res = cc.find_all_graphs(FakePolicy())
+
+    # other threads run during the call: the JIT must not keep any
+    # cached heap value across it
+    [f_graph] = [x for x in res if x.func is f]
+    [op] = [op for block in f_graph.iterblocks()
+               for op in block.operations
+               if op.opname == 'direct_call' and
+                  op.args[0].value._obj.graph.func is raw_sum]
+    call_descr = cc.getcalldescr(op)
+    assert call_descr.extrainfo.has_random_effects()
+    assert call_descr.extrainfo.check_can_invalidate()
+
 def test_call_release_gil():
     from rpython.jit.backend.llgraph.runner import LLGraphCPU
 
@@ -237,7 +237,8 @@ def compile_simple_loop(metainterp, greenkey, trace, runtime_args, enable_opts,
     target_token = TargetToken(jitcell_token)
     target_token.original_jitcell_token = jitcell_token
     label = ResOperation(rop.LABEL, loop_info.inputargs[:], descr=target_token)
-    jump_op.setdescr(target_token)
+    if jump_op.getopnum() == rop.JUMP:
+        jump_op.setdescr(target_token)
     loop.operations = [label] + ops
     if not we_are_translated():
         loop.check_consistency()
@@ -247,6 +248,21 @@ def compile_simple_loop(metainterp, greenkey, trace, runtime_args, enable_opts,
     record_loop_or_bridge(metainterp_sd, loop)
     return target_token
 
+def compile_cut_loop(metainterp, greenkey):
+    """Compile the beginning of a trace from the interpreter that was too
+    long.  It ends in a GUARD_ALWAYS_FAILS, so it is a loop that never
+    loops, but the bridges that continue it can jump back to its label.
+    """
+    metainterp_sd = metainterp.staticdata
+    history = metainterp.history
+    history.trace.tracing_done()
+    metainterp_sd.jitlog.start_new_trace(metainterp_sd,
+            faildescr=None, entry_bridge=False)
+    enable_opts = metainterp.jitdriver_sd.warmstate.enable_opts
+    cut_at = history.get_trace_position()
+    return compile_simple_loop(metainterp, greenkey, history.trace,
+                               history.inputargs, enable_opts, cut_at)
+
 def compile_loop(metainterp, greenkey, start, inputargs, jumpargs,
                  use_unroll=True):
     """Try to compile a new procedure by closing the current history back
@@ -488,6 +504,19 @@ def do_compile_bridge(metainterp_sd, faildescr, inputargs, operations,
                                             original_loop_token, log=log,
                                             logger=metainterp_sd.jitlog)
 
+def get_code_size(asminfo, operations):
+    """Return the number of bytes used by a newly compiled loop or bridge:
+    the size of its machine code and of the resume data of its guards."""
+    size = 0
+    if asminfo is not None:
+        size = asminfo.asmlen
+    for op in operations:
+        if op.is_guard():
+            descr = op.getdescr()
+            if isinstance(descr, ResumeGuardDescr) and descr.rd_numb:
+                size += len(descr.rd_numb.code)
+    return size
+
 def forget_optimization_info(lst, reset_values=False):
     for item in lst:
         item.set_forwarded(None)
@@ -556,7 +585,13 @@ def send_loop_to_backend(greenkey, jitdriver_sd, metainterp_sd, loop, type,
                                       name=loopname)
     #
     if metainterp_sd.warmrunnerdesc is not None:    # for tests
-        metainterp_sd.warmrunnerdesc.memory_manager.keep_loop_alive(original_jitcell_token)
+        memmgr = metainterp_sd.warmrunnerdesc.memory_manager
+        memmgr.record_code_size(original_jitcell_token,
+                                get_code_size(asminfo, operations))
+        memmgr.keep_loop_alive(original_jitcell_token)
+        if metainterp_sd.guard_stats.enabled:
+            metainterp_sd.guard_stats.record_guards(jitdriver_sd.index,
+                                                    greenkey, operations)
 
 def send_bridge_to_backend(jitdriver_sd, metainterp_sd, faildescr, inputargs,
                            operations, original_loop_token, memo):
@@ -603,6 +638,13 @@ def send_bridge_to_backend(jitdriver_sd, metainterp_sd, faildescr, inputargs,
     metainterp_sd.logger_ops.log_bridge(inputargs, operations, None, faildescr,
                                         ops_offset, memo=memo)
     #
+    if metainterp_sd.warmrunnerdesc is not None:    # for tests
+        metainterp_sd.warmrunnerdesc.memory_manager.record_code_size(
+            original_loop_token, get_code_size(asminfo, operations))
+        if metainterp_sd.guard_stats.enabled:
+            metainterp_sd.guard_stats.record_bridge_guards(faildescr,
+                                                           operations)
+    #
     #if metainterp_sd.warmrunnerdesc is not None:    # for tests
     #    metainterp_sd.warmrunnerdesc.memory_manager.keep_loop_alive(
     #        original_loop_token)
@@ -689,14 +731,19 @@ class AbstractResumeGuardDescr(ResumeDescr):
         raise NotImplementedError("abstract base class")
 
     def handle_fail(self, deadframe, metainterp_sd, jitdriver_sd):
+        if metainterp_sd.guard_stats.enabled:
+            metainterp_sd.guard_stats.guard_failed(self)
         if (self.must_compile(deadframe, metainterp_sd, jitdriver_sd)
                 and not rstack.stack_almost_full()):
+            memmgr = metainterp_sd.warmrunnerdesc.memory_manager
             self.start_compiling()
+            starttime = memmgr.start_compiling()
             try:
                 self._trace_and_compile_from_bridge(deadframe, metainterp_sd,
                                                     jitdriver_sd)
             finally:
                 self.done_compiling()
+                memmgr.done_compiling(starttime)
         else:
             from rpython.jit.metainterp.blackhole import resume_in_blackhole
             if isinstance(self, ResumeGuardCopiedDescr):
@@ -766,7 +813,15 @@ class AbstractResumeGuardDescr(ResumeDescr):
                           intval * 1442968193)
         #
         increment = jitdriver_sd.warmstate.increment_trace_eagerness
-        return jitcounter.tick(hash, increment)
+        if not jitcounter.tick(hash, increment):
+            return False
+        memmgr = metainterp_sd.warmrunnerdesc.memory_manager
+        if not memmgr.can_start_compiling():
+            # over the 'compile_budget': try again a bit later
+            metainterp_sd.profiler.count(Counters.COMPILE_POSTPONED)
+            jitcounter.change_current_fraction(hash, 0.98)
+            return False
+        return True
 
     def start_compiling(self):
         # start tracing and compiling from this guard.
@@ -914,6 +969,9 @@ def invent_fail_descr_for_op(opnum, optimizer, copied_from_descr=None):
     elif opnum in (rop.GUARD_IS_OBJECT, rop.GUARD_SUBCLASS, rop.GUARD_GC_TYPE):
         # note - this only happens in tests
         resumedescr = ResumeAtPositionDescr()
+    elif opnum == rop.GUARD_ALWAYS_FAILS:
+        # resumes at the jit_merge_point where the trace was cut
+        resumedescr = ResumeAtPositionDescr()
     elif opnum in (rop.GUARD_EXCEPTION, rop.GUARD_NO_EXCEPTION):
         if copied_from_descr is not None:
             resumedescr = ResumeGuardCopiedExcDescr(copied_from_descr)
@@ -938,6 +996,8 @@ class ResumeGuardForcedDescr(ResumeGuardDescr):
         # the virtualrefs and virtualizable have been forced by
         # handle_async_forcing() just a moment ago.
         from rpython.jit.metainterp.blackhole import resume_in_blackhole
+        if metainterp_sd.guard_stats.enabled:
+            metainterp_sd.guard_stats.guard_failed(self)
         hidden_all_virtuals = metainterp_sd.cpu.get_savedata_ref(deadframe)
         obj = AllVirtuals.show(hidden_all_virtuals)
         all_virtuals = obj.cache
@@ -0,0 +1,127 @@
+import weakref
+from rpython.rlib.listsort import make_timsort_class
+from rpython.rlib.rweakref import RWeakKeyDictionary
+from rpython.rtyper.annlowlevel import llstr
+from rpython.rtyper.lltypesystem import lltype
+from rpython.jit.metainterp.compile import AbstractResumeGuardDescr
+from rpython.jit.metainterp.resoperation import rop, opname
+
+#
+# Counting how often each guard fails, to find out which guards of the
+# compiled loops are the most costly ones (pypyjit.get_guard_stats()).
+#
+# This is disabled by default.  Once enabled, every guard compiled from
+# then on is recorded, together with its opnum and the greenkey of the
+# debug_merge_point just before it, i.e. the location in the interpreted
+# program that produced the guard.  This is the same information as
+# the backend puts in its codemap, but we keep the greenkey instead of
+# the 'unique_id', so that we can give a readable location without
+# needing any machine code address.
+#
+# The failures are counted in AbstractResumeGuardDescr.handle_fail(),
+# and in ResumeGuardForcedDescr.handle_fail() which overrides it (the
+# other override, CompileLoopVersionDescr's, is for guards that never
+# fail).  Failures that go to a bridge are not seen there, so the counts are
+# the number of times the guard failed back to the interpreter: the
+# ones before the bridge is compiled, and all of them if it never is,
+# e.g. for a guard_value that sees too many different values.
+#
+# All the references to the descrs are weak, and the entries of dead
+# guards that never failed are removed from time to time, so that
+# leaving it enabled doesn't keep freed loops alive.
+#
+
+class GuardStatsEntry(object):
+    def __init__(self, descr, opnum, jd_index, greenkey):
+        self.descr_ref = weakref.ref(descr)
+        self.opnum = opnum
+        self.jd_index = jd_index
+        self.greenkey = greenkey        # list of Consts, or None
+        self.failures = 0
+
+def _fails_more(entry1, entry2):
+    return entry1.failures > entry2.failures
+
+GuardStatsEntrySorter = make_timsort_class(lt=_fails_more)
+
+
+class GuardStats(object):
+    enabled = False
+
+    def __init__(self, metainterp_sd):
+        self.metainterp_sd = metainterp_sd
+        self.reset()
+
+    def reset(self):
+        self.entries = []
+        self.entry_of_descr = RWeakKeyDictionary(AbstractResumeGuardDescr,
+                                                 GuardStatsEntry)
+        self.next_cleanup = 1000
+
+    def set_enabled(self, flag):
+        if flag and not self.enabled:
+            self.reset()
+        self.enabled = flag
+
+    def record_guards(self, jd_index, greenkey, operations):
+        """Called after 'operations' are compiled, as a loop starting at
+        'greenkey' or as a bridge."""
+        for op in operations:
+            opnum = op.getopnum()
+            if opnum == rop.DEBUG_MERGE_POINT:
+                jd_index = op.getarg(0).getint()
+                greenkey = op.getarglist()[3:]
+            elif rop.is_guard(opnum):
+                descr = op.getdescr()
+                if isinstance(descr, AbstractResumeGuardDescr):
+                    entry = GuardStatsEntry(descr, opnum, jd_index, greenkey)
+                    self.entries.append(entry)
+                    self.entry_of_descr.set(descr, entry)
+        if len(self.entries) >= self.next_cleanup:
+            self._cleanup()
+
+    def record_bridge_guards(self, faildescr, operations):
+        # the operations before the first debug_merge_point of the bridge
+        # come from the same place as the guard it is attached to
+        jd_index = -1
+        greenkey = None
+        if isinstance(faildescr, AbstractResumeGuardDescr):
+            entry = self.entry_of_descr.get(faildescr)
+            if entry is not None:
+                jd_index = entry.jd_index
+                greenkey = entry.greenkey
+        self.record_guards(jd_index, greenkey, operations)
+
+    def _cleanup(self):
+        # forget the guards that are freed and never failed
+        entries = []
+        for entry in self.entries:
+            if entry.failures > 0 or entry.descr_ref() is not None:
+                entries.append(entry)
+        self.entries = entries
+        self.next_cleanup = max(1000, len(entries) * 2)
+
+    def guard_failed(self, descr):
+        entry = self.entry_of_descr.get(descr)
+        if entry is not None:
+            entry.failures += 1
+
+    def get_location_str(self, entry):
+        if entry.greenkey is None or entry.jd_index < 0:
+            return '?'
+        jd = self.metainterp_sd.jitdrivers_sd[entry.jd_index]
+        return jd.warmstate.get_location_str(entry.greenkey)
+
+    def get_all_stats(self):
+        """Return a GUARD_STATS_CONTAINER with the guards that failed at
+        least once, the ones that fail the most first."""
+        from rpython.rlib.jit_hooks import GUARD_STATS_CONTAINER
+        entries = [entry for entry in self.entries if entry.failures > 0]
+        GuardStatsEntrySorter(entries).sort()
+        ll_stats = lltype.malloc(GUARD_STATS_CONTAINER, len(entries))
+        for i in range(len(entries)):
+            entry = entries[i]
+            ll_stats[i].guard = llstr(opname[entry.opnum].lower())
+            ll_stats[i].location = llstr(self.get_location_str(entry))
+            ll_stats[i].failures = entry.failures
+        return ll_stats
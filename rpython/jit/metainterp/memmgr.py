@@ -1,7 +1,8 @@
-import math
+import math, time
 from rpython.rlib.rarithmetic import r_int64
 from rpython.rlib.debug import debug_start, debug_print, debug_stop
 from rpython.rlib.objectmodel import we_are_translated
+from rpython.rlib.listsort import make_timsort_class
 
 #
 # Logic to decide which loops are old and not used any more.
@@ -19,8 +20,29 @@ from rpython.rlib.objectmodel import we_are_translated
 # 'generation' field is much smaller than the current generation, and
 # removed from the set.
 #
+# The MemoryManager also keeps track of the wall-clock time spent
+# tracing and compiling.  With a non-zero 'compile_budget' parameter,
+# no new loop or bridge is started once the budget is used up for the
+# current one-second window; the JIT counters of the postponed ones
+# are left just below their threshold, so that they are compiled as
+# soon as the next window starts.
+#
+# Finally, with a non-zero 'code_budget' parameter, the MemoryManager
+# puts a limit on the total size of the machine code and resume data of
+# the loops in 'alive_loops' (each LoopToken's 'code_size' is the sum for
+# the loop and all its bridges).  When the limit is exceeded, the least
+# recently entered loops, i.e. the ones with the smallest 'generation',
+# are removed until only 3/4 of the budget is used, so that we don't have
+# to do it again after every new bridge.
+#
+
+def _entered_earlier(looptoken1, looptoken2):
+    return looptoken1.generation < looptoken2.generation
+
+LoopTokenSorter = make_timsort_class(lt=_entered_earlier)
 
 class MemoryManager(object):
+    timer = staticmethod(time.time)
 
     def __init__(self):
         self.check_frequency = -1
@@ -38,6 +60,12 @@ class MemoryManager(object):
         self.current_generation = r_int64(1)
         self.next_check = r_int64(-1)
         self.alive_loops = {}
+        self.compile_budget = 0.0       # in seconds per second; 0 = none
+        self.compile_window_start = 0.0
+        self.compile_time_spent = 0.0
+        self.code_budget = 0            # in bytes; 0 = none
+        self.code_size = 0              # of the loops in alive_loops
+        self.evicted_loops = 0
 
     def set_max_age(self, max_age, check_frequency=0):
         if max_age <= 0:
@@ -49,17 +77,68 @@ class MemoryManager(object):
             self.check_frequency = check_frequency
             self.next_check = self.current_generation + 1
 
+    def set_compile_budget(self, milliseconds):
+        if milliseconds <= 0:
+            self.compile_budget = 0.0
+        else:
+            self.compile_budget = milliseconds * 0.001
+        self.compile_time_spent = 0.0
+
+    def can_start_compiling(self):
+        """Return False if the 'compile_budget' is used up for the
+        current window, in which case tracing should be postponed."""
+        if self.compile_budget <= 0.0:
+            return True
+        now = self.timer()
+        if now - self.compile_window_start >= 1.0:
+            self.compile_window_start = now
+            self.compile_time_spent = 0.0
+        return self.compile_time_spent < self.compile_budget
+
+    def start_compiling(self):
+        if self.compile_budget <= 0.0:
+            return 0.0
+        return self.timer()
+
+    def done_compiling(self, starttime):
+        # note that this may include some time spent in the blackhole
+        # interpreter after an aborted trace, like the profiler's TRACING
+        if self.compile_budget <= 0.0:
+            return
+        self.compile_time_spent += self.timer() - starttime
+
+    def set_code_budget(self, kilobytes):
+        if kilobytes <= 0:
+            self.code_budget = 0
+        else:
+            self.code_budget = kilobytes * 1024
+
+    def record_code_size(self, looptoken, size):
+        """Called when a loop or bridge of 'looptoken' is compiled, with
+        the size of its machine code and resume data."""
+        looptoken.code_size += size
+        if looptoken in self.alive_loops:
+            self.code_size += size
+
     def next_generation(self):
         self.current_generation += 1
         if self.current_generation == self.next_check:
             self._kill_old_loops_now()
             self.next_check = self.current_generation + self.check_frequency
+        if self.code_budget > 0 and self.code_size > self.code_budget:
+            self._evict_loops_now()
 
     def keep_loop_alive(self, looptoken):
         if looptoken.generation != self.current_generation:
             looptoken.generation = self.current_generation
+            if looptoken not in self.alive_loops:
+                self.code_size += looptoken.code_size
             self.alive_loops[looptoken] = None
 
+    def _free_loop(self, looptoken):
+        del self.alive_loops[looptoken]
+        self.code_size -= looptoken.code_size
+
     def _kill_old_loops_now(self):
         debug_start("jit-mem-collect")
         oldtotal = len(self.alive_loops)
@@ -70,20 +149,46 @@ class MemoryManager(object):
         for looptoken in self.alive_loops.keys():
             if (0 <= looptoken.generation < max_generation or
                 looptoken.invalidated):
-                del self.alive_loops[looptoken]
+                self._free_loop(looptoken)
         newtotal = len(self.alive_loops)
         debug_print("Loop tokens freed: ", oldtotal - newtotal)
         debug_print("Loop tokens left:  ", newtotal)
         #print self.alive_loops.keys()
         if not we_are_translated() and oldtotal != newtotal:
             looptoken = None
-            from rpython.rlib import rgc
-            # a single one is not enough for all tests :-(
-            rgc.collect(); rgc.collect(); rgc.collect()
+            self._collect_for_tests()
         debug_stop("jit-mem-collect")
 
+    def _evict_loops_now(self):
+        debug_start("jit-mem-evict")
+        debug_print("Code size before:  ", self.code_size)
+        looptokens = self.alive_loops.keys()
+        LoopTokenSorter(looptokens).sort()
+        target = self.code_budget // 4 * 3
+        count = 0
+        for looptoken in looptokens:
+            if self.code_size <= target:
+                break
+            if looptoken.generation == self.current_generation:
+                break       # entered just now, and so are all the next ones
+            self._free_loop(looptoken)
+            count += 1
+        self.evicted_loops += count
+        debug_print("Loop tokens evicted:", count)
+        debug_print("Code size after:   ", self.code_size)
+        if not we_are_translated() and count > 0:
+            looptokens = looptoken = None
+            self._collect_for_tests()
+        debug_stop("jit-mem-evict")
+
+    def _collect_for_tests(self):
+        from rpython.rlib import rgc
+        # a single one is not enough for all tests :-(
+        rgc.collect(); rgc.collect(); rgc.collect()
+
     def release_all_loops(self):
         debug_start("jit-mem-releaseall")
         debug_print("Loop tokens cleared:", len(self.alive_loops))
         self.alive_loops.clear()
+        self.code_size = 0
         debug_stop("jit-mem-releaseall")
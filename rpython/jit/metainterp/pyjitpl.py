@@ -10,6 +10,7 @@ from rpython.jit.metainterp.heapcache import HeapCache
 from rpython.jit.metainterp.history import (Const, ConstInt, ConstPtr,
     ConstFloat, CONST_NULL, TargetToken, MissingValue, SwitchToBlackhole)
 from rpython.jit.metainterp.jitprof import EmptyProfiler
+from rpython.jit.metainterp.guardstats import GuardStats
 from rpython.jit.metainterp.logger import Logger
 from rpython.jit.metainterp.optimizeopt.util import args_dict
 from rpython.jit.metainterp.resoperation import rop, OpHelpers, GuardResOp
@@ -1128,7 +1129,8 @@ class MIFrame(object):
         warmrunnerstate = targetjitdriver_sd.warmstate
         assembler_call = False
         if warmrunnerstate.inlining:
-            if warmrunnerstate.can_inline_callable(greenboxes):
+            if (not self.metainterp.baseline_trace and
+                    warmrunnerstate.can_inline_callable(greenboxes)):
                 # We've found a potentially inlinable function; now we need to
                 # see if it's already on the stack. In other words: are we about
                 # to enter recursion? If so, we don't want to inline the
@@ -1878,6 +1880,7 @@ class MetaInterpStaticData(object):
 
         self.profiler = ProfilerClass()
         self.profiler.cpu = cpu
+        self.guard_stats = GuardStats(self)
         self.warmrunnerdesc = warmrunnerdesc
         if warmrunnerdesc:
             self.config = warmrunnerdesc.translator.config
@@ -2042,6 +2045,7 @@ class MetaInterpGlobalData(object):
 
 class MetaInterp(object):
     portal_call_depth = 0
+    baseline_trace = False   # if True, call_assembler the recursive portals
     cancel_count = 0
     exported_state = None
     last_exc_box = None
@@ -2428,6 +2432,10 @@ class MetaInterp(object):
         warmrunnerstate = self.jitdriver_sd.warmstate
         if (self.history.length() > warmrunnerstate.trace_limit or
                 self.history.trace_tag_overflow()):
+            if self.can_cut_trace():
+                # continue until the next loop header, where
+                # reached_loop_header() calls cut_trace()
+                return
             jd_sd, greenkey_of_huge_function = self.find_biggest_function()
             self.staticdata.stats.record_aborted(greenkey_of_huge_function)
             self.portal_trace_positions = None
@@ -2442,6 +2450,54 @@ class MetaInterp(object):
                     warmrunnerstate.JitCell.trace_next_iteration(greenkey)
             raise SwitchToBlackhole(Counters.ABORT_TOO_LONG)
 
+    def can_cut_trace(self):
+        # with 'cut_long_traces', a trace that is too long gets up to
+        # twice 'trace_limit' operations to reach the next loop header
+        warmrunnerstate = self.jitdriver_sd.warmstate
+        return (warmrunnerstate.cut_long_traces and
+                self.staticdata.cpu.supports_guard_always_fails and
+                not self.partial_trace and
+                not self.history.trace_tag_overflow() and
+                self.history.length() <= 2 * warmrunnerstate.trace_limit)
+
+    def cut_trace(self, greenboxes):
+        """The trace is too long: compile it up to this loop header, where
+        it leaves to the interpreter with a GUARD_ALWAYS_FAILS.  Like any
+        other guard, it gets a bridge once it failed often enough, and so
+        tracing continues from here.
+        """
+        self.generate_guard(rop.GUARD_ALWAYS_FAILS)
+        # never executed, but the backend wants the trace to end there
+        sd = self.staticdata
+        exits = [history.CONST_NULL]
+        token = sd.exit_frame_with_exception_descr_ref
+        self.history.record(rop.FINISH, exits, None, descr=token)
+        resumekey = self.resumekey
+        if isinstance(resumekey, compile.ResumeFromInterpDescr):
+            # make it a loop, so that the bridges can close it
+            greenkey = resumekey.original_greenkey
+            target_token = compile.compile_cut_loop(self, greenkey)
+            if target_token is None:
+                compile.giveup()
+            assert isinstance(target_token, TargetToken)
+            jitcell_token = target_token.targeting_jitcell_token
+            self.jitdriver_sd.warmstate.attach_procedure_to_interp(
+                greenkey, jitcell_token)
+            sd.stats.add_jitcell_token(jitcell_token)
+        else:
+            target_token = compile.compile_trace(self, resumekey, exits)
+            if target_token is not token:
+                compile.giveup()
+        sd.profiler.count(Counters.TRACE_CUTS)
+        sd.jitlog.trace_cut()
+        loc = self.jitdriver_sd.warmstate.get_location_str(greenboxes)
+        debug_print('~~~ CUT TRACE AT', loc)
+        # run the rest of this iteration in the blackhole interpreter,
+        # starting from the jit_merge_point
+        from rpython.jit.metainterp.blackhole import convert_and_run_from_pyjitpl
+        convert_and_run_from_pyjitpl(self)
+        assert False    # ^^^ must raise
+
     def _interpret(self):
         # Execute the frames forward until we raise a DoneWithThisFrame,
         # a ExitFrameWithException, or a ContinueRunningNormally exception.
@@ -2641,7 +2697,11 @@ class MetaInterp(object):
             self.exported_state = None
             self.staticdata.log('cancelled, tracing more...')
 
-        # Otherwise, no loop found so far, so continue tracing.
+        # Otherwise, no loop found so far, so continue tracing, unless
+        # the trace is already too long.
+        if (self.history.length() > self.jitdriver_sd.warmstate.trace_limit
+                and self.can_cut_trace()):
+            self.cut_trace(greenboxes)
         start = self.history.get_trace_position()
         self.current_merge_points.append((live_arg_boxes, start))
 
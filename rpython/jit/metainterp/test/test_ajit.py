@@ -4674,6 +4674,42 @@ class TestLLtype(BaseLLtypeTests, LLJitMixin):
         res = self.meta_interp(f, [10])
         assert res == f(10)
 
+    def test_cut_long_traces(self):
+        driver = JitDriver(greens=['pc'], reds=['i', 'n'])
+        def step(pc, i):
+            if pc % 3 == 0:
+                return i + 1
+            elif pc % 3 == 1:
+                return i + 2
+            else:
+                return i - 1
+        # one turn of 'pc' is too long for the trace_limit below
+        def f(n):
+            i = 0
+            pc = 0
+            while i < n:
+                driver.jit_merge_point(pc=pc, i=i, n=n)
+                i = step(pc, i)
+                pc += 1
+                if pc == 60:
+                    pc = 0
+            return i
+
+        res = self.meta_interp(f, [3000], trace_limit=40)
+        assert res == f(3000)
+        self.check_aborted_count_at_least(100)
+        #
+        res = self.meta_interp(f, [3000], trace_limit=40, cut_long_traces=1)
+        assert res == f(3000)
+        self.check_aborted_count(0)
+        cuts = [op for loop in get_stats().get_all_loops()
+                   for op in loop._all_operations()
+                   if op.getopname() == 'guard_always_fails']
+        assert cuts
+        # tracing continued from the cuts
+        assert [op for op in cuts
+                   if hasattr(op.getdescr(), '_llgraph_bridge')]
+
     def test_cached_info_missing(self):
         py.test.skip("XXX hitting a non-translated assert in optimizeopt/heap.py, but seems not to hurt the rest")
         driver = JitDriver(greens = [],
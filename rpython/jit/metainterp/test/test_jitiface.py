@@ -1,6 +1,7 @@
 
 import py
-from rpython.rlib.jit import JitDriver, JitHookInterface, Counters, dont_look_inside
+from rpython.rlib.jit import (JitDriver, JitHookInterface, Counters,
+    dont_look_inside, set_param, virtual_ref, virtual_ref_finish, vref_None)
 from rpython.rlib import jit_hooks
 from rpython.jit.metainterp.test.support import LLJitMixin
 from rpython.jit.codewriter.policy import JitPolicy
@@ -349,6 +350,83 @@ class JitHookInterfaceTests(object):
                                no_stats_history=True)
         assert res == 42
 
+    def test_guard_stats(self):
+        driver = JitDriver(greens = ['code'], reds = ['i', 's'],
+                           get_printable_location=lambda code: 'code %d' % code)
+
+        def loop(code, i):
+            s = 0
+            while i > 0:
+                driver.jit_merge_point(code=code, i=i, s=s)
+                if i % 3 == 0:
+                    s += 1
+                i -= 1
+            return s
+
+        def main():
+            # no bridge: all the failures go back to the interpreter
+            set_param(driver, 'trace_eagerness', 10000)
+            loop(5, 90)          # not counted
+            jit_hooks.stats_set_guard_stats(None, True)
+            loop(7, 90)
+            jit_hooks.stats_set_guard_stats(None, False)
+            loop(7, 90)          # not counted either
+            l = jit_hooks.stats_get_guard_stats(None)
+            if len(l) == 0:
+                return 1000
+            for i in range(len(l)):
+                if hlstr(l[i].location) != 'code 7':
+                    return 2000 + i
+                if i > 0 and l[i].failures > l[i - 1].failures:
+                    return 3000 + i
+            # the guard for 'i % 3 == 0' fails most, the loop exit once
+            if hlstr(l[0].guard) != 'guard_false':
+                return 4000
+            if hlstr(l[len(l) - 1].guard) != 'guard_true':
+                return 5000
+            return l[0].failures
+
+        res = self.meta_interp(main, [])
+        assert 20 <= res < 30
+
+    def test_guard_stats_guard_not_forced(self):
+        # ResumeGuardForcedDescr has its own handle_fail()
+        driver = JitDriver(greens = [], reds = ['n'])
+
+        class XY:
+            pass
+        class ExCtx:
+            pass
+        exctx = ExCtx()
+
+        @dont_look_inside
+        def externalfn(n):
+            if n % 5 == 0:
+                exctx.m = exctx.topframeref().n
+            return 1
+
+        def loop(n):
+            while n > 0:
+                driver.jit_merge_point(n=n)
+                xy = XY()
+                xy.n = n
+                exctx.topframeref = vref = virtual_ref(xy)
+                n -= externalfn(n)
+                virtual_ref_finish(vref, xy)
+                exctx.topframeref = vref_None
+
+        def main():
+            jit_hooks.stats_set_guard_stats(None, True)
+            loop(100)
+            l = jit_hooks.stats_get_guard_stats(None)
+            for i in range(len(l)):
+                if hlstr(l[i].guard) == 'guard_not_forced':
+                    return l[i].failures
+            return -1
+
+        res = self.meta_interp(main, [])
+        assert res > 0
+
 
 class LLJitHookInterfaceTests(JitHookInterfaceTests):
     # use this for any backend, instead of the super class
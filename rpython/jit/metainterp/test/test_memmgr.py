@@ -21,6 +21,7 @@ from rpython.rlib import rgc
 class FakeLoopToken:
     generation = 0
     invalidated = False
+    code_size = 0
 
 
 class _TestMemoryManager:
@@ -78,6 +79,76 @@ class _TestMemoryManager:
             else:
                 assert tokens[i] in memmgr.alive_loops
 
+    def test_compile_budget_disabled(self):
+        memmgr = MemoryManager()
+        memmgr.timer = None     # never called
+        memmgr.set_compile_budget(0)
+        for i in range(10):
+            assert memmgr.can_start_compiling()
+            memmgr.done_compiling(memmgr.start_compiling())
+
+    def test_compile_budget(self):
+        memmgr = MemoryManager()
+        clock = [100.0]
+        memmgr.timer = lambda: clock[0]
+        memmgr.set_compile_budget(50)      # 50 ms per second
+        assert memmgr.can_start_compiling()
+        t0 = memmgr.start_compiling()
+        clock[0] += 0.03
+        memmgr.done_compiling(t0)
+        assert memmgr.can_start_compiling()
+        t0 = memmgr.start_compiling()
+        clock[0] += 0.03
+        memmgr.done_compiling(t0)
+        assert not memmgr.can_start_compiling()    # 60 ms used
+        clock[0] += 0.5
+        assert not memmgr.can_start_compiling()
+        clock[0] += 0.5                            # next window
+        assert memmgr.can_start_compiling()
+
+    def test_code_budget(self):
+        memmgr = MemoryManager()
+        memmgr.set_max_age(0)
+        memmgr.set_code_budget(1)          # 1024 bytes
+        tokens = [FakeLoopToken() for i in range(5)]
+        for token in tokens[:4]:
+            memmgr.record_code_size(token, 300)
+            memmgr.keep_loop_alive(token)
+            memmgr.next_generation()
+        # 1200 bytes: the oldest loops are freed until 3/4 of the budget
+        assert memmgr.alive_loops == dict.fromkeys(tokens[2:4])
+        assert memmgr.code_size == 600
+        assert memmgr.evicted_loops == 2
+        # a bridge of a loop that is alive
+        memmgr.record_code_size(tokens[3], 100)
+        assert memmgr.code_size == 700
+        # tokens[2] is entered again, so tokens[3] is the least recent one
+        memmgr.keep_loop_alive(tokens[2])
+        memmgr.record_code_size(tokens[4], 350)
+        memmgr.keep_loop_alive(tokens[4])
+        memmgr.next_generation()
+        assert memmgr.alive_loops == dict.fromkeys([tokens[2], tokens[4]])
+        assert memmgr.code_size == 650
+        assert memmgr.evicted_loops == 3
+        # a freed loop that is still referenced and entered again
+        memmgr.keep_loop_alive(tokens[0])
+        assert memmgr.code_size == 950
+        memmgr.release_all_loops()
+        assert memmgr.code_size == 0
+
+    def test_code_budget_disabled(self):
+        memmgr = MemoryManager()
+        memmgr.set_max_age(0)
+        memmgr.set_code_budget(0)
+        tokens = [FakeLoopToken() for i in range(10)]
+        for token in tokens:
+            memmgr.record_code_size(token, 100000)
+            memmgr.keep_loop_alive(token)
+            memmgr.next_generation()
+        assert memmgr.alive_loops == dict.fromkeys(tokens)
+        assert memmgr.code_size == 1000000
+        assert memmgr.evicted_loops == 0
+
 
 class _TestIntegration(LLJitMixin):
     # See comments in TestMemoryManager.  To get temporarily the normal
@@ -212,6 +283,66 @@ class _TestIntegration(LLJitMixin):
         assert res == 42
         self.check_enter_count(2 + 10*4)
 
+    def test_compile_budget_postpones(self):
+        myjitdriver = JitDriver(greens=['m'], reds=['n'])
+        def g(m):
+            n = 10
+            while n > 0:
+                myjitdriver.can_enter_jit(n=n, m=m)
+                myjitdriver.jit_merge_point(n=n, m=m)
+                n = n - 1
+            return 21
+        def f():
+            for i in range(30):
+                g(i % 3)
+            return 42
+
+        from rpython.jit.metainterp import memmgr
+        orig_timer = memmgr.MemoryManager.timer
+        clock = [0.0]
+        def timer():
+            clock[0] += 0.001   # every compilation takes a millisecond
+            return clock[0]
+        memmgr.MemoryManager.timer = staticmethod(timer)
+        try:
+            res = self.meta_interp(f, [], compile_budget=1)
+        finally:
+            memmgr.MemoryManager.timer = orig_timer
+        assert res == 42
+        # only one loop compiled, the two others are postponed forever
+        self.check_jitcell_token_count(1)
+
+    def test_code_budget_evicts(self):
+        myjitdriver = JitDriver(greens=['m'], reds=['n'])
+        def g(m):
+            n = 10
+            while n > 0:
+                myjitdriver.can_enter_jit(n=n, m=m)
+                myjitdriver.jit_merge_point(n=n, m=m)
+                n = n - 1
+            return 21
+        def f():
+            for i in range(20):
+                g(7)
+                g(5)
+            return 42
+
+        # the llgraph backend produces no machine code: pretend that
+        # every loop and bridge takes 700 bytes, i.e. 1400 per value of 'm'
+        from rpython.jit.metainterp import compile
+        orig_get_code_size = compile.get_code_size
+        compile.get_code_size = lambda asminfo, operations: 700
+        try:
+            res = self.meta_interp(f, [], code_budget=3)
+            assert res == 42
+            self.check_enter_count(4)
+            res = self.meta_interp(f, [], code_budget=1)
+            assert res == 42
+            # one of the two loops is freed whenever the other is compiled
+            self.check_enter_count(40)
+        finally:
+            compile.get_code_size = orig_get_code_size
+
     def test_call_assembler_keep_alive(self):
         myjitdriver1 = JitDriver(greens=['m'], reds=['n'])
         myjitdriver2 = JitDriver(greens=['m'], reds=['n', 'rec'])
@@ -495,6 +495,38 @@ class RecursiveTests:
         res = self.meta_interp(main, [1], enable_opts='', trace_limit=TRACE_LIMIT)
         self.check_resops(call=0, call_may_force=0)
 
+    def test_baseline_threshold(self):
+        myjitdriver = JitDriver(greens=['pc', 'code'], reds=['n'])
+        def f(code, n):
+            pc = 0
+            while pc < len(code):
+                myjitdriver.jit_merge_point(n=n, code=code, pc=pc)
+                op = code[pc]
+                if op == "-":
+                    n -= 1
+                elif op == "c":
+                    n = f("--", n)
+                pc += 1
+            return n
+        def main(n):
+            # no loop: only the functions can be traced, from their start
+            for i in range(20):
+                n = f("-c-", n)
+            return n
+
+        res = self.meta_interp(main, [100], inline=True,
+                               function_threshold=5)
+        assert res == 20
+        # f("-c-") is traced with f("--") inlined
+        get_stats().check_resops(omit_finish=False, call_may_force_i=0)
+
+        res = self.meta_interp(main, [100], inline=True,
+                               function_threshold=50, baseline_threshold=3)
+        assert res == 20
+        # f("-c-") and f("--") are traced on their own
+        get_stats().check_resops(omit_finish=False, finish=2, int_sub=4,
+                                 call_may_force_i=0, call_assembler_i=1)
+
     def test_trace_from_start(self):
         def p(pc, code):
             code = hlstr(code)
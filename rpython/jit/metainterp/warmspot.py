@@ -92,7 +92,8 @@ def jittify_and_run(interp, graph, args, repeat=1, graph_and_interp_only=False,
                     disable_unrolling=sys.maxint,
                     enable_opts=ALL_OPTS_NAMES, max_retrace_guards=15,
                     max_unroll_recursion=7, vec=0, vec_all=0, vec_cost=0,
-                    **kwds):
+                    compile_budget=0, code_budget=0, baseline_threshold=0,
+                    cut_long_traces=0, **kwds):
     from rpython.config.config import ConfigError
     translator = interp.typer.annotator.translator
     try:
@@ -119,6 +120,10 @@ def jittify_and_run(interp, graph, args, repeat=1, graph_and_interp_only=False,
         jd.warmstate.set_param_vec(vec)
         jd.warmstate.set_param_vec_all(vec_all)
         jd.warmstate.set_param_vec_cost(vec_cost)
+        jd.warmstate.set_param_compile_budget(compile_budget)
+        jd.warmstate.set_param_code_budget(code_budget)
+        jd.warmstate.set_param_baseline_threshold(baseline_threshold)
+        jd.warmstate.set_param_cut_long_traces(cut_long_traces)
     warmrunnerdesc.finish()
     if graph_and_interp_only:
         return interp, graph
@@ -580,7 +585,7 @@ class WarmRunnerDesc(object):
 
         def maybe_enter_jit(*args):
             try:
-                maybe_compile_and_run(state.increment_threshold, *args)
+                maybe_compile_and_run(state.increment_threshold, False, *args)
             except Exception as e:
                 crash_in_jit(e)
         maybe_enter_jit._always_inline_ = True
@@ -944,7 +949,8 @@ class WarmRunnerDesc(object):
             try:
                 # maybe enter from the function's start.
                 maybe_compile_and_run(
-                    state.increment_function_threshold, *args)
+                    state.increment_function_threshold,
+                    state.baseline_tracing, *args)
                 #
                 # then run the normal portal function, i.e. the
                 # interpreter's main loop.  It might enter the jit
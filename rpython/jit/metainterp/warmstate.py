@@ -6,7 +6,7 @@ from rpython.jit.metainterp import resoperation, history, jitexc
 from rpython.jit.metainterp.support import ptr2int, int2adr
 from rpython.rlib.debug import debug_start, debug_stop, debug_print
 from rpython.rlib.debug import have_debug_prints_for
-from rpython.rlib.jit import PARAMETERS
+from rpython.rlib.jit import PARAMETERS, Counters
 from rpython.rlib.rjitlog import rjitlog as jl
 from rpython.rlib.nonconst import NonConstant
 from rpython.rlib.objectmodel import specialize, we_are_translated, r_dict
@@ -243,6 +243,11 @@ class WarmEnterState(object):
                 meth = getattr(self, 'set_param_' + name)
                 meth(default_value)
 
+    function_threshold = 0
+    baseline_threshold = 0
+    baseline_tracing = False
+    cut_long_traces = False
+
     def _compute_threshold(self, threshold):
         return self.warmrunnerdesc.jitcounter.compute_threshold(threshold)
 
@@ -250,6 +255,21 @@ class WarmEnterState(object):
         self.increment_threshold = self._compute_threshold(threshold)
 
     def set_param_function_threshold(self, threshold):
+        self.function_threshold = threshold
+        self._update_function_threshold()
+
+    def set_param_baseline_threshold(self, threshold):
+        self.baseline_threshold = threshold
+        self._update_function_threshold()
+
+    def _update_function_threshold(self):
+        # with a 'baseline_threshold' lower than the 'function_threshold',
+        # functions are traced from their start sooner, but on their own:
+        # the functions they call are not inlined
+        threshold = self.function_threshold
+        self.baseline_tracing = 0 < self.baseline_threshold < threshold
+        if self.baseline_tracing:
+            threshold = self.baseline_threshold
         self.increment_function_threshold = self._compute_threshold(threshold)
 
     def set_param_trace_eagerness(self, value):
@@ -258,6 +278,9 @@ class WarmEnterState(object):
     def set_param_trace_limit(self, value):
         self.trace_limit = value
 
+    def set_param_cut_long_traces(self, value):
+        self.cut_long_traces = bool(value)
+
     def set_param_decay(self, decay):
         self.warmrunnerdesc.jitcounter.set_decay(decay)
 
@@ -288,6 +311,18 @@ class WarmEnterState(object):
             self.warmrunnerdesc.memory_manager is not None):   # all for tests
             self.warmrunnerdesc.memory_manager.set_max_age(value)
 
+    def set_param_compile_budget(self, value):
+        # note: it's a global parameter, not a per-jitdriver one
+        if (self.warmrunnerdesc is not None and
+            self.warmrunnerdesc.memory_manager is not None):   # all for tests
+            self.warmrunnerdesc.memory_manager.set_compile_budget(value)
+
+    def set_param_code_budget(self, value):
+        # note: it's a global parameter, not a per-jitdriver one
+        if (self.warmrunnerdesc is not None and
+            self.warmrunnerdesc.memory_manager is not None):   # all for tests
+            self.warmrunnerdesc.memory_manager.set_code_budget(value)
+
     def set_param_retrace_limit(self, value):
         if self.warmrunnerdesc:
             if self.warmrunnerdesc.memory_manager:
@@ -371,6 +406,7 @@ class WarmEnterState(object):
         func_execute_token = self.cpu.make_execute_token(*ARGS)
         cpu = self.cpu
         jitcounter = self.warmrunnerdesc.jitcounter
+        memmgr = self.warmrunnerdesc.memory_manager
         result_type = jitdriver_sd.result_type
 
         def execute_assembler(loop_token, *args):
@@ -411,29 +447,38 @@ class WarmEnterState(object):
             fail_descr.handle_fail(deadframe, metainterp_sd, jitdriver_sd)
             assert 0, "should have raised"
 
-        def bound_reached(hash, cell, *args):
+        def bound_reached(hash, cell, baseline, *args):
             if not confirm_enter_jit(*args):
                 return
+            if not memmgr.can_start_compiling():
+                # over the 'compile_budget': try again a bit later
+                metainterp_sd.profiler.count(Counters.COMPILE_POSTPONED)
+                jitcounter.change_current_fraction(hash, 0.98)
+                return
             jitcounter.decay_all_counters()
             if rstack.stack_almost_full():
                 return
             # start tracing
             from rpython.jit.metainterp.pyjitpl import MetaInterp
             metainterp = MetaInterp(metainterp_sd, jitdriver_sd)
+            metainterp.baseline_trace = baseline
             greenargs = args[:num_green_args]
             if cell is None:
                 cell = JitCell(*greenargs)
                 jitcounter.install_new_cell(hash, cell)
             cell.flags |= JC_TRACING | JC_TRACING_OCCURRED
+            starttime = memmgr.start_compiling()
             try:
                 metainterp.compile_and_run_once(jitdriver_sd, *args)
             finally:
                 cell.flags &= ~JC_TRACING
+                memmgr.done_compiling(starttime)
 
-        def maybe_compile_and_run(increment_threshold, *args):
+        def maybe_compile_and_run(increment_threshold, baseline, *args):
             """Entry point to the JIT.  Called at the point with the
             can_enter_jit() hint, and at the start of a function
-            with a different threshold.
+            with a different threshold.  If 'baseline' is True, tracing
+            starts without inlining the calls to other functions.
             """
             # Look for the cell corresponding to the current greenargs.
             # Search for the JitCell that is of the correct subclass of
@@ -450,7 +495,7 @@ class WarmEnterState(object):
             else:
                 # not found. increment the counter
                 if jitcounter.tick(hash, increment_threshold):
-                    bound_reached(hash, None, *args)
+                    bound_reached(hash, None, baseline, *args)
                 return
 
             # Here, we have found 'cell'.
@@ -462,7 +507,7 @@ class WarmEnterState(object):
                     return
                 # attached by compile_tmp_callback().  count normally
                 if jitcounter.tick(hash, increment_threshold):
-                    bound_reached(hash, cell, *args)
+                    bound_reached(hash, cell, baseline, *args)
                 return
             # machine code was already compiled for these greenargs
             procedure_token = cell.get_procedure_token()
@@ -477,7 +522,7 @@ class WarmEnterState(object):
                         else:
                             tick = True
                         if tick:
-                            bound_reached(hash, cell, *args)
+                            bound_reached(hash, cell, baseline, *args)
                         return
                 # it was an aborted compilation, or maybe a weakref that
                 # has been freed
@@ -42,6 +42,7 @@ def test_really_run():
     assert info.opt_ops == 11
     assert info.opt_guards == 2
     assert info.forcings == 0
+    assert info.compile_postponed == 0
 
 DATA = '''Tracing:         1       0.006992
 Backend:        1       0.000525
@@ -63,6 +64,8 @@ abort: force quasi-immut: 3
 nvirtuals:              13
 nvholes:                14
 nvreused:               15
+compile postponed:      2
+trace cuts:             5
 vecopt tried:           12
 vecopt success:         4
 Total # of loops:       100
@@ -93,5 +96,7 @@ def test_parse():
     assert info.nvirtuals == 13
     assert info.nvholes == 14
     assert info.nvreused == 15
+    assert info.compile_postponed == 2
+    assert info.trace_cuts == 5
     assert info.vecopt_tried == 12
     assert info.vecopt_success == 4
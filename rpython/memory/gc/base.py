@@ -164,6 +164,16 @@ class GCBase(object):
         self.collect()
         return True
 
+    def release_free_memory(self):
+        return 0
+
+    def must_walk_full_stack_after_switch(self):
+        """Called by the shadowstack root walker, for the first minor
+        collection after a thread or stacklet switch.  If it returns False,
+        the minor collection can still stop walking the stack at the frames
+        that were already seen by a previous minor collection."""
+        return True
+
     def malloc(self, typeid, length=0, zero=False):
         """NOT_RPYTHON
         For testing.  The interface used by the gctransformer is
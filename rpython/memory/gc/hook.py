@@ -26,7 +26,7 @@ class GcHooks(object):
         Called after a minor collection
         """
 
-    def on_gc_collect_step(self, duration, oldstate, newstate):
+    def on_gc_collect_step(self, duration, oldstate, newstate, pages_freed):
         """
         Called after each individual step of a major collection, in case the GC is
         incremental.
@@ -34,6 +34,10 @@ class GcHooks(object):
         ``oldstate`` and ``newstate`` are integers which indicate the GC
         state; for incminimark, see incminimark.STATE_* and
         incminimark.GC_STATES.
+
+        ``pages_freed`` is the number of pages of small objects which
+        were entirely freed by this step; it can only be non-zero for
+        the steps done in the sweeping state.
         """
 
 
@@ -54,9 +58,9 @@ class GcHooks(object):
             self.on_gc_minor(duration, total_memory_used, pinned_objects)
 
     @rgc.no_collect
-    def fire_gc_collect_step(self, duration, oldstate, newstate):
+    def fire_gc_collect_step(self, duration, oldstate, newstate, pages_freed):
         if self.is_gc_collect_step_enabled():
-            self.on_gc_collect_step(duration, oldstate, newstate)
+            self.on_gc_collect_step(duration, oldstate, newstate, pages_freed)
 
     @rgc.no_collect
     def fire_gc_collect(self, num_major_collects,
@@ -22,6 +22,9 @@ ARENA = lltype.Struct('ArenaReference',
     # -- The number of free and the total number of pages in the arena
     ('nfreepages', lltype.Signed),
     ('totalpages', lltype.Signed),
+    # -- How many of the free pages, at the end of 'freepages', were
+    #    already given back to the OS by release_free_pages()
+    ('nreleasedpages', lltype.Signed),
     # -- A chained list of free pages in the arena.  Ends with NULL.
     ('freepages', llmemory.Address),
     # -- A linked list of arenas.  See below.
@@ -143,6 +146,10 @@ class ArenaCollection(object):
         self.peak_memory_used = r_uint(0)
         self.total_memory_alloced = r_uint(0)
         self.peak_memory_alloced = r_uint(0)
+        #
+        # the total number of pages freed by mass_free() so far; only
+        # used for statistics (see GcHooks.on_gc_collect_step)
+        self.pages_freed = 0
 
 
     def _new_page_ptr_list(self, length):
@@ -208,6 +215,8 @@ class ArenaCollection(object):
             #
             # The 'result' was part of the chained list; read the next.
             arena.nfreepages -= 1
+            if arena.nreleasedpages > arena.nfreepages:
+                arena.nreleasedpages = arena.nfreepages
             freepages = result.address[0]
             llarena.arena_reset(result,
                                 llmemory.sizeof(llmemory.Address),
@@ -315,6 +324,7 @@ class ArenaCollection(object):
         arena.base = arena_base
         arena.nfreepages = 0        # they are all uninitialized pages
         arena.totalpages = npages
+        arena.nreleasedpages = 0
         arena.freepages = firstpage
         self.num_uninitialized_pages = npages
         self.current_arena = arena
@@ -488,6 +498,79 @@ class ArenaCollection(object):
         return max_pages
 
 
+    def count_free_pages(self):
+        """Return the number of pages that are free in the arenas.  These
+        pages are part of an arena that still contains some objects, so
+        they are not returned to the OS by mass_free().  The uninitialized
+        pages of 'current_arena' are not counted.
+        """
+        count = 0
+        if self.current_arena != ARENA_NULL:
+            count += self.current_arena.nfreepages
+        # during an incremental sweep, arenas_lists[i] may contain arenas
+        # with more than i free pages, so we need to look at all the lists
+        i = 0
+        while i < self.max_pages_per_arena:
+            arena = self.arenas_lists[i]
+            while arena != ARENA_NULL:
+                count += arena.nfreepages
+                arena = arena.nextarena
+            i += 1
+        return count
+
+
+    def release_free_pages(self):
+        """Tell the OS that the content of the free pages of all arenas
+        is not needed any more (with madvise(), where available).  Objects
+        never move, so this is the best we can do to reduce the RSS of a
+        process whose arenas are sparsely used.  The first word of each free
+        page is kept, because the chained list of free pages goes through
+        it, and madvise() only works on whole OS pages: so only the part of
+        each free page after its first OS page is released, which is nothing
+        if the pages are not larger than the OS pages.  Returns the number
+        of bytes released by this call: the pages that were already released
+        by a previous call, and not used since, are not processed again.
+        """
+        # the pages are aligned to 'page_size', which is a power of two like
+        # the size of the OS pages: if it is larger, then each page starts
+        # with exactly one OS page that madvise_arena_free() leaves alone
+        released_per_page = self.page_size - self._get_os_page_size()
+        if released_per_page <= 0:
+            return 0
+        count = 0
+        if self.current_arena != ARENA_NULL:
+            count += self._release_free_pages_in(self.current_arena)
+        i = 0
+        while i < self.max_pages_per_arena:
+            arena = self.arenas_lists[i]
+            while arena != ARENA_NULL:
+                count += self._release_free_pages_in(arena)
+                arena = arena.nextarena
+            i += 1
+        return count * released_per_page
+
+    def _get_os_page_size(self):
+        return llarena.posixpagesize.get()
+
+    def _release_free_pages_in(self, arena):
+        # Freed pages are inserted at the start of the chained list and
+        # allocate_new_page() takes them from there, so the pages already
+        # released are always the last 'nreleasedpages' free pages.  Only
+        # walk the ones before them.  This also stops before the
+        # uninitialized pages with which the list continues in
+        # 'current_arena', which were never touched.
+        pageaddr = arena.freepages
+        count = arena.nfreepages - arena.nreleasedpages
+        n = count
+        while n > 0:
+            nextpageaddr = pageaddr.address[0]
+            llarena.arena_reset(pageaddr + WORD, self.page_size - WORD, 4)
+            pageaddr = nextpageaddr
+            n -= 1
+        arena.nreleasedpages = arena.nfreepages
+        return count
+
+
     def free_page(self, page):
         """Free a whole page."""
         #
@@ -496,6 +579,7 @@ class ArenaCollection(object):
         # end of mass_free().
         arena = page.arena
         arena.nfreepages += 1
+        self.pages_freed += 1
         pageaddr = llmemory.cast_ptr_to_adr(page)
         pageaddr = llarena.getfakearenaaddress(pageaddr)
         llarena.arena_reset(pageaddr, self.page_size, 0)
@@ -21,6 +21,7 @@ class SimpleArenaCollection(object):
         self.all_objects = []
         self.total_memory_used = 0
         self.arenas_count = 0
+        self.pages_freed = 0     # no pages here
 
     def malloc(self, size):
         nsize = raw_malloc_usage(size)
@@ -53,6 +54,12 @@ class SimpleArenaCollection(object):
                 return False
         return True
 
+    def count_free_pages(self):
+        return 0
+
+    def release_free_pages(self):
+        return 0
+
     def mass_free(self, ok_to_free_func):
         self.mass_free_prepare()
         res = self.mass_free_incremental(ok_to_free_func, sys.maxint)
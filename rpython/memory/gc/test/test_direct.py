@@ -68,6 +68,76 @@ class DirectRootWalker(object):
         pass
 
 
+class ShadowStackDirectRootWalker(DirectRootWalker):
+    """Walks the stack roots in a real shadowstack, with the code of
+    ShadowStackRootWalker.  The tests switch between several stacks, as
+    threads and stacklets do.  Only the current stack is walked: the other
+    ones stand for stacks saved in ShadowStackRefs that marking didn't
+    trace yet."""
+    from rpython.memory.gctransform.shadowstack import ShadowStackRootWalker
+    walk_stack_roots = ShadowStackRootWalker.__dict__['walk_stack_roots']
+    del ShadowStackRootWalker
+
+    def __init__(self, tester):
+        DirectRootWalker.__init__(self, tester)
+        self.gc = tester.gc
+        self.gcdata = lltype.malloc(lltype.Struct('GCDATA',
+                ('root_stack_base', llmemory.Address),
+                ('root_stack_top', llmemory.Address),
+                ('can_look_at_partial_stack', lltype.Bool)), flavor='raw')
+        self.gcdata.root_stack_base = llmemory.NULL
+        self.gcdata.root_stack_top = llmemory.NULL
+        self.gcdata.can_look_at_partial_stack = True
+        self.invoke_collect_stack_root = (
+            lambda arg0, arg1, addr: arg0(self.gc, addr))
+        self.stacks = []
+
+    def new_stack(self, depth=10):
+        a = lltype.malloc(ADDR_ARRAY, depth, flavor='raw')
+        self.stacks.append(a)
+        base = llmemory.cast_ptr_to_adr(lltype.direct_arrayitems(a))
+        return [base, base]
+
+    def switch_to(self, stack):
+        # like switch_shadow_stacks() or a stacklet switch
+        if self.gcdata.root_stack_base:
+            self.current[1] = self.gcdata.root_stack_top
+        self.current = stack
+        self.gcdata.root_stack_base = stack[0]
+        self.gcdata.root_stack_top = stack[1]
+        self.gcdata.can_look_at_partial_stack = False
+
+    def push_frame(self, p):
+        # a frame with a single GC pointer, under its (odd) skip bitmask
+        from rpython.memory.gctransform.framework import sizeofaddr
+        top = self.gcdata.root_stack_top
+        top.address[0] = llmemory.cast_ptr_to_adr(p)
+        top += sizeofaddr
+        top.address[0] = llmemory.cast_int_to_adr(1)
+        top += sizeofaddr
+        self.gcdata.root_stack_top = top
+
+    def read_frame(self, stack, PTR, depth=0):
+        from rpython.memory.gctransform.framework import sizeofaddr
+        addr = stack[0] + (2 * depth) * sizeofaddr
+        return llmemory.cast_adr_to_ptr(addr.address[0], PTR)
+
+    def walk_roots(self, collect_stack_root,
+                   collect_static_in_prebuilt_nongc,
+                   collect_static_in_prebuilt_gc,
+                   is_minor=False):
+        DirectRootWalker.walk_roots(self, None,
+                                    collect_static_in_prebuilt_nongc,
+                                    collect_static_in_prebuilt_gc)
+        if collect_stack_root:
+            self.walk_stack_roots(collect_stack_root, is_minor)
+
+    def free(self):
+        for a in self.stacks:
+            lltype.free(a, flavor='raw')
+        lltype.free(self.gcdata, flavor='raw')
+
+
 class BaseDirectGCTest(object):
     GC_PARAMS = {}
 
@@ -676,6 +746,81 @@ class TestIncrementalMiniMarkGCSimple(TestMiniMarkGCSimple):
         self.gc.debug_gc_step_until(incminimark.STATE_SCANNING)
         assert self.stackroots[1].x == 13
 
+    def test_must_walk_full_stack_after_switch(self):
+        assert self.gc.gc_state == incminimark.STATE_SCANNING
+        assert not self.gc.must_walk_full_stack_after_switch()
+        self.stackroots.append(self.malloc(S))
+        self.gc.debug_gc_step_until(incminimark.STATE_MARKING)
+        assert self.gc.must_walk_full_stack_after_switch()
+        self.gc.debug_gc_step_until(incminimark.STATE_SWEEPING)
+        assert not self.gc.must_walk_full_stack_after_switch()
+        self.gc.debug_gc_step_until(incminimark.STATE_SCANNING)
+        assert not self.gc.must_walk_full_stack_after_switch()
+
+    def _old_object_in_skipped_frame(self):
+        walker = ShadowStackDirectRootWalker(self)
+        self.gc.set_root_walker(walker)
+        stack_a = walker.new_stack()
+        stack_b = walker.new_stack()
+        walker.switch_to(stack_a)
+        p = self.malloc(S)
+        p.x = 42
+        walker.push_frame(p)
+        # the minor collection makes 'p' old and marks its frame as seen:
+        # the following minor collections on this stack stop there
+        self.gc._minor_collection()
+        p = walker.read_frame(stack_a, lltype.Ptr(S))
+        assert not self.gc.is_in_nursery(llmemory.cast_ptr_to_adr(p))
+        return walker, stack_a, stack_b
+
+    def test_partial_stack_walk_after_switch(self):
+        walker, stack_a, stack_b = self._old_object_in_skipped_frame()
+        seen = []
+        def collect_stack_root(gc, addr):
+            seen.append(addr)
+        # outside of marking, the frames seen before a switch are skipped
+        assert self.gc.gc_state == incminimark.STATE_SCANNING
+        walker.switch_to(stack_b)
+        walker.switch_to(stack_a)
+        walker.walk_roots(collect_stack_root, None, None, is_minor=True)
+        assert seen == []
+        assert not walker.gcdata.can_look_at_partial_stack
+        walker.free()
+
+    def test_stack_switch_during_marking(self):
+        walker, stack_a, stack_b = self._old_object_in_skipped_frame()
+        # start a major collection while stack_a is saved away, and not
+        # seen by marking; then switch back to stack_a.  The next minor
+        # collection must walk all of stack_a to mark 'p'
+        walker.switch_to(stack_b)
+        self.gc.debug_gc_step_until(incminimark.STATE_MARKING)
+        walker.switch_to(stack_a)
+        self.gc.debug_gc_step_until(incminimark.STATE_SWEEPING)
+        assert walker.gcdata.can_look_at_partial_stack
+        p = walker.read_frame(stack_a, lltype.Ptr(S))
+        hdr = self.gc.header(llmemory.cast_ptr_to_adr(p))
+        assert hdr.tid & incminimark.GCFLAG_VISITED
+        self.gc.debug_gc_step_until(incminimark.STATE_SCANNING)
+        self.gc.collect()
+        p = walker.read_frame(stack_a, lltype.Ptr(S))
+        assert p.x == 42
+        walker.free()
+
+    def test_stack_switch_during_marking_needs_full_walk(self, monkeypatch):
+        # check that the test above fails if the stack is not completely
+        # walked after the switch
+        monkeypatch.setattr(self.gc, 'must_walk_full_stack_after_switch',
+                            lambda: False)
+        walker, stack_a, stack_b = self._old_object_in_skipped_frame()
+        walker.switch_to(stack_b)
+        self.gc.debug_gc_step_until(incminimark.STATE_MARKING)
+        walker.switch_to(stack_a)
+        self.gc.debug_gc_step_until(incminimark.STATE_SWEEPING)
+        p = walker.read_frame(stack_a, lltype.Ptr(S))
+        hdr = self.gc.header(llmemory.cast_ptr_to_adr(p))
+        assert not hdr.tid & incminimark.GCFLAG_VISITED
+        walker.free()
+
     def test_move_out_of_nursery(self):
         obj0 = self.malloc(S)
         obj0.x = 123
@@ -844,3 +989,28 @@ class TestIncrementalMiniMarkGCFull(DirectGCTest):
             (incminimark.STATE_SWEEPING, incminimark.STATE_FINALIZING),
             (incminimark.STATE_FINALIZING, incminimark.STATE_SCANNING)
             ]
+
+
+class TestIncrementalMiniMarkGCMarkPrefetch(TestIncrementalMiniMarkGCFull):
+    # run all the tests again with PYPY_GC_MARK_PREFETCH=3
+
+    def setup_method(self, meth):
+        TestIncrementalMiniMarkGCFull.setup_method(self, meth)
+        self.gc.mark_prefetch_size = 3
+
+    def test_mark_prefetch_step_keeps_pending_objects(self):
+        for i in range(10):
+            curobj = self.malloc(S)
+            curobj.x = i
+            self.stackroots.append(curobj)
+        self.gc.debug_gc_step_until(incminimark.STATE_MARKING)
+        self.gc._minor_collection()
+        pending = self.gc.objects_to_trace.length()
+        assert pending >= 10
+        # a tiny step visits a single object, and the other objects that
+        # went through the ring must be back in 'objects_to_trace'
+        assert self.gc.visit_all_objects_step(1) == 0
+        assert self.gc.objects_to_trace.length() == pending - 1
+        self.gc.collect()
+        for i in range(10):
+            assert self.stackroots[i].x == i
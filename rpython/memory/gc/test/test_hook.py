@@ -26,6 +26,7 @@ class MyGcHooks(GcHooks):
         self.steps = []
         self.collects = []
         self.durations = []
+        self.pages_freed = []
 
     def on_gc_minor(self, duration, total_memory_used, pinned_objects):
         self.durations.append(duration)
@@ -33,11 +34,13 @@ class MyGcHooks(GcHooks):
             'total_memory_used': total_memory_used,
             'pinned_objects': pinned_objects})
 
-    def on_gc_collect_step(self, duration, oldstate, newstate):
+    def on_gc_collect_step(self, duration, oldstate, newstate,
+                           pages_freed):
         self.durations.append(duration)
         self.steps.append({
             'oldstate': oldstate,
             'newstate': newstate})
+        self.pages_freed.append(pages_freed)
 
     def on_gc_collect(self, num_major_collects,
                       arenas_count_before, arenas_count_after,
@@ -104,6 +107,7 @@ class TestIncMiniMarkHooks(BaseDirectGCTest):
         assert len(self.gc.hooks.durations) == 4 # 4 steps
         for d in self.gc.hooks.durations:
             assert d > 0.0
+        assert self.gc.hooks.pages_freed == [0, 0, 0, 0]
         self.gc.hooks.reset()
         #
         self.stackroots.append(self.malloc(S))
@@ -117,6 +121,28 @@ class TestIncMiniMarkHooks(BaseDirectGCTest):
              'rawmalloc_bytes_before': 0}
             ]
 
+    def test_on_gc_collect_step_pages_freed(self):
+        from rpython.memory.gc import incminimark as m
+        # make some old objects, enough to fill a few pages
+        page_size = self.gc.ac.page_size
+        n = 3 * page_size // self.size_of_S
+        for i in range(n):
+            self.stackroots.append(self.malloc(S))
+        self.gc.collect()
+        # now they die
+        del self.stackroots[:]
+        self.gc.hooks._gc_collect_step_enabled = True
+        self.gc.collect()
+        assert len(self.gc.hooks.steps) == len(self.gc.hooks.pages_freed)
+        freed = 0
+        for step, pages_freed in zip(self.gc.hooks.steps,
+                                     self.gc.hooks.pages_freed):
+            if step['oldstate'] != m.STATE_SWEEPING:
+                assert pages_freed == 0
+            freed += pages_freed
+        assert freed >= 3
+        assert freed == self.gc.ac.pages_freed
+
     def test_hook_disabled(self):
         self.gc._minor_collection()
         self.gc.collect()
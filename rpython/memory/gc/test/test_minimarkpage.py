@@ -175,6 +175,46 @@ def test_simple_arena_collection():
     assert not ac.current_arena and ac.num_uninitialized_pages == 0
 
 
+def test_count_and_release_free_pages():
+    pagesize = hdrsize + 16*WORD
+    ospagesize = 8*WORD
+    released = pagesize - ospagesize
+    ac = arena_collection_for_test(pagesize, "#..#.   ")
+    ac._get_os_page_size = lambda: ospagesize
+    assert ac.count_free_pages() == 3
+    assert ac.release_free_pages() == 3 * released
+    # the chained list of free pages is still valid
+    assert ac.count_free_pages() == 3
+    # the pages are only released once
+    assert ac.release_free_pages() == 0
+    page = ac.allocate_new_page(1); checkpage(ac, page, 1)
+    assert ac.count_free_pages() == 2
+    assert ac.release_free_pages() == 0
+    # a page freed again is released again, but not the older ones
+    ac.page_for_size[1] = PAGE_NULL
+    ac.free_page(page)
+    assert ac.count_free_pages() == 3
+    assert ac.release_free_pages() == released
+    assert ac.release_free_pages() == 0
+    page = ac.allocate_new_page(1); checkpage(ac, page, 1)
+    page = ac.allocate_new_page(2); checkpage(ac, page, 2)
+    page = ac.allocate_new_page(3); checkpage(ac, page, 4)
+    assert ac.count_free_pages() == 0
+    assert ac.release_free_pages() == 0
+    page = ac.allocate_new_page(4); checkpage(ac, page, 5)
+
+def test_release_free_pages_not_larger_than_os_pages():
+    # the first OS page of each free page is kept: nothing is released
+    pagesize = hdrsize + 16*WORD
+    ac = arena_collection_for_test(pagesize, "#..#.   ")
+    for ospagesize in [pagesize, pagesize * 2]:
+        ac._get_os_page_size = lambda: ospagesize
+        assert ac.release_free_pages() == 0
+        assert ac.current_arena.nreleasedpages == 0
+    ac._get_os_page_size = lambda: pagesize // 2
+    assert ac.release_free_pages() == 3 * (pagesize - pagesize // 2)
+
+
 def chkob(ac, num_page, pos_obj, obj):
     pageaddr = pagenum(ac, num_page)
     assert obj == pageaddr + hdrsize + pos_obj
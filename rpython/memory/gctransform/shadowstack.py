@@ -118,9 +118,11 @@ class ShadowStackRootWalker(BaseRootWalker):
         # off a ShadowStackRef object (gctransform/shadowstack.py) which
         # was not seen yet.  We might completely miss some old objects
         # from the parts of that stack that are skipped by this is_minor
-        # optimization.
+        # optimization.  The GC tells us if this can occur at all now
+        # (for incminimark, only during the marking phase).
         gcdata = self.gcdata
-        if is_minor and not gcdata.can_look_at_partial_stack:
+        if (is_minor and not gcdata.can_look_at_partial_stack and
+                self.gc.must_walk_full_stack_after_switch()):
             is_minor = False
             gcdata.can_look_at_partial_stack = True
         walk_stack_root(self.invoke_collect_stack_root, collect_stack_root,
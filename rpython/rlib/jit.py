@@ -565,6 +565,18 @@ PARAMETER_DOCS = {
     'vec_cost': 'threshold for which traces to bail. Unpacking increases the counter,'\
                 ' vector operation decrease the cost',
     'vec_all': 'try to vectorize trace loops that occur outside of the numpypy library',
+    'compile_budget': 'maximum number of milliseconds per second spent tracing '
+                      'and compiling; further loops and bridges are postponed '
+                      '(0=no limit)',
+    'code_budget': 'maximum size in KB of the machine code and resume data '
+                   'of the compiled loops; the least recently entered loops '
+                   'are freed when it is exceeded (0=no limit)',
+    'baseline_threshold': 'number of times a function must run for it to be '
+                          'traced from start on its own, without inlining the '
+                          'functions it calls (0=off)',
+    'cut_long_traces': 'instead of aborting traces longer than trace_limit, '
+                       'compile them up to the next loop header and leave '
+                       'to the interpreter from there (1/0)',
 }
 
 PARAMETERS = {'threshold': 1039, # just above 1024, prime
@@ -583,6 +595,10 @@ PARAMETERS = {'threshold': 1039, # just above 1024, prime
               'vec': 0,
               'vec_all': 0,
               'vec_cost': 0,
+              'compile_budget': 0,
+              'code_budget': 0,
+              'baseline_threshold': 0,
+              'cut_long_traces': 0,
               }
 unroll_parameters = unrolling_iterable(PARAMETERS.items())
 
@@ -1332,6 +1348,8 @@ class Counters(object):
     NVIRTUALS
     NVHOLES
     NVREUSED
+    COMPILE_POSTPONED
+    TRACE_CUTS
     TOTAL_COMPILED_LOOPS
     TOTAL_COMPILED_BRIDGES
     TOTAL_FREED_LOOPS
@@ -3,7 +3,7 @@ from rpython.rtyper.llannotation import SomePtr, lltype_to_annotation
 from rpython.rtyper.annlowlevel import (
     cast_instance_to_gcref, cast_gcref_to_instance, llstr)
 from rpython.rtyper.extregistry import ExtRegistryEntry
-from rpython.rtyper.lltypesystem import llmemory, lltype
+from rpython.rtyper.lltypesystem import llmemory, lltype, rstr
 from rpython.flowspace.model import Constant
 
 
@@ -120,6 +120,19 @@ LOOP_RUN_CONTAINER = lltype.GcArray(lltype.Struct('elem',
 def stats_get_loop_run_times(warmrunnerdesc):
     return warmrunnerdesc.metainterp_sd.cpu.get_all_loop_runs()
 
+GUARD_STATS_CONTAINER = lltype.GcArray(lltype.Struct('elem',
+                                  ('guard', lltype.Ptr(rstr.STR)),
+                                  ('location', lltype.Ptr(rstr.STR)),
+                                  ('failures', lltype.Signed)))
+
+@register_helper(None)
+def stats_set_guard_stats(warmrunnerdesc, flag):
+    warmrunnerdesc.metainterp_sd.guard_stats.set_enabled(flag)
+
+@register_helper(lltype.Ptr(GUARD_STATS_CONTAINER))
+def stats_get_guard_stats(warmrunnerdesc):
+    return warmrunnerdesc.metainterp_sd.guard_stats.get_all_stats()
+
 @register_helper(annmodel.SomeInteger(unsigned=True))
 def stats_asmmemmgr_allocated(warmrunnerdesc):
     return warmrunnerdesc.metainterp_sd.cpu.asmmemmgr.get_stats()[0]
@@ -128,6 +141,14 @@ def stats_asmmemmgr_allocated(warmrunnerdesc):
 def stats_asmmemmgr_used(warmrunnerdesc):
     return warmrunnerdesc.metainterp_sd.cpu.asmmemmgr.get_stats()[1]
 
+@register_helper(annmodel.SomeInteger())
+def stats_memmgr_code_size(warmrunnerdesc):
+    return warmrunnerdesc.memory_manager.code_size
+
+@register_helper(annmodel.SomeInteger())
+def stats_memmgr_evicted_loops(warmrunnerdesc):
+    return warmrunnerdesc.memory_manager.evicted_loops
+
 @register_helper(None)
 def stats_memmgr_release_all(warmrunnerdesc):
     warmrunnerdesc.memory_manager.release_all_loops()
@@ -30,6 +30,20 @@ def collect_step():
     gc.collect()
     return _encode_states(1, 0)
 
+def release_free_memory():
+    """
+    Give back to the OS the memory of the pages which are free inside the
+    arenas of the GC, without moving any object.  Return the number of
+    bytes given back by this call, which does not count the pages given
+    back by a previous call and not reused since.  The first OS page of
+    each free page is kept, so this is only part of the free pages, and
+    nothing if the pages of the GC are not larger than the OS pages.  This
+    is best called just after a full collection.
+
+    Only incminimark does something here; the other GCs return 0.
+    """
+    return 0
+
 def _encode_states(oldstate, newstate):
     return oldstate << 8 | newstate
 
@@ -201,6 +215,19 @@ class IsEnabledEntry(ExtRegistryEntry):
         return hop.genop('gc__isenabled', hop.args_v, resulttype=hop.r_result)
 
 
+class ReleaseFreeMemoryEntry(ExtRegistryEntry):
+    _about_ = release_free_memory
+
+    def compute_result_annotation(self):
+        from rpython.annotator import model as annmodel
+        return annmodel.SomeInteger()
+
+    def specialize_call(self, hop):
+        hop.exception_cannot_occur()
+        return hop.genop('gc__release_free_memory', hop.args_v,
+                         resulttype=hop.r_result)
+
+
 class CollectStepEntry(ExtRegistryEntry):
     _about_ = collect_step
 
@@ -845,7 +872,8 @@ def cast_gcref_to_int(gcref):
 (TOTAL_MEMORY, TOTAL_ALLOCATED_MEMORY, TOTAL_MEMORY_PRESSURE,
  PEAK_MEMORY, PEAK_ALLOCATED_MEMORY, TOTAL_ARENA_MEMORY,
  TOTAL_RAWMALLOCED_MEMORY, PEAK_ARENA_MEMORY, PEAK_RAWMALLOCED_MEMORY,
- NURSERY_SIZE, TOTAL_GC_TIME) = range(11)
+ NURSERY_SIZE, TOTAL_GC_TIME, TOTAL_ARENA_ALLOCATED_MEMORY,
+ ARENA_FREE_PAGES_MEMORY) = range(13)
 
 @not_rpython
 def get_stats(stat_no):
@@ -4,6 +4,7 @@ from rpython.translator.tool.cbuild import ExternalCompilationInfo
 from rpython.rtyper.lltypesystem import lltype, llmemory, rffi
 from rpython.rtyper.extregistry import ExtRegistryEntry
 from rpython.rlib.objectmodel import not_rpython, we_are_translated
+from rpython.tool.sourcetools import func_with_new_name
 
 # these functions manipulate directly the GIL, whose definition does not
 # escape the C code itself
@@ -34,6 +35,15 @@ _gil_acquire      = llexternal('RPyGilAcquire', [], lltype.Void,
                               _nowrapper=True, sandboxsafe=True,
                               compilation_info=eci)
 
+# the same as _gil_release, for releasegil() below.  For the JIT, a call
+# that releases the GIL has random effects on GC objects: other threads
+# run and can change any of them, like around an llexternal declared
+# with releasegil=True
+_gil_release_random_effects = llexternal('RPyGilRelease', [], lltype.Void,
+                                         _nowrapper=True, sandboxsafe=True,
+                                         random_effects_on_gcobjs=True,
+                                         compilation_info=eci)
+
 gil_fetch_fastgil = llexternal('RPyFetchFastGil', [], llmemory.Address,
                                _nowrapper=True, sandboxsafe=True,
                                compilation_info=eci)
@@ -216,6 +226,37 @@ yield_thread._dont_inline_ = True
 # The *_external_call() functions are themselves called only from the rffi
 # module from a helper function that also has this hint.
 
+def releasegil(func):
+    """Decorator: call 'func' with the GIL released, so that other threads
+    run in parallel.  This is for RPython functions that only work on raw
+    memory, like the C functions declared with releasegil=True: for
+    example a loop over a buffer from rffi.scoped_nonmovingbuffer().  The
+    arguments must not be GC objects, and 'func' must not allocate, raise,
+    or use any GC object apart from prebuilt constants.
+    """
+    from rpython.rlib import rgc
+    rgc.no_collect(func)     # checked during translation
+
+    def call_without_gil(*args):
+        if we_are_translated():
+            _gil_release_random_effects()
+            res = func(*args)
+        else:
+            release()
+            try:    # only when non-translated
+                res = func(*args)
+            except:
+                acquire()
+                raise
+        acquire()
+        return res
+    # like rffi's call_external_function(): no GC pointer is alive across
+    # the call, and for the GC it can collect, since other threads run
+    call_without_gil._dont_inline_ = True
+    call_without_gil._gctransformer_hint_close_stack_ = True
+    call_without_gil._jit_look_inside_ = False
+    return func_with_new_name(call_without_gil, 'nogil_' + func.__name__)
+
 def gil_get_holder():
     if we_are_translated():
         return _gil_get_holder()
@@ -215,7 +215,7 @@ def returns(*args):
         return method
     return decor
 
-JITLOG_VERSION = 4
+JITLOG_VERSION = 5
 JITLOG_VERSION_16BIT_LE = struct.pack("<H", JITLOG_VERSION)
 
 marks = [
@@ -249,6 +249,7 @@ marks = [
     ('SOURCE_CODE',),
     ('REDIRECT_ASSEMBLER',),
     ('TMP_CALLBACK',),
+    ('CUT_TRACE',),
 ]
 
 start = 0x11
@@ -380,6 +381,12 @@ class JitLogger(object):
             return
         self._write_marked(MARK_ABORT_TRACE, encode_le_addr(self.trace_id))
 
+    def trace_cut(self):
+        # the current trace was too long and is compiled up to here only
+        if not jitlog_enabled():
+            return
+        self._write_marked(MARK_CUT_TRACE, encode_le_addr(self.trace_id))
+
     def _write_marked(self, mark, line):
         if not we_are_translated():
             assert jitlog_enabled()
@@ -151,3 +151,17 @@ class TestLogger(object):
               jl.encode_le_addr(new_id_looptoken) + \
               jl.encode_le_addr(newlooptoken._ll_function_addr)
         assert binary.endswith(end)
+
+    def test_trace_cut(self, tmpdir, metainterp_sd):
+        logger = jl.JitLogger()
+        file = tmpdir.join('binary_file')
+        file.ensure()
+        rfile = create_file(str(file), 'wb')
+        with FdValidator(rfile.fileno()):
+            jl.jitlog_init(rfile.fileno())
+            logger.start_new_trace(metainterp_sd, jd_name='jdname')
+            logger.trace_cut()
+            rfile.close()
+        binary = file.read()
+        assert binary.endswith(jl.MARK_CUT_TRACE +
+                               jl.encode_le_addr(logger.trace_id))
@@ -3,6 +3,7 @@ from zipfile import ZIP_STORED, ZIP_DEFLATED
 from rpython.rlib.streamio import open_file_as_stream
 from rpython.rlib.rstruct.runpack import runpack
 from rpython.rlib.rarithmetic import r_uint, intmask
+from rpython.rlib import rgil
 from rpython.rtyper.tool.rffi_platform import CompilationError
 import os
 
@@ -74,6 +75,15 @@ def crc32(s, crc=r_uint(0)):
         #/* Note:  (crc >> 8) MUST zero fill on left
     return crc ^ r_uint(0xffffffffL)
 
+@rgil.releasegil
+def crc32_raw(buf, length, crc):
+    """Like crc32(), for the 'length' chars of raw memory at 'buf', e.g.
+    from rffi.scoped_nonmovingbuffer().  Runs without the GIL."""
+    crc = ~crc & r_uint(0xffffffffL)
+    for i in range(length):
+        crc = crc_32_tab[(crc ^ r_uint(ord(buf[i]))) & 0xffL] ^ (crc >> 8)
+    return crc ^ r_uint(0xffffffffL)
+
 # parts copied from zipfile library implementation
 
 class BadZipfile(Exception):
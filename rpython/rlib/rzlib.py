@@ -126,6 +126,12 @@ def zlib_external(*a, **kw):
 
 _crc32 = zlib_external('crc32', [uLong, Bytefp, uInt], uLong)
 _adler32 = zlib_external('adler32', [uLong, Bytefp, uInt], uLong)
+# the same, without releasing the GIL: for small inputs, releasing and
+# reacquiring the GIL costs more than the checksum itself
+_crc32_nogil = zlib_external('crc32', [uLong, Bytefp, uInt], uLong,
+                             releasegil=False)
+_adler32_nogil = zlib_external('adler32', [uLong, Bytefp, uInt], uLong,
+                               releasegil=False)
 
 
 # XXX I want to call deflateInit2, not deflateInit2_
@@ -177,7 +183,12 @@ _zlibVersion = zlib_external('zlibVersion', [], rffi.CCHARP)
 
 # ____________________________________________________________
 
-def _crc_or_adler(string, start, function):
+# like CPython, only release the GIL around checksums of more than 5KB
+CHECKSUM_RELEASE_GIL_LIMIT = 5 * 1024
+
+def _crc_or_adler(string, start, function, function_nogil):
+    if len(string) <= CHECKSUM_RELEASE_GIL_LIMIT:
+        function = function_nogil
     with rffi.scoped_nonmovingbuffer(string) as bytes:
         remaining = len(string)
         checksum = start
@@ -196,7 +207,7 @@ def crc32(string, start=CRC32_DEFAULT_START):
     Compute the CRC32 checksum of the string, possibly with the given
     start value, and return it as a unsigned 32 bit integer.
     """
-    return _crc_or_adler(string, start, _crc32)
+    return _crc_or_adler(string, start, _crc32, _crc32_nogil)
 
 ADLER32_DEFAULT_START = 1
 
@@ -205,7 +216,7 @@ def adler32(string, start=ADLER32_DEFAULT_START):
     Compute the Adler-32 checksum of the string, possibly with the given
     start value, and return it as a unsigned 32 bit integer.
     """
-    return _crc_or_adler(string, start, _adler32)
+    return _crc_or_adler(string, start, _adler32, _adler32_nogil)
 
 
 def deflateSetDictionary(stream, string):
@@ -1,5 +1,6 @@
 from rpython.rlib import rgil
 from rpython.rlib.debug import debug_print
+from rpython.rtyper.lltypesystem import lltype, rffi
 from rpython.translator.c.test.test_standalone import StandaloneTests
 from rpython.config.translationoption import get_combined_translation_config
 
@@ -160,6 +161,72 @@ class BaseTestGIL(StandaloneTests):
         data = cbuilder.cmdexec('')
         assert data == "OK\n"
 
+    def test_releasegil_multiple_threads(self):
+        from rpython.rlib import rthread
+
+        # declared with releasegil=False: it must not touch the GIL here
+        sched_yield = rffi.llexternal('sched_yield', [], rffi.INT,
+                                      releasegil=False, _nowrapper=True)
+
+        @rgil.releasegil
+        def wait_for_flag(flag, maxloops):
+            # the other thread needs the GIL to set the flag: without
+            # the GIL released here, this loop would never see it
+            n = 0
+            while flag[0] == 0:
+                if n == maxloops:
+                    return -1
+                sched_yield()
+                n += 1
+            return n
+
+        class Glob:
+            pass
+        glob = Glob()
+
+        def set_flag():
+            glob.flag[0] = 1
+
+        def main(argv):
+            glob.flag = lltype.malloc(rffi.LONGP.TO, 1, flavor='raw')
+            glob.flag[0] = 0
+            rthread.start_new_thread(set_flag, ())
+            n = wait_for_flag(glob.flag, 10000000)
+            lltype.free(glob.flag, flavor='raw')
+            check = rgil.am_I_holding_the_GIL()
+            print "OK" if n >= 0 and check else "FAIL"
+            return 0
+
+        self.config = get_combined_translation_config(
+            overrides={"translation.thread": True})
+        t, cbuilder = self.compile(main)
+        data = cbuilder.cmdexec('')
+        assert data == "OK\n"
+
+
+def test_releasegil_emulated():
+    import thread, time
+    seen = []
+
+    def other_thread():
+        rgil.acquire()
+        seen.append(rgil.am_I_holding_the_GIL())
+        rgil.release()
+
+    @rgil.releasegil
+    def wait_for_other_thread(x):
+        seen.append(rgil.am_I_holding_the_GIL())
+        thread.start_new_thread(other_thread, ())
+        end_time = time.time() + 10.0
+        while len(seen) < 2 and time.time() < end_time:
+            time.sleep(0.001)
+        return x + 1
+
+    assert wait_for_other_thread.__name__ == 'nogil_wait_for_other_thread'
+    assert wait_for_other_thread(41) == 42
+    assert seen == [False, True]
+    assert rgil.am_I_holding_the_GIL()
+
 
 class TestGILShadowStack(BaseTestGIL):
     gc = 'minimark'
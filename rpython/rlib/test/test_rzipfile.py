@@ -48,3 +48,15 @@ class TestRZipFile(BaseTestRZipFile):
 
 class TestRZipFileCompressed(BaseTestRZipFile):
     compression = ZIP_DEFLATED
+
+def test_crc32_raw():
+    import zlib
+    from rpython.rlib.rzipfile import crc32, crc32_raw
+    from rpython.rlib.rarithmetic import r_uint
+    from rpython.rtyper.lltypesystem import rffi
+    for data in ["", "hello, world", "".join(map(chr, range(256))) * 3]:
+        for start in [r_uint(0), r_uint(0x12345678), r_uint(0xffffffff)]:
+            with rffi.scoped_nonmovingbuffer(data) as buf:
+                res = crc32_raw(buf, len(data), start)
+            assert res == crc32(data, start)
+            assert res == r_uint(zlib.crc32(data, start) & 0xffffffff)
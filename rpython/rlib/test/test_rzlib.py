@@ -66,6 +66,21 @@ def test_adler32_start_value():
     assert helloworldsum == rzlib.adler32(hello + world)
 
 
+def test_checksum_release_gil_limit():
+    """
+    Small strings are checksummed without releasing the GIL, big ones
+    with; the results must be the same either way.
+    """
+    limit = rzlib.CHECKSUM_RELEASE_GIL_LIMIT
+    for size in [limit - 1, limit, limit + 1, 3 * limit]:
+        data = ''.join([chr(i & 0xff) for i in range(size)])
+        assert rzlib.crc32(data) == r_uint(zlib.crc32(data) & 0xffffffff)
+        assert rzlib.adler32(data) == r_uint(zlib.adler32(data) & 0xffffffff)
+        half = size // 2
+        assert rzlib.crc32(data[half:], rzlib.crc32(data[:half])) == (
+            rzlib.crc32(data))
+
+
 def test_invalidLevel():
     """
     deflateInit() should raise ValueError when an out of bounds level is
@@ -834,6 +834,9 @@ class LLFrame(object):
     def op_gc__collect_step(self):
         return self.heap.collect_step()
 
+    def op_gc__release_free_memory(self):
+        return self.heap.release_free_memory()
+
     def op_gc__enable(self):
         self.heap.enable()
 
@@ -417,6 +417,7 @@ LL_OPERATIONS = {
     'raw_memset':           LLOp(revdb_protect=True),
     'raw_memcopy':          LLOp(revdb_protect=True),
     'raw_memmove':          LLOp(revdb_protect=True),
+    'raw_prefetch':         LLOp(canrun=True),   # a hint only
     'raw_load':             LLOp(revdb_protect=True, sideeffects=False,
                                                      canrun=True),
     'raw_store':            LLOp(revdb_protect=True, canrun=True),
@@ -477,6 +478,7 @@ LL_OPERATIONS = {
 
     'gc__collect':          LLOp(canmallocgc=True),
     'gc__collect_step':     LLOp(canmallocgc=True),
+    'gc__release_free_memory': LLOp(),
     'gc__enable':           LLOp(),
     'gc__disable':          LLOp(),
     'gc__isenabled':        LLOp(),
@@ -744,6 +744,9 @@ def op_gc_store(p, ofs, newvalue):
     p = llmemory.cast_adr_to_ptr(p + ofs, lltype.Ptr(lltype.FixedSizeArray(TVAL, 1)))
     p[0] = newvalue
 
+def op_raw_prefetch(p):
+    assert isinstance(p, llmemory.fakeaddress)
+
 def op_raw_load(TVAL, p, ofs):
     from rpython.rtyper.lltypesystem import rffi
     p = rffi.cast(llmemory.Address, p)
@@ -25,6 +25,12 @@
 
 #define OP_RAW_MALLOC_USAGE(size, r) r = size
 
+#ifdef __GNUC__
+#define OP_RAW_PREFETCH(p, r) __builtin_prefetch((void*)(p))
+#else
+#define OP_RAW_PREFETCH(p, r) /* nothing */
+#endif
+
 #if defined(MS_WINDOWS) && !defined(__MINGW32__)
 #define alloca  _alloca
 #endif
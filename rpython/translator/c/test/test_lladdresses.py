@@ -33,6 +33,19 @@ def test_memory_access():
     res = fc(1)
     assert res == 1
 
+def test_prefetch():
+    from rpython.rtyper.lltypesystem import lltype
+    from rpython.rtyper.lltypesystem.lloperation import llop
+    def f(value):
+        addr = raw_malloc(16)
+        addr.signed[0] = value
+        llop.raw_prefetch(lltype.Void, addr)
+        result = addr.signed[0]
+        raw_free(addr)
+        return result
+    fc = compile(f, [int])
+    assert fc(42) == 42
+
 def test_memory_access_zero():
     def f():
         blocks = []
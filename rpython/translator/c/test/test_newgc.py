@@ -11,7 +11,7 @@ from rpython.conftest import option
 from rpython.rlib import rgc
 from rpython.rlib.objectmodel import keepalive_until_here, compute_hash, compute_identity_hash, r_dict
 from rpython.rlib.rstring import StringBuilder
-from rpython.rtyper.lltypesystem import lltype, llmemory, rffi
+from rpython.rtyper.lltypesystem import lltype, llmemory, rffi, llarena
 from rpython.rtyper.lltypesystem.lloperation import llop
 from rpython.memory.test import snippet
 from rpython.tool.udir import udir
@@ -1898,6 +1898,38 @@ class TestIncrementalMiniMarkGC(TestMiniMarkGC):
         deleted = self.run("collect_step")
         assert deleted == 1
 
+    def define_release_free_memory(cls):
+        class A(object):
+            pass
+        def f():
+            l = [A() for i in range(200000)]
+            keep = [l[i] for i in range(0, len(l), 2000)]
+            rgc.collect()     # move all the objects out of the nursery
+            n = len(l)        # keep 'l' alive until here
+            l = []
+            rgc.collect()     # now most pages are free
+            free_before = rgc.get_stats(rgc.ARENA_FREE_PAGES_MEMORY)
+            released = rgc.release_free_memory()
+            released_again = rgc.release_free_memory()
+            free_after = rgc.get_stats(rgc.ARENA_FREE_PAGES_MEMORY)
+            total = rgc.get_stats(rgc.TOTAL_ARENA_ALLOCATED_MEMORY)
+            # the first OS page of each free page is not released
+            ospagesize = llarena.posixpagesize.get()
+            gcpagesize = 1024 * rffi.sizeof(lltype.Signed)
+            if gcpagesize > ospagesize:
+                expected = free_before // gcpagesize * (gcpagesize - ospagesize)
+            else:
+                expected = 0
+            return (free_before > 0 and released == expected and
+                    released_again == 0 and
+                    free_after == free_before and
+                    total > free_before and len(keep) * 2000 == n)
+        return f
+
+    def test_release_free_memory(self):
+        res = self.run("release_free_memory")
+        assert res
+
     def define_total_gc_time(cls):
         def f():
             l = []
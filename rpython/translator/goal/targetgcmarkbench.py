@@ -0,0 +1,100 @@
+"""Measure the marking throughput of the major GC against the heap size.
+
+Translate with:
+
+    rpython --gc=incminimark targetgcmarkbench.py
+
+and run it with the heap sizes to try, in MB, e.g.:
+
+    ./targetgcmarkbench-c 16 64 256 1024
+
+For each size, a graph of small objects is built whose edges point to
+random places of the heap (so that marking is dominated by cache
+misses, as in large real-life heaps).  Then a few full collections are
+done, and the time spent in the MARKING steps is reported.  Compare
+the results with PYPY_GC_MARK_PREFETCH=0 and e.g. PYPY_GC_MARK_PREFETCH=16.
+"""
+
+import time
+from rpython.rlib import rgc
+from rpython.memory.gc.hook import GcHooks
+from rpython.rlib.nonconst import NonConstant
+
+STATE_MARKING = 1     # see incminimark.py
+NODE_SIZE = 32        # approximate size of a Node, in bytes
+REPEAT = 5
+
+
+class Node(object):
+    def __init__(self, value):
+        self.value = value
+        self.left = None
+        self.right = None
+
+
+class MarkStats(object):
+    def reset(self):
+        # NonConstant: see the comment in test_transformed_gc.GcHooksStats
+        self.mark_time = NonConstant(0.0)
+        self.mark_steps = NonConstant(0)
+
+MARK_STATS = MarkStats()
+
+
+class MarkHooks(GcHooks):
+    def is_gc_collect_step_enabled(self):
+        return True
+
+    def on_gc_collect_step(self, duration, oldstate, newstate,
+                           pages_freed):
+        if oldstate == STATE_MARKING:
+            MARK_STATS.mark_time += duration
+            MARK_STATS.mark_steps += 1
+
+
+def build_heap(num_nodes):
+    nodes = [Node(i) for i in range(num_nodes)]
+    # link every node to two pseudo-random other nodes
+    seed = 12345
+    for node in nodes:
+        seed = (seed * 1103515245 + 12345) & 0x7fffffff
+        node.left = nodes[seed % num_nodes]
+        seed = (seed * 1103515245 + 12345) & 0x7fffffff
+        node.right = nodes[seed % num_nodes]
+    return nodes
+
+def bench(megabytes):
+    num_nodes = megabytes * 1024 * 1024 // NODE_SIZE
+    heap = build_heap(num_nodes)
+    rgc.collect()       # move everything out of the nursery, warm up
+    MARK_STATS.reset()
+    t0 = time.time()
+    for i in range(REPEAT):
+        rgc.collect()
+    total = time.time() - t0
+    mark_time = MARK_STATS.mark_time / REPEAT
+    if mark_time > 0.0:
+        throughput = (num_nodes * NODE_SIZE) / mark_time / (1024 * 1024)
+    else:
+        throughput = 0.0
+    print '%d MB, %d objects: mark %f s (%f MB/s, %d steps), ' \
+          'full collection %f s' % (megabytes, num_nodes, mark_time,
+                                    throughput,
+                                    MARK_STATS.mark_steps // REPEAT,
+                                    total / REPEAT)
+    return len(heap)
+
+def entry_point(argv):
+    if len(argv) < 2:
+        print 'usage: %s size_in_MB [size_in_MB...]' % (argv[0],)
+        return 2
+    MARK_STATS.reset()
+    for arg in argv[1:]:
+        bench(int(arg))
+    return 0
+
+def get_gchooks():
+    return MarkHooks()
+
+def target(*args):
+    return entry_point, None